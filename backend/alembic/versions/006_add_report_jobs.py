@@ -0,0 +1,49 @@
+"""Add report jobs table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create report_jobs table (used when REPORT_JOB_BACKEND=database)
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('dedup_key', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.Enum('pending', 'running', 'completed', 'failed', name='reportjobstatus'), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_report_jobs_dedup_key'), 'report_jobs', ['dedup_key'], unique=False)
+    op.create_index(op.f('ix_report_jobs_expires_at'), 'report_jobs', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_report_jobs_expires_at'), table_name='report_jobs')
+    op.drop_index(op.f('ix_report_jobs_dedup_key'), table_name='report_jobs')
+    op.drop_table('report_jobs')
+
+    # Drop enum type
+    op.execute('DROP TYPE IF EXISTS reportjobstatus')
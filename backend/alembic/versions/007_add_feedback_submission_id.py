@@ -0,0 +1,29 @@
+"""Add feedback submission id
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Id handed to the submitter before the buffered row is written
+    op.add_column('feedback', sa.Column('submission_id', sa.String(length=36), nullable=True))
+    op.create_unique_constraint('uq_feedback_submission_id', 'feedback', ['submission_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_feedback_submission_id', 'feedback', type_='unique')
+    op.drop_column('feedback', 'submission_id')
@@ -0,0 +1,41 @@
+"""Add feedback listing indexes and message search
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination walks (created_at, id) newest first, optionally per status
+    op.create_index('ix_feedback_created_at_id', 'feedback', ['created_at', 'id'], unique=False)
+    op.create_index('ix_feedback_status_created_at_id', 'feedback', ['status', 'created_at', 'id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Generated tsvector so the search predicate never recomputes it per row
+        op.execute(
+            "ALTER TABLE feedback ADD COLUMN message_tsv tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('english', coalesce(message, ''))) STORED"
+        )
+        op.execute("CREATE INDEX ix_feedback_message_tsv ON feedback USING GIN (message_tsv)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_feedback_message_tsv")
+        op.drop_column('feedback', 'message_tsv')
+
+    op.drop_index('ix_feedback_status_created_at_id', table_name='feedback')
+    op.drop_index('ix_feedback_created_at_id', table_name='feedback')
@@ -0,0 +1,114 @@
+"""Add exercise catalog and workout_logs.exercise_id
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(name: str) -> str:
+    # Frozen copy of app.services.exercise_catalog.normalize_exercise_name
+    return " ".join(name.split()).casefold()
+
+
+def upgrade() -> None:
+    op.create_table(
+        'exercises',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('normalized_name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exercises_id'), 'exercises', ['id'], unique=False)
+    op.create_index(op.f('ix_exercises_normalized_name'), 'exercises', ['normalized_name'], unique=True)
+
+    op.create_table(
+        'exercise_aliases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('alias', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exercise_aliases_id'), 'exercise_aliases', ['id'], unique=False)
+    op.create_index(op.f('ix_exercise_aliases_exercise_id'), 'exercise_aliases', ['exercise_id'], unique=False)
+    op.create_index(op.f('ix_exercise_aliases_alias'), 'exercise_aliases', ['alias'], unique=True)
+
+    op.add_column('workout_logs', sa.Column('exercise_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_workout_logs_exercise_id', 'workout_logs', 'exercises', ['exercise_id'], ['id'])
+
+    # Backfill: one catalog entry per normalized name, displayed with the most
+    # common spelling, then point every log at it
+    conn = op.get_bind()
+    spellings = defaultdict(Counter)
+    for name, count in conn.execute(
+        sa.text("SELECT exercise_name, COUNT(*) FROM workout_logs GROUP BY exercise_name")
+    ):
+        spellings[_normalize(name)][name] += count
+
+    exercises = sa.table(
+        'exercises',
+        sa.column('id', sa.Integer),
+        sa.column('name', sa.String),
+        sa.column('normalized_name', sa.String),
+        sa.column('created_at', sa.DateTime),
+        sa.column('updated_at', sa.DateTime),
+    )
+    now = datetime.now(timezone.utc)
+    if spellings:
+        op.bulk_insert(exercises, [
+            {
+                'name': " ".join(counts.most_common(1)[0][0].split()),
+                'normalized_name': key,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for key, counts in spellings.items()
+        ])
+
+        ids = dict(conn.execute(sa.select(exercises.c.normalized_name, exercises.c.id)).all())
+        conn.execute(
+            sa.text("UPDATE workout_logs SET exercise_id = :exercise_id WHERE exercise_name = :exercise_name"),
+            [
+                {'exercise_id': ids[key], 'exercise_name': name}
+                for key, counts in spellings.items()
+                for name in counts
+            ]
+        )
+
+    op.create_index(
+        'ix_workout_logs_user_exercise_date', 'workout_logs',
+        ['user_id', 'exercise_id', 'workout_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workout_logs_user_exercise_date', table_name='workout_logs')
+    op.drop_constraint('fk_workout_logs_exercise_id', 'workout_logs', type_='foreignkey')
+    op.drop_column('workout_logs', 'exercise_id')
+
+    op.drop_index(op.f('ix_exercise_aliases_alias'), table_name='exercise_aliases')
+    op.drop_index(op.f('ix_exercise_aliases_exercise_id'), table_name='exercise_aliases')
+    op.drop_index(op.f('ix_exercise_aliases_id'), table_name='exercise_aliases')
+    op.drop_table('exercise_aliases')
+    op.drop_index(op.f('ix_exercises_normalized_name'), table_name='exercises')
+    op.drop_index(op.f('ix_exercises_id'), table_name='exercises')
+    op.drop_table('exercises')
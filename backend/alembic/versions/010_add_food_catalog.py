@@ -0,0 +1,53 @@
+"""Add food catalog and diet_logs.food_id
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'foods',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('normalized_name', sa.String(length=255), nullable=False),
+        sa.Column('serving_size', sa.String(length=100), nullable=True),
+        sa.Column('calories', sa.Float(), nullable=True),
+        sa.Column('protein_grams', sa.Float(), nullable=True),
+        sa.Column('carbs_grams', sa.Float(), nullable=True),
+        sa.Column('fat_grams', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_foods_id'), 'foods', ['id'], unique=False)
+    op.create_index(op.f('ix_foods_normalized_name'), 'foods', ['normalized_name'], unique=True)
+
+    op.add_column('diet_logs', sa.Column('food_id', sa.Integer(), nullable=True))
+    op.add_column('diet_logs', sa.Column('servings', sa.Float(), nullable=True))
+    op.create_foreign_key('fk_diet_logs_food_id', 'diet_logs', 'foods', ['food_id'], ['id'])
+    op.create_index(op.f('ix_diet_logs_food_id'), 'diet_logs', ['food_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_diet_logs_food_id'), table_name='diet_logs')
+    op.drop_constraint('fk_diet_logs_food_id', 'diet_logs', type_='foreignkey')
+    op.drop_column('diet_logs', 'servings')
+    op.drop_column('diet_logs', 'food_id')
+
+    op.drop_index(op.f('ix_foods_normalized_name'), table_name='foods')
+    op.drop_index(op.f('ix_foods_id'), table_name='foods')
+    op.drop_table('foods')
@@ -0,0 +1,51 @@
+"""Add personal_records table
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 15:00:00.000000
+
+Existing history is loaded with ``python -m app.db.backfill_personal_records``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'personal_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('max_weight', sa.Float(), nullable=True),
+        sa.Column('max_weight_date', sa.Date(), nullable=True),
+        sa.Column('max_weight_log_id', sa.Integer(), nullable=True),
+        sa.Column('best_e1rm', sa.Float(), nullable=True),
+        sa.Column('best_e1rm_date', sa.Date(), nullable=True),
+        sa.Column('best_e1rm_log_id', sa.Integer(), nullable=True),
+        sa.Column('best_volume', sa.Float(), nullable=True),
+        sa.Column('best_volume_date', sa.Date(), nullable=True),
+        sa.Column('best_volume_log_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'exercise_id', name='uq_personal_records_user_exercise')
+    )
+    op.create_index(op.f('ix_personal_records_id'), 'personal_records', ['id'], unique=False)
+    op.create_index(op.f('ix_personal_records_user_id'), 'personal_records', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_personal_records_user_id'), table_name='personal_records')
+    op.drop_index(op.f('ix_personal_records_id'), table_name='personal_records')
+    op.drop_table('personal_records')
@@ -0,0 +1,39 @@
+"""Add workout_streaks table
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 16:00:00.000000
+
+Rows are filled as users log workouts; users without a row have their
+streaks computed from history on read.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workout_streaks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('current_start', sa.Date(), nullable=False),
+        sa.Column('last_workout_date', sa.Date(), nullable=False),
+        sa.Column('current_length', sa.Integer(), nullable=False),
+        sa.Column('longest_streak', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('workout_streaks')
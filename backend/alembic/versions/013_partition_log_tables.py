@@ -0,0 +1,116 @@
+"""Range-partition workout_logs and diet_logs by month (PostgreSQL)
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 17:00:00.000000
+
+Each table is rebuilt as a declaratively partitioned parent with one
+partition per calendar month covering the existing rows plus the next
+three months, and a default partition for anything outside those ranges.
+The primary key becomes (id, <date column>) because PostgreSQL requires
+the partition key in every unique constraint; ids still come from the
+original sequence. Indexes and foreign keys are recreated on the parent
+and cascade to every partition. Later months are created by
+``python -m app.db.partitions`` (see DATABASE_SETUP.md).
+
+The rewrite copies every row under an exclusive lock, so run it in a
+maintenance window. Other dialects are left unchanged.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_MONTHS = 3
+
+TABLES = {
+    'workout_logs': {
+        'column': 'workout_date',
+        'indexes': {
+            'ix_workout_logs_id': ['id'],
+            'ix_workout_logs_user_id': ['user_id'],
+            'ix_workout_logs_workout_date': ['workout_date'],
+            'ix_workout_logs_user_exercise_date': ['user_id', 'exercise_id', 'workout_date'],
+        },
+        'foreign_keys': {
+            'workout_logs_user_id_fkey': ('user_id', 'users'),
+            'fk_workout_logs_exercise_id': ('exercise_id', 'exercises'),
+        },
+    },
+    'diet_logs': {
+        'column': 'meal_date',
+        'indexes': {
+            'ix_diet_logs_id': ['id'],
+            'ix_diet_logs_user_id': ['user_id'],
+            'ix_diet_logs_meal_date': ['meal_date'],
+            'ix_diet_logs_food_id': ['food_id'],
+        },
+        'foreign_keys': {
+            'diet_logs_user_id_fkey': ('user_id', 'users'),
+            'fk_diet_logs_food_id': ('food_id', 'foods'),
+        },
+    },
+}
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rebuild(table: str, spec: dict, partitioned: bool) -> None:
+    column = spec['column']
+    source = f'{table}_old'
+    bind = op.get_bind()
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {source}')
+    partition_clause = f' PARTITION BY RANGE ({column})' if partitioned else ''
+    op.execute(f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS){partition_clause}')
+
+    if partitioned:
+        first = bind.execute(sa.text(f"SELECT date_trunc('month', min({column}))::date FROM {source}")).scalar()
+        this_month = date.today().replace(day=1)
+        month = min(first or this_month, this_month)
+        while month <= _add_months(this_month, PREMAKE_MONTHS):
+            following = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+            )
+            month = following
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {source}')
+    # Keep the id sequence when the old table (which owns it) is dropped
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'DROP TABLE {source}')
+
+    primary_key = f'id, {column}' if partitioned else 'id'
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})')
+    for name, columns in spec['indexes'].items():
+        op.create_index(name, table, columns, unique=False)
+    for name, (local, remote) in spec['foreign_keys'].items():
+        op.create_foreign_key(name, table, remote, [local], ['id'])
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, spec in TABLES.items():
+        _rebuild(table, spec, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, spec in TABLES.items():
+        # Dropping the old parent also drops all of its partitions
+        _rebuild(table, spec, partitioned=False)
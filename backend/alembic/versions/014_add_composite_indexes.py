@@ -0,0 +1,102 @@
+"""Add composite and covering indexes for per-user and per-coach queries
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19 18:00:00.000000
+
+Almost every log query filters on user_id plus a date range, bookings are
+read by coach or client plus status, and plans by user plus status. The
+log indexes carry INCLUDE columns on PostgreSQL so the daily chart and
+analytics aggregations are answered by index-only scans.
+
+On PostgreSQL the indexes are built CONCURRENTLY, outside the migration
+transaction, so writes keep flowing. A partitioned parent cannot be
+indexed concurrently: its index is created ON ONLY the parent (invalid at
+first), each partition is indexed concurrently and attached, and the
+parent index becomes valid once every partition is attached. Partitions
+created later by ``python -m app.db.partitions`` get the index on attach.
+
+A concurrent build that fails leaves an INVALID index behind; drop it
+(``DROP INDEX CONCURRENTLY <name>``) and rerun the upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (table, key columns, INCLUDE columns on PostgreSQL)
+INDEXES = {
+    'ix_workout_logs_user_date': ('workout_logs', ['user_id', 'workout_date'], ['id']),
+    'ix_diet_logs_user_date': (
+        'diet_logs', ['user_id', 'meal_date'], ['id', 'calories', 'protein_grams', 'carbs_grams', 'fat_grams']
+    ),
+    'ix_bookings_coach_status': ('bookings', ['coach_id', 'status'], ['client_id']),
+    'ix_bookings_client_status': ('bookings', ['client_id', 'status'], []),
+    'ix_workout_plans_user_status': ('workout_plans', ['user_id', 'status'], []),
+    'ix_diet_plans_user_status': ('diet_plans', ['user_id', 'status'], []),
+}
+
+
+def _partitions(table: str) -> list:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = :table ORDER BY child.relname"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+def _is_partitioned(table: str) -> bool:
+    relkind = op.get_bind().execute(
+        sa.text("SELECT relkind::text FROM pg_class WHERE relname = :table AND relkind IN ('r', 'p')"),
+        {"table": table},
+    ).scalar()
+    return relkind == 'p'
+
+
+def _index_sql(name: str, table: str, columns: list, include: list, prefix: str) -> str:
+    include_clause = f" INCLUDE ({', '.join(include)})" if include else ''
+    return f"CREATE INDEX {prefix}IF NOT EXISTS {name} ON {table} ({', '.join(columns)}){include_clause}"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        for name, (table, columns, _) in INDEXES.items():
+            op.create_index(name, table, columns, unique=False)
+        return
+
+    with op.get_context().autocommit_block():
+        for name, (table, columns, include) in INDEXES.items():
+            if not _is_partitioned(table):
+                op.execute(_index_sql(name, table, columns, include, 'CONCURRENTLY '))
+                continue
+            op.execute(_index_sql(name, f'ONLY {table}', columns, include, ''))
+            for partition in _partitions(table):
+                child = f"{partition}_{'_'.join(columns)}_idx"
+                op.execute(_index_sql(child, partition, columns, include, 'CONCURRENTLY '))
+                op.execute(f'ALTER INDEX {name} ATTACH PARTITION {child}')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        for name, (table, _, _) in INDEXES.items():
+            op.drop_index(name, table_name=table)
+        return
+
+    with op.get_context().autocommit_block():
+        for name, (table, _, _) in INDEXES.items():
+            # A partitioned index cannot be dropped concurrently; dropping it
+            # also drops the attached partition indexes
+            concurrently = '' if _is_partitioned(table) else 'CONCURRENTLY '
+            op.execute(f'DROP INDEX {concurrently}IF EXISTS {name}')
@@ -0,0 +1,58 @@
+"""Add plan_templates and template references on plans
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19 19:00:00.000000
+
+Plans assigned from a template keep only their per-client overrides in
+workout_details / meal_plan_details; existing plans have no template and
+keep their full details.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'plan_templates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('coach_id', sa.Integer(), nullable=False),
+        sa.Column('plan_type', sa.Enum('workout', 'diet', name='plantype'), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['coach_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_plan_templates_id'), 'plan_templates', ['id'], unique=False)
+    op.create_index(op.f('ix_plan_templates_coach_id'), 'plan_templates', ['coach_id'], unique=False)
+
+    for table in ('workout_plans', 'diet_plans'):
+        op.add_column(table, sa.Column('template_id', sa.Integer(), nullable=True))
+        op.create_foreign_key(f'fk_{table}_template_id', table, 'plan_templates', ['template_id'], ['id'])
+        op.create_index(op.f(f'ix_{table}_template_id'), table, ['template_id'], unique=False)
+
+
+def downgrade() -> None:
+    for table in ('diet_plans', 'workout_plans'):
+        op.drop_index(op.f(f'ix_{table}_template_id'), table_name=table)
+        op.drop_constraint(f'fk_{table}_template_id', table, type_='foreignkey')
+        op.drop_column(table, 'template_id')
+
+    op.drop_index(op.f('ix_plan_templates_coach_id'), table_name='plan_templates')
+    op.drop_index(op.f('ix_plan_templates_id'), table_name='plan_templates')
+    op.drop_table('plan_templates')
+
+    # Drop enum type
+    op.execute('DROP TYPE plantype')
@@ -0,0 +1,14 @@
+"""
+Vectorized client analytics
+"""
+
+from app.analytics.service import AnalyticsService
+from app.analytics.trends import moving_average, period_change, trend_slope, calorie_adherence
+
+__all__ = [
+    "AnalyticsService",
+    "moving_average",
+    "period_change",
+    "trend_slope",
+    "calorie_adherence",
+]
@@ -0,0 +1,170 @@
+"""
+Client analytics service shared by the client and coach analytics endpoints
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select, func, and_, literal, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.trends import moving_average, period_change, trend_slope, calorie_adherence
+from app.core.config import settings
+from app.models.workout_log import WorkoutLog
+from app.models.diet_log import DietLog
+from app.models.diet_plan import DietPlan
+from app.models.workout_plan import PlanStatus
+
+MOVING_AVERAGE_DAYS = 7
+NUTRIENT_SERIES = ("calories", "protein_grams", "carbs_grams", "fat_grams")
+
+
+def _value(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else round(value, 2)
+
+
+def _series(values: np.ndarray) -> list:
+    return [None if np.isnan(value) else round(float(value), 2) for value in values]
+
+
+def _change(current, previous) -> dict:
+    current, previous = _value(current), _value(previous)
+    if current is None or previous is None:
+        return {"current": current, "previous": previous, "absolute": None, "percent": None}
+    return {
+        "current": current,
+        "previous": previous,
+        "absolute": round(current - previous, 2),
+        "percent": round((current - previous) / previous * 100, 1) if previous else None,
+    }
+
+
+class AnalyticsService:
+    """Service class for client trend analytics"""
+
+    @staticmethod
+    async def load_daily_series(db: AsyncSession, user_id: int, start: date, end: date) -> dict:
+        """
+        Fetch dense per-day columns for a user in one query
+
+        Workout counts and diet totals are aggregated per day in a single
+        UNION ALL statement and scattered into zero-filled NumPy arrays.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            start: First day (inclusive)
+            end: Last day (inclusive)
+
+        Returns:
+            Dict of "workouts" and nutrient name -> float array of length
+            (end - start).days + 1, indexed by day
+        """
+        zero = literal(0.0)
+        workouts = (
+            select(
+                WorkoutLog.workout_date.label("day"),
+                func.count(WorkoutLog.id).label("workouts"),
+                *(zero.label(name) for name in NUTRIENT_SERIES),
+            )
+            .where(and_(WorkoutLog.user_id == user_id, WorkoutLog.workout_date.between(start, end)))
+            .group_by(WorkoutLog.workout_date)
+        )
+        meals = (
+            select(
+                DietLog.meal_date.label("day"),
+                literal(0).label("workouts"),
+                *(func.coalesce(func.sum(getattr(DietLog, name)), 0.0).label(name) for name in NUTRIENT_SERIES),
+            )
+            .where(and_(DietLog.user_id == user_id, DietLog.meal_date.between(start, end)))
+            .group_by(DietLog.meal_date)
+        )
+        daily = union_all(workouts, meals).subquery()
+        result = await db.execute(
+            select(
+                daily.c.day,
+                func.sum(daily.c.workouts).label("workouts"),
+                *(func.sum(daily.c[name]).label(name) for name in NUTRIENT_SERIES),
+            ).group_by(daily.c.day)
+        )
+        rows = result.all()
+
+        length = (end - start).days + 1
+        columns = {name: np.zeros(length) for name in ("workouts", *NUTRIENT_SERIES)}
+        if rows:
+            days = np.array([row.day for row in rows], dtype="datetime64[D]")
+            index = (days - np.datetime64(start, "D")).astype(int)
+            for position, name in enumerate(("workouts", *NUTRIENT_SERIES), start=1):
+                columns[name][index] = np.array([row[position] for row in rows], dtype=float)
+        return columns
+
+    @staticmethod
+    async def get_client_analytics(
+        db: AsyncSession,
+        user_id: int,
+        days: int = 90,
+        today: Optional[date] = None,
+    ) -> dict:
+        """
+        Compute trend analytics for a client
+
+        Moving averages cover the ``days`` days ending today; the series is
+        fetched with six extra leading days so the first average is a full
+        week. Nutrient averages, deltas and slopes only count days with a
+        diet log.
+
+        Args:
+            db: Database session
+            user_id: Client whose analytics are computed
+            days: Window length ending today
+            today: Reference date (defaults to date.today())
+
+        Returns:
+            Dictionary with dates, 7-day moving averages, week-over-week
+            changes, trend slopes per week and calorie adherence
+        """
+        today = today or date.today()
+        start = today - timedelta(days=days - 1)
+        lookback = start - timedelta(days=MOVING_AVERAGE_DAYS - 1)
+        columns = await AnalyticsService.load_daily_series(db, user_id, lookback, today)
+
+        target = (await db.execute(
+            select(DietPlan.target_calories)
+            .where(and_(DietPlan.user_id == user_id, DietPlan.status == PlanStatus.ACTIVE))
+            .order_by(DietPlan.start_date.desc())
+            .limit(1)
+        )).scalar()
+
+        logged = columns["calories"] > 0
+        window = slice(MOVING_AVERAGE_DAYS - 1, None)
+        analytics = {
+            "window": {
+                "days": days,
+                "start_date": start.isoformat(),
+                "end_date": today.isoformat(),
+            },
+            "dates": [(start + timedelta(days=offset)).isoformat() for offset in range(days)],
+        }
+        for name in ("workouts", *NUTRIENT_SERIES):
+            mask = None if name == "workouts" else logged
+            values, days_mask = columns[name][window], None if mask is None else mask[window]
+            current, previous = period_change(values, MOVING_AVERAGE_DAYS, days_mask)
+            analytics[name] = {
+                "moving_average_7d": _series(moving_average(columns[name], MOVING_AVERAGE_DAYS, mask)),
+                "week_over_week": _change(current, previous),
+                "trend_per_week": _value(trend_slope(values, days_mask) * 7),
+            }
+
+        adherence = {"target_calories": target}
+        if target:
+            stats = calorie_adherence(columns["calories"][window], target, settings.ANALYTICS_ADHERENCE_TOLERANCE)
+            adherence.update({
+                "days_logged": int(stats["days_logged"]),
+                "days_within_target": int(stats["days_within_target"]),
+                "rate": _value(stats["rate"]),
+                "average_ratio": _value(stats["average_ratio"]),
+            })
+        analytics["adherence"] = adherence
+        return analytics
@@ -0,0 +1,111 @@
+"""
+Vectorized trend metrics over daily series
+
+Every function takes arrays whose last axis is consecutive days, so the
+same code handles one client (1-D) or a cohort stacked as a 2-D array.
+An optional boolean ``mask`` marks the days that count (for example days
+with a diet log), so unlogged days do not drag averages towards zero.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def _masked(values: np.ndarray, mask: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.asarray(values, dtype=float)
+    if mask is None:
+        return values, np.ones_like(values)
+    mask = np.asarray(mask, dtype=bool)
+    return np.where(mask, values, 0.0), mask.astype(float)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.full(np.shape(numerator), np.nan), where=denominator > 0)
+
+
+def moving_average(values, window: int = 7, mask=None) -> np.ndarray:
+    """
+    Trailing mean over full windows
+
+    Args:
+        values: Daily values, shape (..., n)
+        window: Window length in days
+        mask: Days to include (defaults to all)
+
+    Returns:
+        Array of shape (..., n - window + 1); NaN where a window has no days
+    """
+    values, weights = _masked(values, mask)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    sums = np.pad(np.cumsum(values, axis=-1), pad)
+    counts = np.pad(np.cumsum(weights, axis=-1), pad)
+    return _ratio(sums[..., window:] - sums[..., :-window], counts[..., window:] - counts[..., :-window])
+
+
+def period_change(values, period: int = 7, mask=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compare the last ``period`` days with the ``period`` days before them
+
+    Without a mask both periods are totals; with a mask they are means of
+    the included days (NaN when a period has none).
+
+    Returns:
+        (current, previous) arrays of shape (...)
+    """
+    values, weights = _masked(values, mask)
+    current = values[..., -period:].sum(axis=-1)
+    previous = values[..., -2 * period:-period].sum(axis=-1)
+    if mask is None:
+        return current, previous
+    return (
+        _ratio(current, weights[..., -period:].sum(axis=-1)),
+        _ratio(previous, weights[..., -2 * period:-period].sum(axis=-1)),
+    )
+
+
+def trend_slope(values, mask=None) -> np.ndarray:
+    """
+    Least-squares slope in units per day
+
+    Returns:
+        Array of shape (...); NaN with fewer than two included days
+    """
+    values, weights = _masked(values, mask)
+    x = np.arange(values.shape[-1], dtype=float)
+    count = weights.sum(axis=-1, keepdims=True)
+    mean_x = _ratio((weights * x).sum(axis=-1, keepdims=True), count)
+    mean_y = _ratio((weights * values).sum(axis=-1, keepdims=True), count)
+    dx = np.where(weights > 0, x - mean_x, 0.0)
+    slope = _ratio((dx * (values - mean_y) * weights).sum(axis=-1), (dx * dx * weights).sum(axis=-1))
+    return np.where(count[..., 0] >= 2, slope, np.nan)
+
+
+def calorie_adherence(calories, target, tolerance: float = 0.1) -> dict:
+    """
+    Adherence of logged days to a daily calorie target
+
+    A day adheres when its total is within ``tolerance`` (a fraction) of
+    the target. Days without calories are not counted.
+
+    Args:
+        calories: Daily calorie totals, shape (..., n)
+        target: Daily target, scalar or shape (...)
+        tolerance: Allowed relative deviation
+
+    Returns:
+        Dict of arrays: days_logged, days_within_target, rate (percent of
+        logged days) and average_ratio (mean calories / target)
+    """
+    calories = np.asarray(calories, dtype=float)
+    target = np.asarray(target, dtype=float)[..., np.newaxis]
+    logged = calories > 0
+    ratio = _ratio(calories, np.broadcast_to(target, calories.shape))
+    within = logged & (np.abs(ratio - 1) <= tolerance)
+    days_logged = logged.sum(axis=-1)
+    return {
+        "days_logged": days_logged,
+        "days_within_target": within.sum(axis=-1),
+        "rate": _ratio(within.sum(axis=-1) * 100.0, days_logged),
+        "average_ratio": _ratio(np.where(logged, ratio, 0.0).sum(axis=-1), days_logged),
+    }
@@ -2,34 +2,49 @@
 Admin endpoints - for system administration and management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import delete, select, func, and_
+from sqlalchemy.orm import load_only, selectinload
 from datetime import date, timedelta
-from typing import List
+from typing import List, Literal, Optional
 
 from app.db.base import get_db
-from app.core.dependencies import require_admin
-from app.models.user import User, UserRole
+from app.core.dependencies import load_full_profile, require_admin
+from app.core.cache import cached
+from app.core.downsample import downsample_chart
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.user import CORE_COLUMNS, User, UserRole, full_profile
+from app.models.exercise import Exercise, ExerciseAlias
 from app.models.workout_log import WorkoutLog
 from app.models.diet_log import DietLog
 from app.models.workout_plan import WorkoutPlan
 from app.models.diet_plan import DietPlan
+from app.models.plan_template import PlanTemplate
 from app.schemas.user import UserUpdate
-from app.schemas.auth import UserResponse
+from app.schemas.auth import UserResponse, UserSummary
+from app.schemas.exercise import ExerciseAliasCreate, ExerciseResponse
+from app.schemas.report_job import ReportJobResponse
+from app.services.report_service import ReportService
+from app.services.exercise_catalog import exercise_catalog, normalize_exercise_name
+from app.services.food_catalog import import_foods_csv
+from app.services.report_jobs import report_job_manager
 
 router = APIRouter()
 
 
 # User Management
-@router.get("/users", response_model=List[UserResponse])
+@router.get("/users", response_model=List[UserSummary])
 async def get_all_users(
     role: UserRole = None,
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all users, optionally filtered by role"""
-    query = select(User)
+    query = select(User).options(load_only(*CORE_COLUMNS, raiseload=True))
     
     if role:
         query = query.where(User.role == role)
@@ -47,7 +62,7 @@ async def get_user(
 ):
     """Get a specific user by ID"""
     result = await db.execute(
-        select(User).where(User.id == user_id)
+        select(User).options(*full_profile()).where(User.id == user_id)
     )
     user = result.scalar_one_or_none()
     
@@ -69,7 +84,7 @@ async def update_user(
 ):
     """Update a user (admin only)"""
     result = await db.execute(
-        select(User).where(User.id == user_id)
+        select(User).options(*full_profile()).where(User.id == user_id)
     )
     user = result.scalar_one_or_none()
     
@@ -82,7 +97,7 @@ async def update_user(
     # Check if email is being changed and if it's already taken
     if user_data.email and user_data.email != user.email:
         email_check = await db.execute(
-            select(User).where(User.email == user_data.email)
+            select(User.id).where(User.email == user_data.email)
         )
         if email_check.scalar_one_or_none():
             raise HTTPException(
@@ -95,8 +110,7 @@ async def update_user(
         setattr(user, field, value)
     
     await db.commit()
-    await db.refresh(user)
-    return user
+    return await load_full_profile(db, user)
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -124,10 +138,104 @@ async def delete_user(
             detail="User not found"
         )
     
+    await _detach_plan_templates(db, user_id)
     await db.delete(user)
     await db.commit()
 
 
+async def _detach_plan_templates(db: AsyncSession, coach_id: int) -> None:
+    """Copy resolved details into plans assigned from the coach's templates, then delete the templates
+
+    Such plans store only their overrides, so dropping the templates alone
+    would silently empty the clients' plans.
+    """
+    coach_templates = select(PlanTemplate.id).where(PlanTemplate.coach_id == coach_id)
+    for model, details_field in ((WorkoutPlan, "workout_details"), (DietPlan, "meal_plan_details")):
+        result = await db.execute(select(model).where(model.template_id.in_(coach_templates)))
+        for plan in result.unique().scalars():
+            setattr(plan, details_field, plan.template.resolve(getattr(plan, details_field)))
+            plan.template = None
+    await db.flush()
+    await db.execute(delete(PlanTemplate).where(PlanTemplate.coach_id == coach_id))
+
+
+# Exercise Catalog
+def _exercise_response(exercise: Exercise) -> ExerciseResponse:
+    return ExerciseResponse(
+        id=exercise.id,
+        name=exercise.name,
+        aliases=sorted(alias.alias for alias in exercise.aliases),
+    )
+
+
+@router.get("/exercises", response_model=List[ExerciseResponse])
+async def get_exercises(
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the exercise catalog with aliases (admin only)"""
+    result = await db.execute(
+        select(Exercise).options(selectinload(Exercise.aliases)).order_by(Exercise.name)
+    )
+    return [_exercise_response(exercise) for exercise in result.scalars().all()]
+
+
+@router.post("/exercises/{exercise_id}/aliases", response_model=ExerciseResponse, status_code=status.HTTP_201_CREATED)
+async def add_exercise_alias(
+    exercise_id: int,
+    alias_data: ExerciseAliasCreate,
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add an alias that resolves to an existing exercise (admin only)"""
+    result = await db.execute(
+        select(Exercise).options(selectinload(Exercise.aliases)).where(Exercise.id == exercise_id)
+    )
+    exercise = result.scalar_one_or_none()
+    
+    if not exercise:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exercise not found"
+        )
+    
+    # Names already in use keep their own entry; re-pointing them would leave
+    # other processes' caches resolving to the old id
+    if await exercise_catalog.resolve(db, alias_data.alias) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Alias already in use"
+        )
+    
+    exercise.aliases.append(ExerciseAlias(alias=normalize_exercise_name(alias_data.alias)))
+    await db.commit()
+    return _exercise_response(exercise)
+
+
+# Food Catalog
+@router.post("/foods/import")
+async def import_foods(
+    file: UploadFile = File(...),
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk import the food catalog from CSV (admin only)
+    
+    Columns: name (required), serving_size, calories, protein_grams,
+    carbs_grams, fat_grams. Foods whose name already exists are updated.
+    Invalid rows are skipped and reported; an unreadable file imports nothing.
+    """
+    try:
+        return await import_foods_csv(db, file.file, batch_size=settings.FOOD_IMPORT_BATCH_SIZE)
+    except (ValueError, csv.Error) as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CSV file: {exc}"
+        )
+
+
 # Platform Statistics
 @router.get("/stats")
 async def get_platform_stats(
@@ -198,6 +306,14 @@ async def get_platform_stats(
     }
 
 
+@router.get("/metrics")
+async def get_metrics(
+    current_user: User = Depends(require_admin),
+):
+    """Get this worker's in-process metrics (cache hits, misses, coalescing)"""
+    return metrics.snapshot()
+
+
 # Usage Report
 @router.get("/reports/usage")
 async def generate_usage_report(
@@ -206,77 +322,47 @@ async def generate_usage_report(
     db: AsyncSession = Depends(get_db)
 ):
     """Generate a usage report for the specified period"""
-    start_date = date.today() - timedelta(days=days)
-    
-    # New users in period
-    new_users = await db.execute(
-        select(func.count(User.id))
-        .where(User.created_at >= start_date)
-    )
-    
-    # Activity in period
-    workouts_in_period = await db.execute(
-        select(func.count(WorkoutLog.id))
-        .where(WorkoutLog.workout_date >= start_date)
-    )
-    
-    diet_logs_in_period = await db.execute(
-        select(func.count(DietLog.id))
-        .where(DietLog.meal_date >= start_date)
-    )
-    
-    # Plans created in period
-    workout_plans_created = await db.execute(
-        select(func.count(WorkoutPlan.id))
-        .where(WorkoutPlan.created_at >= start_date)
-    )
-    
-    diet_plans_created = await db.execute(
-        select(func.count(DietPlan.id))
-        .where(DietPlan.created_at >= start_date)
-    )
-    
-    # Most active users
-    most_active_workout = await db.execute(
-        select(User.id, User.full_name, User.email, func.count(WorkoutLog.id).label('count'))
-        .join(WorkoutLog, User.id == WorkoutLog.user_id)
-        .where(WorkoutLog.workout_date >= start_date)
-        .group_by(User.id, User.full_name, User.email)
-        .order_by(func.count(WorkoutLog.id).desc())
-        .limit(5)
-    )
-    
-    top_users = [
-        {
-            "user_id": row[0],
-            "full_name": row[1],
-            "email": row[2],
-            "workout_count": row[3]
-        }
-        for row in most_active_workout.all()
-    ]
-    
-    return {
-        "report_period_days": days,
-        "start_date": start_date.isoformat(),
-        "end_date": date.today().isoformat(),
-        "new_users": new_users.scalar() or 0,
-        "activity": {
-            "workouts_logged": workouts_in_period.scalar() or 0,
-            "diet_logs": diet_logs_in_period.scalar() or 0
-        },
-        "plans_created": {
-            "workout_plans": workout_plans_created.scalar() or 0,
-            "diet_plans": diet_plans_created.scalar() or 0
-        },
-        "top_users": top_users
-    }
+    return await ReportService.usage_report(db, days)
+
+
+@router.post("/reports/usage", response_model=ReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_usage_report(
+    days: int = 30,
+    current_user: User = Depends(require_admin),
+):
+    """
+    Queue a usage report for background generation
+
+    Identical requests submitted while a job is still pending or running
+    return the same job. Poll GET /reports/{job_id} for the result.
+    """
+    return await report_job_manager.submit("usage", {"days": days})
+
+
+@router.get("/reports/{job_id}", response_model=ReportJobResponse)
+async def get_report_job(
+    job_id: str,
+    current_user: User = Depends(require_admin),
+):
+    """Get the status and, once completed, the result of a report job"""
+    job = await report_job_manager.get(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found"
+        )
+
+    return job
 
 
 # Chart Data Endpoints
 @router.get("/charts/user-growth")
+@cached("admin.user_growth", ttl=settings.CHART_CACHE_TTL_SECONDS, stale_ttl=settings.CHART_CACHE_STALE_SECONDS)
 async def get_user_growth_chart(
     days: int = 90,
+    max_points: Optional[int] = Query(None, ge=3, le=2000),
+    downsample: Literal["lttb", "bucket"] = "lttb",
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
@@ -311,17 +397,24 @@ async def get_user_growth_chart(
         elif row.role == "admin":
             growth_data[date_str]["admins"] = row.count
     
-    return {
-        "labels": list(growth_data.keys()),
-        "clients": [growth_data[k]["clients"] for k in growth_data.keys()],
-        "coaches": [growth_data[k]["coaches"] for k in growth_data.keys()],
-        "admins": [growth_data[k]["admins"] for k in growth_data.keys()]
-    }
+    return downsample_chart(
+        list(growth_data.keys()),
+        {
+            "clients": [growth_data[k]["clients"] for k in growth_data.keys()],
+            "coaches": [growth_data[k]["coaches"] for k in growth_data.keys()],
+            "admins": [growth_data[k]["admins"] for k in growth_data.keys()]
+        },
+        max_points,
+        downsample,
+    )
 
 
 @router.get("/charts/platform-usage")
+@cached("admin.platform_usage", ttl=settings.CHART_CACHE_TTL_SECONDS, stale_ttl=settings.CHART_CACHE_STALE_SECONDS)
 async def get_platform_usage_chart(
     days: int = 30,
+    max_points: Optional[int] = Query(None, ge=3, le=2000),
+    downsample: Literal["lttb", "bucket"] = "lttb",
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
@@ -353,18 +446,23 @@ async def get_platform_usage_chart(
     diet_data = diet_result.all()
     
     return {
-        "workouts": {
-            "labels": [row.workout_date.isoformat() for row in workout_data],
-            "data": [row.count for row in workout_data]
-        },
-        "diet_logs": {
-            "labels": [row.meal_date.isoformat() for row in diet_data],
-            "data": [row.count for row in diet_data]
-        }
+        "workouts": downsample_chart(
+            [row.workout_date.isoformat() for row in workout_data],
+            {"data": [row.count for row in workout_data]},
+            max_points,
+            downsample,
+        ),
+        "diet_logs": downsample_chart(
+            [row.meal_date.isoformat() for row in diet_data],
+            {"data": [row.count for row in diet_data]},
+            max_points,
+            downsample,
+        )
     }
 
 
 @router.get("/charts/coach-performance")
+@cached("admin.coach_performance", ttl=settings.CHART_CACHE_TTL_SECONDS, stale_ttl=settings.CHART_CACHE_STALE_SECONDS)
 async def get_coach_performance_chart(
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
@@ -393,8 +491,11 @@ async def get_coach_performance_chart(
 
 
 @router.get("/charts/system-health")
+@cached("admin.system_health", ttl=settings.CHART_CACHE_TTL_SECONDS, stale_ttl=settings.CHART_CACHE_STALE_SECONDS)
 async def get_system_health_chart(
     days: int = 7,
+    max_points: Optional[int] = Query(None, ge=3, le=2000),
+    downsample: Literal["lttb", "bucket"] = "lttb",
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
@@ -421,10 +522,12 @@ async def get_system_health_chart(
     
     # Calculate engagement rate
     return {
-        "daily_active_users": {
-            "labels": [row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date) for row in active_users_data],
-            "data": [row.count for row in active_users_data]
-        },
+        "daily_active_users": downsample_chart(
+            [row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date) for row in active_users_data],
+            {"data": [row.count for row in active_users_data]},
+            max_points,
+            downsample,
+        ),
         "total_users": total_users,
         "active_rate": (active_users_data[-1].count / total_users * 100) if active_users_data and total_users > 0 else 0
     }
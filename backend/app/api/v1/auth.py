@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.base import get_db
 from app.schemas.auth import UserSignup, UserLogin, UserWithToken, UserResponse
 from app.services.auth_service import AuthService
-from app.core.dependencies import get_current_active_user
+from app.core.dependencies import get_current_active_user, load_full_profile
 from app.models.user import User
 
 router = APIRouter()
@@ -50,7 +50,8 @@ async def login(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current authenticated user information
@@ -59,7 +60,7 @@ async def get_current_user_info(
     
     Returns current user's profile information
     """
-    return UserResponse.model_validate(current_user)
+    return UserResponse.model_validate(await load_full_profile(db, current_user))
 
 
 @router.post("/logout")
@@ -5,9 +5,12 @@ Booking endpoints - for managing coach-client training sessions
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
+from sqlalchemy.orm import load_only
 from typing import List
 
 from app.db.base import get_db
+from app.core.cache import cached, response_cache
+from app.core.config import settings
 from app.core.dependencies import get_current_active_user, require_coach, require_admin
 from app.models.user import User, UserRole
 from app.models.booking import Booking, BookingStatus
@@ -21,9 +24,15 @@ from app.schemas.booking import (
 
 router = APIRouter()
 
+# The columns the coach board shows
+COACH_BOARD_COLUMNS = (
+    User.id, User.full_name, User.strengths, User.specialties, User.experience, User.available_slots
+)
+
 
 # Client endpoints
 @router.get("/coaches", response_model=List[CoachAvailability])
+@cached("bookings.coaches", ttl=settings.COACH_BOARD_CACHE_TTL_SECONDS)
 async def get_available_coaches(
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db)
@@ -32,6 +41,7 @@ async def get_available_coaches(
     # Get all coaches
     result = await db.execute(
         select(User)
+        .options(load_only(*COACH_BOARD_COLUMNS, raiseload=True))
         .where(User.role == UserRole.COACH)
         .order_by(User.full_name)
     )
@@ -75,7 +85,7 @@ async def get_coach_availability(
     """Get a specific coach's profile and availability"""
     # Get coach
     result = await db.execute(
-        select(User).where(
+        select(User).options(load_only(*COACH_BOARD_COLUMNS, raiseload=True)).where(
             and_(User.id == coach_id, User.role == UserRole.COACH)
         )
     )
@@ -180,6 +190,8 @@ async def book_training_slot(
     
     await db.commit()
     await db.refresh(booking)
+    # Booked slot counts changed; other workers catch up within the board's TTL
+    response_cache.invalidate("bookings.coaches")
     
     return booking
 
@@ -303,6 +315,8 @@ async def update_booking(
     
     await db.commit()
     await db.refresh(booking)
+    # Booked slot counts changed; other workers catch up within the board's TTL
+    response_cache.invalidate("bookings.coaches")
     
     return booking
 
@@ -2,15 +2,18 @@
 Client endpoints - for client users to manage their fitness data
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, extract
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from app.db.base import get_db
-from app.core.dependencies import require_client
+from app.analytics import AnalyticsService
+from app.core.dependencies import require_client, load_full_profile
+from app.core.downsample import downsample_chart
 from app.models.user import User
+from app.models.exercise import Exercise
 from app.models.workout_log import WorkoutLog
 from app.models.diet_log import DietLog
 from app.models.workout_plan import WorkoutPlan
@@ -21,6 +24,14 @@ from app.schemas.workout_plan import WorkoutPlanResponse
 from app.schemas.diet_plan import DietPlanResponse
 from app.schemas.user import UserProfileUpdate
 from app.schemas.auth import UserResponse
+from app.schemas.autocomplete import AutocompleteSuggestion
+from app.schemas.personal_record import PersonalRecordResponse
+from app.services.autocomplete import autocomplete
+from app.services.exercise_catalog import exercise_catalog
+from app.services.food_catalog import food_catalog, fill_nutrition, NUTRIENT_FIELDS
+from app.services.progress_service import ProgressService
+from app.services.personal_records import PersonalRecordService
+from app.services.streak_service import StreakService
 
 router = APIRouter()
 
@@ -38,8 +49,12 @@ async def create_workout_log(
         **log_data.model_dump()
     )
     db.add(workout_log)
+    await db.flush()
+    await PersonalRecordService.record_log(db, workout_log)
+    await StreakService.record_workout(db, current_user.id, workout_log.workout_date)
     await db.commit()
     await db.refresh(workout_log)
+    autocomplete.exercises.add(workout_log.exercise_name, workout_log.exercise_id, current_user.id)
     return workout_log
 
 
@@ -107,12 +122,22 @@ async def update_workout_log(
             detail="Workout log not found"
         )
     
+    previous_name = workout_log.exercise_name
+    previous_exercise_id = workout_log.exercise_id
+    previous_date = workout_log.workout_date
     update_data = log_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(workout_log, field, value)
     
+    await db.flush()
+    await PersonalRecordService.log_updated(db, workout_log, previous_exercise_id)
+    if workout_log.workout_date != previous_date:
+        await StreakService.refresh(db, [current_user.id])
     await db.commit()
     await db.refresh(workout_log)
+    if workout_log.exercise_name != previous_name:
+        autocomplete.exercises.add(previous_name, user_id=current_user.id, uses=-1)
+        autocomplete.exercises.add(workout_log.exercise_name, workout_log.exercise_id, current_user.id)
     return workout_log
 
 
@@ -137,7 +162,11 @@ async def delete_workout_log(
         )
     
     await db.delete(workout_log)
+    await db.flush()
+    await PersonalRecordService.log_deleted(db, current_user.id, workout_log.exercise_id, log_id)
+    await StreakService.refresh(db, [current_user.id])
     await db.commit()
+    autocomplete.exercises.add(workout_log.exercise_name, user_id=current_user.id, uses=-1)
 
 
 # Diet Log Endpoints
@@ -148,13 +177,26 @@ async def create_diet_log(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new diet log entry"""
+    values = log_data.model_dump()
+    
+    # Fill the name and any omitted macros from the food catalog
+    if log_data.food_id is not None:
+        food = await food_catalog.get(db, log_data.food_id)
+        if not food:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Food not found"
+            )
+        fill_nutrition(values, food, log_data.servings)
+    
     diet_log = DietLog(
         user_id=current_user.id,
-        **log_data.model_dump()
+        **values
     )
     db.add(diet_log)
     await db.commit()
     await db.refresh(diet_log)
+    autocomplete.foods.add(diet_log.food_name, diet_log.food_id, current_user.id)
     return diet_log
 
 
@@ -222,12 +264,33 @@ async def update_diet_log(
             detail="Diet log not found"
         )
     
+    previous_name = diet_log.food_name
     update_data = log_data.model_dump(exclude_unset=True)
+    
+    # A new food or serving count recomputes macros not given in this update
+    food_id = update_data.get("food_id", diet_log.food_id)
+    if food_id is not None and ("food_id" in update_data or "servings" in update_data):
+        food = await food_catalog.get(db, food_id)
+        if not food:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Food not found"
+            )
+        refill = {field: update_data.get(field) for field in NUTRIENT_FIELDS}
+        if "food_id" not in update_data or "food_name" in update_data:
+            refill["food_name"] = update_data.get("food_name", diet_log.food_name)
+        update_data.update(
+            fill_nutrition(refill, food, update_data.get("servings", diet_log.servings))
+        )
+    
     for field, value in update_data.items():
         setattr(diet_log, field, value)
     
     await db.commit()
     await db.refresh(diet_log)
+    if diet_log.food_name != previous_name:
+        autocomplete.foods.add(previous_name, user_id=current_user.id, uses=-1)
+        autocomplete.foods.add(diet_log.food_name, diet_log.food_id, current_user.id)
     return diet_log
 
 
@@ -253,6 +316,7 @@ async def delete_diet_log(
     
     await db.delete(diet_log)
     await db.commit()
+    autocomplete.foods.add(diet_log.food_name, user_id=current_user.id, uses=-1)
 
 
 # Workout Plans
@@ -334,74 +398,51 @@ async def get_diet_plan(
 # Progress tracking
 @router.get("/progress")
 async def get_progress(
+    days: int = Query(30, ge=1, le=365),
+    compare: bool = False,
     current_user: User = Depends(require_client),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get user's progress metrics"""
-    # Get workout statistics for the last 30 days
-    thirty_days_ago = date.today() - timedelta(days=30)
+    """
+    Get user's progress metrics
     
-    workout_result = await db.execute(
-        select(func.count(WorkoutLog.id))
-        .where(
-            and_(
-                WorkoutLog.user_id == current_user.id,
-                WorkoutLog.workout_date >= thirty_days_ago
-            )
-        )
-    )
-    workout_count = workout_result.scalar() or 0
-    
-    # Get diet log statistics
-    diet_result = await db.execute(
-        select(func.count(DietLog.id))
-        .where(
-            and_(
-                DietLog.user_id == current_user.id,
-                DietLog.meal_date >= thirty_days_ago
-            )
-        )
-    )
-    diet_log_count = diet_result.scalar() or 0
-    
-    # Get active plans count
-    active_workout_plans = await db.execute(
-        select(func.count(WorkoutPlan.id))
-        .where(
-            and_(
-                WorkoutPlan.user_id == current_user.id,
-                WorkoutPlan.status == "active"
-            )
-        )
-    )
-    active_workout_plan_count = active_workout_plans.scalar() or 0
+    - **days**: Window length ending today (e.g. 7, 30, 90 or 365)
+    - **compare**: Include the preceding window of the same length
+    """
+    return await ProgressService.get_progress(db, current_user.id, days=days, compare=compare)
+
+
+@router.get("/records", response_model=List[PersonalRecordResponse])
+async def get_personal_records(
+    current_user: User = Depends(require_client),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the user's personal records (max weight, estimated 1RM, volume) per exercise"""
+    return await PersonalRecordService.get_records(db, current_user.id)
+
+
+@router.get("/analytics")
+async def get_analytics(
+    days: int = Query(90, ge=14, le=365),
+    current_user: User = Depends(require_client),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get trend analytics for the user
     
-    active_diet_plans = await db.execute(
-        select(func.count(DietPlan.id))
-        .where(
-            and_(
-                DietPlan.user_id == current_user.id,
-                DietPlan.status == "active"
-            )
-        )
-    )
-    active_diet_plan_count = active_diet_plans.scalar() or 0
+    - **days**: Window length ending today (at least two weeks)
     
-    return {
-        "last_30_days": {
-            "workout_sessions": workout_count,
-            "diet_logs": diet_log_count
-        },
-        "active_plans": {
-            "workout_plans": active_workout_plan_count,
-            "diet_plans": active_diet_plan_count
-        }
-    }
+    Returns 7-day moving averages, week-over-week changes and trend slopes
+    for workouts and nutrients, plus calorie adherence to the active diet plan.
+    """
+    return await AnalyticsService.get_client_analytics(db, current_user.id, days=days)
 
 
 @router.get("/charts/workout-frequency")
 async def get_workout_frequency_chart(
     days: int = 30,
+    max_points: Optional[int] = Query(None, ge=3, le=2000),
+    downsample: Literal["lttb", "bucket"] = "lttb",
     current_user: User = Depends(require_client),
     db: AsyncSession = Depends(get_db)
 ):
@@ -425,15 +466,19 @@ async def get_workout_frequency_chart(
     )
     
     data = result.all()
-    return {
-        "labels": [row.workout_date.isoformat() for row in data],
-        "data": [row.count for row in data]
-    }
+    return downsample_chart(
+        [row.workout_date.isoformat() for row in data],
+        {"data": [row.count for row in data]},
+        max_points,
+        downsample,
+    )
 
 
 @router.get("/charts/diet-adherence")
 async def get_diet_adherence_chart(
     days: int = 30,
+    max_points: Optional[int] = Query(None, ge=3, le=2000),
+    downsample: Literal["lttb", "bucket"] = "lttb",
     current_user: User = Depends(require_client),
     db: AsyncSession = Depends(get_db)
 ):
@@ -475,12 +520,19 @@ async def get_diet_adherence_chart(
     )
     active_plan = target_result.scalar_one_or_none()
     
+    chart = downsample_chart(
+        [row.meal_date.isoformat() for row in data],
+        {
+            "calories": [float(row.total_calories or 0) for row in data],
+            "protein": [float(row.total_protein or 0) for row in data],
+            "carbs": [float(row.total_carbs or 0) for row in data],
+            "fat": [float(row.total_fat or 0) for row in data],
+        },
+        max_points,
+        downsample,
+    )
     return {
-        "labels": [row.meal_date.isoformat() for row in data],
-        "calories": [float(row.total_calories or 0) for row in data],
-        "protein": [float(row.total_protein or 0) for row in data],
-        "carbs": [float(row.total_carbs or 0) for row in data],
-        "fat": [float(row.total_fat or 0) for row in data],
+        **chart,
         "targets": {
             "calories": float(active_plan.target_calories) if active_plan else None,
             "protein": float(active_plan.target_protein_grams) if active_plan else None,
@@ -494,18 +546,23 @@ async def get_diet_adherence_chart(
 async def get_workout_volume_chart(
     days: int = 90,
     exercise: Optional[str] = None,
+    max_points: Optional[int] = Query(None, ge=3, le=2000),
+    downsample: Literal["lttb", "bucket"] = "lttb",
     current_user: User = Depends(require_client),
     db: AsyncSession = Depends(get_db)
 ):
     """Get workout volume trends (weight progression over time)"""
     start_date = date.today() - timedelta(days=days)
     
-    # Base query
+    # Aggregate on the integer exercise id; the name comes from the catalog
     query = select(
         WorkoutLog.workout_date,
-        WorkoutLog.exercise_name,
+        Exercise.id.label('exercise_id'),
+        Exercise.name.label('exercise_name'),
         func.avg(WorkoutLog.weight).label('avg_weight'),
         func.max(WorkoutLog.weight).label('max_weight')
+    ).join(
+        Exercise, WorkoutLog.exercise_id == Exercise.id
     ).where(
         and_(
             WorkoutLog.user_id == current_user.id,
@@ -514,37 +571,38 @@ async def get_workout_volume_chart(
         )
     )
     
-    # Filter by exercise if specified
+    # Filter by exercise if specified (any spelling or alias)
     if exercise:
-        query = query.where(WorkoutLog.exercise_name == exercise)
+        exercise_id = await exercise_catalog.resolve(db, exercise)
+        if exercise_id is None:
+            return {"exercises": [], "data": {}}
+        query = query.where(WorkoutLog.exercise_id == exercise_id)
     
-    query = query.group_by(WorkoutLog.workout_date, WorkoutLog.exercise_name).order_by(WorkoutLog.workout_date)
+    query = query.group_by(WorkoutLog.workout_date, Exercise.id, Exercise.name).order_by(WorkoutLog.workout_date)
     
     result = await db.execute(query)
-    data = result.all()
-    
-    # Get unique exercises
-    exercises_result = await db.execute(
-        select(WorkoutLog.exercise_name)
-        .where(
-            and_(
-                WorkoutLog.user_id == current_user.id,
-                WorkoutLog.workout_date >= start_date,
-                WorkoutLog.weight.isnot(None)
-            )
-        )
-        .distinct()
-    )
-    exercises = [row[0] for row in exercises_result.all()]
-    
-    # Group data by exercise
+    return build_workout_volume_payload(result.all(), max_points, downsample)
+
+
+def build_workout_volume_payload(rows, max_points: Optional[int], downsample: str) -> dict:
+    """
+    Group daily (workout_date, exercise_name, avg_weight, max_weight) rows
+    into one downsampled series per exercise
+    """
     exercise_data = {}
-    for row in data:
+    for row in rows:
         if row.exercise_name not in exercise_data:
             exercise_data[row.exercise_name] = {"dates": [], "avg_weights": [], "max_weights": []}
         exercise_data[row.exercise_name]["dates"].append(row.workout_date.isoformat())
         exercise_data[row.exercise_name]["avg_weights"].append(float(row.avg_weight or 0))
         exercise_data[row.exercise_name]["max_weights"].append(float(row.max_weight or 0))
+    exercises = list(exercise_data)
+    
+    # Each exercise is its own series; downsample them independently
+    for name, series in exercise_data.items():
+        exercise_data[name] = downsample_chart(
+            series.pop("dates"), series, max_points, downsample, primary="max_weights", label_key="dates"
+        )
     
     return {
         "exercises": exercises,
@@ -552,13 +610,35 @@ async def get_workout_volume_chart(
     }
 
 
+# Autocomplete
+@router.get("/autocomplete/exercises", response_model=List[AutocompleteSuggestion])
+async def autocomplete_exercises(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    current_user: User = Depends(require_client),
+):
+    """Suggest exercise names matching q, the user's most used first (no DB access)"""
+    return autocomplete.exercises.search(q, current_user.id, limit)
+
+
+@router.get("/autocomplete/foods", response_model=List[AutocompleteSuggestion])
+async def autocomplete_foods(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    current_user: User = Depends(require_client),
+):
+    """Suggest food names matching q, the user's most used first (no DB access)"""
+    return autocomplete.foods.search(q, current_user.id, limit)
+
+
 # Profile management
 @router.get("/profile", response_model=UserResponse)
 async def get_profile(
     current_user: User = Depends(require_client),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get user's own profile"""
-    return UserResponse.model_validate(current_user)
+    return UserResponse.model_validate(await load_full_profile(db, current_user))
 
 
 @router.put("/profile", response_model=UserResponse)
@@ -568,11 +648,11 @@ async def update_profile(
     db: AsyncSession = Depends(get_db)
 ):
     """Update user's own profile"""
+    current_user = await load_full_profile(db, current_user)
     update_data = profile_data.model_dump(exclude_unset=True)
     
     for field, value in update_data.items():
         setattr(current_user, field, value)
     
     await db.commit()
-    await db.refresh(current_user)
-    return UserResponse.model_validate(current_user)
+    return UserResponse.model_validate(await load_full_profile(db, current_user))
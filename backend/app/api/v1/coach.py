@@ -2,31 +2,44 @@
 Coach endpoints - for coaches to manage clients and plans
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, insert, and_, func
+from sqlalchemy.orm import load_only
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import List, Literal, Optional, Type, Union
 
 from app.db.base import get_db
-from app.core.dependencies import require_coach
-from app.models.user import User, UserRole
+from app.analytics import AnalyticsService
+from app.core.cache import response_cache
+from app.core.dependencies import require_coach, load_full_profile
+from app.core.downsample import downsample_chart
+from app.models.user import CORE_COLUMNS, User, UserRole, full_profile
+from app.models.booking import Booking
 from app.models.workout_log import WorkoutLog
 from app.models.diet_log import DietLog
 from app.models.workout_plan import WorkoutPlan
 from app.models.diet_plan import DietPlan
+from app.models.plan_template import PlanTemplate, PlanType
 from app.schemas.workout_log import WorkoutLogResponse
 from app.schemas.diet_log import DietLogResponse
-from app.schemas.workout_plan import WorkoutPlanCreate, WorkoutPlanUpdate, WorkoutPlanResponse
-from app.schemas.diet_plan import DietPlanCreate, DietPlanUpdate, DietPlanResponse
-from app.schemas.auth import UserResponse
+from app.schemas.workout_plan import WorkoutPlanCreate, WorkoutPlanUpdate, WorkoutPlanResponse, WorkoutPlanBulkAssign
+from app.schemas.diet_plan import DietPlanCreate, DietPlanUpdate, DietPlanResponse, DietPlanBulkAssign
+from app.schemas.plan_template import (
+    PlanTemplateCreate, PlanTemplateUpdate, PlanTemplateResponse, PlanBulkAssignResponse
+)
+from app.schemas.auth import UserResponse, UserSummary
 from app.schemas.user import CoachProfileUpdate
+from app.schemas.personal_record import PersonalRecordResponse
+from app.services.progress_service import ProgressService
+from app.services.personal_records import PersonalRecordService
+from app.services.streak_service import StreakService
 
 router = APIRouter()
 
 
 # Client Management
-@router.get("/clients", response_model=List[UserResponse])
+@router.get("/clients", response_model=List[UserSummary])
 async def get_clients(
     current_user: User = Depends(require_coach),
     db: AsyncSession = Depends(get_db)
@@ -35,64 +48,75 @@ async def get_clients(
     # For coaches, only show clients they have bookings with
     # For admins, show all clients
     if current_user.role == UserRole.COACH:
-        from app.models.booking import Booking
-        # Get unique client IDs from bookings
+        # Semi-join on the booked client IDs; SELECT DISTINCT over the user
+        # row fails on PostgreSQL, which has no equality operator for json
         result = await db.execute(
             select(User)
-            .join(Booking, User.id == Booking.client_id)
-            .where(Booking.coach_id == current_user.id)
-            .distinct()
+            .options(load_only(*CORE_COLUMNS, raiseload=True))
+            .where(User.id.in_(select(Booking.client_id).where(Booking.coach_id == current_user.id)))
             .order_by(User.full_name)
         )
     else:
         # Admin can see all clients
         result = await db.execute(
             select(User)
+            .options(load_only(*CORE_COLUMNS, raiseload=True))
             .where(User.role == UserRole.CLIENT)
             .order_by(User.full_name)
         )
     return result.scalars().all()
 
 
-@router.get("/clients/{client_id}", response_model=UserResponse)
-async def get_client(
-    client_id: int,
-    current_user: User = Depends(require_coach),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get a specific client's profile (only if connected through booking)"""
-    # Verify client exists
-    result = await db.execute(
-        select(User).where(
-            and_(User.id == client_id, User.role == UserRole.CLIENT)
-        )
-    )
-    client = result.scalar_one_or_none()
+async def _ensure_coach_client(db: AsyncSession, current_user: User, client_id: int, viewing: str) -> None:
+    """
+    Check that client_id is a client the current user may view
+    
+    Admins may view every client; coaches only those they have a booking with.
     
-    if not client:
+    Args:
+        db: Database session
+        current_user: Coach or admin making the request
+        client_id: Client being viewed
+        viewing: What is being viewed, for the error message (e.g. "logs")
+        
+    Raises:
+        HTTPException: 404 if there is no such client, 403 if the coach has no booking with them
+    """
+    client_check = await db.execute(
+        select(User.id).where(and_(User.id == client_id, User.role == UserRole.CLIENT))
+    )
+    if client_check.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Client not found"
         )
     
-    # For coaches, verify they have a booking with this client
     if current_user.role == UserRole.COACH:
-        from app.models.booking import Booking
+        # A coach may have several bookings with the same client
         booking_check = await db.execute(
-            select(Booking).where(
+            select(Booking.id).where(
                 and_(
                     Booking.coach_id == current_user.id,
                     Booking.client_id == client_id
                 )
-            )
+            ).limit(1)
         )
-        if not booking_check.scalar_one_or_none():
+        if booking_check.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only view profiles of clients you're connected with through bookings"
+                detail=f"You can only view {viewing} of clients you're connected with through bookings"
             )
-    
-    return client
+
+
+@router.get("/clients/{client_id}", response_model=UserResponse)
+async def get_client(
+    client_id: int,
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a specific client's profile (only if connected through booking)"""
+    await _ensure_coach_client(db, current_user, client_id, "profiles")
+    return await db.get(User, client_id, options=full_profile())
 
 
 # View Client Workout Logs
@@ -105,34 +129,7 @@ async def get_client_workout_logs(
     db: AsyncSession = Depends(get_db)
 ):
     """Get workout logs for a specific client (only if connected through booking)"""
-    # Verify client exists
-    client_result = await db.execute(
-        select(User).where(
-            and_(User.id == client_id, User.role == UserRole.CLIENT)
-        )
-    )
-    if not client_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Client not found"
-        )
-    
-    # For coaches, verify they have a booking with this client
-    if current_user.role == UserRole.COACH:
-        from app.models.booking import Booking
-        booking_check = await db.execute(
-            select(Booking).where(
-                and_(
-                    Booking.coach_id == current_user.id,
-                    Booking.client_id == client_id
-                )
-            )
-        )
-        if not booking_check.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only view logs of clients you're connected with through bookings"
-            )
+    await _ensure_coach_client(db, current_user, client_id, "logs")
     
     query = select(WorkoutLog).where(WorkoutLog.user_id == client_id)
     
@@ -156,34 +153,7 @@ async def get_client_diet_logs(
     db: AsyncSession = Depends(get_db)
 ):
     """Get diet logs for a specific client (only if connected through booking)"""
-    # Verify client exists
-    client_result = await db.execute(
-        select(User).where(
-            and_(User.id == client_id, User.role == UserRole.CLIENT)
-        )
-    )
-    if not client_result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Client not found"
-        )
-    
-    # For coaches, verify they have a booking with this client
-    if current_user.role == UserRole.COACH:
-        from app.models.booking import Booking
-        booking_check = await db.execute(
-            select(Booking).where(
-                and_(
-                    Booking.coach_id == current_user.id,
-                    Booking.client_id == client_id
-                )
-            )
-        )
-        if not booking_check.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only view logs of clients you're connected with through bookings"
-            )
+    await _ensure_coach_client(db, current_user, client_id, "logs")
     
     query = select(DietLog).where(DietLog.user_id == client_id)
     
@@ -201,69 +171,154 @@ async def get_client_diet_logs(
 @router.get("/clients/{client_id}/progress")
 async def get_client_progress(
     client_id: int,
+    days: int = Query(30, ge=1, le=365),
+    compare: bool = False,
     current_user: User = Depends(require_coach),
     db: AsyncSession = Depends(get_db)
 ):
     """Get progress metrics for a specific client (only if connected through booking)"""
-    # Verify client exists
-    client_result = await db.execute(
-        select(User).where(
-            and_(User.id == client_id, User.role == UserRole.CLIENT)
-        )
-    )
-    if not client_result.scalar_one_or_none():
+    await _ensure_coach_client(db, current_user, client_id, "progress")
+    
+    progress = await ProgressService.get_progress(db, client_id, days=days, compare=compare)
+    return {"client_id": client_id, **progress}
+
+
+@router.get("/clients/{client_id}/records", response_model=List[PersonalRecordResponse])
+async def get_client_records(
+    client_id: int,
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get personal records for a specific client (only if connected through booking)"""
+    await _ensure_coach_client(db, current_user, client_id, "records")
+    
+    return await PersonalRecordService.get_records(db, client_id)
+
+
+@router.get("/clients/{client_id}/analytics")
+async def get_client_analytics(
+    client_id: int,
+    days: int = Query(90, ge=14, le=365),
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get trend analytics for a specific client (only if connected through booking)"""
+    await _ensure_coach_client(db, current_user, client_id, "analytics")
+    
+    analytics = await AnalyticsService.get_client_analytics(db, client_id, days=days)
+    return {"client_id": client_id, **analytics}
+
+
+# Plan Templates
+async def _get_template(db: AsyncSession, template_id: int, plan_type: PlanType, current_user: User) -> PlanTemplate:
+    """Load a template of the given type that the current coach may assign"""
+    template = await db.get(PlanTemplate, template_id)
+    if (
+        template is None
+        or template.plan_type != plan_type
+        or (current_user.role == UserRole.COACH and template.coach_id != current_user.id)
+    ):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Client not found"
-        )
-    
-    # For coaches, verify they have a booking with this client
-    if current_user.role == UserRole.COACH:
-        from app.models.booking import Booking
-        booking_check = await db.execute(
-            select(Booking).where(
-                and_(
-                    Booking.coach_id == current_user.id,
-                    Booking.client_id == client_id
-                )
-            )
+            detail="Plan template not found"
         )
-        if not booking_check.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only view progress of clients you're connected with through bookings"
-            )
-    
-    # Get statistics
-    thirty_days_ago = date.today() - timedelta(days=30)
-    
-    workout_count = await db.execute(
-        select(func.count(WorkoutLog.id))
-        .where(
-            and_(
-                WorkoutLog.user_id == client_id,
-                WorkoutLog.workout_date >= thirty_days_ago
-            )
+    return template
+
+
+async def _bulk_assign(
+    db: AsyncSession,
+    model: Union[Type[WorkoutPlan], Type[DietPlan]],
+    details_field: str,
+    template: PlanTemplate,
+    assign_data: Union[WorkoutPlanBulkAssign, DietPlanBulkAssign],
+) -> List[int]:
+    """Insert one plan per client referencing the template, in a single multi-row INSERT"""
+    unknown = set(assign_data.overrides) - set(assign_data.user_ids)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Overrides given for users not being assigned: {sorted(unknown)}"
         )
-    )
-    
-    diet_count = await db.execute(
-        select(func.count(DietLog.id))
-        .where(
-            and_(
-                DietLog.user_id == client_id,
-                DietLog.meal_date >= thirty_days_ago
-            )
+
+    # Verify every target user is a client with one query
+    client_ids = set((await db.execute(
+        select(User.id).where(and_(User.id.in_(assign_data.user_ids), User.role == UserRole.CLIENT))
+    )).scalars())
+    missing = [user_id for user_id in assign_data.user_ids if user_id not in client_ids]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Clients not found: {missing}"
+        )
+
+    # Rows share everything but the client and its overrides; the template's
+    # details are not copied into them
+    shared = assign_data.model_dump(exclude={"template_id", "user_ids", "overrides"})
+    shared["name"] = assign_data.name or template.name
+    shared["description"] = assign_data.description if assign_data.description is not None else template.description
+    rows = [
+        {**shared, "user_id": user_id, "template_id": template.id, details_field: assign_data.overrides.get(user_id)}
+        for user_id in assign_data.user_ids
+    ]
+    result = await db.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+    plan_ids = list(result.scalars())
+    await db.commit()
+    return plan_ids
+
+
+@router.post("/plan-templates", response_model=PlanTemplateResponse, status_code=status.HTTP_201_CREATED)
+async def create_plan_template(
+    template_data: PlanTemplateCreate,
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a workout or diet plan template"""
+    template = PlanTemplate(**template_data.model_dump(), coach_id=current_user.id)
+    db.add(template)
+    await db.commit()
+    await db.refresh(template)
+    return template
+
+
+@router.get("/plan-templates", response_model=List[PlanTemplateResponse])
+async def get_plan_templates(
+    plan_type: Optional[PlanType] = None,
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the coach's plan templates (all templates for admins)"""
+    query = select(PlanTemplate)
+    if current_user.role == UserRole.COACH:
+        query = query.where(PlanTemplate.coach_id == current_user.id)
+    if plan_type:
+        query = query.where(PlanTemplate.plan_type == plan_type)
+
+    result = await db.execute(query.order_by(PlanTemplate.name))
+    return result.scalars().all()
+
+
+@router.put("/plan-templates/{template_id}", response_model=PlanTemplateResponse)
+async def update_plan_template(
+    template_id: int,
+    template_data: PlanTemplateUpdate,
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a plan template; every plan assigned from it sees the new details"""
+    template = await db.get(PlanTemplate, template_id)
+    if template is None or (current_user.role == UserRole.COACH and template.coach_id != current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Plan template not found"
         )
-    )
-    
-    return {
-        "client_id": client_id,
-        "last_30_days": {
-            "workout_sessions": workout_count.scalar() or 0,
-            "diet_logs": diet_count.scalar() or 0
-        }
-    }
+
+    update_data = template_data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(template, field, value)
+
+    await db.commit()
+    await db.refresh(template)
+    return template
 
 
 # Workout Plan Management
@@ -286,6 +341,9 @@ async def create_workout_plan(
             detail="Client not found"
         )
     
+    if plan_data.template_id is not None:
+        await _get_template(db, plan_data.template_id, PlanType.WORKOUT, current_user)
+    
     workout_plan = WorkoutPlan(**plan_data.model_dump())
     db.add(workout_plan)
     await db.commit()
@@ -293,6 +351,18 @@ async def create_workout_plan(
     return workout_plan
 
 
+@router.post("/workout-plans/bulk-assign", response_model=PlanBulkAssignResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_assign_workout_plans(
+    assign_data: WorkoutPlanBulkAssign,
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Assign a workout plan template to many clients at once"""
+    template = await _get_template(db, assign_data.template_id, PlanType.WORKOUT, current_user)
+    plan_ids = await _bulk_assign(db, WorkoutPlan, "workout_details", template, assign_data)
+    return {"template_id": template.id, "created": len(plan_ids), "plan_ids": plan_ids}
+
+
 @router.get("/workout-plans", response_model=List[WorkoutPlanResponse])
 async def get_all_workout_plans(
     client_id: Optional[int] = None,
@@ -380,6 +450,9 @@ async def create_diet_plan(
             detail="Client not found"
         )
     
+    if plan_data.template_id is not None:
+        await _get_template(db, plan_data.template_id, PlanType.DIET, current_user)
+    
     diet_plan = DietPlan(**plan_data.model_dump())
     db.add(diet_plan)
     await db.commit()
@@ -387,6 +460,18 @@ async def create_diet_plan(
     return diet_plan
 
 
+@router.post("/diet-plans/bulk-assign", response_model=PlanBulkAssignResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_assign_diet_plans(
+    assign_data: DietPlanBulkAssign,
+    current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
+):
+    """Assign a diet plan template to many clients at once"""
+    template = await _get_template(db, assign_data.template_id, PlanType.DIET, current_user)
+    plan_ids = await _bulk_assign(db, DietPlan, "meal_plan_details", template, assign_data)
+    return {"template_id": template.id, "created": len(plan_ids), "plan_ids": plan_ids}
+
+
 @router.get("/diet-plans", response_model=List[DietPlanResponse])
 async def get_all_diet_plans(
     client_id: Optional[int] = None,
@@ -469,6 +554,7 @@ async def get_client_overview_chart(
         .where(User.role == UserRole.CLIENT)
     )
     clients = clients_result.scalars().all()
+    streaks = await StreakService.get_streaks(db, [client.id for client in clients])
     
     client_data = []
     for client in clients:
@@ -510,7 +596,8 @@ async def get_client_overview_chart(
             "client_id": client.id,
             "workouts": workout_count.scalar() or 0,
             "diet_logs": diet_count.scalar() or 0,
-            "active_plans": active_plans.scalar() or 0
+            "active_plans": active_plans.scalar() or 0,
+            **streaks[client.id]
         })
     
     return {"clients": client_data}
@@ -519,6 +606,8 @@ async def get_client_overview_chart(
 @router.get("/charts/engagement")
 async def get_engagement_chart(
     days: int = 30,
+    max_points: Optional[int] = Query(None, ge=3, le=2000),
+    downsample: Literal["lttb", "bucket"] = "lttb",
     current_user: User = Depends(require_coach),
     db: AsyncSession = Depends(get_db)
 ):
@@ -562,14 +651,18 @@ async def get_engagement_chart(
     diet_data = diet_result.all()
     
     return {
-        "workouts": {
-            "labels": [row.workout_date.isoformat() for row in workout_data],
-            "data": [row.count for row in workout_data]
-        },
-        "diet_logs": {
-            "labels": [row.meal_date.isoformat() for row in diet_data],
-            "data": [row.count for row in diet_data]
-        }
+        "workouts": downsample_chart(
+            [row.workout_date.isoformat() for row in workout_data],
+            {"data": [row.count for row in workout_data]},
+            max_points,
+            downsample,
+        ),
+        "diet_logs": downsample_chart(
+            [row.meal_date.isoformat() for row in diet_data],
+            {"data": [row.count for row in diet_data]},
+            max_points,
+            downsample,
+        )
     }
 
 
@@ -609,9 +702,10 @@ async def get_plan_assignments_chart(
 @router.get("/profile", response_model=UserResponse)
 async def get_profile(
     current_user: User = Depends(require_coach),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get coach's own profile"""
-    return UserResponse.model_validate(current_user)
+    return UserResponse.model_validate(await load_full_profile(db, current_user))
 
 
 @router.put("/profile", response_model=UserResponse)
@@ -621,11 +715,13 @@ async def update_profile(
     db: AsyncSession = Depends(get_db)
 ):
     """Update coach's own profile"""
+    current_user = await load_full_profile(db, current_user)
     update_data = profile_data.model_dump(exclude_unset=True)
     
     for field, value in update_data.items():
         setattr(current_user, field, value)
     
     await db.commit()
-    await db.refresh(current_user)
-    return UserResponse.model_validate(current_user)
+    # The booking board shows coach profiles
+    response_cache.invalidate("bookings.coaches")
+    return UserResponse.model_validate(await load_full_profile(db, current_user))
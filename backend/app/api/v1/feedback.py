@@ -2,20 +2,28 @@
 Feedback endpoints - for collecting user feedback and suggestions
 """
 
-from fastapi import APIRouter, Depends, Request, status, Header
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, Header
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, literal_column, tuple_
 from typing import List, Optional
 
 from app.db.base import get_db
 from app.core.dependencies import get_current_user, require_admin
+from app.core.pagination import encode_cursor, decode_cursor
 from app.core.security import decode_access_token
 from app.models.user import User
-from app.models.feedback import Feedback
-from app.schemas.feedback import FeedbackCreate, FeedbackResponse, FeedbackStatusUpdate
+from app.models.feedback import Feedback, FeedbackStatus
+from app.schemas.feedback import FeedbackAccepted, FeedbackCreate, FeedbackResponse, FeedbackStatusUpdate
+from app.services.feedback_buffer import feedback_buffer, FeedbackBufferFull
 
 router = APIRouter()
 
+# Size of the feedback.user_agent column
+USER_AGENT_MAX_LENGTH = 500
+
 
 async def get_optional_current_user(
     authorization: Optional[str] = Header(None),
@@ -52,11 +60,10 @@ async def get_optional_current_user(
     return None
 
 
-@router.post("/", response_model=FeedbackResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=FeedbackAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def submit_feedback(
     feedback_data: FeedbackCreate,
     request: Request,
-    db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_current_user)
 ):
     """
@@ -67,43 +74,101 @@ async def submit_feedback(
     - **email**: Email (optional, auto-filled for authenticated users)
     - **is_anonymous**: Submit anonymously (optional)
     - **page_url**: Current page URL (optional)
+    
+    The submission is queued and written in batches; the returned
+    submission_id identifies the row once it has been stored.
     """
-    # Create feedback entry
-    feedback = Feedback(
-        user_id=current_user.id if current_user and not feedback_data.is_anonymous else None,
-        name=feedback_data.name if feedback_data.name else (current_user.full_name if current_user and not feedback_data.is_anonymous else None),
-        email=feedback_data.email if feedback_data.email else (current_user.email if current_user and not feedback_data.is_anonymous else None),
-        message=feedback_data.message,
-        is_anonymous=feedback_data.is_anonymous,
-        page_url=feedback_data.page_url,
-        user_agent=request.headers.get("user-agent", None)
-    )
+    identified_user = current_user if current_user and not feedback_data.is_anonymous else None
+    submission_id = str(uuid.uuid4())
     
-    db.add(feedback)
-    await db.commit()
-    await db.refresh(feedback)
-    return feedback
+    try:
+        await feedback_buffer.submit({
+            "submission_id": submission_id,
+            "user_id": identified_user.id if identified_user else None,
+            "name": feedback_data.name if feedback_data.name else (identified_user.full_name if identified_user else None),
+            "email": feedback_data.email if feedback_data.email else (identified_user.email if identified_user else None),
+            "message": feedback_data.message,
+            "is_anonymous": feedback_data.is_anonymous,
+            "page_url": feedback_data.page_url,
+            "user_agent": request.headers.get("user-agent", "")[:USER_AGENT_MAX_LENGTH] or None
+        })
+    except FeedbackBufferFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Feedback is temporarily unavailable, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    
+    return FeedbackAccepted(submission_id=submission_id)
+
+
+def _message_matches(dialect_name: str, q: str):
+    """Full-text predicate on PostgreSQL, case-insensitive substring match elsewhere"""
+    if dialect_name == "postgresql":
+        # message_tsv is a generated tsvector column with a GIN index (migration 008)
+        return literal_column("feedback.message_tsv").op("@@")(
+            func.websearch_to_tsquery("english", q)
+        )
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return Feedback.message.ilike(f"%{escaped}%", escape="\\")
 
 
 @router.get("/", response_model=List[FeedbackResponse])
 async def get_all_feedback(
+    response: Response,
+    status_filter: Optional[List[FeedbackStatus]] = Query(None, alias="status"),
+    q: Optional[str] = Query(None, min_length=1, max_length=200),
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
     current_user: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all feedback submissions (Admin only)
     
-    Returns a list of all feedback submissions with pagination
+    Returns feedback newest first with keyset pagination on (created_at, id).
+    
+    - **status**: Only include these statuses (repeatable)
+    - **q**: Full-text search over the message
+    - **cursor**: Value of the previous page's X-Next-Cursor header
+    - **skip**: Offset pagination, kept for older clients (ignored with cursor)
+    - **limit**: Page size
     """
+    query = select(Feedback)
+    
+    if status_filter:
+        query = query.where(Feedback.status.in_(status_filter))
+    if q:
+        query = query.where(_message_matches(db.get_bind().dialect.name, q))
+    
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            cursor_created_at = datetime.fromisoformat(cursor_created_at)
+            cursor_id = int(cursor_id)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(
+            tuple_(Feedback.created_at, Feedback.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+    
     result = await db.execute(
-        select(Feedback)
-        .order_by(Feedback.created_at.desc())
-        .offset(skip)
+        query
+        .order_by(Feedback.created_at.desc(), Feedback.id.desc())
         .limit(limit)
     )
     feedback_list = result.scalars().all()
+    
+    if len(feedback_list) == limit:
+        last = feedback_list[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor([last.created_at, last.id])
+    
     return feedback_list
 
 
@@ -125,7 +190,6 @@ async def update_feedback_status(
     feedback = result.scalar_one_or_none()
     
     if not feedback:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Feedback not found")
     
     feedback.status = status_update.status
@@ -3,11 +3,17 @@ Health check endpoints
 """
 
 from datetime import datetime, timezone
+from typing import Optional
 
+from fastapi import APIRouter, Header
+from fastapi.responses import JSONResponse
 
-from fastapi import APIRouter
-
+from app.core.cache import make_cache_key, response_cache
 from app.core.config import settings
+from app.core.security import decode_access_token
+from app.models.user import UserRole
+from app.services.health_checks import health_checker
+from app.services.warmup import warmup
 
 router = APIRouter()
 
@@ -23,3 +29,44 @@ async def health_check():
         "version": settings.APP_VERSION,
         "environment": settings.ENVIRONMENT,
     }
+
+
+def _is_admin_token(authorization: Optional[str]) -> bool:
+    # Checked from the token alone: the report must not depend on the database being up
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer":
+        return False
+    payload = decode_access_token(token)
+    return payload is not None and payload.get("role") == UserRole.ADMIN.value
+
+
+@router.get("/health/deep")
+async def deep_health_check(authorization: Optional[str] = Header(None)):
+    """
+    Dependency health: database round trip, pool saturation, Redis and event-loop lag
+
+    For monitoring, not container liveness: it answers 503 when the database
+    is down, which is no reason to restart the app. Results are reused for
+    HEALTH_CACHE_SECONDS, and concurrent probes share one run, so frequent
+    checks add no load. Only an admin token gets the measurements and error
+    names; other callers see each check's status.
+    """
+    report = await response_cache.get_or_compute(
+        make_cache_key("health.deep", {}), "health.deep", health_checker.run, settings.HEALTH_CACHE_SECONDS
+    )
+    if not _is_admin_token(authorization):
+        report = {
+            "status": report["status"],
+            "checked_at": report["checked_at"],
+            "checks": {name: {"status": check["status"]} for name, check in report["checks"].items()},
+        }
+    return JSONResponse(status_code=503 if report["status"] == "down" else 200, content=report)
+
+
+@router.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 503 until this worker has finished its startup warm-up
+    """
+    status = warmup.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
@@ -3,24 +3,30 @@ User management endpoints (example of protected routes)
 """
 
 from fastapi import APIRouter, Depends
-from app.core.dependencies import get_current_active_user, require_admin
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_current_active_user, load_full_profile, require_admin
+from app.db.base import get_db
 from app.models.user import User
-from app.schemas.auth import UserResponse
+from app.schemas.auth import UserResponse, UserSummary
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_my_profile(current_user: User = Depends(get_current_active_user)):
+async def get_my_profile(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get current user's profile
     
     Requires authentication
     """
-    return UserResponse.model_validate(current_user)
+    return UserResponse.model_validate(await load_full_profile(db, current_user))
 
 
-@router.get("/admin/users", response_model=list[UserResponse])
+@router.get("/admin/users", response_model=list[UserSummary])
 async def list_all_users(current_user: User = Depends(require_admin)):
     """
     List all users (admin only)
@@ -0,0 +1,213 @@
+"""
+Read-through response cache for expensive, user-independent endpoints
+
+Endpoints decorated with ``@cached`` are keyed by namespace and query
+parameters (the authenticated user and the DB session are excluded).
+Concurrent misses for the same key are coalesced onto a single computation,
+and entries past their TTL are served stale while one background task
+recomputes them with a fresh database session.
+"""
+
+import asyncio
+import functools
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.base import AsyncSessionLocal
+
+
+class _CacheEntry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class ResponseCache:
+    """In-process TTL cache with single-flight misses and stale-while-revalidate"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # Sessions for background revalidation are opened outside request scope
+        self.session_factory = AsyncSessionLocal
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._revalidating: Dict[str, asyncio.Task] = {}
+
+    async def get_or_compute(
+        self,
+        key: str,
+        namespace: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0.0,
+        revalidate: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, computing it at most once concurrently
+
+        Args:
+            key: Cache key
+            namespace: Metric label for the cached endpoint
+            compute: Coroutine factory producing the value in the caller's context
+            ttl: Seconds the value is served as fresh
+            stale_ttl: Extra seconds the value may be served while revalidating
+            revalidate: Coroutine factory used for background refreshes
+
+        Returns:
+            The cached or freshly computed value
+        """
+        while True:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                if now < entry.fresh_until:
+                    self._entries.move_to_end(key)
+                    metrics.increment("cache_hits_total", namespace=namespace)
+                    return entry.value
+                if now < entry.stale_until:
+                    self._entries.move_to_end(key)
+                    metrics.increment("cache_stale_hits_total", namespace=namespace)
+                    self._schedule_revalidation(key, namespace, revalidate or compute, ttl, stale_ttl)
+                    return entry.value
+
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                metrics.increment("cache_coalesced_total", namespace=namespace)
+                try:
+                    return await asyncio.shield(inflight)
+                except asyncio.CancelledError:
+                    if not inflight.cancelled():
+                        raise
+                    # The leader was cancelled, not this request: look up or compute again
+                    continue
+
+            metrics.increment("cache_misses_total", namespace=namespace)
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            try:
+                value = await compute()
+            except Exception as exc:
+                future.set_exception(exc)
+                # Mark the exception as retrieved when nobody was waiting on it
+                future.exception()
+                raise
+            except BaseException:
+                # Cancellation of the leader only: waiters retry on their own
+                future.cancel()
+                raise
+            else:
+                self._store(key, value, ttl, stale_ttl)
+                future.set_result(value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+    def _store(self, key: str, value: Any, ttl: float, stale_ttl: float) -> None:
+        now = time.monotonic()
+        self._entries[key] = _CacheEntry(value, now + ttl, now + ttl + stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        metrics.set_gauge("cache_entries", len(self._entries))
+
+    def _schedule_revalidation(
+        self,
+        key: str,
+        namespace: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+    ) -> None:
+        if key in self._revalidating:
+            return
+
+        async def refresh():
+            try:
+                value = await compute()
+            except Exception:
+                metrics.increment("cache_revalidation_errors_total", namespace=namespace)
+            else:
+                self._store(key, value, ttl, stale_ttl)
+                metrics.increment("cache_revalidations_total", namespace=namespace)
+            finally:
+                self._revalidating.pop(key, None)
+
+        self._revalidating[key] = asyncio.create_task(refresh())
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop entries whose key starts with prefix (all entries by default)"""
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+        metrics.set_gauge("cache_entries", len(self._entries))
+
+    async def drain(self) -> None:
+        """Wait for background revalidations to finish"""
+        while self._revalidating:
+            await asyncio.gather(*list(self._revalidating.values()), return_exceptions=True)
+
+    def clear(self) -> None:
+        """Drop all entries and forget loop-bound in-flight state"""
+        self._entries.clear()
+        self._inflight.clear()
+        self._revalidating.clear()
+
+
+response_cache = ResponseCache(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def make_cache_key(namespace: str, params: dict) -> str:
+    """Build a stable cache key from the namespace and request parameters"""
+    return f"{namespace}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def cached(
+    namespace: str,
+    ttl: float,
+    stale_ttl: float = 0.0,
+    exclude: Iterable[str] = ("current_user", "db"),
+):
+    """
+    Cache an async endpoint's response keyed by its non-excluded parameters
+
+    The wrapped endpoint must take its database session as ``db``; background
+    revalidation calls it again with a session from the cache's session
+    factory because the original request's session is closed by then.
+
+    Args:
+        namespace: Key prefix and metric label for the endpoint
+        ttl: Seconds a response is served as fresh
+        stale_ttl: Extra seconds a response is served while revalidating
+        exclude: Parameter names that do not vary the response
+    """
+    excluded = frozenset(exclude)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = make_cache_key(
+                namespace,
+                {name: value for name, value in kwargs.items() if name not in excluded},
+            )
+
+            async def compute():
+                return await func(**kwargs)
+
+            async def revalidate():
+                async with response_cache.session_factory() as session:
+                    return await func(**{**kwargs, "db": session})
+
+            return await response_cache.get_or_compute(
+                key, namespace, compute, ttl, stale_ttl, revalidate
+            )
+
+        return wrapper
+
+    return decorator
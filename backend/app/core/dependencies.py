@@ -9,9 +9,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_access_token
 from app.db.base import get_db
-from app.models.user import User, UserRole
+from app.models.user import CORE_COLUMNS, User, UserRole, full_profile
 from app.schemas.auth import TokenData
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -51,8 +52,8 @@ async def get_current_user(
     if email is None or user_id is None:
         raise credentials_exception
     
-    # Fetch user from database
-    result = await db.execute(select(User).where(User.id == user_id))
+    # Fetch user from database; the profile columns are left to the endpoints that need them
+    result = await db.execute(select(User).options(load_only(*CORE_COLUMNS, raiseload=True)).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
     if user is None:
@@ -67,6 +68,20 @@ async def get_current_user(
     return user
 
 
+async def load_full_profile(db: AsyncSession, user: User) -> User:
+    """
+    Load every column of a user, e.g. the current user for a profile endpoint
+    
+    Args:
+        db: Database session
+        user: User loaded with only some of its columns
+        
+    Returns:
+        The same User object, fully loaded
+    """
+    return await db.get(User, user.id, options=full_profile(), populate_existing=True)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -0,0 +1,124 @@
+"""
+Server-side downsampling for chart time series
+
+Chart endpoints accept a ``max_points`` parameter and reduce each series
+to at most that many points before responding, so the payload stays
+bounded no matter how many days are requested. Two methods are offered:
+
+- ``lttb``: Largest-Triangle-Three-Buckets keeps the original points that
+  best preserve the visual shape of the line.
+- ``bucket``: splits the series into equal buckets and reports the
+  average with the min and max of each bucket.
+
+Both operate on NumPy arrays of the already fetched columns.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "bucket")
+
+
+def lttb_indices(y: Sequence[float], max_points: int) -> np.ndarray:
+    """
+    Select the indices of the points kept by Largest-Triangle-Three-Buckets
+
+    The x axis is the point position, which matches daily chart series.
+    The first and last points are always kept.
+
+    Args:
+        y: Series values
+        max_points: Number of points to keep (at least 3)
+
+    Returns:
+        Sorted array of selected indices
+    """
+    values = np.asarray(y, dtype=float)
+    n = len(values)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    # Interior points split into max_points - 2 buckets of (nearly) equal size
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = np.empty(max_points, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # Third vertex: average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = values[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], values[-1]
+
+        px, py = x[previous], values[previous]
+        areas = np.abs(
+            (px - avg_x) * (values[start:end] - py)
+            - (px - x[start:end]) * (avg_y - py)
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def bucket_bounds(n: int, max_points: int) -> np.ndarray:
+    """Start index of each of max_points equal-size buckets over n points"""
+    return np.linspace(0, n, max_points, endpoint=False).astype(int)
+
+
+def downsample_chart(
+    labels: List[str],
+    series: Dict[str, List[float]],
+    max_points: Optional[int],
+    method: str = "lttb",
+    primary: Optional[str] = None,
+    label_key: str = "labels",
+) -> dict:
+    """
+    Downsample aligned series sharing one label axis into a chart payload
+
+    With ``lttb`` the indices are chosen from the primary series and
+    applied to every series so they stay aligned. With ``bucket`` each
+    label is the first label of its bucket and every series reports the
+    bucket average, with per-bucket min and max under ``min`` and ``max``.
+
+    Args:
+        labels: X axis labels (dates)
+        series: Series name -> values, each as long as labels
+        max_points: Maximum points to return; None or >= len(labels) keeps all
+        method: "lttb" or "bucket"
+        primary: Series driving LTTB selection (defaults to the first)
+        label_key: Payload key for the labels
+
+    Returns:
+        ``{label_key: labels, **series}``, plus ``min``, ``max`` (bucket)
+        and a ``downsampled`` summary when points were dropped
+    """
+    n = len(labels)
+    if not max_points or max_points >= n:
+        return {label_key: labels, **series}
+
+    if method == "bucket":
+        starts = bucket_bounds(n, max_points)
+        counts = np.diff(np.append(starts, n))
+        payload = {label_key: [labels[i] for i in starts], "min": {}, "max": {}}
+        for name, values in series.items():
+            values = np.asarray(values, dtype=float)
+            payload[name] = (np.add.reduceat(values, starts) / counts).round(4).tolist()
+            payload["min"][name] = np.minimum.reduceat(values, starts).tolist()
+            payload["max"][name] = np.maximum.reduceat(values, starts).tolist()
+    else:
+        indices = lttb_indices(series[primary or next(iter(series))], max_points)
+        payload = {label_key: [labels[i] for i in indices]}
+        for name, values in series.items():
+            payload[name] = np.asarray(values)[indices].tolist()
+
+    payload["downsampled"] = {"method": method, "points": len(payload[label_key]), "source_points": n}
+    return payload
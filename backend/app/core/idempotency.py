@@ -0,0 +1,354 @@
+"""
+Idempotency-Key support for POST requests
+
+A POST carrying an ``Idempotency-Key`` header runs at most once per key and
+client: the response is stored for IDEMPOTENCY_TTL_SECONDS and replayed to
+retries with an ``Idempotent-Replayed: true`` header. A retry arriving while
+the first request is still running waits for it (up to
+IDEMPOTENCY_WAIT_SECONDS, then 409) instead of executing a second time.
+
+Keys are scoped to the caller (user id of a valid bearer token, else the
+client IP) and bound to a fingerprint of the method, path, query string and
+body; reusing a key for a different request is answered 422. Server errors
+are not stored, so a retry after a 5xx runs the request again.
+
+Records live in a pluggable store: in-memory (per worker) or Redis, where a
+SET NX reservation makes the first request win across all workers.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.rate_limit import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyStore:
+    """Interface for idempotency record storage backends
+
+    A record is a dict with ``state`` (in_progress or completed),
+    ``fingerprint`` and, once completed, ``response``.
+    """
+
+    async def reserve(self, key: str, fingerprint: str, lock_ttl: float) -> Optional[dict]:
+        """Claim key for a new request
+
+        Returns:
+            None when the caller now owns the key, otherwise the existing record
+        """
+        raise NotImplementedError
+
+    async def complete(self, key: str, record: dict, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def release(self, key: str) -> None:
+        """Drop a reservation so a retry executes the request again"""
+        raise NotImplementedError
+
+    async def wait(self, key: str, timeout: float) -> Optional[dict]:
+        """Wait until key is no longer in progress
+
+        Returns:
+            The record (still in progress when the timeout expired), or None
+            once the reservation was released or expired
+        """
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Process-local records, suitable for a single worker and for tests"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> (record, monotonic expiry)
+        self._records: Dict[str, Tuple[dict, float]] = {}
+        self._done: Dict[str, asyncio.Event] = {}
+
+    def _get(self, key: str) -> Optional[dict]:
+        entry = self._records.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[1]:
+            del self._records[key]
+            self._notify(key)
+            return None
+        return entry[0]
+
+    def _notify(self, key: str) -> None:
+        event = self._done.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (_, expires) in self._records.items() if now >= expires]:
+            del self._records[key]
+            self._notify(key)
+        if len(self._records) >= self.max_keys:
+            # Forget the oldest completed records; running requests keep theirs
+            completed = [key for key, (record, _) in self._records.items() if record["state"] == COMPLETED]
+            for key in completed[: max(1, self.max_keys // 4)]:
+                del self._records[key]
+
+    async def reserve(self, key: str, fingerprint: str, lock_ttl: float) -> Optional[dict]:
+        record = self._get(key)
+        if record is not None:
+            return record
+        if len(self._records) >= self.max_keys:
+            self._evict()
+        self._records[key] = ({"state": IN_PROGRESS, "fingerprint": fingerprint}, time.monotonic() + lock_ttl)
+        return None
+
+    async def complete(self, key: str, record: dict, ttl: float) -> None:
+        self._records[key] = (record, time.monotonic() + ttl)
+        self._notify(key)
+
+    async def release(self, key: str) -> None:
+        self._records.pop(key, None)
+        self._notify(key)
+
+    async def wait(self, key: str, timeout: float) -> Optional[dict]:
+        record = self._get(key)
+        if record is None or record["state"] != IN_PROGRESS:
+            return record
+        event = self._done.setdefault(key, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._get(key)
+
+    async def clear(self) -> None:
+        self._records.clear()
+        for event in self._done.values():
+            event.set()
+        self._done.clear()
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Records shared by all workers through Redis"""
+
+    def __init__(self, prefix: str = "idempotency:", poll_interval: float = 0.05):
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def _client():
+        from app.core.redis_client import get_redis
+
+        return get_redis()
+
+    async def _get(self, key: str) -> Optional[dict]:
+        value = await self._client().get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    async def reserve(self, key: str, fingerprint: str, lock_ttl: float) -> Optional[dict]:
+        record = json.dumps({"state": IN_PROGRESS, "fingerprint": fingerprint})
+        while True:
+            if await self._client().set(self.prefix + key, record, nx=True, px=int(lock_ttl * 1000)):
+                return None
+            existing = await self._get(key)
+            if existing is not None:
+                return existing
+            # Released or expired between SET and GET; try to claim it again
+
+    async def complete(self, key: str, record: dict, ttl: float) -> None:
+        await self._client().set(self.prefix + key, json.dumps(record), px=int(ttl * 1000))
+
+    async def release(self, key: str) -> None:
+        await self._client().delete(self.prefix + key)
+
+    async def wait(self, key: str, timeout: float) -> Optional[dict]:
+        deadline = time.monotonic() + timeout
+        interval = self.poll_interval
+        while True:
+            record = await self._get(key)
+            if record is None or record["state"] != IN_PROGRESS or time.monotonic() >= deadline:
+                return record
+            await asyncio.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            interval = min(interval * 2, 0.5)
+
+    async def clear(self) -> None:
+        client = self._client()
+        async for key in client.scan_iter(match=self.prefix + "*"):
+            await client.delete(key)
+
+
+def create_idempotency_store(backend: str) -> IdempotencyStore:
+    """Create the record store configured by IDEMPOTENCY_BACKEND"""
+    if backend == "memory":
+        return InMemoryIdempotencyStore(max_keys=settings.IDEMPOTENCY_MAX_KEYS)
+    if backend == "redis":
+        return RedisIdempotencyStore()
+    raise ValueError(f"Unknown idempotency backend: {backend}")
+
+
+def request_fingerprint(method: str, path: str, query: bytes, body: bytes) -> str:
+    """Hash of everything that makes two requests the same request"""
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query, body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+async def _send_json(send, status: int, detail: str, headers: List[Tuple[bytes, bytes]] = ()) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware running each keyed POST once and replaying its response"""
+
+    def __init__(self, app, store: IdempotencyStore):
+        self.app = app
+        self.store = store
+
+    async def _read_body(self, receive) -> Tuple[Optional[bytes], List[dict]]:
+        """Buffer the request body; None when it exceeds IDEMPOTENCY_MAX_BODY_BYTES"""
+        messages, size = [], 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                return None, messages
+            size += len(message.get("body", b""))
+            if size > settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                return None, messages
+            if not message.get("more_body", False):
+                return b"".join(m.get("body", b"") for m in messages), messages
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+        header = next((value for name, value in scope["headers"] if name == b"idempotency-key"), None)
+        if header is None:
+            return await self.app(scope, receive, send)
+        if not header or len(header) > MAX_KEY_LENGTH:
+            return await _send_json(send, 400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+
+        body, buffered = await self._read_body(receive)
+
+        async def replay_receive():
+            # Hand the buffered messages to the app first, then the rest of the stream
+            if buffered:
+                return buffered.pop(0)
+            return await receive()
+
+        if body is None:
+            # Too large to fingerprint (e.g. a catalog upload): run it without idempotency
+            metrics.increment("idempotency_skipped_total")
+            return await self.app(scope, replay_receive, send)
+
+        key = f"{rate_limiter.key(scope)}:{header.decode('latin-1')}"
+        fingerprint = request_fingerprint(scope["method"], scope["path"], scope.get("query_string", b""), body)
+
+        try:
+            record = await self.store.reserve(key, fingerprint, settings.IDEMPOTENCY_LOCK_SECONDS)
+        except Exception:
+            return await self._run_without_key(scope, replay_receive, send)
+
+        while record is not None:
+            if record["fingerprint"] != fingerprint:
+                metrics.increment("idempotency_mismatches_total")
+                return await _send_json(send, 422, "Idempotency-Key was already used for a different request")
+            if record["state"] == COMPLETED:
+                metrics.increment("idempotency_replays_total")
+                return await self._replay(record["response"], send)
+
+            # A duplicate of a request that is still running: wait for its outcome
+            metrics.increment("idempotency_waits_total")
+            try:
+                record = await self.store.wait(key, settings.IDEMPOTENCY_WAIT_SECONDS)
+                if record is None:
+                    # The first attempt failed or expired; this retry runs the request itself
+                    record = await self.store.reserve(key, fingerprint, settings.IDEMPOTENCY_LOCK_SECONDS)
+                    continue
+            except Exception:
+                return await self._run_without_key(scope, replay_receive, send)
+            if record["state"] == IN_PROGRESS:
+                return await _send_json(
+                    send, 409, "A request with this Idempotency-Key is still in progress", [(b"retry-after", b"1")]
+                )
+
+        await self._execute(scope, replay_receive, send, key, fingerprint)
+
+    async def _run_without_key(self, scope, receive, send) -> None:
+        # An unavailable shared store must not take the write endpoints down with it
+        logger.warning("Idempotency store unavailable; running request without a key", exc_info=True)
+        metrics.increment("idempotency_store_errors_total")
+        await self.app(scope, receive, send)
+
+    async def _execute(self, scope, receive, send, key: str, fingerprint: str) -> None:
+        response = {"status": 500, "headers": [], "body": []}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [[name.decode("latin-1"), value.decode("latin-1")]
+                                       for name, value in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        stored = False
+        try:
+            await self.app(scope, receive, capture)
+            if response["status"] < 500:
+                record = {
+                    "state": COMPLETED,
+                    "fingerprint": fingerprint,
+                    "response": {
+                        "status": response["status"],
+                        "headers": response["headers"],
+                        "body": base64.b64encode(b"".join(response["body"])).decode("ascii"),
+                    },
+                }
+                try:
+                    await self.store.complete(key, record, settings.IDEMPOTENCY_TTL_SECONDS)
+                    stored = True
+                except Exception:
+                    logger.warning("Failed to store idempotent response", exc_info=True)
+                    metrics.increment("idempotency_store_errors_total")
+        finally:
+            if not stored:
+                # Errors and aborted requests are not replayed; let a retry run again
+                try:
+                    await self.store.release(key)
+                except Exception:
+                    logger.warning("Failed to release idempotency key", exc_info=True)
+
+    @staticmethod
+    async def _replay(response: dict, send) -> None:
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in response["headers"]]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": response["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(response["body"])})
+
+
+idempotency_store = create_idempotency_store(settings.IDEMPOTENCY_BACKEND)
@@ -0,0 +1,55 @@
+"""
+Lightweight in-process metrics registry
+
+Counters and gauges are kept per worker process and exposed as JSON through
+the admin API. Metric keys follow the ``name{label="value"}`` convention so
+they can be scraped into Prometheus-style tooling without renaming.
+"""
+
+from collections import defaultdict
+from typing import Dict
+
+
+def _metric_key(name: str, labels: Dict[str, str]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class MetricsRegistry:
+    """Registry of process-local counters and gauges"""
+
+    def __init__(self):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increase a counter"""
+        self._counters[_metric_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to its current value"""
+        self._gauges[_metric_key(name, labels)] = value
+
+    def get(self, name: str, **labels: str) -> float:
+        """Read a counter or gauge, defaulting to 0"""
+        key = _metric_key(name, labels)
+        if key in self._gauges:
+            return self._gauges[key]
+        return self._counters.get(key, 0)
+
+    def snapshot(self) -> dict:
+        """Return a copy of all metrics"""
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+        }
+
+    def reset(self) -> None:
+        """Drop all recorded metrics"""
+        self._counters.clear()
+        self._gauges.clear()
+
+
+metrics = MetricsRegistry()
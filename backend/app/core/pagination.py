@@ -0,0 +1,40 @@
+"""
+Opaque cursors for keyset pagination
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort-key values of the last row of a page as an opaque cursor
+
+    Args:
+        values: Sort-key values, e.g. [created_at, id]
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
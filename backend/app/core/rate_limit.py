@@ -0,0 +1,248 @@
+"""
+Token-bucket rate limiting
+
+Every client has a bucket of RATE_LIMIT_BURST tokens refilled at
+RATE_LIMIT_RATE tokens per second. A request spends its route's cost
+(RATE_LIMIT_COSTS, 1 by default) and is answered 429 with ``Retry-After``
+when the bucket is short. Clients are keyed by the user id of a valid bearer
+token, falling back to the client IP.
+
+Buckets live in a pluggable store: in-memory (per worker) or Redis, where a
+Lua script refills and spends atomically so all workers share one bucket.
+The middleware is plain ASGI and caches verified tokens, keeping its
+overhead to a few microseconds per request with the in-memory store.
+"""
+
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketStore:
+    """Interface for token bucket storage backends"""
+
+    async def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        """Spend cost tokens from key's bucket
+
+        Returns:
+            0 when the tokens were spent, otherwise the seconds until enough
+            tokens will have accumulated
+        """
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryTokenBucketStore(TokenBucketStore):
+    """Process-local buckets, suitable for a single worker and for tests"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> [tokens, monotonic time of the last update]
+        self._buckets: Dict[str, List[float]] = {}
+
+    def _evict(self, now: float, rate: float, burst: float) -> None:
+        # Buckets that have refilled completely carry no state worth keeping
+        idle = burst / rate
+        for key in [key for key, (_, updated) in self._buckets.items() if now - updated >= idle]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            # Still full of active clients: forget the oldest-created quarter
+            for key in list(self._buckets)[: max(1, self.max_keys // 4)]:
+                del self._buckets[key]
+
+    async def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._evict(now, rate, burst)
+            bucket = self._buckets[key] = [burst, now]
+        else:
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / rate
+
+    async def clear(self) -> None:
+        self._buckets.clear()
+
+
+# KEYS[1] bucket; ARGV rate, burst, cost. Uses the Redis clock so every
+# worker refills against the same time. Returns the retry delay as a string
+# because Lua numbers are truncated to integers in replies.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = burst
+else
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+end
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(retry)
+"""
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """Buckets shared by all workers through Redis"""
+
+    def __init__(self, prefix: str = "ratelimit:"):
+        self.prefix = prefix
+        self._script = None
+
+    async def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        if self._script is None:
+            from app.core.redis_client import get_redis
+
+            self._script = get_redis().register_script(TOKEN_BUCKET_LUA)
+        retry = await self._script(keys=[self.prefix + key], args=[rate, burst, cost])
+        return float(retry)
+
+    async def clear(self) -> None:
+        from app.core.redis_client import get_redis
+
+        client = get_redis()
+        async for key in client.scan_iter(match=self.prefix + "*"):
+            await client.delete(key)
+
+
+def create_token_bucket_store(backend: str) -> TokenBucketStore:
+    """Create the bucket store configured by RATE_LIMIT_BACKEND"""
+    if backend == "memory":
+        return InMemoryTokenBucketStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    if backend == "redis":
+        return RedisTokenBucketStore()
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+def parse_route_costs(costs: Dict[str, float]) -> List[Tuple[Optional[str], str, float]]:
+    """Turn ``{"POST /api/v1/auth/login": 10, "/api/v1/admin/charts/": 5}`` into
+    (method or None, path prefix, cost) rules, most specific first"""
+    rules = []
+    for route, cost in costs.items():
+        method, _, path = route.strip().rpartition(" ")
+        rules.append((method.upper() or None, path, float(cost)))
+    # Longer prefixes first; a method-specific rule beats a catch-all one of the same prefix
+    rules.sort(key=lambda rule: (-len(rule[1]), rule[0] is None))
+    return rules
+
+
+class RateLimiter:
+    """Decides the key and cost of a request and spends it from the store"""
+
+    def __init__(self, store: TokenBucketStore, rate: float, burst: float, costs: Dict[str, float],
+                 token_cache_size: int = 10000):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+        self.rules = parse_route_costs(costs)
+        self.token_cache_size = token_cache_size
+        # Bearer token -> (user id, expiry); verifying a JWT costs ~50 us
+        self._tokens: Dict[str, Tuple[Optional[int], float]] = {}
+
+    def cost(self, method: str, path: str) -> float:
+        """Cost of a request; 0 exempts it"""
+        for rule_method, prefix, cost in self.rules:
+            if path.startswith(prefix) and (rule_method is None or rule_method == method):
+                return cost
+        return 1.0
+
+    def _user_id(self, token: str) -> Optional[int]:
+        cached = self._tokens.get(token)
+        now = time.time()
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        payload = decode_access_token(token)
+        # Forged or expired tokens fall back to the IP, so they cannot drain another user's bucket
+        user_id = payload.get("user_id") if payload else None
+        if len(self._tokens) >= self.token_cache_size:
+            self._tokens.clear()
+        self._tokens[token] = (user_id, float(payload.get("exp", 0)) if payload else now + 60)
+        return user_id
+
+    def key(self, scope) -> str:
+        """user:<id> for a valid bearer token, ip:<address> otherwise"""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                if value[:7].lower() == b"bearer ":
+                    user_id = self._user_id(value[7:].decode("latin-1"))
+                    if user_id is not None:
+                        return f"user:{user_id}"
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def check(self, scope) -> float:
+        """Spend the request's cost; returns 0 when allowed, else the retry delay"""
+        cost = self.cost(scope["method"], scope["path"])
+        if cost <= 0:
+            return 0.0
+        try:
+            return await self.store.take(self.key(scope), min(cost, self.burst), self.rate, self.burst)
+        except Exception:
+            # An unavailable shared store must not take the API down with it
+            logger.warning("Rate limit store unavailable; allowing request", exc_info=True)
+            metrics.increment("rate_limit_store_errors_total")
+            return 0.0
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 with Retry-After once a client's bucket is empty"""
+
+    def __init__(self, app, limiter: "RateLimiter"):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        retry_after = await self.limiter.check(scope)
+        if retry_after <= 0:
+            return await self.app(scope, receive, send)
+
+        metrics.increment("rate_limited_total")
+        body = b'{"detail":"Too many requests"}'
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+rate_limiter = RateLimiter(
+    store=create_token_bucket_store(settings.RATE_LIMIT_BACKEND),
+    rate=settings.RATE_LIMIT_RATE,
+    burst=settings.RATE_LIMIT_BURST,
+    costs=settings.RATE_LIMIT_COSTS,
+)
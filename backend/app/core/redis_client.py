@@ -0,0 +1,31 @@
+"""
+Shared Redis client
+
+The client is created on first use from REDIS_URL, so processes that never
+touch Redis need no server. Connections are pooled by redis-py and opened
+lazily.
+"""
+
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Return the process-wide Redis client"""
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the client's connections (application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,32 @@
+"""
+Rebuild the personal_records table from existing workout logs
+
+Run once after migration 011, and after bulk-loading logs outside the API
+(for example with ``app.db.seed_charts``):
+
+    python -m app.db.backfill_personal_records [--user-id ID] [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.db.base import AsyncSessionLocal
+from app.services.personal_records import PersonalRecordService
+
+
+async def backfill_personal_records(user_id: int = None, batch_size: int = 1000) -> None:
+    """Recompute personal records for every user, or a single user"""
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        written = await PersonalRecordService.backfill(session, user_id=user_id, batch_size=batch_size)
+        await session.commit()
+    print(f"Wrote {written} personal records in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild personal records from workout history")
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(backfill_personal_records(args.user_id, args.batch_size))
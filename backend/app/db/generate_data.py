@@ -0,0 +1,443 @@
+"""
+Bulk synthetic data generator for benchmarking
+
+Generates coaches, clients, bookings, plans and a history of workout and
+diet logs at production scale, so performance changes can be measured on
+realistic data:
+
+    python -m app.db.generate_data --clients 10000 --coaches 200 --days 365 \\
+        --workouts-per-day 1.5 --meals-per-day 3 --bookings-per-coach 25 --seed 42
+
+Rows are streamed from generators one day at a time (memory grows with the
+number of clients, not with the history) and bulk-loaded with COPY on
+PostgreSQL or multi-row INSERTs on SQLite. Logs are written in date order,
+interleaving users the way production traffic does. On PostgreSQL the
+monthly log partitions covering the history are created first, several
+months are loaded concurrently (--jobs) and the tables are analyzed at the
+end. Most of the load time is index maintenance and foreign key checks;
+--skip-fk-checks halves it for a superuser.
+
+Users get e-mail addresses under ``@gen<seed>.vibe`` and the password
+``generated123``; run again with another --seed to add more data.
+Personal records and streaks are not generated; run
+``python -m app.db.backfill_personal_records`` afterwards if needed.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from itertools import islice, repeat
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.security import get_password_hash
+from app.db.base import Base, engine
+from app.db.partitions import PARTITIONED_TABLES, add_months, ensure_partitions, list_partitions, months_between
+from app.db.seed_charts import EXERCISES, BREAKFAST_FOODS, LUNCH_FOODS, DINNER_FOODS, SNACK_FOODS
+from app.models import Exercise, Food, User
+from app.services.exercise_catalog import normalize_exercise_name
+from app.services.food_catalog import normalize_food_name
+
+PASSWORD = "generated123"
+
+MEALS = {
+    "breakfast": BREAKFAST_FOODS,
+    "lunch": LUNCH_FOODS,
+    "dinner": DINNER_FOODS,
+    "snack": SNACK_FOODS,
+}
+# Share of diet logs per meal type, in MEALS order
+MEAL_WEIGHTS = [0.27, 0.27, 0.27, 0.19]
+
+USER_COLUMNS = [
+    "email", "hashed_password", "full_name", "role", "is_active", "is_verified",
+    "available_slots", "age", "weight", "created_at", "updated_at",
+]
+BOOKING_COLUMNS = ["coach_id", "client_id", "slot_number", "scheduled_at", "status", "created_at", "updated_at"]
+WORKOUT_PLAN_COLUMNS = ["user_id", "name", "start_date", "status", "duration_weeks", "created_at", "updated_at"]
+DIET_PLAN_COLUMNS = [
+    "user_id", "name", "start_date", "status", "target_calories", "target_protein_grams",
+    "target_carbs_grams", "target_fat_grams", "created_at", "updated_at",
+]
+WORKOUT_LOG_COLUMNS = [
+    "user_id", "workout_date", "exercise_name", "exercise_id", "sets", "reps", "weight",
+    "duration_minutes", "created_at", "updated_at",
+]
+DIET_LOG_COLUMNS = [
+    "user_id", "meal_date", "meal_type", "food_name", "food_id", "servings", "calories",
+    "protein_grams", "carbs_grams", "fat_grams", "created_at", "updated_at",
+]
+
+# SQLite allows at most 32766 bound parameters per statement
+SQLITE_MAX_PARAMETERS = 32766
+
+
+def _stamp(day: date, hour: int = 12) -> datetime:
+    return datetime.combine(day, dtime(hour), timezone.utc)
+
+
+def user_rows(
+    rng: np.random.Generator, role: str, count: int, domain: str, password: str, first_day: date, slots: int
+) -> Iterator[tuple]:
+    """Coach or client rows, created some time before the history starts"""
+    ages = rng.integers(20, 60, size=count).tolist()
+    weights = np.round(rng.uniform(55, 110, size=count), 1).tolist()
+    joined = rng.integers(1, 180, size=count).tolist()
+    for index in range(count):
+        created = _stamp(first_day - timedelta(days=joined[index]), 9)
+        yield (
+            f"{role}{index}@{domain}", password, f"{role.title()} {index}", role, True, True,
+            slots, ages[index], weights[index], created, created,
+        )
+
+
+def booking_rows(
+    rng: np.random.Generator, coach_ids: List[int], client_ids: List[int], per_coach: int, today: date
+) -> Iterator[tuple]:
+    """Bookings spread round-robin over the clients, one slot each"""
+    statuses = np.array(["pending", "confirmed", "completed", "cancelled"], dtype=object)
+    stamp = _stamp(today)
+    for position, coach_id in enumerate(coach_ids):
+        picks = rng.choice(len(statuses), size=per_coach, p=[0.2, 0.5, 0.2, 0.1])
+        offsets = rng.integers(-60, 30, size=per_coach).tolist()
+        for slot in range(per_coach):
+            client_id = client_ids[(position * per_coach + slot) % len(client_ids)]
+            yield (
+                coach_id, client_id, slot + 1, _stamp(today + timedelta(days=offsets[slot]), 17),
+                statuses[picks[slot]], stamp, stamp,
+            )
+
+
+def plan_rows(rng: np.random.Generator, client_ids: List[int], first_day: date) -> Tuple[list, list]:
+    """One active workout plan and one active diet plan per client"""
+    starts = rng.integers(0, 60, size=len(client_ids)).tolist()
+    calories = rng.choice([1800.0, 2000.0, 2200.0, 2500.0, 2800.0], size=len(client_ids)).tolist()
+    workout_plans, diet_plans = [], []
+    for index, client_id in enumerate(client_ids):
+        start = first_day + timedelta(days=starts[index])
+        stamp = _stamp(start, 8)
+        workout_plans.append((client_id, "Training block", start, "active", 12, stamp, stamp))
+        target = calories[index]
+        diet_plans.append((
+            client_id, "Nutrition plan", start, "active",
+            target, round(target * 0.3 / 4, 1), round(target * 0.45 / 4, 1), round(target * 0.25 / 9, 1),
+            stamp, stamp,
+        ))
+    return workout_plans, diet_plans
+
+
+def workout_log_rows(
+    rng: np.random.Generator,
+    client_ids: np.ndarray,
+    activity: np.ndarray,
+    exercise_ids: Dict[str, int],
+    first_day: date,
+    days: int,
+    per_day: float,
+) -> Iterator[tuple]:
+    """Workout logs day by day; each client logs Poisson(per_day * activity) exercises"""
+    names = np.array(EXERCISES, dtype=object)
+    ids = np.array([exercise_ids[name] for name in EXERCISES])
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        counts = rng.poisson(per_day * activity)
+        total = int(counts.sum())
+        if not total:
+            continue
+        stamp = _stamp(day, 18)
+        pick = rng.integers(len(names), size=total)
+        yield from zip(
+            np.repeat(client_ids, counts).tolist(),
+            repeat(day),
+            names[pick].tolist(),
+            ids[pick].tolist(),
+            rng.integers(2, 6, size=total).tolist(),
+            rng.integers(5, 16, size=total).tolist(),
+            np.round(rng.uniform(10, 140, size=total), 1).tolist(),
+            rng.integers(10, 61, size=total).tolist(),
+            repeat(stamp),
+            repeat(stamp),
+        )
+
+
+def diet_log_rows(
+    rng: np.random.Generator,
+    client_ids: np.ndarray,
+    activity: np.ndarray,
+    food_ids: Dict[str, int],
+    first_day: date,
+    days: int,
+    per_day: float,
+) -> Iterator[tuple]:
+    """Diet logs day by day; each client logs Poisson(per_day * activity) meals"""
+    meal_types = np.array(list(MEALS), dtype=object)
+    # (meal, food) -> name, catalog id and macros
+    names = np.array([[food[0] for food in foods] for foods in MEALS.values()], dtype=object)
+    ids = np.array([[food_ids[food[0]] for food in foods] for foods in MEALS.values()])
+    macros = np.array([[food[1:] for food in foods] for foods in MEALS.values()], dtype=float)
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        counts = rng.poisson(per_day * np.minimum(activity, 1.2))
+        total = int(counts.sum())
+        if not total:
+            continue
+        stamp = _stamp(day, 13)
+        meal = rng.choice(len(meal_types), size=total, p=MEAL_WEIGHTS)
+        food = rng.integers(names.shape[1], size=total)
+        servings = rng.choice([0.5, 1.0, 1.0, 1.0, 1.5, 2.0], size=total)
+        scaled = np.round(macros[meal, food] * servings[:, None], 1)
+        yield from zip(
+            np.repeat(client_ids, counts).tolist(),
+            repeat(day),
+            meal_types[meal].tolist(),
+            names[meal, food].tolist(),
+            ids[meal, food].tolist(),
+            servings.tolist(),
+            *(scaled[:, column].tolist() for column in range(4)),
+            repeat(stamp),
+            repeat(stamp),
+        )
+
+
+async def load_rows(
+    conn: AsyncConnection, table: str, columns: List[str], rows: Iterable[tuple], batch_size: int = 1000
+) -> int:
+    """
+    Bulk-load rows into a table without materializing them
+
+    PostgreSQL streams the iterable through COPY; other dialects insert
+    batches of rows with one multi-row INSERT statement each.
+
+    Returns:
+        Number of rows loaded
+    """
+    if conn.dialect.name == "postgresql":
+        raw = await conn.get_raw_connection()
+        status = await raw.driver_connection.copy_records_to_table(table, records=rows, columns=columns)
+        return int(status.split()[-1])
+
+    insert = Base.metadata.tables[table].insert()
+    batch_size = max(1, min(batch_size, SQLITE_MAX_PARAMETERS // len(columns)))
+    rows = iter(rows)
+    loaded = 0
+    while batch := list(islice(rows, batch_size)):
+        await conn.execute(insert.values([dict(zip(columns, row)) for row in batch]))
+        loaded += len(batch)
+    return loaded
+
+
+async def _ensure_catalog(conn: AsyncConnection) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Make sure the sample exercises and foods exist and return name -> id maps"""
+    insert_ = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+    now = datetime.now(timezone.utc)
+    await conn.execute(
+        insert_(Exercise.__table__)
+        .values([
+            {"name": name, "normalized_name": normalize_exercise_name(name), "created_at": now, "updated_at": now}
+            for name in EXERCISES
+        ])
+        .on_conflict_do_nothing(index_elements=["normalized_name"])
+    )
+    foods = [food for foods in MEALS.values() for food in foods]
+    await conn.execute(
+        insert_(Food.__table__)
+        .values([
+            {
+                "name": name, "normalized_name": normalize_food_name(name), "serving_size": "1 serving",
+                "calories": calories, "protein_grams": protein, "carbs_grams": carbs, "fat_grams": fat,
+                "created_at": now, "updated_at": now,
+            }
+            for name, calories, protein, carbs, fat in foods
+        ])
+        .on_conflict_do_nothing(index_elements=["normalized_name"])
+    )
+    exercises = await conn.execute(
+        select(Exercise.normalized_name, Exercise.id)
+        .where(Exercise.normalized_name.in_([normalize_exercise_name(name) for name in EXERCISES]))
+    )
+    exercise_ids = dict(exercises.all())
+    food_rows = await conn.execute(
+        select(Food.normalized_name, Food.id)
+        .where(Food.normalized_name.in_([normalize_food_name(food[0]) for food in foods]))
+    )
+    food_ids = dict(food_rows.all())
+    return (
+        {name: exercise_ids[normalize_exercise_name(name)] for name in EXERCISES},
+        {food[0]: food_ids[normalize_food_name(food[0])] for food in foods},
+    )
+
+
+async def _user_ids(conn: AsyncConnection, domain: str, role: str) -> List[int]:
+    result = await conn.execute(
+        select(User.id).where(User.email.like(f"%@{domain}"), User.role == role).order_by(User.id)
+    )
+    return list(result.scalars())
+
+
+async def generate(
+    engine_,
+    clients: int,
+    coaches: int,
+    days: int,
+    workouts_per_day: float = 1.5,
+    meals_per_day: float = 3.0,
+    bookings_per_coach: int = 10,
+    seed: int = 42,
+    batch_size: int = 1000,
+    jobs: int = 4,
+    skip_fk_checks: bool = False,
+    today: date = None,
+    report=print,
+) -> Dict[str, int]:
+    """
+    Generate and load a synthetic dataset
+
+    Args:
+        engine_: Async engine to load into (migrated schema)
+        clients: Number of clients
+        coaches: Number of coaches
+        days: Days of log history ending today
+        workouts_per_day: Average workout log rows per client per day
+        meals_per_day: Average diet log rows per client per day
+        bookings_per_coach: Bookings created for each coach
+        seed: Random seed; also names the generated users
+        batch_size: Rows per INSERT statement on SQLite
+        jobs: Months of logs loaded concurrently on PostgreSQL
+        skip_fk_checks: Skip foreign key checks while loading on PostgreSQL
+        today: Last day of the history (defaults to date.today())
+        report: Callable receiving progress lines
+
+    Returns:
+        Table name -> rows loaded
+    """
+    today = today or date.today()
+    first_day = today - timedelta(days=days - 1)
+    domain = f"gen{seed}.vibe"
+    rng = np.random.default_rng(seed)
+    loaded: Dict[str, int] = {}
+
+    async def load(table: str, columns: List[str], rows: Iterable[tuple], label: str = "") -> None:
+        started = time.perf_counter()
+        async with engine_.begin() as conn:
+            if skip_fk_checks and engine_.dialect.name == "postgresql":
+                # Disables the foreign key triggers for this transaction (superuser only);
+                # every generated id was read back from the database
+                await conn.execute(text("SET LOCAL session_replication_role = replica"))
+            count = await load_rows(conn, table, columns, rows, batch_size)
+        loaded[table] = loaded.get(table, 0) + count
+        seconds = time.perf_counter() - started
+        report(f"  {table:<14} {label:<8} {count:>12,} rows in {seconds:7.1f} s")
+
+    async with engine_.begin() as conn:
+        if await _user_ids(conn, domain, "client") or await _user_ids(conn, domain, "coach"):
+            raise ValueError(f"Users under @{domain} already exist; choose another --seed")
+        exercise_ids, food_ids = await _ensure_catalog(conn)
+
+    password = get_password_hash(PASSWORD)
+    slots = max(10, bookings_per_coach)
+    await load("users", USER_COLUMNS, user_rows(rng, "coach", coaches, domain, password, first_day, slots), "coaches")
+    await load("users", USER_COLUMNS, user_rows(rng, "client", clients, domain, password, first_day, 10), "clients")
+
+    async with engine_.connect() as conn:
+        coach_ids = await _user_ids(conn, domain, "coach")
+        client_ids = await _user_ids(conn, domain, "client")
+
+    if coach_ids and client_ids and bookings_per_coach:
+        await load("bookings", BOOKING_COLUMNS, booking_rows(rng, coach_ids, client_ids, bookings_per_coach, today))
+    workout_plans, diet_plans = plan_rows(rng, client_ids, first_day)
+    await load("workout_plans", WORKOUT_PLAN_COLUMNS, workout_plans)
+    await load("diet_plans", DIET_PLAN_COLUMNS, diet_plans)
+    del workout_plans, diet_plans
+
+    if engine_.dialect.name == "postgresql":
+        # History older than the existing partitions would all land in the default one
+        async with engine_.begin() as conn:
+            for table, column in PARTITIONED_TABLES.items():
+                if await list_partitions(conn, table):
+                    await ensure_partitions(conn, table, column, today, start=first_day)
+
+    client_array = np.array(client_ids, dtype=np.int64)
+    # Some clients train and log far more consistently than others
+    activity = rng.uniform(0.2, 1.8, size=len(client_ids))
+
+    # Logs are loaded one month at a time. Each month has its own random
+    # stream, so the data does not depend on how many load concurrently;
+    # on PostgreSQL every month lands in its own partition and the index
+    # maintenance of the months runs in parallel.
+    chunks = []
+    for index, month in enumerate(months_between(first_day, today)):
+        start = max(month, first_day)
+        count = (min(add_months(month, 1) - timedelta(days=1), today) - start).days + 1
+        label = f"{month:%Y-%m}"
+        chunks.append(("workout_logs", WORKOUT_LOG_COLUMNS, label, workout_log_rows(
+            np.random.default_rng([seed, 0, index]), client_array, activity, exercise_ids, start, count,
+            workouts_per_day,
+        )))
+        chunks.append(("diet_logs", DIET_LOG_COLUMNS, label, diet_log_rows(
+            np.random.default_rng([seed, 1, index]), client_array, activity, food_ids, start, count, meals_per_day,
+        )))
+    # The SQLite test engine shares a single connection
+    limit = asyncio.Semaphore(jobs if engine_.dialect.name == "postgresql" else 1)
+
+    async def load_chunk(table: str, columns: List[str], label: str, rows: Iterable[tuple]) -> None:
+        async with limit:
+            await load(table, columns, rows, label)
+
+    await asyncio.gather(*(load_chunk(*chunk) for chunk in chunks))
+
+    if engine_.dialect.name == "postgresql":
+        async with engine_.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for table in ("users", "bookings", "workout_plans", "diet_plans", "workout_logs", "diet_logs"):
+                await conn.execute(text(f"ANALYZE {table}"))
+    return loaded
+
+
+async def main(args) -> None:
+    print(
+        f"Generating {args.clients} clients and {args.coaches} coaches with {args.days} days of history "
+        f"(seed {args.seed}) into {engine.dialect.name}"
+    )
+    started = time.perf_counter()
+    loaded = await generate(
+        engine,
+        clients=args.clients,
+        coaches=args.coaches,
+        days=args.days,
+        workouts_per_day=args.workouts_per_day,
+        meals_per_day=args.meals_per_day,
+        bookings_per_coach=args.bookings_per_coach,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        jobs=args.jobs,
+        skip_fk_checks=args.skip_fk_checks,
+    )
+    await engine.dispose()
+    print(f"Loaded {sum(loaded.values()):,} rows in {time.perf_counter() - started:.1f} s")
+    print(f"Log in as client0@gen{args.seed}.vibe / {PASSWORD}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--coaches", type=int, default=20)
+    parser.add_argument("--days", type=int, default=365, help="Days of log history ending today")
+    parser.add_argument("--workouts-per-day", type=float, default=1.5,
+                        help="Average workout log rows per client per day")
+    parser.add_argument("--meals-per-day", type=float, default=3.0, help="Average diet log rows per client per day")
+    parser.add_argument("--bookings-per-coach", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per INSERT statement on SQLite")
+    parser.add_argument("--jobs", type=int, default=4, help="Months of logs loaded concurrently on PostgreSQL")
+    parser.add_argument("--skip-fk-checks", action="store_true",
+                        help="Skip foreign key checks while loading (PostgreSQL superuser only, about 2x faster)")
+    args = parser.parse_args()
+    if args.clients < 1 or args.coaches < 0 or args.days < 1 or args.jobs < 1:
+        parser.error("--clients, --days and --jobs must be positive and --coaches non-negative")
+    asyncio.run(main(args))
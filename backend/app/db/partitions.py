@@ -0,0 +1,192 @@
+"""
+Maintenance for the monthly partitions of workout_logs and diet_logs
+
+On PostgreSQL both tables are range-partitioned by month (migration 013)
+with a default partition catching rows outside the created months. Run
+this regularly (e.g. a daily cron job) so future months exist before
+writes reach them, and to retire months past the retention period:
+
+    python -m app.db.partitions ensure [--months-ahead N]
+    python -m app.db.partitions archive --retention-months N [--archive-schema NAME | --drop]
+
+``archive`` detaches each month that ended before the cutoff. The detached
+table is left as a standalone table (ready for pg_dump), moved into the
+archive schema, or dropped with ``--drop``.
+"""
+
+import argparse
+import asyncio
+import re
+from datetime import date
+from typing import Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.base import engine
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "workout_logs": "workout_date",
+    "diet_logs": "meal_date",
+}
+
+IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def add_months(month: date, count: int) -> date:
+    """First day of the month ``count`` months after ``month``"""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> Iterator[date]:
+    """First days of every month from first to last, inclusive"""
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of a table's partition for a month, e.g. workout_logs_p2026_01"""
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_month(table: str, name: str) -> Optional[date]:
+    """Month covered by a partition name, or None for other tables"""
+    match = re.fullmatch(rf"{table}_p(\d{{4}})_(\d{{2}})", name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[str]:
+    """Names of the partitions currently attached to a table"""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, table: str, column: str, through: date, start: Optional[date] = None
+) -> List[str]:
+    """
+    Create missing monthly partitions from ``start`` (default: the current
+    month) through ``through``
+
+    Rows that already landed in the default partition for a new month are
+    moved into it before it is attached, since PostgreSQL refuses to attach
+    a range the default partition still holds rows for.
+
+    Returns:
+        Names of the partitions created
+    """
+    existing = set(await list_partitions(conn, table))
+    created = []
+    for month in months_between(start or date.today(), through):
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        bounds = {"start": month, "end": add_months(month, 1)}
+        await conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"))
+        if f"{table}_default" in existing:
+            await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {table}_default "
+                    f"WHERE {column} >= :start AND {column} < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+        await conn.execute(
+            text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def archive_partitions(
+    conn: AsyncConnection,
+    table: str,
+    before: date,
+    archive_schema: Optional[str] = None,
+    drop: bool = False,
+) -> List[str]:
+    """
+    Detach monthly partitions that ended on or before ``before``
+
+    Args:
+        conn: Connection inside a transaction
+        table: Partitioned table
+        before: First day of the oldest month to keep
+        archive_schema: Move detached partitions into this schema
+        drop: Drop detached partitions instead of keeping them
+
+    Returns:
+        Names of the partitions detached
+    """
+    detached = []
+    for name in sorted(await list_partitions(conn, table)):
+        month = partition_month(table, name)
+        if month is None or add_months(month, 1) > before:
+            continue
+        await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if drop:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        elif archive_schema:
+            await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+            await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        detached.append(name)
+    return detached
+
+
+async def main(args) -> None:
+    if engine.dialect.name != "postgresql":
+        print(f"Partitioning is only used on PostgreSQL (current database: {engine.dialect.name})")
+        return
+
+    this_month = date.today().replace(day=1)
+    for table, column in PARTITIONED_TABLES.items():
+        # One transaction per table so a failure leaves the other untouched
+        async with engine.begin() as conn:
+            if args.command == "ensure":
+                names = await ensure_partitions(conn, table, column, add_months(this_month, args.months_ahead))
+                print(f"{table}: created {len(names)} partition(s) {' '.join(names)}".rstrip())
+            else:
+                cutoff = add_months(this_month, -args.retention_months)
+                names = await archive_partitions(conn, table, cutoff, args.archive_schema, args.drop)
+                action = "dropped" if args.drop else "detached"
+                print(f"{table}: {action} {len(names)} partition(s) before {cutoff} {' '.join(names)}".rstrip())
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain monthly partitions of the log tables")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure", help="Create partitions for upcoming months")
+    ensure.add_argument("--months-ahead", type=int, default=settings.PARTITION_PREMAKE_MONTHS)
+
+    archive = commands.add_parser("archive", help="Detach partitions older than the retention period")
+    archive.add_argument("--retention-months", type=int, default=settings.PARTITION_RETENTION_MONTHS)
+    target = archive.add_mutually_exclusive_group()
+    target.add_argument("--archive-schema", default=None)
+    target.add_argument("--drop", action="store_true")
+
+    args = parser.parse_args()
+    if args.command == "archive":
+        if args.retention_months <= 0:
+            parser.error("set --retention-months or PARTITION_RETENTION_MONTHS to a positive number of months")
+        if args.archive_schema and not IDENTIFIER.match(args.archive_schema):
+            parser.error("--archive-schema must be a lowercase SQL identifier")
+    asyncio.run(main(args))
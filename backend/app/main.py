@@ -2,11 +2,36 @@
 Main FastAPI application entry point
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import health, auth, users, client, coach, admin, feedback, bookings
 from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware, idempotency_store
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.redis_client import close_redis
+from app.services.report_jobs import report_job_manager
+from app.services.feedback_buffer import feedback_buffer
+from app.services.autocomplete import autocomplete
+from app.services.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and graceful shutdown"""
+    # Connections, statements and caches (including autocomplete) warm up in
+    # the background; /api/v1/ready reports when this worker is warm
+    warmup.start()
+    yield
+    await warmup.stop()
+    autocomplete.stop()
+    # Let in-flight background work finish before the worker exits
+    await feedback_buffer.stop()
+    await report_job_manager.shutdown()
+    await close_redis()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -15,6 +40,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -26,12 +52,23 @@ if settings.NGROK_FRONTEND_URL:
 if settings.NGROK_BACKEND_URL:
     allowed_origins.append(settings.NGROK_BACKEND_URL)
 
+# Middleware added first runs innermost: rate limiting (and CORS around it)
+# sees every request before an idempotent response is replayed
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+
+# Added before CORS so that 429 responses still carry CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Feedback pagination and the 429/503 responses are read by the browser frontend
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
 # Include routers
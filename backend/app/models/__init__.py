@@ -3,23 +3,41 @@ Database models package
 """
 
 from app.models.user import User, UserRole
+from app.models.exercise import Exercise, ExerciseAlias
 from app.models.workout_log import WorkoutLog
+from app.models.personal_record import PersonalRecord
+from app.models.workout_streak import WorkoutStreak
+from app.models.food import Food
 from app.models.diet_log import DietLog, MealType
+from app.models.plan_template import PlanTemplate, PlanType
 from app.models.workout_plan import WorkoutPlan, PlanStatus
 from app.models.diet_plan import DietPlan
 from app.models.feedback import Feedback
 from app.models.booking import Booking, BookingStatus
+from app.models.report_job import ReportJob, ReportJobStatus
 
 __all__ = [
     "User",
     "UserRole",
+    "Exercise",
+    "ExerciseAlias",
     "WorkoutLog",
+    "PersonalRecord",
+    "WorkoutStreak",
+    "Food",
     "DietLog",
     "MealType",
+    "PlanTemplate",
+    "PlanType",
     "WorkoutPlan",
     "DietPlan",
     "PlanStatus",
     "Feedback",
     "Booking",
     "BookingStatus",
+    "ReportJob",
+    "ReportJobStatus",
 ]
+
+# Registers the flush hook that assigns WorkoutLog.exercise_id
+import app.services.exercise_catalog  # noqa: E402,F401
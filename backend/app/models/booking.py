@@ -2,7 +2,7 @@
 Booking model for coach-client training sessions
 """
 
-from sqlalchemy import String, Integer, ForeignKey, DateTime, Boolean, Text, Enum as SQLEnum
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Boolean, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 from datetime import datetime
@@ -24,6 +24,11 @@ class Booking(Base, TimestampMixin):
     """Booking model for personal training sessions"""
     
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Active bookings of a coach (slot counts, connected clients) or a client
+        Index("ix_bookings_coach_status", "coach_id", "status", postgresql_include=["client_id"]),
+        Index("ix_bookings_client_status", "client_id", "status"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     coach_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
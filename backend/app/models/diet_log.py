@@ -2,7 +2,7 @@
 DietLog model
 """
 
-from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date, Enum as SQLEnum
+from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 from typing import Optional
@@ -23,12 +23,25 @@ class DietLog(Base, TimestampMixin):
     """DietLog model for tracking user meals and nutrition"""
     
     __tablename__ = "diet_logs"
+    __table_args__ = (
+        # Date-range reads for one user; the macros are included so the daily
+        # nutrition totals are index-only scans on PostgreSQL
+        Index(
+            "ix_diet_logs_user_date", "user_id", "meal_date",
+            postgresql_include=["id", "calories", "protein_grams", "carbs_grams", "fat_grams"],
+        ),
+    )
     
+    # On PostgreSQL the table is range-partitioned by month on meal_date and the
+    # primary key is (id, meal_date); ids stay unique through the sequence
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     meal_date: Mapped[Date] = mapped_column(Date, nullable=False, index=True)
     meal_type: Mapped[MealType] = mapped_column(SQLEnum(MealType, values_callable=lambda enum_cls: [e.value for e in enum_cls]), nullable=False)
     food_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Catalog food the macros were filled from, if any
+    food_id: Mapped[Optional[int]] = mapped_column(ForeignKey("foods.id"), nullable=True, index=True)
+    servings: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     calories: Mapped[float] = mapped_column(Float, nullable=True)
     protein_grams: Mapped[float] = mapped_column(Float, nullable=True)
     carbs_grams: Mapped[float] = mapped_column(Float, nullable=True)
@@ -37,6 +50,7 @@ class DietLog(Base, TimestampMixin):
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="diet_logs")
+    food: Mapped[Optional["Food"]] = relationship("Food")
     
     def __repr__(self) -> str:
         return f"<DietLog(id={self.id}, user_id={self.user_id}, food={self.food_name}, date={self.meal_date})>"
@@ -2,7 +2,7 @@
 DietPlan model
 """
 
-from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date, Enum as SQLEnum, JSON
+from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date, Index, Enum as SQLEnum, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
@@ -15,6 +15,9 @@ class DietPlan(Base, TimestampMixin):
     """DietPlan model for structured diet programs"""
     
     __tablename__ = "diet_plans"
+    __table_args__ = (
+        Index("ix_diet_plans_user_status", "user_id", "status"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -30,11 +33,22 @@ class DietPlan(Base, TimestampMixin):
     target_carbs_grams: Mapped[float] = mapped_column(Float, nullable=True)
     target_fat_grams: Mapped[float] = mapped_column(Float, nullable=True)
     
-    # Store meal plan details as JSON (can be structured later with separate tables)
+    # Store meal plan details as JSON (can be structured later with separate tables).
+    # Plans assigned from a template hold only their per-client overrides here
     meal_plan_details: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    template_id: Mapped[Optional[int]] = mapped_column(ForeignKey("plan_templates.id"), nullable=True, index=True)
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="diet_plans")
+    # Joined so that responses can resolve the details without another query
+    template: Mapped[Optional["PlanTemplate"]] = relationship("PlanTemplate", lazy="joined")
+    
+    @property
+    def resolved_meal_plan_details(self) -> Optional[dict]:
+        """The template's details with this plan's overrides applied"""
+        if self.template is None:
+            return self.meal_plan_details
+        return self.template.resolve(self.meal_plan_details)
     
     def __repr__(self) -> str:
         return f"<DietPlan(id={self.id}, user_id={self.user_id}, name={self.name}, status={self.status})>"
@@ -0,0 +1,45 @@
+"""
+Exercise catalog models
+"""
+
+from sqlalchemy import String, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+from app.models.base import TimestampMixin
+
+
+class Exercise(Base, TimestampMixin):
+    """Canonical exercise referenced by workout logs"""
+
+    __tablename__ = "exercises"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Lowercased, whitespace-collapsed name used for lookups
+    normalized_name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+
+    # Relationships
+    aliases: Mapped[list["ExerciseAlias"]] = relationship(
+        "ExerciseAlias", back_populates="exercise", cascade="all, delete-orphan"
+    )
+
+    def __repr__(self) -> str:
+        return f"<Exercise(id={self.id}, name={self.name})>"
+
+
+class ExerciseAlias(Base, TimestampMixin):
+    """Alternative name that resolves to a canonical exercise"""
+
+    __tablename__ = "exercise_aliases"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    exercise_id: Mapped[int] = mapped_column(ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Stored normalized, like Exercise.normalized_name
+    alias: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+
+    # Relationships
+    exercise: Mapped["Exercise"] = relationship("Exercise", back_populates="aliases")
+
+    def __repr__(self) -> str:
+        return f"<ExerciseAlias(id={self.id}, exercise_id={self.exercise_id}, alias={self.alias})>"
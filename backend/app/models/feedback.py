@@ -2,7 +2,7 @@
 Feedback model
 """
 
-from sqlalchemy import String, Text, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy import String, Text, ForeignKey, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 import enum
@@ -23,8 +23,17 @@ class Feedback(Base, TimestampMixin):
     """Feedback model for user suggestions and issue reports"""
     
     __tablename__ = "feedback"
+    __table_args__ = (
+        # Keyset pagination over (created_at, id), with and without a status filter.
+        # On PostgreSQL, migration 008 also adds a generated message_tsv column with a
+        # GIN index for full-text search; it is not mapped so SQLite can create the table.
+        Index("ix_feedback_created_at_id", "created_at", "id"),
+        Index("ix_feedback_status_created_at_id", "status", "created_at", "id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    # Server-generated id returned to the submitter before the row is written
+    submission_id: Mapped[Optional[str]] = mapped_column(String(36), unique=True, nullable=True)
     user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True, index=True)
     name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
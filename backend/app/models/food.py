@@ -0,0 +1,29 @@
+"""
+Food catalog model
+"""
+
+from sqlalchemy import String, Float
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+
+from app.db.base import Base
+from app.models.base import TimestampMixin
+
+
+class Food(Base, TimestampMixin):
+    """Catalog food with nutrition per serving"""
+    
+    __tablename__ = "foods"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Lowercased, whitespace-collapsed name; the import upserts on it
+    normalized_name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    serving_size: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # e.g. "1 scoop (30 g)"
+    calories: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    protein_grams: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    carbs_grams: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    fat_grams: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    
+    def __repr__(self) -> str:
+        return f"<Food(id={self.id}, name={self.name})>"
@@ -0,0 +1,40 @@
+"""
+PersonalRecord model
+"""
+
+from sqlalchemy import Float, ForeignKey, Date, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import Optional
+
+from app.db.base import Base
+from app.models.base import TimestampMixin
+
+
+class PersonalRecord(Base, TimestampMixin):
+    """Best results per user and exercise, kept in step with workout logs"""
+
+    __tablename__ = "personal_records"
+    __table_args__ = (
+        UniqueConstraint("user_id", "exercise_id", name="uq_personal_records_user_exercise"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    exercise_id: Mapped[int] = mapped_column(ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    # Each record keeps the log that set it so edits and deletes of that
+    # log know to recompute the exercise
+    max_weight: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    max_weight_date: Mapped[Optional[Date]] = mapped_column(Date, nullable=True)
+    max_weight_log_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    best_e1rm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    best_e1rm_date: Mapped[Optional[Date]] = mapped_column(Date, nullable=True)
+    best_e1rm_log_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+    best_volume: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    best_volume_date: Mapped[Optional[Date]] = mapped_column(Date, nullable=True)
+    best_volume_log_id: Mapped[Optional[int]] = mapped_column(nullable=True)
+
+    # Relationships
+    exercise: Mapped["Exercise"] = relationship("Exercise")
+
+    def __repr__(self) -> str:
+        return f"<PersonalRecord(user_id={self.user_id}, exercise_id={self.exercise_id}, max_weight={self.max_weight})>"
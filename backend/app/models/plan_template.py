@@ -0,0 +1,45 @@
+"""
+PlanTemplate model
+"""
+
+from sqlalchemy import String, Text, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+import enum
+
+from app.db.base import Base
+from app.models.base import TimestampMixin
+
+
+class PlanType(str, enum.Enum):
+    """Kind of plan a template is for"""
+    WORKOUT = "workout"
+    DIET = "diet"
+
+
+class PlanTemplate(Base, TimestampMixin):
+    """Plan details shared by every plan assigned from the template
+
+    A plan row references its template and stores only its per-client
+    overrides, so the details JSON is kept once however many clients follow
+    the plan, and editing the template updates all of them.
+    """
+
+    __tablename__ = "plan_templates"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    coach_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    plan_type: Mapped[PlanType] = mapped_column(SQLEnum(PlanType, values_callable=lambda enum_cls: [e.value for e in enum_cls]), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # workout_details or meal_plan_details, depending on plan_type
+    details: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    def resolve(self, overrides: Optional[dict]) -> Optional[dict]:
+        """Details of a plan using this template: top-level override keys replace the template's"""
+        if not overrides:
+            return self.details
+        return {**(self.details or {}), **overrides}
+
+    def __repr__(self) -> str:
+        return f"<PlanTemplate(id={self.id}, coach_id={self.coach_id}, plan_type={self.plan_type}, name={self.name})>"
@@ -0,0 +1,44 @@
+"""
+ReportJob model for asynchronously generated admin reports
+"""
+
+from sqlalchemy import String, Text, DateTime, JSON, Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from datetime import datetime
+import enum
+
+from app.db.base import Base
+from app.models.base import TimestampMixin
+
+
+class ReportJobStatus(str, enum.Enum):
+    """Report job status enumeration"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ReportJob(Base, TimestampMixin):
+    """ReportJob model used by the database-backed report job store"""
+
+    __tablename__ = "report_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    params: Mapped[dict] = mapped_column(JSON, nullable=False)
+    dedup_key: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    status: Mapped[ReportJobStatus] = mapped_column(
+        SQLEnum(ReportJobStatus, values_callable=lambda enum_cls: [e.value for e in enum_cls]),
+        default=ReportJobStatus.PENDING,
+        nullable=False
+    )
+    result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+
+    def __repr__(self) -> str:
+        return f"<ReportJob(id={self.id}, kind={self.kind}, status={self.status})>"
@@ -3,7 +3,7 @@ User model
 """
 
 from sqlalchemy import String, Boolean, Enum as SQLEnum, Integer, Float, Text, JSON
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, undefer_group
 from typing import Optional, Dict, Any
 import enum
 
@@ -18,6 +18,20 @@ class UserRole(str, enum.Enum):
     ADMIN = "admin"
 
 
+# Deferred column groups. Authentication and list views read only the core
+# columns; detail endpoints load the profile groups with full_profile().
+# Touching an unloaded profile column raises instead of lazy loading, which
+# an async session cannot do.
+CLIENT_PROFILE = "client_profile"
+COACH_PROFILE = "coach_profile"
+CUSTOM_FIELDS = "custom_fields"
+PROFILE_GROUPS = (CLIENT_PROFILE, COACH_PROFILE, CUSTOM_FIELDS)
+
+
+def _profile(group: str) -> dict:
+    return {"deferred": True, "deferred_group": group, "deferred_raiseload": True}
+
+
 class User(Base, TimestampMixin):
     """User model for authentication and profile"""
     
@@ -36,30 +50,30 @@ class User(Base, TimestampMixin):
     gender: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
     # Client-specific profile fields
-    height: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    weight: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    bicep_size: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    waist: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
-    target_goals: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    dietary_restrictions: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    health_complications: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    injuries: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    gym_access: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    supplements: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    referral_source: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    height: Mapped[Optional[float]] = mapped_column(Float, nullable=True, **_profile(CLIENT_PROFILE))
+    weight: Mapped[Optional[float]] = mapped_column(Float, nullable=True, **_profile(CLIENT_PROFILE))
+    bicep_size: Mapped[Optional[float]] = mapped_column(Float, nullable=True, **_profile(CLIENT_PROFILE))
+    waist: Mapped[Optional[float]] = mapped_column(Float, nullable=True, **_profile(CLIENT_PROFILE))
+    target_goals: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(CLIENT_PROFILE))
+    dietary_restrictions: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(CLIENT_PROFILE))
+    health_complications: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(CLIENT_PROFILE))
+    injuries: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(CLIENT_PROFILE))
+    gym_access: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, **_profile(CLIENT_PROFILE))
+    supplements: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(CLIENT_PROFILE))
+    referral_source: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, **_profile(CLIENT_PROFILE))
     
     # Coach-specific profile fields
-    track_record: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    experience: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    certifications: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    competitions: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    qualifications: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    specialties: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    strengths: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    track_record: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(COACH_PROFILE))
+    experience: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(COACH_PROFILE))
+    certifications: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(COACH_PROFILE))
+    competitions: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(COACH_PROFILE))
+    qualifications: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(COACH_PROFILE))
+    specialties: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(COACH_PROFILE))
+    strengths: Mapped[Optional[str]] = mapped_column(Text, nullable=True, **_profile(COACH_PROFILE))
     available_slots: Mapped[int] = mapped_column(Integer, default=10, nullable=False)
     
     # Custom fields for extensibility
-    custom_fields: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    custom_fields: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True, **_profile(CUSTOM_FIELDS))
     
     # Relationships
     workout_logs: Mapped[list["WorkoutLog"]] = relationship(
@@ -83,3 +97,12 @@ class User(Base, TimestampMixin):
     
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, role={self.role})>"
+
+
+# What authentication, role checks and the user list views read
+CORE_COLUMNS = (User.id, User.email, User.full_name, User.role, User.is_active, User.is_verified)
+
+
+def full_profile() -> list:
+    """Loader options for detail endpoints: every deferred profile group"""
+    return [undefer_group(group) for group in PROFILE_GROUPS]
@@ -2,7 +2,7 @@
 WorkoutLog model
 """
 
-from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date
+from sqlalchemy import String, Integer, Float, Text, ForeignKey, Date, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
@@ -14,11 +14,21 @@ class WorkoutLog(Base, TimestampMixin):
     """WorkoutLog model for tracking user workouts"""
     
     __tablename__ = "workout_logs"
+    __table_args__ = (
+        # Per-exercise volume and progression queries for one user
+        Index("ix_workout_logs_user_exercise_date", "user_id", "exercise_id", "workout_date"),
+        # Date-range reads for one user; id is included for the daily counts
+        Index("ix_workout_logs_user_date", "user_id", "workout_date", postgresql_include=["id"]),
+    )
     
+    # On PostgreSQL the table is range-partitioned by month on workout_date and the
+    # primary key is (id, workout_date); ids stay unique through the sequence
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     workout_date: Mapped[Date] = mapped_column(Date, nullable=False, index=True)
     exercise_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Assigned from exercise_name on flush (see app.services.exercise_catalog)
+    exercise_id: Mapped[Optional[int]] = mapped_column(ForeignKey("exercises.id"), nullable=True)
     sets: Mapped[int] = mapped_column(Integer, nullable=True)
     reps: Mapped[int] = mapped_column(Integer, nullable=True)
     weight: Mapped[float] = mapped_column(Float, nullable=True)  # in kg or lbs
@@ -27,6 +37,7 @@ class WorkoutLog(Base, TimestampMixin):
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="workout_logs")
+    exercise: Mapped[Optional["Exercise"]] = relationship("Exercise")
     
     def __repr__(self) -> str:
         return f"<WorkoutLog(id={self.id}, user_id={self.user_id}, exercise={self.exercise_name}, date={self.workout_date})>"
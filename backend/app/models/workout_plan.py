@@ -2,7 +2,7 @@
 WorkoutPlan model
 """
 
-from sqlalchemy import String, Integer, Text, ForeignKey, Date, Enum as SQLEnum, JSON
+from sqlalchemy import String, Integer, Text, ForeignKey, Date, Index, Enum as SQLEnum, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 import enum
@@ -23,6 +23,9 @@ class WorkoutPlan(Base, TimestampMixin):
     """WorkoutPlan model for structured workout programs"""
     
     __tablename__ = "workout_plans"
+    __table_args__ = (
+        Index("ix_workout_plans_user_status", "user_id", "status"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -33,11 +36,22 @@ class WorkoutPlan(Base, TimestampMixin):
     status: Mapped[PlanStatus] = mapped_column(SQLEnum(PlanStatus, values_callable=lambda enum_cls: [e.value for e in enum_cls]), default=PlanStatus.ACTIVE, nullable=False)
     duration_weeks: Mapped[int] = mapped_column(Integer, nullable=True)
     
-    # Store workout details as JSON (can be structured later with separate tables)
+    # Store workout details as JSON (can be structured later with separate tables).
+    # Plans assigned from a template hold only their per-client overrides here
     workout_details: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    template_id: Mapped[Optional[int]] = mapped_column(ForeignKey("plan_templates.id"), nullable=True, index=True)
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="workout_plans")
+    # Joined so that responses can resolve the details without another query
+    template: Mapped[Optional["PlanTemplate"]] = relationship("PlanTemplate", lazy="joined")
+    
+    @property
+    def resolved_workout_details(self) -> Optional[dict]:
+        """The template's details with this plan's overrides applied"""
+        if self.template is None:
+            return self.workout_details
+        return self.template.resolve(self.workout_details)
     
     def __repr__(self) -> str:
         return f"<WorkoutPlan(id={self.id}, user_id={self.user_id}, name={self.name}, status={self.status})>"
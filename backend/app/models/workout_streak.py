@@ -0,0 +1,26 @@
+"""
+WorkoutStreak model
+"""
+
+from sqlalchemy import Integer, ForeignKey, Date
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.base import TimestampMixin
+
+
+class WorkoutStreak(Base, TimestampMixin):
+    """Cached streak state per user, advanced as workouts are logged"""
+
+    __tablename__ = "workout_streaks"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # The latest run of consecutive training days; it is only "current"
+    # while last_workout_date is today or yesterday
+    current_start: Mapped[Date] = mapped_column(Date, nullable=False)
+    last_workout_date: Mapped[Date] = mapped_column(Date, nullable=False)
+    current_length: Mapped[int] = mapped_column(Integer, nullable=False)
+    longest_streak: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<WorkoutStreak(user_id={self.user_id}, current={self.current_length}, longest={self.longest_streak})>"
@@ -35,14 +35,22 @@ class TokenData(BaseModel):
     role: Optional[str] = None
 
 
-class UserResponse(BaseModel):
-    """Schema for user response"""
+class UserSummary(BaseModel):
+    """Schema for users in list views: the core columns only"""
     id: int
     email: str
     full_name: str
     role: UserRole
     is_active: bool
     is_verified: bool
+    
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class UserResponse(UserSummary):
+    """Schema for user response"""
     # Common profile fields
     age: Optional[int] = None
     gender: Optional[str] = None
@@ -0,0 +1,14 @@
+"""
+Schemas for autocomplete suggestions
+"""
+
+from typing import Optional
+from pydantic import BaseModel
+
+
+class AutocompleteSuggestion(BaseModel):
+    """Schema for one autocomplete suggestion"""
+    name: str
+    id: Optional[int] = None  # exercise_id or food_id when the name is in the catalog
+    user_uses: int
+    total_uses: int
@@ -4,7 +4,7 @@ Schemas for diet log operations
 
 from datetime import date
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.diet_log import MealType
 
@@ -22,8 +22,20 @@ class DietLogBase(BaseModel):
 
 
 class DietLogCreate(DietLogBase):
-    """Schema for creating a diet log"""
-    pass
+    """Schema for creating a diet log
+    
+    With food_id, food_name and any omitted macros are filled from the
+    food catalog, scaled by servings.
+    """
+    food_name: Optional[str] = Field(None, min_length=1, max_length=255)
+    food_id: Optional[int] = None
+    servings: Optional[float] = Field(None, gt=0)
+    
+    @model_validator(mode="after")
+    def food_name_or_id(self):
+        if self.food_name is None and self.food_id is None:
+            raise ValueError("Either food_name or food_id is required")
+        return self
 
 
 class DietLogUpdate(BaseModel):
@@ -36,12 +48,16 @@ class DietLogUpdate(BaseModel):
     carbs_grams: Optional[float] = Field(None, ge=0)
     fat_grams: Optional[float] = Field(None, ge=0)
     notes: Optional[str] = None
+    food_id: Optional[int] = None
+    servings: Optional[float] = Field(None, gt=0)
 
 
 class DietLogResponse(DietLogBase):
     """Schema for diet log response"""
     id: int
     user_id: int
+    food_id: Optional[int] = None
+    servings: Optional[float] = None
     
     model_config = {
         "from_attributes": True
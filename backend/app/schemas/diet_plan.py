@@ -4,9 +4,10 @@ Schemas for diet plan operations
 
 from datetime import date
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 
 from app.models.workout_plan import PlanStatus
+from app.schemas.plan_template import PlanBulkAssignBase
 
 
 class DietPlanBase(BaseModel):
@@ -23,8 +24,21 @@ class DietPlanBase(BaseModel):
 
 
 class DietPlanCreate(DietPlanBase):
-    """Schema for creating a diet plan"""
+    """Schema for creating a diet plan
+
+    With a template_id, meal_plan_details holds only this client's overrides of the
+    template's details.
+    """
     user_id: int = Field(..., description="ID of the user this plan is for")
+    template_id: Optional[int] = None
+
+
+class DietPlanBulkAssign(PlanBulkAssignBase):
+    """Schema for assigning a diet plan template to many clients"""
+    target_calories: Optional[float] = Field(None, ge=0)
+    target_protein_grams: Optional[float] = Field(None, ge=0)
+    target_carbs_grams: Optional[float] = Field(None, ge=0)
+    target_fat_grams: Optional[float] = Field(None, ge=0)
 
 
 class DietPlanUpdate(BaseModel):
@@ -46,6 +60,9 @@ class DietPlanResponse(DietPlanBase):
     id: int
     user_id: int
     status: PlanStatus
+    template_id: Optional[int] = None
+    # Template details with the plan's overrides applied
+    meal_plan_details: Optional[dict] = Field(None, validation_alias=AliasChoices("resolved_meal_plan_details", "meal_plan_details"))
     
     model_config = {
         "from_attributes": True
@@ -0,0 +1,25 @@
+"""
+Schemas for the exercise catalog
+"""
+
+from typing import List
+from pydantic import BaseModel, Field, field_validator
+
+
+class ExerciseAliasCreate(BaseModel):
+    """Schema for adding an alias to an exercise"""
+    alias: str = Field(..., min_length=1, max_length=255)
+
+    @field_validator("alias")
+    @classmethod
+    def alias_not_blank(cls, value: str) -> str:
+        if not value.strip():
+            raise ValueError("Alias must not be blank")
+        return value
+
+
+class ExerciseResponse(BaseModel):
+    """Schema for a catalog exercise with its aliases"""
+    id: int
+    name: str
+    aliases: List[str] = []
@@ -35,9 +35,16 @@ class FeedbackStatusUpdate(BaseModel):
     status: FeedbackStatus
 
 
+class FeedbackAccepted(BaseModel):
+    """Schema for a feedback submission accepted for asynchronous storage"""
+    submission_id: str
+    status: str = "queued"
+
+
 class FeedbackResponse(FeedbackBase):
     """Schema for feedback response"""
     id: int
+    submission_id: Optional[str] = None
     user_id: Optional[int] = None
     user_agent: Optional[str] = None
     status: FeedbackStatus
@@ -0,0 +1,20 @@
+"""
+Schemas for personal records
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PersonalRecordResponse(BaseModel):
+    """Schema for a user's best results on one exercise"""
+    exercise_id: int
+    exercise_name: str
+    max_weight: Optional[float] = None
+    max_weight_date: Optional[date] = None
+    best_e1rm: Optional[float] = None
+    best_e1rm_date: Optional[date] = None
+    best_volume: Optional[float] = None
+    best_volume_date: Optional[date] = None
+    updated_at: datetime
@@ -0,0 +1,65 @@
+"""
+Schemas for plan templates and bulk plan assignment
+"""
+
+from datetime import date
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.plan_template import PlanType
+
+# One request assigns a plan to at most this many clients
+MAX_BULK_ASSIGN_CLIENTS = 1000
+
+
+class PlanTemplateBase(BaseModel):
+    """Base schema for plan template"""
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    details: Optional[dict] = None
+
+
+class PlanTemplateCreate(PlanTemplateBase):
+    """Schema for creating a plan template"""
+    plan_type: PlanType
+
+
+class PlanTemplateUpdate(BaseModel):
+    """Schema for updating a plan template; changes apply to every plan using it"""
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    details: Optional[dict] = None
+
+
+class PlanTemplateResponse(PlanTemplateBase):
+    """Schema for plan template response"""
+    id: int
+    coach_id: int
+    plan_type: PlanType
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class PlanBulkAssignBase(BaseModel):
+    """Base schema for assigning a template to many clients at once"""
+    template_id: int
+    user_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ASSIGN_CLIENTS)
+    name: Optional[str] = Field(None, min_length=1, max_length=255, description="Defaults to the template's name")
+    description: Optional[str] = None
+    start_date: date
+    end_date: Optional[date] = None
+    overrides: Dict[int, dict] = Field(default_factory=dict, description="Per-client detail overrides by user ID")
+
+    @field_validator("user_ids")
+    @classmethod
+    def unique_user_ids(cls, user_ids: List[int]) -> List[int]:
+        return list(dict.fromkeys(user_ids))
+
+
+class PlanBulkAssignResponse(BaseModel):
+    """Schema for bulk assignment response"""
+    template_id: int
+    created: int
+    plan_ids: List[int]
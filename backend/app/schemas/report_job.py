@@ -0,0 +1,27 @@
+"""
+Schemas for background report jobs
+"""
+
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+from app.models.report_job import ReportJobStatus
+
+
+class ReportJobResponse(BaseModel):
+    """Schema for report job status and result"""
+    id: str
+    kind: str
+    params: dict
+    status: ReportJobStatus
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    model_config = {
+        "from_attributes": True
+    }
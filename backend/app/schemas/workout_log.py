@@ -38,6 +38,7 @@ class WorkoutLogResponse(WorkoutLogBase):
     """Schema for workout log response"""
     id: int
     user_id: int
+    exercise_id: Optional[int] = None
     
     model_config = {
         "from_attributes": True
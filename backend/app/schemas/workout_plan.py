@@ -4,9 +4,10 @@ Schemas for workout plan operations
 
 from datetime import date
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 
 from app.models.workout_plan import PlanStatus
+from app.schemas.plan_template import PlanBulkAssignBase
 
 
 class WorkoutPlanBase(BaseModel):
@@ -20,8 +21,18 @@ class WorkoutPlanBase(BaseModel):
 
 
 class WorkoutPlanCreate(WorkoutPlanBase):
-    """Schema for creating a workout plan"""
+    """Schema for creating a workout plan
+
+    With a template_id, workout_details holds only this client's overrides of the
+    template's details.
+    """
     user_id: int = Field(..., description="ID of the user this plan is for")
+    template_id: Optional[int] = None
+
+
+class WorkoutPlanBulkAssign(PlanBulkAssignBase):
+    """Schema for assigning a workout plan template to many clients"""
+    duration_weeks: Optional[int] = Field(None, ge=1)
 
 
 class WorkoutPlanUpdate(BaseModel):
@@ -40,6 +51,9 @@ class WorkoutPlanResponse(WorkoutPlanBase):
     id: int
     user_id: int
     status: PlanStatus
+    template_id: Optional[int] = None
+    # Template details with the plan's overrides applied
+    workout_details: Optional[dict] = Field(None, validation_alias=AliasChoices("resolved_workout_details", "workout_details"))
     
     model_config = {
         "from_attributes": True
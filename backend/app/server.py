@@ -0,0 +1,179 @@
+"""
+Production server entry point
+
+    python -m app.server
+
+Runs the app under a gunicorn arbiter with uvicorn workers. The worker
+count follows the container's cgroup CPU (and memory) limits rather than
+the host's core count, uvloop/httptools are used when installed, workers
+are recycled after a jittered number of requests, and SIGTERM drains
+in-flight requests before exiting. With SERVER_PRELOAD the app is imported
+once in the arbiter and shared copy-on-write by the forked workers.
+"""
+
+import importlib.util
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+from app.core.config import settings
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Extra time the arbiter grants after the drain for lifespan shutdown (buffer flushes, report jobs)
+SHUTDOWN_HEADROOM_SECONDS = 5
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except (OSError, ValueError):
+        return None
+
+
+def cpu_limit(root: Path = CGROUP_ROOT) -> float:
+    """CPUs available to this process: the cgroup quota or the CPU affinity, whichever is lower
+
+    Args:
+        root: cgroup filesystem mount point
+
+    Returns:
+        Possibly fractional CPU count (a 1.5 CPU quota gives 1.5)
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    quota = period = None
+    cpu_max = _read(root / "cpu.max")
+    if cpu_max:
+        fields = cpu_max.split()
+        if len(fields) == 2 and fields[0] != "max":
+            quota, period = fields
+    else:
+        # cgroup v1: quota is -1 when unlimited
+        quota = _read(root / "cpu" / "cpu.cfs_quota_us") or _read(root / "cpu,cpuacct" / "cpu.cfs_quota_us")
+        period = _read(root / "cpu" / "cpu.cfs_period_us") or _read(root / "cpu,cpuacct" / "cpu.cfs_period_us")
+
+    try:
+        if quota is not None and period is not None and int(quota) > 0 and int(period) > 0:
+            cpus = min(cpus, int(quota) / int(period))
+    except ValueError:
+        pass
+    return cpus
+
+
+def memory_limit_bytes(root: Path = CGROUP_ROOT) -> Optional[int]:
+    """Memory limit of the cgroup, or None when unlimited or unknown"""
+    value = _read(root / "memory.max") or _read(root / "memory" / "memory.limit_in_bytes")
+    if not value or value == "max":
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        return None
+    # cgroup v1 reports "unlimited" as a huge page-aligned number
+    return limit if limit < 1 << 60 else None
+
+
+def worker_count(root: Path = CGROUP_ROOT) -> int:
+    """Number of workers to fork
+
+    SERVER_WORKERS wins when set; otherwise SERVER_WORKERS_PER_CORE per
+    available CPU, rounded up. Either way the count is capped by
+    SERVER_MAX_WORKERS and by how many SERVER_WORKER_MEMORY_MB workers fit
+    in the memory limit.
+    """
+    if settings.SERVER_WORKERS > 0:
+        workers = settings.SERVER_WORKERS
+    else:
+        workers = math.ceil(cpu_limit(root) * settings.SERVER_WORKERS_PER_CORE)
+    if settings.SERVER_MAX_WORKERS > 0:
+        workers = min(workers, settings.SERVER_MAX_WORKERS)
+
+    memory = memory_limit_bytes(root)
+    if memory is not None and settings.SERVER_WORKER_MEMORY_MB > 0:
+        workers = min(workers, memory // (settings.SERVER_WORKER_MEMORY_MB * 1024 * 1024))
+    return max(1, int(workers))
+
+
+def select_loop(preference: str = "auto") -> str:
+    """uvicorn event loop: uvloop when installed, unless configured otherwise"""
+    if preference != "auto":
+        return preference
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def select_http(preference: str = "auto") -> str:
+    """uvicorn HTTP parser: httptools when installed, unless configured otherwise"""
+    if preference != "auto":
+        return preference
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """uvicorn worker using the configured loop, parser and drain timeout"""
+
+    CONFIG_KWARGS = {
+        "loop": select_loop(settings.SERVER_LOOP),
+        "http": select_http(settings.SERVER_HTTP),
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    }
+
+
+def post_fork(server, worker) -> None:
+    """Drop database connections inherited from the arbiter (opened while preloading)"""
+    from app.db.base import engine
+
+    engine.sync_engine.dispose(close=False)
+
+
+def gunicorn_options(root: Path = CGROUP_ROOT) -> dict:
+    """gunicorn settings derived from the SERVER_* settings"""
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": worker_count(root),
+        "worker_class": "app.server.UvicornWorker",
+        # Each worker restarts after max_requests plus up to jitter requests, so they do not all recycle at once
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        # uvicorn drains within SERVER_GRACEFUL_TIMEOUT_SECONDS; the arbiter only kills workers after that
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + SHUTDOWN_HEADROOM_SECONDS,
+        "timeout": settings.SERVER_TIMEOUT_SECONDS,
+        "keepalive": settings.SERVER_KEEPALIVE_SECONDS,
+        "preload_app": settings.SERVER_PRELOAD,
+        "post_fork": post_fork,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+
+
+class Server(BaseApplication):
+    """gunicorn application serving app.main:app"""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+
+        return app
+
+
+def main() -> None:
+    Server(gunicorn_options()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
 
-from app.models.user import User
+from app.models.user import User, full_profile
 from app.schemas.auth import UserSignup, UserLogin, UserWithToken, UserResponse
 from app.core.security import verify_password, get_password_hash, create_access_token
 from app.core.config import settings
@@ -33,7 +33,7 @@ class AuthService:
             HTTPException: If email already exists
         """
         # Check if user already exists
-        result = await db.execute(select(User).where(User.email == user_data.email))
+        result = await db.execute(select(User.id).where(User.email == user_data.email))
         existing_user = result.scalar_one_or_none()
         
         if existing_user:
@@ -55,7 +55,8 @@ class AuthService:
         
         db.add(new_user)
         await db.commit()
-        await db.refresh(new_user)
+        # A refresh would leave the deferred profile columns unloaded
+        new_user = await db.get(User, new_user.id, options=full_profile(), populate_existing=True)
         
         # Create access token
         access_token = create_access_token(
@@ -86,8 +87,8 @@ class AuthService:
         Raises:
             HTTPException: If credentials are invalid
         """
-        # Find user by email
-        result = await db.execute(select(User).where(User.email == login_data.email))
+        # Find user by email; the response carries the full profile
+        result = await db.execute(select(User).options(*full_profile()).where(User.email == login_data.email))
         user = result.scalar_one_or_none()
         
         if not user:
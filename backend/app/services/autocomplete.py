@@ -0,0 +1,264 @@
+"""
+In-memory prefix indexes for exercise and food autocomplete
+
+Each index keeps a sorted list of (token, name key) pairs, one per word
+suffix of every known name, so "pre" matches both "Press" and "Bench
+Press". Lookups bisect that list and rank the matches by the caller's own
+usage first and global usage second, without touching the database.
+
+Indexes are built from the logs at startup and updated in place by the log
+endpoints of this process. Optional periodic rebuilds
+(AUTOCOMPLETE_REFRESH_SECONDS, off by default, jittered per worker) pick up
+writes served by other workers; a rebuild sorts the new index in a thread
+and swaps it in, so the event loop keeps serving requests meanwhile.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, func, literal
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models.exercise import Exercise
+from app.models.food import Food
+from app.models.diet_log import DietLog
+from app.models.workout_log import WorkoutLog
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class _Entry:
+    __slots__ = ("name", "item_id", "uses")
+
+    def __init__(self, name: str, item_id: Optional[int]):
+        self.name = name
+        self.item_id = item_id
+        self.uses = 0
+
+
+MAX_SUGGESTIONS = 25
+# Prefixes matching more tokens than this keep a memoized global top list
+WIDE_PREFIX_TOKENS = 256
+
+
+class PrefixIndex:
+    """Sorted-array prefix index with global and per-user usage counts"""
+
+    def __init__(self):
+        self._tokens: List[tuple] = []
+        self._entries: Dict[str, _Entry] = {}
+        self._user_uses: Dict[int, Dict[str, int]] = defaultdict(dict)
+        # Wide prefix -> its MAX_SUGGESTIONS most used keys
+        self._top: Dict[str, List[str]] = {}
+        self._loading = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _global_rank(self, key: str) -> tuple:
+        return (-self._entries[key].uses, key)
+
+    def _matching_top_prefixes(self, key: str):
+        padded = " " + key
+        return [prefix for prefix in self._top if (" " + prefix) in padded]
+
+    def add(self, name: str, item_id: Optional[int] = None, user_id: Optional[int] = None, uses: int = 1) -> None:
+        """
+        Record uses of a name, adding it to the index if new
+
+        Args:
+            name: Name as displayed
+            item_id: Catalog id (exercise or food) if known
+            user_id: User the uses belong to, if any
+            uses: Number of uses to add (negative to remove)
+        """
+        key = _normalize(name)
+        if not key:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(" ".join(name.split()), item_id)
+            words = key.split(" ")
+            for i in range(len(words)):
+                token = (" ".join(words[i:]), key)
+                if self._loading:
+                    self._tokens.append(token)
+                else:
+                    insort(self._tokens, token)
+        elif item_id is not None:
+            entry.item_id = item_id
+
+        entry.uses = max(entry.uses + uses, 0)
+        if user_id is not None:
+            user_uses = self._user_uses[user_id]
+            count = user_uses.get(key, 0) + uses
+            if count > 0:
+                user_uses[key] = count
+            else:
+                user_uses.pop(key, None)
+
+        if self._top:
+            for prefix in self._matching_top_prefixes(key):
+                if uses < 0:
+                    # Another key may now outrank this one; recompute on demand
+                    del self._top[prefix]
+                    continue
+                top = self._top[prefix]
+                if key not in top:
+                    top.append(key)
+                top.sort(key=self._global_rank)
+                del top[MAX_SUGGESTIONS:]
+
+    def load(self, rows: Iterable[tuple]) -> None:
+        """
+        Bulk add (name, item_id, user_id, uses) rows, sorting tokens once
+
+        Args:
+            rows: Iterable of arguments for add()
+        """
+        self._loading = True
+        try:
+            for row in rows:
+                self.add(*row)
+        finally:
+            self._loading = False
+            self._tokens.sort()
+            self._top.clear()
+
+    def _keys_for(self, prefix: str, user_uses: Dict[str, int]):
+        lo = bisect_left(self._tokens, (prefix,))
+        hi = bisect_left(self._tokens, (prefix + "\uffff",), lo)
+        if hi - lo <= WIDE_PREFIX_TOKENS:
+            return {key for _, key in self._tokens[lo:hi]}
+
+        # Wide prefix: the globally most used keys plus the user's own matches
+        top = self._top.get(prefix)
+        if top is None:
+            top = self._top[prefix] = heapq.nsmallest(
+                MAX_SUGGESTIONS,
+                {key for _, key in self._tokens[lo:hi]},
+                key=self._global_rank,
+            )
+        needle = " " + prefix
+        return set(top).union(key for key in user_uses if needle in " " + key)
+
+    def search(self, prefix: str, user_id: Optional[int] = None, limit: int = 10) -> List[dict]:
+        """
+        Find names with a word starting with prefix, best ranked first
+
+        Args:
+            prefix: Text typed so far
+            user_id: Rank this user's own names first
+            limit: Maximum number of suggestions (up to MAX_SUGGESTIONS)
+
+        Returns:
+            List of dictionaries with name, id and the user's and global use counts
+        """
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+
+        user_uses = self._user_uses.get(user_id, {}) if user_id is not None else {}
+        entries = self._entries
+        best = heapq.nsmallest(
+            min(limit, MAX_SUGGESTIONS),
+            self._keys_for(prefix, user_uses),
+            key=lambda key: (-user_uses.get(key, 0), -entries[key].uses, key),
+        )
+        return [
+            {
+                "name": entries[key].name,
+                "id": entries[key].item_id,
+                "user_uses": user_uses.get(key, 0),
+                "total_uses": entries[key].uses,
+            }
+            for key in best
+        ]
+
+
+async def _exercise_rows(session) -> List[tuple]:
+    catalog = await session.execute(select(Exercise.name, Exercise.id, literal(None), literal(0)))
+    usage = await session.execute(
+        select(Exercise.name, Exercise.id, WorkoutLog.user_id, func.count(WorkoutLog.id))
+        .join(Exercise, WorkoutLog.exercise_id == Exercise.id)
+        .group_by(Exercise.id, Exercise.name, WorkoutLog.user_id)
+    )
+    return catalog.all() + usage.all()
+
+
+async def _food_rows(session) -> List[tuple]:
+    catalog = await session.execute(select(Food.name, Food.id, literal(None), literal(0)))
+    usage = await session.execute(
+        select(DietLog.food_name, literal(None), DietLog.user_id, func.count(DietLog.id))
+        .group_by(DietLog.food_name, DietLog.user_id)
+    )
+    return catalog.all() + usage.all()
+
+
+def _index_from(rows: List[tuple]) -> PrefixIndex:
+    index = PrefixIndex()
+    index.load(rows)
+    return index
+
+
+class AutocompleteService:
+    """Holds the exercise and food indexes of this process"""
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        # Builds run outside of any request, so they open their own sessions
+        self.session_factory = AsyncSessionLocal
+        self.exercises = PrefixIndex()
+        self.foods = PrefixIndex()
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def build(self) -> None:
+        """Rebuild both indexes from the database and swap them in"""
+        async with self.session_factory() as session:
+            exercise_rows = await _exercise_rows(session)
+            food_rows = await _food_rows(session)
+        # Loading hundreds of thousands of rows takes the better part of a second:
+        # keep it off the event loop. The new indexes are private until swapped in.
+        exercises = await asyncio.to_thread(_index_from, exercise_rows)
+        foods = await asyncio.to_thread(_index_from, food_rows)
+        self.exercises, self.foods = exercises, foods
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            # Jittered so that the workers of a server do not all rebuild at once
+            await asyncio.sleep(self.refresh_seconds * random.uniform(0.75, 1.25))
+            try:
+                await self.build()
+            except Exception:
+                logger.exception("Failed to rebuild autocomplete indexes")
+
+    async def start(self) -> None:
+        """Schedule periodic rebuilds and build the indexes (application startup)"""
+        if self.refresh_seconds > 0 and self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_forever())
+        await self.build()
+
+    def stop(self) -> None:
+        """Cancel periodic rebuilds"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+        self._refresher = None
+
+    def reset(self) -> None:
+        """Stop rebuilding and empty both indexes"""
+        self.stop()
+        self.exercises = PrefixIndex()
+        self.foods = PrefixIndex()
+
+
+autocomplete = AutocompleteService(refresh_seconds=settings.AUTOCOMPLETE_REFRESH_SECONDS)
@@ -0,0 +1,142 @@
+"""
+Exercise catalog with an in-process name-to-id intern cache
+
+Workout logs keep the exercise name as typed, but aggregate queries group
+on ``exercise_id``. A ``before_flush`` hook resolves the id for every new or
+renamed WorkoutLog, so callers never set it themselves. Names are matched
+after normalization (case and whitespace) against canonical names and
+aliases; unknown names create a new catalog entry. Resolved ids are cached
+per process so repeated names cost no query, and ids of entries created in
+a transaction are only cached once that transaction commits.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.exercise import Exercise, ExerciseAlias
+from app.models.workout_log import WorkoutLog
+
+
+def normalize_exercise_name(name: str) -> str:
+    """Lowercase and collapse whitespace so spelling variants share one key"""
+    return " ".join(name.split()).casefold()
+
+
+def display_exercise_name(name: str) -> str:
+    """Trim and collapse whitespace while keeping the user's capitalization"""
+    return " ".join(name.split())
+
+
+class ExerciseCatalog:
+    """Resolves exercise names to catalog ids with a bounded LRU cache"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+
+    def _remember(self, key: str, exercise_id: int) -> None:
+        self._ids[key] = exercise_id
+        self._ids.move_to_end(key)
+        while len(self._ids) > self.max_entries:
+            self._ids.popitem(last=False)
+
+    def _query(self, session: Session, key: str) -> Optional[int]:
+        return session.execute(
+            select(Exercise.id)
+            .outerjoin(ExerciseAlias, ExerciseAlias.exercise_id == Exercise.id)
+            .where(or_(Exercise.normalized_name == key, ExerciseAlias.alias == key))
+            .limit(1)
+        ).scalar()
+
+    def lookup(self, session: Session, name: str) -> Optional[int]:
+        """
+        Find the id for an exercise name without creating it
+
+        Args:
+            session: Synchronous ORM session (``AsyncSession.sync_session``)
+            name: Exercise name or alias in any spelling
+
+        Returns:
+            The exercise id, or None if the name is unknown
+        """
+        key = normalize_exercise_name(name)
+        exercise_id = self._ids.get(key)
+        if exercise_id is not None:
+            self._ids.move_to_end(key)
+            metrics.increment("exercise_cache_hits_total")
+            return exercise_id
+
+        metrics.increment("exercise_cache_misses_total")
+        exercise_id = self._query(session, key)
+        if exercise_id is not None:
+            self._remember(key, exercise_id)
+        return exercise_id
+
+    def intern(self, session: Session, name: str) -> int:
+        """
+        Return the id for an exercise name, adding it to the catalog if new
+
+        Args:
+            session: Synchronous ORM session (``AsyncSession.sync_session``)
+            name: Exercise name or alias in any spelling
+
+        Returns:
+            The exercise id
+        """
+        exercise_id = self.lookup(session, name)
+        if exercise_id is not None:
+            return exercise_id
+
+        key = normalize_exercise_name(name)
+        pending = session.info.setdefault("pending_exercises", {})
+        if key in pending:
+            return pending[key]
+
+        insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+        # A concurrent writer may add the same name first; keep its row
+        session.execute(
+            insert(Exercise.__table__)
+            .values(name=display_exercise_name(name), normalized_name=key)
+            .on_conflict_do_nothing(index_elements=["normalized_name"])
+        )
+        exercise_id = self._query(session, key)
+        pending[key] = exercise_id
+        return exercise_id
+
+    async def resolve(self, db, name: str) -> Optional[int]:
+        """Async wrapper around lookup for use in endpoints"""
+        return await db.run_sync(lambda session: self.lookup(session, name))
+
+    def clear(self) -> None:
+        """Forget all cached ids"""
+        self._ids.clear()
+
+
+exercise_catalog = ExerciseCatalog(max_entries=settings.EXERCISE_CACHE_MAX_ENTRIES)
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_exercise_ids(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, WorkoutLog) or not obj.exercise_name:
+            continue
+        if obj.exercise_id is None or inspect(obj).attrs.exercise_name.history.has_changes():
+            obj.exercise_id = exercise_catalog.intern(session, obj.exercise_name)
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_committed_exercises(session):
+    for key, exercise_id in session.info.pop("pending_exercises", {}).items():
+        exercise_catalog._remember(key, exercise_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_exercises(session):
+    session.info.pop("pending_exercises", None)
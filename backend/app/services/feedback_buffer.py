@@ -0,0 +1,151 @@
+"""
+Write-behind buffer for feedback submissions
+
+Submissions are queued in a bounded in-process queue and a background
+flusher batch-inserts them every FEEDBACK_BUFFER_FLUSH_INTERVAL_MS or
+FEEDBACK_BUFFER_BATCH_SIZE rows, whichever comes first. When the queue is
+full, submitters wait up to FEEDBACK_BUFFER_ENQUEUE_TIMEOUT_MS before being
+rejected so the API can answer with 503 instead of piling up work.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.base import AsyncSessionLocal
+from app.models.feedback import Feedback
+
+logger = logging.getLogger(__name__)
+
+
+class FeedbackBufferFull(Exception):
+    """Raised when the buffer stays full for longer than the enqueue timeout"""
+
+
+class FeedbackBuffer:
+    """Bounded queue with a background batch flusher for Feedback rows"""
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval_ms: int, enqueue_timeout_ms: int):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        # Flushes run outside of any request, so they open their own sessions
+        self.session_factory = AsyncSessionLocal
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def _ensure_started(self) -> asyncio.Queue:
+        # Started lazily so the queue and task bind to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+        return self._queue
+
+    @property
+    def pending(self) -> int:
+        """Number of submissions waiting to be written"""
+        return self._queue.qsize() if self._queue else 0
+
+    async def submit(self, row: dict) -> None:
+        """
+        Queue a feedback row for insertion
+
+        Args:
+            row: Column values for a Feedback row
+
+        Raises:
+            FeedbackBufferFull: If no space frees up within the enqueue timeout
+        """
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(queue.put(row), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                metrics.increment("feedback_buffer_rejected_total")
+                raise FeedbackBufferFull()
+        metrics.increment("feedback_buffer_enqueued_total")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._write(batch)
+
+    async def _insert(self, rows: List[dict]) -> None:
+        async with self.session_factory() as session:
+            await session.execute(insert(Feedback), rows)
+            await session.commit()
+
+    async def _write(self, batch: List[dict]) -> None:
+        try:
+            try:
+                await self._insert(batch)
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                # Submitters were already told 202; retry row by row so one bad
+                # row does not take the rest of the batch down with it
+                logger.warning("Batch insert of %d feedback rows failed; retrying row by row", len(batch), exc_info=True)
+                await self._write_rows(batch)
+            else:
+                metrics.increment("feedback_buffer_flushed_total", len(batch))
+                metrics.increment("feedback_buffer_batches_total")
+        except Exception:
+            metrics.increment("feedback_buffer_dropped_total", len(batch))
+            logger.exception("Failed to write %d buffered feedback rows", len(batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _write_rows(self, batch: List[dict]) -> None:
+        for row in batch:
+            try:
+                await self._insert([row])
+            except Exception:
+                metrics.increment("feedback_buffer_dropped_total")
+                logger.exception("Dropped buffered feedback row %s", row.get("submission_id"))
+            else:
+                metrics.increment("feedback_buffer_flushed_total")
+
+    async def flush(self) -> None:
+        """Wait until every queued submission has been written"""
+        if self._queue is not None and self._flusher is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Flush remaining submissions and stop the flusher (graceful shutdown)"""
+        await self.flush()
+        self.reset()
+
+    def reset(self) -> None:
+        """Stop the flusher and drop loop-bound state"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+        self._flusher = None
+        self._queue = None
+
+
+feedback_buffer = FeedbackBuffer(
+    max_size=settings.FEEDBACK_BUFFER_MAX_SIZE,
+    batch_size=settings.FEEDBACK_BUFFER_BATCH_SIZE,
+    flush_interval_ms=settings.FEEDBACK_BUFFER_FLUSH_INTERVAL_MS,
+    enqueue_timeout_ms=settings.FEEDBACK_BUFFER_ENQUEUE_TIMEOUT_MS,
+)
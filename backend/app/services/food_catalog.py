@@ -0,0 +1,204 @@
+"""
+Food catalog: cached nutrition lookup and streamed CSV import
+
+Diet log writes that reference a catalog food read its per-serving macros
+through a per-process LRU cache of hot foods. Catalog imports stream the
+uploaded CSV row by row and upsert it in batches, invalidating cached
+entries for the foods they touch. That only reaches the worker that ran the
+import, so entries also expire after FOOD_CACHE_TTL_SECONDS and the other
+workers pick up the change within that time.
+"""
+
+import csv
+import io
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.food import Food
+
+NUTRIENT_FIELDS = ("calories", "protein_grams", "carbs_grams", "fat_grams")
+MAX_REPORTED_ERRORS = 20
+
+
+def normalize_food_name(name: str) -> str:
+    """Lowercase and collapse whitespace so spelling variants share one key"""
+    return " ".join(name.split()).casefold()
+
+
+class FoodCatalog:
+    """Per-process LRU cache of catalog foods keyed by id"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # food id -> (food, monotonic expiry)
+        self._foods: "OrderedDict[int, Tuple[dict, float]]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, food_id: int) -> Optional[dict]:
+        """
+        Get a food's name and per-serving nutrition
+
+        Args:
+            db: Database session
+            food_id: Catalog food id
+
+        Returns:
+            Dictionary with name, serving_size and nutrient fields, or None
+        """
+        entry = self._foods.get(food_id)
+        if entry is not None:
+            food, expires = entry
+            if time.monotonic() < expires:
+                self._foods.move_to_end(food_id)
+                metrics.increment("food_cache_hits_total")
+                return food
+            del self._foods[food_id]
+
+        metrics.increment("food_cache_misses_total")
+        row = (await db.execute(
+            select(Food.name, Food.serving_size, *(getattr(Food, field) for field in NUTRIENT_FIELDS))
+            .where(Food.id == food_id)
+        )).one_or_none()
+        if row is None:
+            return None
+
+        food = dict(row._mapping)
+        self._foods[food_id] = (food, time.monotonic() + self.ttl)
+        while len(self._foods) > self.max_entries:
+            self._foods.popitem(last=False)
+        return food
+
+    def invalidate(self, food_ids) -> None:
+        """Drop cached entries for the given food ids"""
+        for food_id in food_ids:
+            self._foods.pop(food_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._foods.clear()
+
+
+food_catalog = FoodCatalog(max_entries=settings.FOOD_CACHE_MAX_ENTRIES, ttl=settings.FOOD_CACHE_TTL_SECONDS)
+
+
+def fill_nutrition(values: Dict, food: dict, servings: Optional[float]) -> Dict:
+    """
+    Fill nutrient fields that were not given from the food's per-serving values
+
+    Args:
+        values: Diet log column values; explicitly provided nutrients are kept
+        food: Catalog food as returned by FoodCatalog.get
+        servings: Number of servings eaten (defaults to one)
+
+    Returns:
+        The updated values
+    """
+    multiplier = servings if servings is not None else 1.0
+    for field in NUTRIENT_FIELDS:
+        if values.get(field) is None and food[field] is not None:
+            values[field] = round(food[field] * multiplier, 2)
+    if not values.get("food_name"):
+        values["food_name"] = food["name"]
+    return values
+
+
+def _parse_row(row: Dict[str, str]) -> dict:
+    name = " ".join((row.get("name") or "").split())
+    if not name:
+        raise ValueError("name is required")
+    if len(name) > 255:
+        raise ValueError("name is longer than 255 characters")
+
+    food = {
+        "name": name,
+        "normalized_name": normalize_food_name(name),
+        "serving_size": (row.get("serving_size") or "").strip()[:100] or None,
+    }
+    for field in NUTRIENT_FIELDS:
+        raw = (row.get(field) or "").strip()
+        if not raw:
+            food[field] = None
+            continue
+        try:
+            food[field] = float(raw)
+        except ValueError:
+            raise ValueError(f"{field} is not a number")
+        if food[field] < 0:
+            raise ValueError(f"{field} must not be negative")
+    return food
+
+
+async def _upsert(db: AsyncSession, batch: List[dict]) -> None:
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Food.__table__).values(batch)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["normalized_name"],
+        set_={
+            field: stmt.excluded[field]
+            for field in ("name", "serving_size", *NUTRIENT_FIELDS, "updated_at")
+        },
+    ).returning(Food.id)
+    food_catalog.invalidate((await db.execute(stmt)).scalars().all())
+
+
+async def import_foods_csv(db: AsyncSession, file: BinaryIO, batch_size: int) -> dict:
+    """
+    Stream a CSV of foods into the catalog with batched upserts
+
+    The file needs a ``name`` column and may have ``serving_size``,
+    ``calories``, ``protein_grams``, ``carbs_grams`` and ``fat_grams``.
+    Rows are parsed one at a time and written every batch_size rows, so
+    memory stays bounded regardless of file size. Existing foods with the
+    same normalized name are updated.
+
+    Args:
+        db: Database session
+        file: Binary file object positioned at the start of the CSV
+        batch_size: Rows per multi-row INSERT
+
+    Returns:
+        Dictionary with imported and rejected counts and the first errors
+
+    Raises:
+        ValueError: If the header is missing or the file is not UTF-8
+        csv.Error: If the file is not valid CSV
+    """
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    if not reader.fieldnames or "name" not in reader.fieldnames:
+        raise ValueError("CSV must have a header row with a 'name' column")
+
+    imported = 0
+    rejected = 0
+    errors = []
+    # Keyed by normalized name: one statement cannot upsert the same row twice
+    batch: Dict[str, dict] = {}
+
+    for row in reader:
+        try:
+            food = _parse_row(row)
+        except ValueError as exc:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": reader.line_num, "error": str(exc)})
+            continue
+
+        batch[food["normalized_name"]] = food
+        imported += 1
+        if len(batch) >= batch_size:
+            await _upsert(db, list(batch.values()))
+            batch.clear()
+
+    if batch:
+        await _upsert(db, list(batch.values()))
+    await db.commit()
+
+    return {"imported": imported, "rejected": rejected, "errors": errors}
+
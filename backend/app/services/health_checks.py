@@ -0,0 +1,137 @@
+"""
+Dependency health probes for the deep health check
+
+Each probe measures one dependency and grades it "ok", "degraded" (slower
+or fuller than its configured threshold) or "down". The overall status is
+"down" when the database is down, "degraded" when any probe is not "ok",
+and "ok" otherwise; a down Redis only degrades, as no request path needs it.
+Probes run concurrently, each bounded by HEALTH_CHECK_TIMEOUT_SECONDS.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import get_redis
+from app.db.base import engine
+
+
+def _grade(value: float, threshold: float) -> str:
+    return "degraded" if value > threshold else "ok"
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+class HealthChecker:
+    """Runs the dependency probes of this worker"""
+
+    def __init__(self):
+        # Probes run outside of request scope with their own connections
+        self.engine = engine
+        # Returns the Redis client to ping, or None to skip the Redis probe
+        self.redis_factory: Optional[Callable] = get_redis if settings.HEALTH_CHECK_REDIS else None
+
+    async def check_database(self) -> dict:
+        """Time acquiring a pooled connection and a SELECT 1 round trip"""
+        started = time.perf_counter()
+        timings = {}
+
+        async def probe():
+            async with self.engine.connect() as conn:
+                timings["acquire_ms"] = _elapsed_ms(started)
+                query_started = time.perf_counter()
+                await conn.execute(text("SELECT 1"))
+                timings["query_ms"] = _elapsed_ms(query_started)
+
+        try:
+            await asyncio.wait_for(probe(), settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+        except Exception as exc:
+            return {"status": "down", "error": exc.__class__.__name__, "latency_ms": _elapsed_ms(started)}
+
+        latency_ms = _elapsed_ms(started)
+        metrics.set_gauge("health_db_latency_ms", latency_ms)
+        return {
+            "status": _grade(latency_ms, settings.HEALTH_DB_LATENCY_DEGRADED_MS),
+            "latency_ms": latency_ms,
+            **timings,
+        }
+
+    def check_pool(self) -> dict:
+        """Share of the pool's connections (including overflow) checked out"""
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+            # Static and null pools have no capacity to saturate
+            return {"status": "ok", "pool": pool.__class__.__name__}
+
+        capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        checked_out = pool.checkedout()
+        saturation = round(checked_out / capacity, 3) if capacity else 0.0
+        metrics.set_gauge("health_pool_saturation", saturation)
+        return {
+            "status": "degraded" if saturation >= settings.HEALTH_POOL_SATURATION_DEGRADED else "ok",
+            "pool": pool.__class__.__name__,
+            "size": pool.size(),
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "capacity": capacity,
+            "saturation": saturation,
+        }
+
+    async def check_redis(self) -> dict:
+        """Time a PING, when Redis checks are enabled"""
+        if self.redis_factory is None:
+            return {"status": "disabled"}
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.redis_factory().ping(), settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+        except Exception as exc:
+            return {"status": "down", "error": exc.__class__.__name__, "latency_ms": _elapsed_ms(started)}
+
+        latency_ms = _elapsed_ms(started)
+        metrics.set_gauge("health_redis_latency_ms", latency_ms)
+        return {"status": _grade(latency_ms, settings.HEALTH_REDIS_LATENCY_DEGRADED_MS), "latency_ms": latency_ms}
+
+    async def check_event_loop(self, interval: float = 0.01) -> dict:
+        """How late a short sleep wakes up: time the loop spends on other work"""
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag_ms = round(max(time.perf_counter() - started - interval, 0.0) * 1000, 2)
+        metrics.set_gauge("health_event_loop_lag_ms", lag_ms)
+        return {"status": _grade(lag_ms, settings.HEALTH_LOOP_LAG_DEGRADED_MS), "lag_ms": lag_ms}
+
+    async def run(self) -> dict:
+        """Run every probe and grade the overall status"""
+        started = time.perf_counter()
+        database, redis, event_loop = await asyncio.gather(
+            self.check_database(), self.check_redis(), self.check_event_loop()
+        )
+        checks: Dict[str, dict] = {
+            "database": database,
+            "pool": self.check_pool(),
+            "redis": redis,
+            "event_loop": event_loop,
+        }
+
+        if database["status"] == "down":
+            status = "down"
+        elif any(check["status"] in ("degraded", "down") for check in checks.values()):
+            status = "degraded"
+        else:
+            status = "ok"
+        metrics.increment("health_checks_total", status=status)
+        return {
+            "status": status,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": _elapsed_ms(started),
+            "checks": checks,
+        }
+
+
+health_checker = HealthChecker()
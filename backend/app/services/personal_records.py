@@ -0,0 +1,274 @@
+"""
+Personal records per user and exercise
+
+Max weight, best estimated one-rep max (Epley) and best single-log volume
+are stored in ``personal_records`` and updated in the same transaction as
+the workout log write. A new or edited log is only compared against the
+stored record; when the log holding a record is edited or deleted, just
+that exercise is recomputed from the user's logs. ``backfill`` rebuilds
+the table from existing history.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete, insert, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.exercise import Exercise
+from app.models.personal_record import PersonalRecord
+from app.models.workout_log import WorkoutLog
+
+RECORD_FIELDS = ("max_weight", "best_e1rm", "best_volume")
+
+# Record field -> (value, date, log id) of the log holding it
+RecordState = Dict[str, Tuple[float, date, int]]
+
+
+def estimate_one_rep_max(weight: Optional[float], reps: Optional[int]) -> Optional[float]:
+    """Epley estimate of the one-rep max, or None without weight and reps"""
+    if not weight or not reps:
+        return None
+    if reps == 1:
+        return weight
+    return round(weight * (1 + reps / 30), 2)
+
+
+def log_metrics(weight: Optional[float], reps: Optional[int], sets: Optional[int]) -> Dict[str, Optional[float]]:
+    """Record candidates of one workout log; a missing set count means one set"""
+    return {
+        "max_weight": weight or None,
+        "best_e1rm": estimate_one_rep_max(weight, reps),
+        "best_volume": weight * reps * (sets or 1) if weight and reps else None,
+    }
+
+
+def _improve(state: RecordState, log_id: int, log_date: date, metrics: Dict[str, Optional[float]]) -> bool:
+    # Ties go to the earlier log, which is when the record was first set
+    changed = False
+    for field, value in metrics.items():
+        if value is None:
+            continue
+        current = state.get(field)
+        if current is None or value > current[0] or (value == current[0] and log_date < current[1]):
+            state[field] = (value, log_date, log_id)
+            changed = True
+    return changed
+
+
+def _state(record: PersonalRecord) -> RecordState:
+    return {
+        field: (getattr(record, field), getattr(record, f"{field}_date"), getattr(record, f"{field}_log_id"))
+        for field in RECORD_FIELDS
+        if getattr(record, field) is not None
+    }
+
+
+def _columns(state: RecordState) -> dict:
+    values = {}
+    for field in RECORD_FIELDS:
+        value, log_date, log_id = state.get(field, (None, None, None))
+        values.update({field: value, f"{field}_date": log_date, f"{field}_log_id": log_id})
+    return values
+
+
+async def _locked_record(db: AsyncSession, user_id: int, exercise_id: int) -> PersonalRecord:
+    # Create the row if needed, then lock it so concurrent writes for the
+    # same exercise apply one after the other (FOR UPDATE is a no-op on SQLite)
+    insert_ = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    await db.execute(
+        insert_(PersonalRecord.__table__)
+        .values(user_id=user_id, exercise_id=exercise_id)
+        .on_conflict_do_nothing(index_elements=["user_id", "exercise_id"])
+    )
+    result = await db.execute(
+        select(PersonalRecord)
+        .where(and_(PersonalRecord.user_id == user_id, PersonalRecord.exercise_id == exercise_id))
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def _holds_record(db: AsyncSession, user_id: int, exercise_id: int, log_id: int) -> bool:
+    result = await db.execute(
+        select(PersonalRecord.id).where(
+            and_(
+                PersonalRecord.user_id == user_id,
+                PersonalRecord.exercise_id == exercise_id,
+                or_(*(getattr(PersonalRecord, f"{field}_log_id") == log_id for field in RECORD_FIELDS)),
+            )
+        )
+    )
+    return result.first() is not None
+
+
+class PersonalRecordService:
+    """Service class for maintaining and reading personal records"""
+
+    @staticmethod
+    async def record_log(db: AsyncSession, log: WorkoutLog) -> None:
+        """
+        Raise the user's records for the log's exercise if the log beats them
+
+        The log must be flushed so its id and exercise_id are assigned.
+
+        Args:
+            db: Database session (the caller commits)
+            log: New or edited workout log
+        """
+        metrics = log_metrics(log.weight, log.reps, log.sets)
+        if all(value is None for value in metrics.values()):
+            return
+        record = await _locked_record(db, log.user_id, log.exercise_id)
+        state = _state(record)
+        if _improve(state, log.id, log.workout_date, metrics):
+            for column, value in _columns(state).items():
+                setattr(record, column, value)
+
+    @staticmethod
+    async def recompute(db: AsyncSession, user_id: int, exercise_id: int) -> None:
+        """
+        Rebuild one exercise's records from the user's workout logs
+
+        Args:
+            db: Database session (the caller commits)
+            user_id: User ID
+            exercise_id: Exercise ID
+        """
+        record = await _locked_record(db, user_id, exercise_id)
+        result = await db.execute(
+            select(WorkoutLog.id, WorkoutLog.workout_date, WorkoutLog.weight, WorkoutLog.reps, WorkoutLog.sets)
+            .where(
+                and_(
+                    WorkoutLog.user_id == user_id,
+                    WorkoutLog.exercise_id == exercise_id,
+                    WorkoutLog.weight.is_not(None),
+                )
+            )
+        )
+        state: RecordState = {}
+        for row in result:
+            _improve(state, row.id, row.workout_date, log_metrics(row.weight, row.reps, row.sets))
+
+        if not state:
+            await db.delete(record)
+            return
+        for column, value in _columns(state).items():
+            setattr(record, column, value)
+
+    @staticmethod
+    async def log_updated(db: AsyncSession, log: WorkoutLog, previous_exercise_id: int) -> None:
+        """
+        Update records after a workout log was edited and flushed
+
+        Args:
+            db: Database session (the caller commits)
+            log: Edited workout log
+            previous_exercise_id: Exercise the log belonged to before the edit
+        """
+        if previous_exercise_id != log.exercise_id:
+            if await _holds_record(db, log.user_id, previous_exercise_id, log.id):
+                await PersonalRecordService.recompute(db, log.user_id, previous_exercise_id)
+            await PersonalRecordService.record_log(db, log)
+        elif await _holds_record(db, log.user_id, log.exercise_id, log.id):
+            await PersonalRecordService.recompute(db, log.user_id, log.exercise_id)
+        else:
+            await PersonalRecordService.record_log(db, log)
+
+    @staticmethod
+    async def log_deleted(db: AsyncSession, user_id: int, exercise_id: int, log_id: int) -> None:
+        """
+        Update records after a workout log was deleted and flushed
+
+        Args:
+            db: Database session (the caller commits)
+            user_id: Owner of the deleted log
+            exercise_id: Exercise of the deleted log
+            log_id: ID of the deleted log
+        """
+        if await _holds_record(db, user_id, exercise_id, log_id):
+            await PersonalRecordService.recompute(db, user_id, exercise_id)
+
+    @staticmethod
+    async def get_records(db: AsyncSession, user_id: int) -> List[dict]:
+        """
+        Get a user's personal records ordered by exercise name
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            One dict per exercise with the record values and dates
+        """
+        result = await db.execute(
+            select(PersonalRecord, Exercise.name)
+            .join(Exercise, Exercise.id == PersonalRecord.exercise_id)
+            .where(PersonalRecord.user_id == user_id)
+            .order_by(Exercise.name)
+        )
+        return [
+            {
+                "exercise_id": record.exercise_id,
+                "exercise_name": name,
+                **{field: getattr(record, field) for field in RECORD_FIELDS},
+                **{f"{field}_date": getattr(record, f"{field}_date") for field in RECORD_FIELDS},
+                "updated_at": record.updated_at,
+            }
+            for record, name in result.all()
+        ]
+
+    @staticmethod
+    async def backfill(db: AsyncSession, user_id: Optional[int] = None, batch_size: int = 1000) -> int:
+        """
+        Rebuild personal records from existing workout history
+
+        Logs are streamed in (user, exercise) order so memory stays bounded
+        by the batch size, and records are inserted in batches.
+
+        Args:
+            db: Database session (the caller commits)
+            user_id: Only rebuild this user's records
+            batch_size: Logs fetched and records inserted per round trip
+
+        Returns:
+            Number of records written
+        """
+        log_scope, record_scope = [], []
+        if user_id is not None:
+            log_scope.append(WorkoutLog.user_id == user_id)
+            record_scope.append(PersonalRecord.user_id == user_id)
+        await db.execute(delete(PersonalRecord).where(*record_scope))
+
+        stream = await db.stream(
+            select(
+                WorkoutLog.user_id, WorkoutLog.exercise_id, WorkoutLog.id,
+                WorkoutLog.workout_date, WorkoutLog.weight, WorkoutLog.reps, WorkoutLog.sets,
+            )
+            .where(and_(WorkoutLog.weight.is_not(None), WorkoutLog.exercise_id.is_not(None), *log_scope))
+            .order_by(WorkoutLog.user_id, WorkoutLog.exercise_id)
+            .execution_options(yield_per=batch_size)
+        )
+        key: Optional[Tuple[int, int]] = None
+        state: RecordState = {}
+        pending: List[dict] = []
+        written = 0
+        async for row in stream:
+            if (row.user_id, row.exercise_id) != key:
+                if state:
+                    pending.append({"user_id": key[0], "exercise_id": key[1], **_columns(state)})
+                key, state = (row.user_id, row.exercise_id), {}
+            _improve(state, row.id, row.workout_date, log_metrics(row.weight, row.reps, row.sets))
+            if len(pending) >= batch_size:
+                await db.execute(insert(PersonalRecord), pending)
+                written += len(pending)
+                pending = []
+        if state:
+            pending.append({"user_id": key[0], "exercise_id": key[1], **_columns(state)})
+        if pending:
+            await db.execute(insert(PersonalRecord), pending)
+            written += len(pending)
+        return written
@@ -0,0 +1,120 @@
+"""
+Progress service layer shared by the client and coach progress endpoints
+"""
+
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+
+from app.models.workout_log import WorkoutLog
+from app.models.diet_log import DietLog
+from app.models.workout_plan import WorkoutPlan, PlanStatus
+from app.models.diet_plan import DietPlan
+from app.services.streak_service import StreakService
+
+
+def _count(column, *conditions):
+    return select(func.count(column)).where(and_(*conditions)).scalar_subquery()
+
+
+def _change(current: int, previous: int) -> dict:
+    return {
+        "absolute": current - previous,
+        "percent": round((current - previous) / previous * 100, 1) if previous else None,
+    }
+
+
+class ProgressService:
+    """Service class for client progress metrics"""
+
+    @staticmethod
+    async def get_progress(
+        db: AsyncSession,
+        user_id: int,
+        days: int = 30,
+        compare: bool = False,
+        today: Optional[date] = None,
+    ) -> dict:
+        """
+        Compute a client's progress metrics in a single statement
+
+        Every count is a scalar subquery of one SELECT, so the window
+        length and the prior-period comparison do not add round-trips.
+        Streaks come from StreakService.
+
+        Args:
+            db: Database session
+            user_id: Client whose progress is computed
+            days: Length of the window ending today
+            compare: Also count the preceding window of the same length
+            today: Reference date (defaults to date.today())
+
+        Returns:
+            Dictionary with window counts, active plans, streaks and optional comparison
+        """
+        today = today or date.today()
+        start = today - timedelta(days=days)
+        previous_start = start - timedelta(days=days)
+
+        columns = [
+            _count(WorkoutLog.id, WorkoutLog.user_id == user_id, WorkoutLog.workout_date >= start)
+            .label("workout_sessions"),
+            _count(DietLog.id, DietLog.user_id == user_id, DietLog.meal_date >= start)
+            .label("diet_logs"),
+            _count(WorkoutPlan.id, WorkoutPlan.user_id == user_id, WorkoutPlan.status == PlanStatus.ACTIVE)
+            .label("workout_plans"),
+            _count(DietPlan.id, DietPlan.user_id == user_id, DietPlan.status == PlanStatus.ACTIVE)
+            .label("diet_plans"),
+        ]
+        if compare:
+            columns += [
+                _count(
+                    WorkoutLog.id,
+                    WorkoutLog.user_id == user_id,
+                    WorkoutLog.workout_date >= previous_start,
+                    WorkoutLog.workout_date < start,
+                ).label("previous_workout_sessions"),
+                _count(
+                    DietLog.id,
+                    DietLog.user_id == user_id,
+                    DietLog.meal_date >= previous_start,
+                    DietLog.meal_date < start,
+                ).label("previous_diet_logs"),
+            ]
+
+        row = (await db.execute(select(*columns))).one()
+
+        window = {
+            "workout_sessions": row.workout_sessions or 0,
+            "diet_logs": row.diet_logs or 0,
+        }
+        progress = {
+            "window": {
+                "days": days,
+                "start_date": start.isoformat(),
+                "end_date": today.isoformat(),
+            },
+            f"last_{days}_days": window,
+            "active_plans": {
+                "workout_plans": row.workout_plans or 0,
+                "diet_plans": row.diet_plans or 0,
+            },
+            "streaks": (await StreakService.get_streaks(db, [user_id], today))[user_id],
+        }
+
+        if compare:
+            previous = {
+                "workout_sessions": row.previous_workout_sessions or 0,
+                "diet_logs": row.previous_diet_logs or 0,
+            }
+            progress["previous_period"] = {
+                "start_date": previous_start.isoformat(),
+                "end_date": (start - timedelta(days=1)).isoformat(),
+                **previous,
+            }
+            progress["change"] = {
+                key: _change(window[key], previous[key]) for key in window
+            }
+
+        return progress
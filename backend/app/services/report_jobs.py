@@ -0,0 +1,324 @@
+"""
+Background job subsystem for long-running admin reports
+
+Reports are submitted as jobs, executed on the event loop in the background
+and kept for a retention period. Identical jobs that are still pending or
+running are deduplicated onto the same job id. A job still pending or
+running REPORT_JOB_STALE_SECONDS after it was created is presumed abandoned
+by a worker that died before recording the outcome: it is marked failed
+(and so eventually purged) when the store is purged or the job is read. Job state lives in a pluggable
+store: in-memory (single process, tests) or the ``report_jobs`` table.
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select, delete, update, and_
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.models.report_job import ReportJob, ReportJobStatus
+from app.schemas.report_job import ReportJobResponse
+from app.services.report_service import ReportService
+
+ACTIVE_STATUSES = (ReportJobStatus.PENDING, ReportJobStatus.RUNNING)
+ABANDONED_ERROR = "Abandoned: the worker running the report stopped before it finished"
+
+# Report kind -> coroutine building the report from (db, **params)
+REPORT_BUILDERS: Dict[str, Callable[..., Awaitable[dict]]] = {
+    "usage": ReportService.usage_report,
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite drops tzinfo on round-trip; stored timestamps are always UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def make_dedup_key(kind: str, params: dict) -> str:
+    """Build a stable deduplication key from the report kind and parameters"""
+    return f"{kind}:{json.dumps(params, sort_keys=True, separators=(',', ':'))}"
+
+
+class ReportJobStore:
+    """Interface for report job storage backends"""
+
+    async def create(self, job: ReportJobResponse, dedup_key: str) -> None:
+        raise NotImplementedError
+
+    async def get(self, job_id: str) -> Optional[ReportJobResponse]:
+        raise NotImplementedError
+
+    async def find_active(self, dedup_key: str, created_after: datetime) -> Optional[ReportJobResponse]:
+        """Latest pending or running job for dedup_key created after created_after"""
+        raise NotImplementedError
+
+    async def update(self, job_id: str, **fields) -> None:
+        raise NotImplementedError
+
+    async def purge_expired(self, now: datetime) -> int:
+        raise NotImplementedError
+
+    async def fail_stale(self, created_before: datetime, now: datetime, expires_at: datetime) -> int:
+        """Mark pending or running jobs created before created_before as failed"""
+        raise NotImplementedError
+
+
+class InMemoryReportJobStore(ReportJobStore):
+    """Process-local job store, suitable for a single worker and for tests"""
+
+    def __init__(self):
+        self._jobs: Dict[str, ReportJobResponse] = {}
+        self._dedup_keys: Dict[str, str] = {}
+
+    async def create(self, job: ReportJobResponse, dedup_key: str) -> None:
+        self._jobs[job.id] = job
+        self._dedup_keys[job.id] = dedup_key
+
+    async def get(self, job_id: str) -> Optional[ReportJobResponse]:
+        job = self._jobs.get(job_id)
+        return job.model_copy() if job else None
+
+    async def find_active(self, dedup_key: str, created_after: datetime) -> Optional[ReportJobResponse]:
+        for job_id, key in reversed(self._dedup_keys.items()):
+            job = self._jobs[job_id]
+            if key == dedup_key and job.status in ACTIVE_STATUSES and _as_utc(job.created_at) > created_after:
+                return job.model_copy()
+        return None
+
+    async def update(self, job_id: str, **fields) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self._jobs[job_id] = job.model_copy(update=fields)
+
+    async def purge_expired(self, now: datetime) -> int:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.expires_at is not None and _as_utc(job.expires_at) <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            del self._dedup_keys[job_id]
+        return len(expired)
+
+    async def fail_stale(self, created_before: datetime, now: datetime, expires_at: datetime) -> int:
+        stale = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in ACTIVE_STATUSES and _as_utc(job.created_at) < created_before
+        ]
+        for job_id in stale:
+            await self.update(job_id, status=ReportJobStatus.FAILED, error=ABANDONED_ERROR,
+                              finished_at=now, expires_at=expires_at)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._jobs.clear()
+        self._dedup_keys.clear()
+
+
+class DatabaseReportJobStore(ReportJobStore):
+    """Job store backed by the report_jobs table, shared by all workers"""
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory or AsyncSessionLocal
+
+    async def create(self, job: ReportJobResponse, dedup_key: str) -> None:
+        async with self.session_factory() as session:
+            session.add(ReportJob(dedup_key=dedup_key, **job.model_dump()))
+            await session.commit()
+
+    async def get(self, job_id: str) -> Optional[ReportJobResponse]:
+        async with self.session_factory() as session:
+            row = await session.get(ReportJob, job_id)
+            return ReportJobResponse.model_validate(row) if row else None
+
+    async def find_active(self, dedup_key: str, created_after: datetime) -> Optional[ReportJobResponse]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(ReportJob)
+                .where(
+                    and_(
+                        ReportJob.dedup_key == dedup_key,
+                        ReportJob.status.in_(ACTIVE_STATUSES),
+                        ReportJob.created_at > created_after
+                    )
+                )
+                .order_by(ReportJob.created_at.desc())
+                .limit(1)
+            )
+            row = result.scalar_one_or_none()
+            return ReportJobResponse.model_validate(row) if row else None
+
+    async def update(self, job_id: str, **fields) -> None:
+        async with self.session_factory() as session:
+            row = await session.get(ReportJob, job_id)
+            if row is None:
+                return
+            for field, value in fields.items():
+                setattr(row, field, value)
+            await session.commit()
+
+    async def purge_expired(self, now: datetime) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(ReportJob).where(ReportJob.expires_at <= now)
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+    async def fail_stale(self, created_before: datetime, now: datetime, expires_at: datetime) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(ReportJob)
+                .where(
+                    and_(
+                        ReportJob.status.in_(ACTIVE_STATUSES),
+                        ReportJob.created_at < created_before
+                    )
+                )
+                .values(status=ReportJobStatus.FAILED, error=ABANDONED_ERROR, finished_at=now, expires_at=expires_at)
+            )
+            await session.commit()
+            return result.rowcount or 0
+
+
+def create_report_job_store(backend: str) -> ReportJobStore:
+    """Create the job store configured by REPORT_JOB_BACKEND"""
+    if backend == "memory":
+        return InMemoryReportJobStore()
+    if backend == "database":
+        return DatabaseReportJobStore()
+    raise ValueError(f"Unknown report job backend: {backend}")
+
+
+class ReportJobManager:
+    """Submits, deduplicates and executes report jobs in the background"""
+
+    def __init__(self, store: ReportJobStore, ttl_seconds: int, max_concurrency: int, stale_seconds: int):
+        self.store = store
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.stale_after = timedelta(seconds=stale_seconds)
+        self.max_concurrency = max_concurrency
+        # Sessions for job execution are opened independently of any request
+        self.session_factory = AsyncSessionLocal
+        self._submit_lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: set = set()
+
+    def _primitives(self):
+        # Created lazily so they bind to the running event loop
+        if self._submit_lock is None:
+            self._submit_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._submit_lock, self._semaphore
+
+    async def submit(self, kind: str, params: dict) -> ReportJobResponse:
+        """
+        Submit a report job, reusing an identical pending or running job
+
+        Args:
+            kind: Report kind, must be registered in REPORT_BUILDERS
+            params: Keyword arguments for the report builder
+
+        Returns:
+            The new or deduplicated job
+        """
+        if kind not in REPORT_BUILDERS:
+            raise ValueError(f"Unknown report kind: {kind}")
+
+        dedup_key = make_dedup_key(kind, params)
+        submit_lock, _ = self._primitives()
+
+        async with submit_lock:
+            now = datetime.now(timezone.utc)
+            await self.store.purge_expired(now)
+            await self.store.fail_stale(now - self.stale_after, now, now + self.ttl)
+
+            existing = await self.store.find_active(dedup_key, now - self.stale_after)
+            if existing:
+                return existing
+
+            job = ReportJobResponse(
+                id=str(uuid.uuid4()),
+                kind=kind,
+                params=params,
+                status=ReportJobStatus.PENDING,
+                created_at=now,
+            )
+            await self.store.create(job, dedup_key)
+
+        task = asyncio.create_task(self._run(job.id, kind, params))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get(self, job_id: str) -> Optional[ReportJobResponse]:
+        """Get a job by id, treating expired jobs as missing"""
+        now = datetime.now(timezone.utc)
+        job = await self.store.get(job_id)
+        if job and job.status in ACTIVE_STATUSES and _as_utc(job.created_at) < now - self.stale_after:
+            # Its worker died; report the failure rather than leave clients polling forever
+            await self.store.update(job_id, status=ReportJobStatus.FAILED, error=ABANDONED_ERROR,
+                                    finished_at=now, expires_at=now + self.ttl)
+            job = await self.store.get(job_id)
+        if job and job.expires_at and _as_utc(job.expires_at) <= now:
+            return None
+        return job
+
+    async def _run(self, job_id: str, kind: str, params: dict) -> None:
+        _, semaphore = self._primitives()
+        try:
+            async with semaphore:
+                await self.store.update(
+                    job_id,
+                    status=ReportJobStatus.RUNNING,
+                    started_at=datetime.now(timezone.utc)
+                )
+                async with self.session_factory() as session:
+                    result = await REPORT_BUILDERS[kind](session, **params)
+        except asyncio.CancelledError:
+            # Cancelled on shutdown: record it so the job is not deduplicated onto forever
+            await self._finish(job_id, status=ReportJobStatus.FAILED, error="Cancelled before completion")
+            raise
+        except Exception as exc:
+            await self._finish(job_id, status=ReportJobStatus.FAILED, error=str(exc) or exc.__class__.__name__)
+        else:
+            await self._finish(job_id, status=ReportJobStatus.COMPLETED, result=result)
+
+    async def _finish(self, job_id: str, **fields) -> None:
+        finished_at = datetime.now(timezone.utc)
+        await self.store.update(job_id, finished_at=finished_at, expires_at=finished_at + self.ttl, **fields)
+
+    async def drain(self) -> None:
+        """Wait for all in-flight jobs to finish"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Give in-flight jobs a chance to finish, then cancel the rest"""
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except asyncio.TimeoutError:
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            # Let the cancelled jobs record their failure
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget loop-bound state (used on shutdown and between tests)"""
+        self._tasks.clear()
+        self._submit_lock = None
+        self._semaphore = None
+
+
+report_job_manager = ReportJobManager(
+    store=create_report_job_store(settings.REPORT_JOB_BACKEND),
+    ttl_seconds=settings.REPORT_JOB_RESULT_TTL_SECONDS,
+    max_concurrency=settings.REPORT_JOB_MAX_CONCURRENCY,
+    stale_seconds=settings.REPORT_JOB_STALE_SECONDS,
+)
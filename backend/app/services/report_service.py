@@ -0,0 +1,95 @@
+"""
+Report service layer for admin reporting
+"""
+
+from datetime import date, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.models.user import User
+from app.models.workout_log import WorkoutLog
+from app.models.diet_log import DietLog
+from app.models.workout_plan import WorkoutPlan
+from app.models.diet_plan import DietPlan
+
+
+class ReportService:
+    """Service class for building admin reports"""
+
+    @staticmethod
+    async def usage_report(db: AsyncSession, days: int = 30) -> dict:
+        """
+        Build a usage report for the specified period
+
+        Args:
+            db: Database session
+            days: Number of days covered by the report
+
+        Returns:
+            Dictionary with new users, activity, plans created and top users
+        """
+        start_date = date.today() - timedelta(days=days)
+
+        # New users in period
+        new_users = await db.execute(
+            select(func.count(User.id))
+            .where(User.created_at >= start_date)
+        )
+
+        # Activity in period
+        workouts_in_period = await db.execute(
+            select(func.count(WorkoutLog.id))
+            .where(WorkoutLog.workout_date >= start_date)
+        )
+
+        diet_logs_in_period = await db.execute(
+            select(func.count(DietLog.id))
+            .where(DietLog.meal_date >= start_date)
+        )
+
+        # Plans created in period
+        workout_plans_created = await db.execute(
+            select(func.count(WorkoutPlan.id))
+            .where(WorkoutPlan.created_at >= start_date)
+        )
+
+        diet_plans_created = await db.execute(
+            select(func.count(DietPlan.id))
+            .where(DietPlan.created_at >= start_date)
+        )
+
+        # Most active users
+        most_active_workout = await db.execute(
+            select(User.id, User.full_name, User.email, func.count(WorkoutLog.id).label('count'))
+            .join(WorkoutLog, User.id == WorkoutLog.user_id)
+            .where(WorkoutLog.workout_date >= start_date)
+            .group_by(User.id, User.full_name, User.email)
+            .order_by(func.count(WorkoutLog.id).desc())
+            .limit(5)
+        )
+
+        top_users = [
+            {
+                "user_id": row[0],
+                "full_name": row[1],
+                "email": row[2],
+                "workout_count": row[3]
+            }
+            for row in most_active_workout.all()
+        ]
+
+        return {
+            "report_period_days": days,
+            "start_date": start_date.isoformat(),
+            "end_date": date.today().isoformat(),
+            "new_users": new_users.scalar() or 0,
+            "activity": {
+                "workouts_logged": workouts_in_period.scalar() or 0,
+                "diet_logs": diet_logs_in_period.scalar() or 0
+            },
+            "plans_created": {
+                "workout_plans": workout_plans_created.scalar() or 0,
+                "diet_plans": diet_plans_created.scalar() or 0
+            },
+            "top_users": top_users
+        }
@@ -0,0 +1,233 @@
+"""
+Workout streaks and weekly consistency
+
+A streak is a run of consecutive days with at least one workout. Streaks
+are found in the database with a gaps-and-islands query: over the distinct
+(user_id, workout_date) pairs, the day number minus the row number is
+constant within a run, so grouping on that difference yields one row per
+streak.
+
+The latest run and the longest streak are cached per user in
+``workout_streaks``. A new workout log advances the cached run without
+reading the history; back-dated logs, edits and deletes recompute the
+user's streaks with the window query. Users without cached state yet are
+computed on read.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, delete, func, cast, literal, distinct, Date, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.workout_log import WorkoutLog
+from app.models.workout_streak import WorkoutStreak
+
+CONSISTENCY_WEEKS = 4
+
+EPOCH = date(1970, 1, 1)
+
+
+def _day_number(column, dialect: str):
+    """Whole days since a fixed epoch, so consecutive dates differ by one"""
+    if dialect == "postgresql":
+        return cast(column - literal(EPOCH, Date), Integer)
+    return cast(func.julianday(column), Integer)
+
+
+def _training_days(user_ids: List[int], since: Optional[date] = None):
+    conditions = [WorkoutLog.user_id.in_(user_ids)]
+    if since is not None:
+        conditions.append(WorkoutLog.workout_date >= since)
+    return select(WorkoutLog.user_id, WorkoutLog.workout_date).where(*conditions).distinct().subquery()
+
+
+def _streaks_query(user_ids: List[int], dialect: str):
+    days = _training_days(user_ids)
+    islands = select(
+        days.c.user_id,
+        days.c.workout_date,
+        (
+            _day_number(days.c.workout_date, dialect)
+            - func.row_number().over(partition_by=days.c.user_id, order_by=days.c.workout_date)
+        ).label("island"),
+    ).subquery()
+    runs = (
+        select(
+            islands.c.user_id,
+            func.min(islands.c.workout_date).label("run_start"),
+            func.max(islands.c.workout_date).label("run_end"),
+            func.count().label("run_length"),
+        )
+        .group_by(islands.c.user_id, islands.c.island)
+        .subquery()
+    )
+    ranked = select(
+        runs.c.user_id,
+        runs.c.run_start,
+        runs.c.run_end,
+        runs.c.run_length,
+        func.row_number().over(partition_by=runs.c.user_id, order_by=runs.c.run_end.desc()).label("recency"),
+        func.max(runs.c.run_length).over(partition_by=runs.c.user_id).label("longest"),
+    ).subquery()
+    return select(
+        ranked.c.user_id.label("user_id"),
+        ranked.c.run_start.label("current_start"),
+        ranked.c.run_end.label("last_workout_date"),
+        ranked.c.run_length.label("current_length"),
+        ranked.c.longest.label("longest_streak"),
+    ).where(ranked.c.recency == 1)
+
+
+class StreakService:
+    """Service class for workout streaks"""
+
+    @staticmethod
+    async def compute(db: AsyncSession, user_ids: List[int]) -> Dict[int, dict]:
+        """
+        Compute the latest run and longest streak from workout history
+
+        Args:
+            db: Database session
+            user_ids: Users to compute
+
+        Returns:
+            User ID -> streak state, for users with at least one workout
+        """
+        if not user_ids:
+            return {}
+        result = await db.execute(_streaks_query(user_ids, db.get_bind().dialect.name))
+        return {row.user_id: dict(row._mapping) for row in result}
+
+    @staticmethod
+    async def refresh(db: AsyncSession, user_ids: List[int]) -> None:
+        """
+        Recompute and store the cached streak state of the given users
+
+        Args:
+            db: Database session (the caller commits)
+            user_ids: Users whose workout history changed
+        """
+        streaks = await StreakService.compute(db, user_ids)
+        stale = [user_id for user_id in user_ids if user_id not in streaks]
+        if stale:
+            await db.execute(delete(WorkoutStreak).where(WorkoutStreak.user_id.in_(stale)))
+        if not streaks:
+            return
+
+        insert_ = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        statement = insert_(WorkoutStreak.__table__).values(list(streaks.values()))
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    column: statement.excluded[column]
+                    for column in (
+                        "current_start", "last_workout_date", "current_length", "longest_streak", "updated_at"
+                    )
+                },
+            )
+        )
+
+    @staticmethod
+    async def record_workout(db: AsyncSession, user_id: int, workout_date: date) -> None:
+        """
+        Advance the cached streak for a newly logged workout
+
+        The log must already be flushed, in case the history is recomputed.
+
+        Args:
+            db: Database session (the caller commits)
+            user_id: User who logged the workout
+            workout_date: Date of the new log
+        """
+        result = await db.execute(
+            select(WorkoutStreak)
+            .where(WorkoutStreak.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        streak = result.scalar_one_or_none()
+        if streak is None or workout_date < streak.current_start:
+            # No cached state yet, or a back-dated log that may join runs
+            await StreakService.refresh(db, [user_id])
+            return
+
+        gap = (workout_date - streak.last_workout_date).days
+        if gap <= 0:
+            return
+        if gap == 1:
+            streak.current_length += 1
+        else:
+            streak.current_start = workout_date
+            streak.current_length = 1
+        streak.last_workout_date = workout_date
+        streak.longest_streak = max(streak.longest_streak, streak.current_length)
+
+    @staticmethod
+    async def get_streaks(db: AsyncSession, user_ids: List[int], today: Optional[date] = None) -> Dict[int, dict]:
+        """
+        Get streak and weekly consistency metrics for several users
+
+        The current streak counts while the latest run ends today or
+        yesterday. Weekly consistency covers the last CONSISTENCY_WEEKS
+        weeks ending today.
+
+        Args:
+            db: Database session
+            user_ids: Users to report
+            today: Reference date (defaults to date.today())
+
+        Returns:
+            User ID -> current_streak, longest_streak, last_workout_date
+            and weekly_consistency
+        """
+        if not user_ids:
+            return {}
+        today = today or date.today()
+        dialect = db.get_bind().dialect.name
+
+        result = await db.execute(
+            select(
+                WorkoutStreak.user_id, WorkoutStreak.current_start, WorkoutStreak.last_workout_date,
+                WorkoutStreak.current_length, WorkoutStreak.longest_streak,
+            ).where(WorkoutStreak.user_id.in_(user_ids))
+        )
+        streaks = {row.user_id: dict(row._mapping) for row in result}
+        missing = [user_id for user_id in user_ids if user_id not in streaks]
+        streaks.update(await StreakService.compute(db, missing))
+
+        since = today - timedelta(days=CONSISTENCY_WEEKS * 7 - 1)
+        days = _training_days(user_ids, since)
+        week = (_day_number(days.c.workout_date, dialect) - _day_number(literal(since, Date), dialect)) // 7
+        result = await db.execute(
+            select(
+                days.c.user_id,
+                func.count().label("training_days"),
+                func.count(distinct(week)).label("active_weeks"),
+            )
+            .where(days.c.workout_date <= today)
+            .group_by(days.c.user_id)
+        )
+        consistency = {row.user_id: row for row in result}
+
+        summary = {}
+        for user_id in user_ids:
+            streak = streaks.get(user_id)
+            weekly = consistency.get(user_id)
+            active_weeks = weekly.active_weeks if weekly else 0
+            alive = streak is not None and streak["last_workout_date"] >= today - timedelta(days=1)
+            summary[user_id] = {
+                "current_streak": streak["current_length"] if alive else 0,
+                "longest_streak": streak["longest_streak"] if streak else 0,
+                "last_workout_date": streak["last_workout_date"].isoformat() if streak else None,
+                "weekly_consistency": {
+                    "weeks": CONSISTENCY_WEEKS,
+                    "active_weeks": active_weeks,
+                    "rate": round(active_weeks / CONSISTENCY_WEEKS * 100, 1),
+                    "training_days": weekly.training_days if weekly else 0,
+                },
+            }
+        return summary
@@ -0,0 +1,178 @@
+"""
+Per-worker startup warm-up
+
+The first requests of a fresh worker otherwise pay for opening pool
+connections, configuring the ORM mappers, compiling statements and filling
+caches. Warm-up does that work in the background right after startup: the
+worker already answers ``/api/v1/health`` (liveness) while
+``/api/v1/ready`` answers 503 until warm-up has finished.
+
+Hot statements are warmed by running the dashboard endpoints' queries for
+placeholder users that match no rows, on every pre-opened connection. This
+fills SQLAlchemy's compiled statement cache and, on PostgreSQL, asyncpg's
+per-connection prepared statement cache.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import configure_mappers, load_only
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.base import AsyncSessionLocal, engine
+from app.models.user import CORE_COLUMNS, User, UserRole, full_profile
+from app.services.autocomplete import autocomplete
+
+logger = logging.getLogger(__name__)
+
+
+async def run_hot_statements(db: AsyncSession) -> None:
+    """Run the queries behind login and the client and coach dashboards once"""
+    from app.api.v1 import client, coach
+    from app.services.progress_service import ProgressService
+
+    # Transient placeholders; id 0 matches no rows
+    client_user = User(id=0, role=UserRole.CLIENT)
+    coach_user = User(id=0, role=UserRole.COACH)
+    charts = {"max_points": None, "downsample": "lttb"}
+
+    # get_current_user and login
+    await db.execute(select(User).options(load_only(*CORE_COLUMNS, raiseload=True)).where(User.id == 0))
+    await db.execute(select(User).options(*full_profile()).where(User.email == ""))
+
+    await client.get_workout_logs(start_date=None, end_date=None, current_user=client_user, db=db)
+    await client.get_diet_logs(start_date=None, end_date=None, current_user=client_user, db=db)
+    await ProgressService.get_progress(db, client_user.id, days=30, compare=False)
+    await client.get_workout_frequency_chart(days=30, current_user=client_user, db=db, **charts)
+    await client.get_diet_adherence_chart(days=30, current_user=client_user, db=db, **charts)
+    await client.get_workout_volume_chart(days=90, exercise=None, current_user=client_user, db=db, **charts)
+
+    # The coach charts aggregate over every client, far too costly to run per connection
+    await coach.get_clients(current_user=coach_user, db=db)
+
+
+class WarmupService:
+    """Warms this worker once after startup and reports readiness"""
+
+    def __init__(self, pool_connections: int, enabled: bool = True):
+        self.pool_connections = pool_connections
+        self.enabled = enabled
+        # Warm-up runs outside of any request, so it opens its own connections
+        self.engine = engine
+        self.session_factory = AsyncSessionLocal
+        self.ready = False
+        self.duration_seconds: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.failed: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _configure_mappers(self) -> None:
+        configure_mappers()
+
+    def _connection_count(self) -> int:
+        """WARMUP_POOL_CONNECTIONS, clamped to what the pool can hand out right now"""
+        count = max(1, self.pool_connections)
+        pool = self.engine.pool
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        if not hasattr(pool, "size") or max_overflow < 0:
+            # Static and null pools, or unlimited overflow: nothing to exhaust
+            return count
+        available = max(1, pool.size() + max_overflow - pool.checkedout())
+        if count > available:
+            logger.warning(
+                "WARMUP_POOL_CONNECTIONS=%d exceeds the %d connections the pool can hand out; warming %d",
+                self.pool_connections, available, available
+            )
+        return min(count, available)
+
+    async def _warm_connections(self) -> None:
+        async with AsyncExitStack() as stack:
+            # Hold every connection at once so the pool has to open each of them.
+            # Asking for more than the pool holds would wait for the pool timeout.
+            connections = await asyncio.gather(*(
+                stack.enter_async_context(self.engine.connect())
+                for _ in range(self._connection_count())
+            ))
+            for connection in connections:
+                async with AsyncSession(bind=connection) as session:
+                    await run_hot_statements(session)
+
+    async def _prime_caches(self) -> None:
+        from app.api.v1.bookings import get_available_coaches
+
+        await autocomplete.start()
+        # Last, so the short-lived board entry is still fresh when traffic arrives
+        async with self.session_factory() as session:
+            await get_available_coaches(current_user=None, db=session)
+
+    async def run(self) -> None:
+        """Run every warm-up step, then mark the worker ready
+
+        A failing step is logged and recorded but does not keep the worker
+        out of rotation; requests then simply pay the cold cost themselves.
+        """
+        started = time.perf_counter()
+        steps = [
+            ("mappers", self._configure_mappers),
+            ("connections", self._warm_connections),
+            ("caches", self._prime_caches),
+        ]
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                await step()
+            except Exception:
+                logger.exception("Warm-up step %s failed", name)
+                self.failed.append(name)
+                metrics.increment("warmup_failures_total", step=name)
+            self.steps[name] = time.perf_counter() - step_started
+            metrics.set_gauge("warmup_step_duration_seconds", self.steps[name], step=name)
+
+        self.duration_seconds = time.perf_counter() - started
+        metrics.set_gauge("warmup_duration_seconds", self.duration_seconds)
+        self.ready = True
+        logger.info("Warm-up finished in %.2f s", self.duration_seconds)
+
+    def start(self) -> None:
+        """Schedule warm-up in the background (application startup)"""
+        if not self.enabled:
+            self.ready = True
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel a warm-up still in progress (application shutdown)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def status(self) -> dict:
+        """Readiness and timings for the readiness probe"""
+        return {
+            "ready": self.ready,
+            "warmup_seconds": round(self.duration_seconds, 3) if self.duration_seconds is not None else None,
+            "steps": {name: round(seconds, 3) for name, seconds in self.steps.items()},
+            "failed_steps": list(self.failed),
+        }
+
+    def reset(self) -> None:
+        """Forget warm-up results"""
+        self.ready = False
+        self.duration_seconds = None
+        self.steps = {}
+        self.failed = []
+        self._task = None
+
+
+warmup = WarmupService(pool_connections=settings.WARMUP_POOL_CONNECTIONS, enabled=settings.WARMUP_ENABLED)
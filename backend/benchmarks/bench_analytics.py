@@ -0,0 +1,89 @@
+"""
+Benchmark for the vectorized analytics metrics (app/analytics/trends.py)
+
+Computes 7-day moving averages, week-over-week change, trend slope and
+calorie adherence over a year of synthetic daily data per client, once
+with the NumPy functions on a stacked (clients x days) array and once with
+a naive per-row Python loop, checks that both agree and prints timings.
+
+Usage:
+    python -m benchmarks.bench_analytics --clients 1000 --days 365
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.analytics.trends import moving_average, period_change, trend_slope, calorie_adherence
+
+
+def naive_metrics(calories, target, window=7, tolerance=0.1):
+    """Per-client metrics with plain Python loops over the daily rows"""
+    averages = []
+    for end in range(window, len(calories) + 1):
+        logged = [value for value in calories[end - window:end] if value > 0]
+        averages.append(sum(logged) / len(logged) if logged else math.nan)
+
+    def week_mean(values):
+        logged = [value for value in values if value > 0]
+        return sum(logged) / len(logged) if logged else math.nan
+
+    current = week_mean(calories[-window:])
+    previous = week_mean(calories[-2 * window:-window])
+
+    points = [(day, value) for day, value in enumerate(calories) if value > 0]
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+    within = sum(1 for _, value in points if abs(value / target - 1) <= tolerance)
+    return averages, current, previous, slope, within
+
+
+def vectorized_metrics(calories, targets, window=7, tolerance=0.1):
+    """Cohort metrics with the app.analytics functions"""
+    logged = calories > 0
+    averages = moving_average(calories, window, logged)
+    current, previous = period_change(calories, window, logged)
+    slope = trend_slope(calories, logged)
+    adherence = calorie_adherence(calories, targets, tolerance)
+    return averages, current, previous, slope, adherence["days_within_target"]
+
+
+def main(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    targets = rng.choice([1800.0, 2000.0, 2200.0, 2500.0], size=args.clients)
+    calories = rng.normal(targets[:, None], 250, size=(args.clients, args.days)).round()
+    # Roughly one day in five has no diet log
+    calories[rng.random(calories.shape) < 0.2] = 0.0
+    rows = calories.tolist()
+
+    started = time.perf_counter()
+    naive = [naive_metrics(row, target) for row, target in zip(rows, targets.tolist())]
+    naive_seconds = time.perf_counter() - started
+
+    # Leave one-off NumPy dispatch setup out of the timing
+    vectorized_metrics(calories[:1], targets[:1])
+    started = time.perf_counter()
+    averages, current, previous, slope, within = vectorized_metrics(calories, targets)
+    numpy_seconds = time.perf_counter() - started
+
+    np.testing.assert_allclose(averages, [result[0] for result in naive])
+    np.testing.assert_allclose(current, [result[1] for result in naive])
+    np.testing.assert_allclose(previous, [result[2] for result in naive])
+    np.testing.assert_allclose(slope, [result[3] for result in naive])
+    np.testing.assert_array_equal(within, [result[4] for result in naive])
+
+    print(f"Clients: {args.clients}, days: {args.days}")
+    print(f"  naive loop  {naive_seconds * 1000:9.1f} ms")
+    print(f"  numpy       {numpy_seconds * 1000:9.1f} ms  ({naive_seconds / numpy_seconds:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,75 @@
+"""
+Latency benchmark for the in-memory autocomplete prefix index
+
+Builds an index of synthetic names with per-user usage counts and times
+search() for random 1-4 character prefixes after a warm-up pass,
+reporting p50/p99 in milliseconds (the endpoint target is p99 < 2 ms).
+
+Usage:
+    python -m benchmarks.bench_autocomplete --names 20000 --users 1000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from app.services.autocomplete import PrefixIndex
+
+WORDS = [
+    "bench", "press", "squat", "front", "back", "split", "romanian", "deadlift",
+    "row", "cable", "dumbbell", "barbell", "incline", "decline", "curl", "hammer",
+    "lateral", "raise", "lunge", "walking", "pull", "up", "chin", "dip", "fly",
+    "extension", "kickback", "shrug", "plank", "crunch", "sprint", "run",
+]
+
+
+def _name(rng: random.Random) -> str:
+    words = rng.sample(WORDS, rng.randint(1, 3))
+    # A numeric suffix keeps synthetic names distinct at larger sizes
+    return " ".join(words).title() + f" {rng.randint(1, 999)}"
+
+
+def main(args) -> None:
+    rng = random.Random(args.seed)
+    index = PrefixIndex()
+
+    rows = [
+        (name, None, rng.randint(1, args.users), rng.randint(1, 20))
+        for name in (_name(rng) for _ in range(args.names))
+        for _ in range(rng.randint(1, 5))
+    ]
+    start = time.perf_counter()
+    index.load(rows)
+    build_seconds = time.perf_counter() - start
+
+    prefixes = [
+        rng.choice(WORDS)[: rng.randint(1, 4)] if rng.random() < 0.9 else rng.choice(string.ascii_lowercase)
+        for _ in range(args.queries)
+    ]
+    # Warm the memoized wide-prefix lists as a long-running worker would be
+    for prefix in prefixes:
+        index.search(prefix, limit=10)
+
+    timings = []
+    for prefix in prefixes:
+        user_id = rng.randint(1, args.users)
+        began = time.perf_counter()
+        index.search(prefix, user_id, limit=10)
+        timings.append((time.perf_counter() - began) * 1000)
+    timings.sort()
+
+    print(f"Names: {len(index)}, users: {args.users}, build: {build_seconds:.2f}s")
+    print(f"Queries: {args.queries}")
+    print(f"  p50 {timings[len(timings) // 2]:.3f} ms")
+    print(f"  p99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+    print(f"  max {timings[-1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
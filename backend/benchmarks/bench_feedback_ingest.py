@@ -0,0 +1,127 @@
+"""
+Throughput benchmark: per-request commit vs write-behind feedback ingestion
+
+Runs the same burst of concurrent submissions through both strategies
+against a scratch SQLite database (or DATABASE_URL with --database-url)
+and reports submissions per second for each.
+
+Usage:
+    python -m benchmarks.bench_feedback_ingest --requests 5000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models import Feedback
+from app.services.feedback_buffer import FeedbackBuffer
+
+
+def _row(i: int) -> dict:
+    return {
+        "message": f"Benchmark feedback #{i}: the dashboard felt slow today",
+        "is_anonymous": True,
+        "page_url": "http://localhost:3000/client/dashboard",
+        "user_agent": "bench/1.0",
+    }
+
+
+async def _run_concurrently(total: int, concurrency: int, submit) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await submit(i)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+
+
+async def bench_per_request_commit(session_factory, total: int, concurrency: int) -> float:
+    """Baseline: one session, INSERT, COMMIT and refresh per submission"""
+    async def submit(i: int):
+        async with session_factory() as session:
+            feedback = Feedback(**_row(i))
+            session.add(feedback)
+            await session.commit()
+            await session.refresh(feedback)
+
+    start = time.perf_counter()
+    await _run_concurrently(total, concurrency, submit)
+    return time.perf_counter() - start
+
+
+async def bench_write_behind(session_factory, total: int, concurrency: int, batch_size: int, interval_ms: int) -> float:
+    """Write-behind: enqueue per submission, batched INSERTs in the background"""
+    buffer = FeedbackBuffer(
+        max_size=max(total, 1),
+        batch_size=batch_size,
+        flush_interval_ms=interval_ms,
+        enqueue_timeout_ms=1000,
+    )
+    buffer.session_factory = session_factory
+
+    async def submit(i: int):
+        await buffer.submit(_row(i))
+
+    start = time.perf_counter()
+    await _run_concurrently(total, concurrency, submit)
+    # Count the time until everything is durable, not just enqueued
+    await buffer.stop()
+    return time.perf_counter() - start
+
+
+async def main(args) -> None:
+    if args.database_url:
+        database_url = args.database_url
+        engine = create_async_engine(database_url)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench_feedback.db")
+        database_url = f"sqlite+aiosqlite:///{path}"
+        # Concurrent per-request commits contend for SQLite's write lock
+        engine = create_async_engine(database_url, connect_args={"timeout": 60})
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    results = {}
+    for name, bench in (
+        ("per-request commit", lambda: bench_per_request_commit(session_factory, args.requests, args.concurrency)),
+        ("write-behind", lambda: bench_write_behind(
+            session_factory, args.requests, args.concurrency, args.batch_size, args.flush_interval_ms
+        )),
+    ):
+        async with session_factory() as session:
+            await session.execute(delete(Feedback))
+            await session.commit()
+
+        elapsed = await bench()
+
+        async with session_factory() as session:
+            written = (await session.execute(select(func.count(Feedback.id)))).scalar()
+        assert written == args.requests, f"{name}: expected {args.requests} rows, found {written}"
+        results[name] = args.requests / elapsed
+
+    await engine.dispose()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"Submissions: {args.requests}, concurrency: {args.concurrency}")
+    for name, rate in results.items():
+        print(f"  {name:<20} {rate:>10.0f} submissions/s")
+    print(f"  speedup              {results['write-behind'] / results['per-request commit']:>10.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--flush-interval-ms", type=int, default=250)
+    parser.add_argument("--database-url", default=None, help="Async SQLAlchemy URL (defaults to scratch SQLite)")
+    asyncio.run(main(parser.parse_args()))
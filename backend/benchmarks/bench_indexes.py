@@ -0,0 +1,142 @@
+"""
+Benchmark for the composite and covering indexes of migration 014
+
+Runs the per-user and per-coach queries those indexes serve against the
+configured PostgreSQL database (DATABASE_URL), once inside a transaction
+that drops the 014 indexes and is rolled back ("before"), and once with the
+indexes in place ("after"). Each query is timed with EXPLAIN ANALYZE and
+the median server execution time, the buffers touched and the scan types
+of the plan are printed.
+
+Run it against a seeded copy, never production: dropping the indexes takes
+an exclusive lock on the tables for the duration of the "before" pass.
+
+Usage:
+    python -m benchmarks.bench_indexes --runs 15
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.db.base import engine
+
+NEW_INDEXES = [
+    "ix_workout_logs_user_date",
+    "ix_diet_logs_user_date",
+    "ix_bookings_coach_status",
+    "ix_bookings_client_status",
+    "ix_workout_plans_user_status",
+    "ix_diet_plans_user_status",
+]
+
+QUERIES = {
+    "workout log list (30 days)": (
+        "SELECT * FROM workout_logs WHERE user_id = :client AND workout_date >= :month_ago "
+        "ORDER BY workout_date DESC"
+    ),
+    "workout frequency chart (365 days)": (
+        "SELECT workout_date, count(id) FROM workout_logs WHERE user_id = :client AND workout_date >= :year_ago "
+        "GROUP BY workout_date ORDER BY workout_date"
+    ),
+    "diet adherence chart (365 days)": (
+        "SELECT meal_date, sum(calories), sum(protein_grams), sum(carbs_grams), sum(fat_grams) FROM diet_logs "
+        "WHERE user_id = :client AND meal_date >= :year_ago GROUP BY meal_date ORDER BY meal_date"
+    ),
+    "coach clients' training days (28 days)": (
+        "SELECT DISTINCT user_id, workout_date FROM workout_logs "
+        "WHERE user_id IN (SELECT client_id FROM bookings WHERE coach_id = :coach) AND workout_date >= :four_weeks_ago"
+    ),
+    "coach active bookings": (
+        "SELECT count(*) FROM bookings WHERE coach_id = :coach AND status IN ('confirmed', 'pending')"
+    ),
+    "client bookings by status": (
+        "SELECT * FROM bookings WHERE client_id = :client AND status = 'confirmed'"
+    ),
+    "active plans of a client": (
+        "SELECT (SELECT count(*) FROM workout_plans WHERE user_id = :client AND status = 'active'), "
+        "(SELECT count(*) FROM diet_plans WHERE user_id = :client AND status = 'active')"
+    ),
+}
+
+
+def _scans(node: dict) -> set:
+    scans = {node["Node Type"]} if node["Node Type"].endswith("Scan") else set()
+    for child in node.get("Plans", []):
+        scans |= _scans(child)
+    return scans
+
+
+async def measure(conn, sql: str, params: dict, runs: int) -> dict:
+    """Median execution time (ms), shared buffers and scan types of a query"""
+    timings, buffers, scans = [], 0, set()
+    for _ in range(runs):
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)
+        plan = result.scalar_one()
+        plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+        timings.append(plan["Execution Time"])
+        buffers = plan["Plan"].get("Shared Hit Blocks", 0) + plan["Plan"].get("Shared Read Blocks", 0)
+        scans = _scans(plan["Plan"])
+    return {"ms": statistics.median(timings), "buffers": buffers, "scans": ", ".join(sorted(scans))}
+
+
+async def run_all(conn, params: dict, runs: int) -> dict:
+    return {name: await measure(conn, sql, params, runs) for name, sql in QUERIES.items()}
+
+
+async def main(args) -> None:
+    if engine.dialect.name != "postgresql":
+        print(f"This benchmark needs PostgreSQL (current database: {engine.dialect.name})")
+        return
+
+    today = date.today()
+    async with engine.connect() as conn:
+        # The coach with the most bookings and one of their clients
+        await conn.begin()
+        row = (await conn.execute(text(
+            "SELECT coach_id, min(client_id) AS client_id FROM bookings "
+            "GROUP BY coach_id ORDER BY count(*) DESC LIMIT 1"
+        ))).first()
+        if row is None:
+            print("No bookings found; seed the database first")
+            await engine.dispose()
+            return
+        counts = (await conn.execute(text(
+            "SELECT (SELECT count(*) FROM workout_logs), (SELECT count(*) FROM diet_logs), "
+            "(SELECT count(*) FROM bookings)"
+        ))).first()
+        params = {
+            "coach": row.coach_id,
+            "client": row.client_id,
+            "month_ago": today - timedelta(days=30),
+            "year_ago": today - timedelta(days=365),
+            "four_weeks_ago": today - timedelta(days=27),
+        }
+
+        # Dropping an index is transactional, so "before" is rolled back
+        for name in NEW_INDEXES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        before = await run_all(conn, params, args.runs)
+        await conn.rollback()
+
+        async with conn.begin():
+            after = await run_all(conn, params, args.runs)
+    await engine.dispose()
+
+    print(f"Workout logs: {counts[0]}, diet logs: {counts[1]}, bookings: {counts[2]}; median of {args.runs} runs")
+    for name in QUERIES:
+        b, a = before[name], after[name]
+        print(f"  {name}")
+        print(f"    before {b['ms']:8.3f} ms  {b['buffers']:6d} buffers  {b['scans']}")
+        print(f"    after  {a['ms']:8.3f} ms  {a['buffers']:6d} buffers  {a['scans']}"
+              f"  ({b['ms'] / a['ms']:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=15)
+    asyncio.run(main(parser.parse_args()))
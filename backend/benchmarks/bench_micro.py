@@ -0,0 +1,380 @@
+"""
+Microbenchmarks for hot-path building blocks, with stored baselines
+
+Times the small pieces every request goes through: JWT encode/decode, the
+rate-limit middleware, the pydantic response models, chart payload building
+and SQLAlchemy statement construction and compilation. Each benchmark reports the best and median
+time per call over several repeats.
+
+Results are compared with a baseline file (default
+benchmarks/baselines/micro.json) and the run exits with status 1 when a
+benchmark got slower than the baseline by more than --threshold. Times are
+normalized by a fixed pure-Python calibration loop measured in the same
+run, so a baseline recorded on another machine is still roughly
+comparable; use --no-normalize to compare raw times on the same machine.
+
+Usage:
+    python -m benchmarks.bench_micro                  # compare with the baseline
+    python -m benchmarks.bench_micro --save           # record a new baseline
+    python -m benchmarks.bench_micro -k sql --threshold 0.15
+
+    # Compare two commits
+    git checkout main && python -m benchmarks.bench_micro --save --baseline /tmp/main.json
+    git checkout - && python -m benchmarks.bench_micro --baseline /tmp/main.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, desc, func, select
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.client import build_workout_volume_payload
+from app.core.rate_limit import InMemoryTokenBucketStore, RateLimiter, RateLimitMiddleware
+from app.core.security import create_access_token, decode_access_token
+from app.core.config import settings
+from app.models import Booking, BookingStatus, Exercise, User, UserRole, WorkoutLog
+from app.schemas.auth import UserResponse
+from app.schemas.booking import BookingWithDetails
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+REPEATS = 7
+
+# name -> setup function returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a setup function under a benchmark name"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _full_user() -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=1042, email="jordan.client@example.com", hashed_password="x" * 60, full_name="Jordan Client",
+        role=UserRole.CLIENT, is_active=True, is_verified=True, age=34, gender="non-binary",
+        height=178.0, weight=81.5, bicep_size=36.5, waist=84.0,
+        target_goals="Deadlift 200 kg and run a sub-25 minute 5k", dietary_restrictions="Lactose intolerant",
+        health_complications="None", injuries="Left shoulder impingement (2023)", gym_access="Full commercial gym",
+        supplements="Creatine, vitamin D", referral_source="Friend",
+        track_record="3 years of structured training", experience="Intermediate",
+        certifications="None", competitions="Local powerlifting meet 2024", qualifications="None",
+        specialties="Strength", strengths="Consistency", available_slots=10,
+        custom_fields={"preferred_time": "morning", "timezone": "Europe/Berlin", "units": "metric"},
+        created_at=now, updated_at=now,
+    )
+
+
+@benchmark("security.create_access_token")
+def bench_create_token():
+    claims = {"sub": "jordan.client@example.com", "user_id": 1042, "role": "client"}
+    return lambda: create_access_token(claims)
+
+
+@benchmark("security.decode_access_token")
+def bench_decode_token():
+    token = create_access_token({"sub": "jordan.client@example.com", "user_id": 1042, "role": "client"})
+    return lambda: decode_access_token(token)
+
+
+def _run_to_completion(coro) -> None:
+    # The in-memory store never suspends, so the coroutine finishes on its first step
+    try:
+        coro.send(None)
+    except StopIteration:
+        pass
+    else:
+        raise RuntimeError("coroutine suspended")
+
+
+def _rate_limit_middleware(headers: list):
+    async def endpoint(scope, receive, send):
+        pass
+
+    limiter = RateLimiter(InMemoryTokenBucketStore(max_keys=100000), rate=1e9, burst=1e9, costs=settings.RATE_LIMIT_COSTS)
+    middleware = RateLimitMiddleware(endpoint, limiter)
+    scope = {
+        "type": "http", "method": "GET", "path": "/api/v1/client/charts/workout-volume",
+        "headers": [(b"host", b"api.example.com"), (b"accept", b"application/json"), *headers],
+        "client": ("203.0.113.9", 52144),
+    }
+    return lambda: _run_to_completion(middleware(scope, None, None))
+
+
+@benchmark("rate_limit.middleware_user")
+def bench_rate_limit_user():
+    token = create_access_token({"sub": "jordan.client@example.com", "user_id": 1042, "role": "client"})
+    return _rate_limit_middleware([(b"authorization", f"Bearer {token}".encode())])
+
+
+@benchmark("rate_limit.middleware_anonymous")
+def bench_rate_limit_anonymous():
+    return _rate_limit_middleware([])
+
+
+@benchmark("schema.user_response_validate")
+def bench_user_response():
+    user = _full_user()
+    return lambda: UserResponse.model_validate(user)
+
+
+@benchmark("schema.booking_with_details_x50")
+def bench_booking_with_details():
+    # The per-booking dict the booking list endpoints build, for a page of 50
+    now = datetime.now(timezone.utc)
+    bookings = [
+        Booking(
+            id=i, coach_id=7, client_id=100 + i, slot_number=i % 10 + 1, scheduled_at=now + timedelta(days=i),
+            status=BookingStatus.CONFIRMED, notes="Focus on squat depth", created_at=now, updated_at=now,
+        )
+        for i in range(50)
+    ]
+
+    def build():
+        return [
+            BookingWithDetails(**{
+                "id": booking.id,
+                "coach_id": booking.coach_id,
+                "client_id": booking.client_id,
+                "slot_number": booking.slot_number,
+                "scheduled_at": booking.scheduled_at,
+                "status": booking.status,
+                "notes": booking.notes,
+                "created_at": booking.created_at,
+                "updated_at": booking.updated_at,
+                "coach_name": "Casey Coach",
+                "client_name": f"Client {booking.client_id}",
+            })
+            for booking in bookings
+        ]
+    return build
+
+
+def _volume_rows(days: int = 90, exercises: int = 6) -> list:
+    class Row:
+        __slots__ = ("workout_date", "exercise_name", "avg_weight", "max_weight")
+
+        def __init__(self, *values):
+            for slot, value in zip(self.__slots__, values):
+                setattr(self, slot, value)
+
+    start = date(2026, 1, 1)
+    return [
+        Row(start + timedelta(days=day), f"Exercise {e}", 60.0 + e + day * 0.1, 70.0 + e + day * 0.1)
+        for day in range(days)
+        for e in range(exercises)
+    ]
+
+
+@benchmark("chart.workout_volume_payload")
+def bench_volume_payload():
+    rows = _volume_rows()
+    return lambda: build_workout_volume_payload(rows, None, "lttb")
+
+
+@benchmark("chart.workout_volume_payload_lttb50")
+def bench_volume_payload_lttb():
+    rows = _volume_rows(days=365)
+    return lambda: build_workout_volume_payload(rows, 50, "lttb")
+
+
+# Common selects, built as the endpoints build them
+def _current_user_query():
+    return select(User).where(User.id == 1042)
+
+
+def _workout_logs_query():
+    return (
+        select(WorkoutLog)
+        .where(WorkoutLog.user_id == 1042, WorkoutLog.workout_date >= date(2026, 1, 1))
+        .order_by(desc(WorkoutLog.workout_date))
+    )
+
+
+def _coach_clients_query():
+    return select(User).where(
+        User.role == UserRole.CLIENT,
+        User.id.in_(select(Booking.client_id).where(Booking.coach_id == 7)),
+    )
+
+
+def _volume_chart_query():
+    return (
+        select(
+            WorkoutLog.workout_date,
+            Exercise.id.label("exercise_id"),
+            Exercise.name.label("exercise_name"),
+            func.avg(WorkoutLog.weight).label("avg_weight"),
+            func.max(WorkoutLog.weight).label("max_weight"),
+        )
+        .join(Exercise, WorkoutLog.exercise_id == Exercise.id)
+        .where(and_(WorkoutLog.user_id == 1042, WorkoutLog.workout_date >= date(2026, 1, 1),
+                    WorkoutLog.weight.isnot(None)))
+        .group_by(WorkoutLog.workout_date, Exercise.id, Exercise.name)
+        .order_by(WorkoutLog.workout_date)
+    )
+
+
+QUERIES = {
+    "current_user": _current_user_query,
+    "workout_logs": _workout_logs_query,
+    "coach_clients": _coach_clients_query,
+    "volume_chart": _volume_chart_query,
+}
+
+
+def _register_queries() -> None:
+    dialect = postgresql.asyncpg.dialect()
+    for name, build in QUERIES.items():
+        # Paid on every execution: building the statement and its cache key
+        benchmark(f"sql.build_cache_key.{name}")(lambda build=build: lambda: build()._generate_cache_key())
+        # Paid on a compiled-cache miss
+        stmt = build()
+        benchmark(f"sql.compile.{name}")(lambda stmt=stmt: lambda: stmt.compile(dialect=dialect))
+
+
+_register_queries()
+
+
+def calibrate() -> float:
+    """Seconds per call of a fixed pure-Python workload"""
+    def work():
+        return sum(i * i for i in range(1000))
+    return measure(work)["min_s"]
+
+
+def measure(func: Callable[[], object], repeats: int = REPEATS) -> dict:
+    """Best and median seconds per call, with loops sized to ~0.2 s per repeat"""
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    times = [t / loops for t in timer.repeat(repeat=repeats, number=loops)]
+    return {"min_s": min(times), "median_s": statistics.median(times), "loops": loops}
+
+
+def run(names: List[str]) -> dict:
+    """Measure the named benchmarks plus the calibration loop"""
+    results = {}
+    for name in names:
+        timing = measure(BENCHMARKS[name]())
+        results[name] = {
+            "min_us": round(timing["min_s"] * 1e6, 3),
+            "median_us": round(timing["median_s"] * 1e6, 3),
+            "loops": timing["loops"],
+        }
+    return {
+        "calibration_us": round(calibrate() * 1e6, 3),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "commit": _git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, normalize: bool = True) -> List[dict]:
+    """
+    Compare a run with a baseline
+
+    The ratio is current / baseline best time, both divided by their run's
+    calibration time when normalizing. A ratio above 1 + threshold is a
+    regression.
+
+    Returns:
+        One row per current benchmark with ratio (None when new) and status
+    """
+    scale = 1.0
+    if normalize and current.get("calibration_us") and baseline.get("calibration_us"):
+        scale = baseline["calibration_us"] / current["calibration_us"]
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            rows.append({"name": name, "current_us": result["min_us"], "baseline_us": None,
+                         "ratio": None, "status": "new"})
+            continue
+        ratio = result["min_us"] * scale / before["min_us"]
+        if ratio > 1 + threshold:
+            status = "REGRESSED"
+        elif ratio < 1 / (1 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "current_us": result["min_us"], "baseline_us": before["min_us"],
+                     "ratio": round(ratio, 3), "status": status})
+    return rows
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args) -> int:
+    names = [name for name in BENCHMARKS if not args.k or args.k in name]
+    if not names:
+        print(f"No benchmark matches {args.k!r}")
+        return 1
+    current = run(names)
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+
+    baseline_path = Path(args.baseline)
+    if args.save:
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() and args.k else None
+        if baseline:
+            # Refresh only the selected benchmarks of an existing baseline
+            baseline["results"].update(current["results"])
+            current = {**current, "results": baseline["results"]}
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(current, indent=2) + "\n")
+        for name in names:
+            result = current["results"][name]
+            print(f"  {name:<44} {result['min_us']:>11.2f} us  (median {result['median_us']:.2f})")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; record one with --save")
+        return 1
+    baseline = json.loads(baseline_path.read_text())
+    rows = compare(current, baseline, args.threshold, normalize=not args.no_normalize)
+    print(
+        f"Baseline {baseline.get('commit') or '?'} ({baseline.get('recorded_at', '?')}), "
+        f"threshold +{args.threshold:.0%}, {'normalized' if not args.no_normalize else 'raw'} times"
+    )
+    for row in rows:
+        baseline_us = f"{row['baseline_us']:>11.2f}" if row["baseline_us"] is not None else f"{'-':>11}"
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(f"  {row['name']:<44} {row['current_us']:>11.2f} us  vs {baseline_us} us  {ratio:>6}  {row['status']}")
+    regressed = [row["name"] for row in rows if row["status"] == "REGRESSED"]
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--no-normalize", action="store_true", help="Compare raw times, not calibrated ones")
+    parser.add_argument("--output", default="", help="Also write this run's results to a JSON file")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,160 @@
+"""
+Benchmark for the bytes the user endpoints read and send
+
+Calls the endpoints that load users (authentication alone, profiles, the
+coach and admin user lists and the coach board) against the configured
+PostgreSQL database (DATABASE_URL). For each request it prints the rows and
+bytes its SELECTs returned (``pg_column_size`` of every result row) and the
+size of the HTTP response body.
+
+Generated datasets leave the profile columns empty. ``--fill-profiles``
+first writes a realistic profile into every user that has none, so run it
+on a seeded copy, never production.
+
+Usage:
+    python -m benchmarks.bench_user_columns --fill-profiles
+"""
+
+import argparse
+import asyncio
+import json
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+
+from app.core.cache import response_cache
+from app.core.rate_limit import rate_limiter
+from app.core.security import create_access_token
+from app.db.base import engine
+from app.main import app
+
+CLIENT_PROFILE = {
+    "height": 178.0,
+    "weight": 82.5,
+    "bicep_size": 36.0,
+    "waist": 86.0,
+    "target_goals": (
+        "Lose 6 kg of fat over the next four months while keeping strength on the main lifts, "
+        "then build towards a 140 kg deadlift and a sub-25 minute 5 km run before the summer."
+    ),
+    "dietary_restrictions": "Lactose intolerant; no pork. Prefers high-protein breakfasts.",
+    "health_complications": "Mild asthma, controlled with an inhaler; blood pressure slightly elevated last check-up.",
+    "injuries": "Left shoulder impingement (2022), avoid behind-the-neck pressing; occasional lower back tightness.",
+    "gym_access": "Commercial gym, 4 days a week",
+    "supplements": "Whey protein, creatine monohydrate 5 g, vitamin D, omega-3",
+    "referral_source": "Instagram",
+}
+COACH_PROFILE = {
+    "track_record": (
+        "Coached 150+ clients since 2015, from first-time lifters to national-level powerlifters; "
+        "average client fat loss of 7 kg over 16 weeks and dozens of first competition entries."
+    ),
+    "experience": "10 years of personal training, 4 years as head coach at a strength and conditioning gym.",
+    "certifications": "NSCA-CSCS, Precision Nutrition Level 1, USA Weightlifting Level 1, First Aid and CPR",
+    "competitions": "National powerlifting championships 2018 and 2019 (83 kg class), regional strongman 2021",
+    "qualifications": "BSc Sport and Exercise Science; MSc Strength and Conditioning",
+    "specialties": "Powerlifting, fat loss, return to training after injury",
+    "strengths": "Technique coaching, sustainable nutrition habits, programming around busy schedules",
+}
+CUSTOM_FIELDS = {"preferred_contact": "email", "timezone": "Europe/London", "onboarding": {"completed": True, "step": 5}}
+
+ENDPOINTS = [
+    ("authentication only", "client", "/api/v1/users/stats"),
+    ("client profile", "client", "/api/v1/client/profile"),
+    ("coach client list", "coach", "/api/v1/coach/clients"),
+    ("coach client detail", "coach", "/api/v1/coach/clients/{client_id}"),
+    ("admin user list (clients)", "admin", "/api/v1/admin/users?role=client"),
+    ("admin user detail", "admin", "/api/v1/admin/users/{client_id}"),
+    ("coach board", "client", "/api/v1/bookings/coaches"),
+]
+
+
+async def fill_profiles() -> None:
+    """Give every user without a profile a realistic one"""
+    columns = {
+        "client": {**CLIENT_PROFILE, "custom_fields": json.dumps(CUSTOM_FIELDS)},
+        "coach": {**COACH_PROFILE, "custom_fields": json.dumps(CUSTOM_FIELDS)},
+    }
+    async with engine.begin() as conn:
+        for role, values in columns.items():
+            assignments = ", ".join(
+                f"{name} = CAST(:{name} AS json)" if name == "custom_fields" else f"{name} = :{name}"
+                for name in values
+            )
+            await conn.execute(
+                text(f"UPDATE users SET {assignments} WHERE role = '{role}' AND custom_fields IS NULL"), values
+            )
+
+
+async def pick_users() -> dict:
+    async with engine.connect() as conn:
+        row = (await conn.execute(text(
+            "SELECT coach_id, client_id FROM bookings ORDER BY coach_id LIMIT 1"
+        ))).one()
+        admin_id = await conn.scalar(text("SELECT id FROM users WHERE role = 'admin' ORDER BY id LIMIT 1"))
+        users = {"coach": row.coach_id, "client": row.client_id, "admin": admin_id}
+        emails = {
+            role: await conn.scalar(text("SELECT email FROM users WHERE id = :id"), {"id": user_id})
+            for role, user_id in users.items()
+        }
+    return {role: (user_id, emails[role]) for role, user_id in users.items()}
+
+
+async def result_bytes(statements) -> tuple:
+    """Rows and bytes the captured SELECTs return"""
+    rows = size = 0
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(
+                f"SELECT count(*), coalesce(sum(pg_column_size(t.*)), 0) FROM ({statement}) AS t", parameters
+            )
+            count, total = result.one()
+            rows += count
+            size += total
+    return rows, size
+
+
+async def run(args) -> None:
+    if args.fill_profiles:
+        await fill_profiles()
+    users = await pick_users()
+    tokens = {role: create_access_token({"sub": email, "user_id": user_id}) for role, (user_id, email) in users.items()}
+    rate_limiter.burst = float("inf")
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    print(f"{'endpoint':<28} {'SQL rows':>9} {'SQL bytes':>11} {'HTTP bytes':>11}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for label, role, path in ENDPOINTS:
+            url = path.format(client_id=users["client"][0])
+            headers = {"Authorization": f"Bearer {tokens[role]}"}
+            # One untimed call warms the caches that are not per request
+            await client.get(url, headers=headers)
+            response_cache.clear()
+
+            statements.clear()
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            try:
+                response = await client.get(url, headers=headers)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", capture)
+            response.raise_for_status()
+
+            rows, size = await result_bytes(list(statements))
+            print(f"{label:<28} {rows:>9} {size:>11} {len(response.content):>11}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fill-profiles", action="store_true",
+                        help="write a realistic profile into every user without one first")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Load-test harness modelling real client, coach and admin sessions
+
+Simulated users arrive at a configurable rate (open loop, Poisson
+arrivals) and each runs one session mirroring a frontend flow:
+
+- client: login, dashboard fan-out (progress, logs, charts), log writes
+- coach: login, dashboard charts, client review, plan creation
+- admin: login, dashboard, then polls the platform stats
+- booking: a burst of clients booking the same coach at once
+
+Latency percentiles, throughput and error rates are reported per endpoint
+as JSON and as a terminal summary. See ``python -m loadtest --help`` and
+the "Load Testing" section of benchmarks/README.md.
+"""
@@ -0,0 +1,132 @@
+"""
+Run a load test against a running API
+
+    python -m loadtest --base-url http://localhost:8000 --rate 20 --duration 60 \\
+        --mix client=70,coach=15,admin=5,booking=10 --output loadtest.json
+
+Simulated users log in with the accounts of
+``python -m app.db.generate_data --seed <--dataset-seed>`` and the admin of
+``python -m app.db.seed``. With --start-server a local uvicorn is started
+for the run on the port of --base-url, using the configured DATABASE_URL.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import httpx
+
+from loadtest.runner import parse_mix, run_load
+from loadtest.scenarios import Accounts
+from loadtest.stats import format_summary
+
+
+def start_server(base_url: str, workers: int) -> subprocess.Popen:
+    """Start uvicorn for the app and wait until /api/v1/health answers"""
+    url = urlparse(base_url)
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", url.hostname, "--port", str(url.port or 80),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        env={
+            **os.environ,
+            "DEBUG": os.environ.get("DEBUG", "false"),
+            # All simulated users share this machine's address
+            "RATE_LIMIT_ENABLED": os.environ.get("RATE_LIMIT_ENABLED", "false"),
+        },
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/api/v1/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30 s")
+
+
+async def main(args) -> None:
+    accounts = Accounts.generated(
+        args.dataset_seed, args.clients, args.coaches, args.admin_email, args.admin_password
+    )
+    print(
+        f"Load test: {args.rate} sessions/s for {args.duration} s against {args.base_url} "
+        f"(mix {args.mix})", flush=True
+    )
+    report = await run_load(
+        args.base_url,
+        accounts,
+        parse_mix(args.mix),
+        rate=args.rate,
+        duration=args.duration,
+        concurrency=args.concurrency,
+        think_time=args.think_time,
+        login_ratio=args.login_ratio,
+        burst_size=args.burst_size,
+        admin_polls=args.admin_polls,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    report["config"] = {key: value for key, value in vars(args).items() if key not in ("admin_password", "output")}
+    print(format_summary(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, default=10, help="Session arrivals per second")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds during which sessions arrive")
+    parser.add_argument("--mix", default="client=70,coach=15,admin=5,booking=10",
+                        help="Relative weights of the client, coach, admin and booking scenarios")
+    parser.add_argument("--concurrency", type=int, default=200, help="Sessions in flight at most")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between page loads (s)")
+    parser.add_argument("--login-ratio", type=float, default=0.2,
+                        help="Share of sessions of a returning user that log in again")
+    parser.add_argument("--burst-size", type=int, default=10, help="Clients per booking burst")
+    parser.add_argument("--admin-polls", type=int, default=5, help="Stats polls per admin session")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the simulated behaviour")
+    parser.add_argument("--dataset-seed", type=int, default=42, help="--seed of app.db.generate_data")
+    parser.add_argument("--clients", type=int, default=1000, help="Generated clients to draw from")
+    parser.add_argument("--coaches", type=int, default=20, help="Generated coaches to draw from")
+    parser.add_argument("--admin-email", default="admin@vibe.com")
+    parser.add_argument("--admin-password", default="admin123")
+    parser.add_argument("--output", default="loadtest-results.json", help="JSON report path ('' to skip)")
+    parser.add_argument("--start-server", action="store_true", help="Run a local uvicorn for the test")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --start-server")
+    args = parser.parse_args()
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.rate <= 0 or args.duration <= 0 or args.clients < 1 or args.coaches < 1:
+        parser.error("--rate, --duration, --clients and --coaches must be positive")
+
+    server = start_server(args.base_url, args.workers) if args.start_server else None
+    try:
+        asyncio.run(main(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                # Requests still queued on an overloaded server delay the graceful shutdown
+                server.kill()
@@ -0,0 +1,105 @@
+"""
+Open-loop session scheduler
+
+Sessions arrive as a Poisson process at ``rate`` per second for
+``duration`` seconds, whatever the server's response times, so a slow
+server shows up as growing latency instead of quietly reducing the offered
+load. Each arrival picks a scenario by the weights of the user mix.
+"""
+
+import asyncio
+import random
+from typing import Dict, Optional
+
+import httpx
+
+from loadtest.scenarios import SCENARIOS, Accounts, Context
+from loadtest.stats import Recorder
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Parse a user mix like ``client=70,coach=15,admin=5,booking=10``
+
+    Raises:
+        ValueError: On unknown scenarios or non-positive totals
+    """
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight)
+    if sum(mix.values()) <= 0 or any(weight < 0 for weight in mix.values()):
+        raise ValueError("Scenario weights must be non-negative and not all zero")
+    return mix
+
+
+async def run_load(
+    base_url: str,
+    accounts: Accounts,
+    mix: Dict[str, float],
+    rate: float,
+    duration: float,
+    concurrency: int = 200,
+    think_time: float = 0.5,
+    login_ratio: float = 0.2,
+    burst_size: int = 10,
+    admin_polls: int = 5,
+    timeout: float = 30.0,
+    seed: Optional[int] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> dict:
+    """
+    Run a load test and return its report
+
+    Args:
+        base_url: Server root, e.g. http://localhost:8000
+        accounts: Logins for the simulated users
+        mix: Scenario name -> relative weight
+        rate: Session arrivals per second
+        duration: Seconds during which sessions arrive
+        concurrency: Sessions in flight at most; arrivals beyond it are dropped
+        think_time: Mean pause between page loads within a session (seconds)
+        login_ratio: Share of sessions of a known user that log in again
+        burst_size: Clients per booking burst
+        admin_polls: Stats polls per admin session
+        timeout: Per-request timeout (seconds)
+        seed: Seed for scenario choice, accounts and payloads
+        transport: httpx transport override (e.g. ASGITransport in tests)
+
+    Returns:
+        Report dict, see Recorder.report()
+    """
+    rng = random.Random(seed)
+    recorder = Recorder()
+    names, weights = zip(*mix.items())
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits, transport=transport) as client:
+        ctx = Context(client, recorder, accounts, rng, think_time, login_ratio, burst_size, admin_polls)
+        active = set()
+
+        async def session(name: str) -> None:
+            try:
+                await SCENARIOS[name](ctx)
+                recorder.sessions[name] += 1
+            except Exception:
+                recorder.failed_sessions[name] += 1
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        while True:
+            await asyncio.sleep(rng.expovariate(rate))
+            if loop.time() >= deadline:
+                break
+            if len(active) >= concurrency:
+                recorder.dropped_sessions += 1
+                continue
+            task = asyncio.create_task(session(rng.choices(names, weights)[0]))
+            active.add(task)
+            task.add_done_callback(active.discard)
+        if active:
+            await asyncio.gather(*active)
+    recorder.finish()
+    return recorder.report()
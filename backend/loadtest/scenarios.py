@@ -0,0 +1,270 @@
+"""
+Simulated user sessions mirroring the frontend flows
+
+Each scenario is a coroutine taking a ``Context`` and running one user
+session against the API. Requests are recorded under their route template
+(``GET /api/v1/coach/clients/{client_id}``) so ids do not split the stats.
+"""
+
+import asyncio
+import random
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.db.seed_charts import EXERCISES, BREAKFAST_FOODS, LUNCH_FOODS, DINNER_FOODS, SNACK_FOODS
+from loadtest.stats import Recorder
+
+API = "/api/v1"
+
+MEALS = {
+    "breakfast": BREAKFAST_FOODS,
+    "lunch": LUNCH_FOODS,
+    "dinner": DINNER_FOODS,
+    "snack": SNACK_FOODS,
+}
+
+
+class Accounts:
+    """Logins available to the simulated users"""
+
+    def __init__(self, clients: List[str], coaches: List[str], admin: str, password: str, admin_password: str):
+        self.clients = clients
+        self.coaches = coaches
+        self.admin = admin
+        self.password = password
+        self.admin_password = admin_password
+
+    @classmethod
+    def generated(cls, seed: int, clients: int, coaches: int, admin: str, admin_password: str) -> "Accounts":
+        """Accounts created by ``python -m app.db.generate_data --seed <seed>``"""
+        from app.db.generate_data import PASSWORD
+
+        return cls(
+            clients=[f"client{i}@gen{seed}.vibe" for i in range(clients)],
+            coaches=[f"coach{i}@gen{seed}.vibe" for i in range(coaches)],
+            admin=admin,
+            password=PASSWORD,
+            admin_password=admin_password,
+        )
+
+
+class Context:
+    """Shared state of a run: HTTP client, recorder, accounts and tokens"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        recorder: Recorder,
+        accounts: Accounts,
+        rng: random.Random,
+        think_time: float = 0.5,
+        login_ratio: float = 0.2,
+        burst_size: int = 10,
+        admin_polls: int = 5,
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.accounts = accounts
+        self.rng = rng
+        self.think_time = think_time
+        self.login_ratio = login_ratio
+        self.burst_size = burst_size
+        self.admin_polls = admin_polls
+        # email -> access token, so returning users can skip the login
+        self.tokens: Dict[str, str] = {}
+
+
+class Session:
+    """One simulated user"""
+
+    def __init__(self, ctx: Context):
+        self.ctx = ctx
+        self.headers: Dict[str, str] = {}
+
+    async def request(self, method: str, path: str, name: Optional[str] = None, **kwargs) -> Optional[httpx.Response]:
+        """Send a request and record it; returns None when no response arrived"""
+        endpoint = f"{method} {API}{name or path}"
+        started = time.perf_counter()
+        try:
+            response = await self.ctx.client.request(method, f"{API}{path}", headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.ctx.recorder.record(endpoint, time.perf_counter() - started, 0)
+            return None
+        self.ctx.recorder.record(endpoint, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def json(self, method: str, path: str, name: Optional[str] = None, **kwargs):
+        """Send a request and return its JSON body, or None unless it succeeded"""
+        response = await self.request(method, path, name, **kwargs)
+        if response is None or response.status_code >= 400:
+            return None
+        return response.json()
+
+    async def login(self, email: str, password: str) -> bool:
+        """Log in, or reuse the user's token except for a login_ratio share of sessions"""
+        token = self.ctx.tokens.get(email)
+        if token is None or self.ctx.rng.random() < self.ctx.login_ratio:
+            body = await self.json("POST", "/auth/login", json={"email": email, "password": password})
+            if body is None:
+                return False
+            token = self.ctx.tokens[email] = body["access_token"]
+        self.headers = {"Authorization": f"Bearer {token}"}
+        return True
+
+    async def think(self) -> None:
+        """Pause like a user reading the page (exponentially distributed)"""
+        if self.ctx.think_time > 0:
+            await asyncio.sleep(self.ctx.rng.expovariate(1 / self.ctx.think_time))
+
+
+async def client_session(ctx: Context) -> None:
+    """Client dashboard: load progress, logs and charts, then log a workout and a meal"""
+    session = Session(ctx)
+    if not await session.login(ctx.rng.choice(ctx.accounts.clients), ctx.accounts.password):
+        raise RuntimeError("client login failed")
+    await session.request("GET", "/auth/me")
+    await asyncio.gather(
+        session.request("GET", "/client/progress"),
+        session.request("GET", "/client/workout-logs"),
+        session.request("GET", "/client/diet-logs"),
+        session.request("GET", "/client/charts/workout-frequency", params={"days": 30}),
+        session.request("GET", "/client/charts/diet-adherence", params={"days": 30}),
+        session.request("GET", "/client/charts/workout-volume", params={"days": 90}),
+    )
+    await session.think()
+
+    today = date.today().isoformat()
+    await session.request("POST", "/client/workout-logs", json={
+        "workout_date": today,
+        "exercise_name": ctx.rng.choice(EXERCISES),
+        "sets": ctx.rng.randint(2, 5),
+        "reps": ctx.rng.randint(5, 15),
+        "weight": round(ctx.rng.uniform(10, 140), 1),
+        "duration_minutes": ctx.rng.randint(10, 60),
+    })
+    # The dashboard reloads its data after every write
+    await asyncio.gather(
+        session.request("GET", "/client/progress"),
+        session.request("GET", "/client/workout-logs"),
+        session.request("GET", "/client/diet-logs"),
+    )
+    await session.think()
+
+    meal_type = ctx.rng.choice(list(MEALS))
+    food, calories, protein, carbs, fat = ctx.rng.choice(MEALS[meal_type])
+    await session.request("POST", "/client/diet-logs", json={
+        "meal_date": today,
+        "meal_type": meal_type,
+        "food_name": food,
+        "calories": calories,
+        "protein_grams": protein,
+        "carbs_grams": carbs,
+        "fat_grams": fat,
+    })
+    await asyncio.gather(
+        session.request("GET", "/client/progress"),
+        session.request("GET", "/client/workout-logs"),
+        session.request("GET", "/client/diet-logs"),
+    )
+
+
+async def coach_session(ctx: Context) -> None:
+    """Coach dashboard: list clients and charts, review one client, assign a plan"""
+    session = Session(ctx)
+    if not await session.login(ctx.rng.choice(ctx.accounts.coaches), ctx.accounts.password):
+        raise RuntimeError("coach login failed")
+    await session.request("GET", "/auth/me")
+    clients, *_ = await asyncio.gather(
+        session.json("GET", "/coach/clients"),
+        session.request("GET", "/coach/charts/client-overview"),
+        session.request("GET", "/coach/charts/engagement", params={"days": 30}),
+        session.request("GET", "/coach/charts/plan-assignments"),
+    )
+    if not clients:
+        return
+    await session.think()
+
+    client_id = ctx.rng.choice(clients)["id"]
+    await asyncio.gather(
+        session.request("GET", f"/coach/clients/{client_id}", "/coach/clients/{client_id}"),
+        session.request("GET", f"/coach/clients/{client_id}/progress", "/coach/clients/{client_id}/progress"),
+        session.request("GET", f"/coach/clients/{client_id}/workout-logs", "/coach/clients/{client_id}/workout-logs"),
+        session.request("GET", f"/coach/clients/{client_id}/diet-logs", "/coach/clients/{client_id}/diet-logs"),
+    )
+    await session.think()
+
+    today = date.today().isoformat()
+    if ctx.rng.random() < 0.5:
+        await session.request("POST", "/coach/workout-plans", json={
+            "user_id": client_id,
+            "name": "Strength block",
+            "start_date": today,
+            "duration_weeks": ctx.rng.choice([4, 8, 12]),
+            "workout_details": {"days_per_week": ctx.rng.randint(3, 5)},
+        })
+    else:
+        calories = ctx.rng.choice([1800, 2000, 2200, 2500])
+        await session.request("POST", "/coach/diet-plans", json={
+            "user_id": client_id,
+            "name": "Nutrition plan",
+            "start_date": today,
+            "target_calories": calories,
+            "target_protein_grams": round(calories * 0.3 / 4),
+            "target_carbs_grams": round(calories * 0.45 / 4),
+            "target_fat_grams": round(calories * 0.25 / 9),
+        })
+    await session.request("GET", "/coach/charts/plan-assignments")
+
+
+async def admin_session(ctx: Context) -> None:
+    """Admin dashboard: stats, users and charts, then stats polling"""
+    session = Session(ctx)
+    if not await session.login(ctx.accounts.admin, ctx.accounts.admin_password):
+        raise RuntimeError("admin login failed")
+    await session.request("GET", "/auth/me")
+    await asyncio.gather(
+        session.request("GET", "/admin/stats"),
+        session.request("GET", "/admin/users", params={"role": "coach"}),
+        session.request("GET", "/admin/charts/user-growth", params={"days": 90}),
+        session.request("GET", "/admin/charts/platform-usage", params={"days": 30}),
+        session.request("GET", "/admin/charts/system-health", params={"days": 7}),
+    )
+    for _ in range(ctx.admin_polls):
+        await session.think()
+        await session.request("GET", "/admin/stats")
+
+
+async def booking_burst(ctx: Context) -> None:
+    """Several clients book slots with the same coach at the same moment"""
+    emails = ctx.rng.sample(ctx.accounts.clients, min(ctx.burst_size, len(ctx.accounts.clients)))
+    sessions = [Session(ctx) for _ in emails]
+    logged_in = await asyncio.gather(*(
+        session.login(email, ctx.accounts.password) for session, email in zip(sessions, emails)
+    ))
+    sessions = [session for session, ok in zip(sessions, logged_in) if ok]
+    if not sessions:
+        raise RuntimeError("booking clients could not log in")
+
+    coaches = await sessions[0].json("GET", "/bookings/coaches")
+    if not coaches:
+        return
+    coach_id = ctx.rng.choice(coaches)["coach_id"]
+    await asyncio.gather(*(
+        session.request("POST", "/bookings/book", json={
+            "coach_id": coach_id,
+            "slot_number": ctx.rng.randint(1, 10),
+        })
+        for session in sessions
+    ))
+    await asyncio.gather(*(session.request("GET", "/bookings/my-bookings") for session in sessions))
+
+
+SCENARIOS = {
+    "client": client_session,
+    "coach": coach_session,
+    "admin": admin_session,
+    "booking": booking_burst,
+}
@@ -0,0 +1,119 @@
+"""
+Latency and error bookkeeping for load-test runs
+"""
+
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class EndpointStats:
+    """Latencies and status codes of one endpoint"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.status_codes: Counter = Counter()
+
+    def record(self, seconds: float, status_code: int) -> None:
+        """Record one request; status_code 0 means no response (timeout, connection error)"""
+        self.latencies.append(seconds)
+        self.status_codes[status_code] += 1
+
+    @property
+    def errors(self) -> int:
+        """Server errors and requests that got no response"""
+        return sum(count for code, count in self.status_codes.items() if code == 0 or code >= 500)
+
+    @property
+    def rejected(self) -> int:
+        """Requests answered with a 4xx status"""
+        return sum(count for code, count in self.status_codes.items() if 400 <= code < 500)
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latencies.extend(other.latencies)
+        self.status_codes.update(other.status_codes)
+
+    def summary(self, elapsed: float) -> dict:
+        """Count, throughput, error rates and latency percentiles (ms)"""
+        count = len(self.latencies)
+        summary = {
+            "requests": count,
+            "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "rejected": self.rejected,
+            "rejected_rate": round(self.rejected / count, 4) if count else 0.0,
+            "status_codes": {str(code): n for code, n in sorted(self.status_codes.items())},
+        }
+        if count:
+            latencies = np.array(self.latencies) * 1000
+            for p, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+                summary[f"p{p}_ms"] = round(float(value), 2)
+            summary["max_ms"] = round(float(latencies.max()), 2)
+        return summary
+
+
+class Recorder:
+    """Collects request and session outcomes of a run"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.sessions: Counter = Counter()
+        self.failed_sessions: Counter = Counter()
+        self.dropped_sessions = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, endpoint: str, seconds: float, status_code: int) -> None:
+        self.endpoints[endpoint].record(seconds, status_code)
+
+    def finish(self) -> None:
+        self.finished = time.perf_counter()
+
+    def report(self) -> dict:
+        """The run as a JSON-serializable dict"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        overall = EndpointStats()
+        for stats in self.endpoints.values():
+            overall.merge(stats)
+        return {
+            "duration_s": round(elapsed, 2),
+            "sessions": dict(self.sessions),
+            "failed_sessions": dict(self.failed_sessions),
+            "dropped_sessions": self.dropped_sessions,
+            "overall": overall.summary(elapsed),
+            "endpoints": {name: self.endpoints[name].summary(elapsed) for name in sorted(self.endpoints)},
+        }
+
+
+def format_summary(report: dict) -> str:
+    """Terminal table of a report, slowest p95 first"""
+    overall = report["overall"]
+    lines = [
+        f"Duration {report['duration_s']} s, {overall['requests']} requests, "
+        f"{overall['throughput_rps']} req/s, {overall['error_rate']:.2%} errors, "
+        f"{overall['rejected_rate']:.2%} rejected (4xx)",
+        "Sessions: " + ", ".join(f"{name} {count}" for name, count in sorted(report["sessions"].items())),
+    ]
+    if report["failed_sessions"]:
+        lines.append("Failed sessions: " + ", ".join(
+            f"{name} {count}" for name, count in sorted(report["failed_sessions"].items())
+        ))
+    if report["dropped_sessions"]:
+        lines.append(f"Dropped sessions (concurrency limit): {report['dropped_sessions']}")
+    lines.append("")
+    header = f"{'endpoint':<58} {'reqs':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>7} {'4xx':>7}"
+    lines += [header, "-" * len(header)]
+    endpoints = sorted(report["endpoints"].items(), key=lambda item: -item[1].get("p95_ms", 0))
+    for name, stats in endpoints + [("overall", overall)]:
+        lines.append(
+            f"{name:<58} {stats['requests']:>7} {stats['throughput_rps']:>8.1f} "
+            f"{stats.get('p50_ms', 0):>8.1f} {stats.get('p95_ms', 0):>8.1f} {stats.get('p99_ms', 0):>8.1f} "
+            f"{stats['error_rate']:>7.2%} {stats['rejected_rate']:>7.2%}"
+        )
+    lines.append("(latencies in ms; err = 5xx or no response)")
+    return "\n".join(lines)
@@ -11,6 +11,16 @@ from app.db.base import Base, get_db
 
 # Import all models to ensure they're registered with Base
 from app.models import User, WorkoutLog, DietLog, WorkoutPlan, DietPlan, Booking, Feedback
+from app.services.report_jobs import report_job_manager, InMemoryReportJobStore
+from app.core.cache import response_cache
+from app.core.idempotency import idempotency_store
+from app.core.rate_limit import rate_limiter
+from app.services.feedback_buffer import feedback_buffer
+from app.services.exercise_catalog import exercise_catalog
+from app.services.food_catalog import food_catalog
+from app.services.autocomplete import autocomplete
+from app.services.warmup import warmup
+from app.services.health_checks import health_checker
 
 # Test database URL with StaticPool for proper in-memory SQLite sharing
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -37,6 +47,15 @@ async def override_get_db():
 
 app.dependency_overrides[get_db] = override_get_db
 
+# Background workers open their own sessions outside of request scope
+report_job_manager.session_factory = TestSessionLocal
+response_cache.session_factory = TestSessionLocal
+feedback_buffer.session_factory = TestSessionLocal
+autocomplete.session_factory = TestSessionLocal
+warmup.engine = test_engine
+warmup.session_factory = TestSessionLocal
+health_checker.engine = test_engine
+
 
 @pytest.fixture(scope="function", autouse=True)
 async def setup_database():
@@ -46,6 +65,20 @@ async def setup_database():
     
     yield
     
+    await report_job_manager.drain()
+    await response_cache.drain()
+    await feedback_buffer.stop()
+    response_cache.clear()
+    await rate_limiter.store.clear()
+    await idempotency_store.clear()
+    # Ids are reused once the tables are recreated
+    exercise_catalog.clear()
+    food_catalog.clear()
+    autocomplete.reset()
+    warmup.reset()
+    report_job_manager.reset()
+    report_job_manager.store = InMemoryReportJobStore()
+    
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
@@ -5,11 +5,15 @@ Tests for admin endpoints
 import pytest
 from datetime import date, timedelta
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import func, select, text
 
 from app.main import app
 from app.models.user import User, UserRole
 from app.models.workout_log import WorkoutLog
 from app.models.diet_log import DietLog, MealType
+from app.models.diet_plan import DietPlan
+from app.models.plan_template import PlanTemplate, PlanType
+from app.models.workout_plan import WorkoutPlan
 from app.core.security import create_access_token
 
 
@@ -106,6 +110,25 @@ async def test_get_all_users_filtered_by_role(admin_token, client_user, test_db)
     assert all(user["role"] == "client" for user in data)
 
 
+@pytest.mark.asyncio
+async def test_user_list_returns_summaries(admin_token, client_user, test_db):
+    """Test that the user list leaves the profile to the user detail endpoint"""
+    client_user.target_goals = "Run a marathon"
+    client_user.custom_fields = {"timezone": "Europe/London"}
+    await test_db.commit()
+    
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        listed = await ac.get("/api/v1/admin/users?role=client", headers=headers)
+        detail = await ac.get(f"/api/v1/admin/users/{client_user.id}", headers=headers)
+    
+    assert listed.status_code == 200
+    assert set(listed.json()[0]) == {"id", "email", "full_name", "role", "is_active", "is_verified"}
+    assert detail.json()["target_goals"] == "Run a marathon"
+    assert detail.json()["custom_fields"] == {"timezone": "Europe/London"}
+
+
 @pytest.mark.asyncio
 async def test_get_all_users_unauthorized(coach_token):
     """Test that non-admins cannot access admin endpoints"""
@@ -249,3 +272,47 @@ async def test_get_platform_usage_chart(admin_token, client_user, test_db):
     data = response.json()
     # Flexible check for chart data structure
     assert isinstance(data, dict)
+
+
+@pytest.fixture
+async def foreign_keys_on(test_db):
+    """Enforce foreign keys on the shared SQLite connection, as PostgreSQL does"""
+    await test_db.commit()
+    await test_db.execute(text("PRAGMA foreign_keys=ON"))
+    assert await test_db.scalar(text("PRAGMA foreign_keys")) == 1
+    yield
+    await test_db.rollback()
+    await test_db.execute(text("PRAGMA foreign_keys=OFF"))
+
+
+@pytest.mark.asyncio
+async def test_delete_coach_keeps_plans_assigned_from_templates(
+    admin_token, coach_user, client_user, test_db, foreign_keys_on
+):
+    """Test that deleting a coach copies template details into the assigned plans"""
+    template = PlanTemplate(
+        coach_id=coach_user.id, plan_type=PlanType.WORKOUT, name="Strength Block", details={"days": 4, "focus": "squat"}
+    )
+    diet_template = PlanTemplate(coach_id=coach_user.id, plan_type=PlanType.DIET, name="Cut", details={"meals": 5})
+    test_db.add_all([template, diet_template])
+    await test_db.flush()
+    test_db.add_all([
+        WorkoutPlan(user_id=client_user.id, name="Strength Block", start_date=date.today(),
+                    template_id=template.id, workout_details={"focus": "bench"}),
+        DietPlan(user_id=client_user.id, name="Cut", start_date=date.today(), template_id=diet_template.id),
+    ])
+    await test_db.commit()
+    
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.delete(
+            f"/api/v1/admin/users/{coach_user.id}",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+    
+    assert response.status_code == 204
+    assert await test_db.scalar(select(func.count()).select_from(PlanTemplate)) == 0
+    workout = (await test_db.execute(select(WorkoutPlan.template_id, WorkoutPlan.workout_details))).one()
+    assert tuple(workout) == (None, {"days": 4, "focus": "bench"})
+    diet = (await test_db.execute(select(DietPlan.template_id, DietPlan.meal_plan_details))).one()
+    assert tuple(diet) == (None, {"meals": 5})
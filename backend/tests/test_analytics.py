@@ -0,0 +1,122 @@
+"""
+Tests for client analytics
+"""
+
+import numpy as np
+import pytest
+from datetime import date, timedelta
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.workout_log import WorkoutLog
+from app.models.diet_log import DietLog, MealType
+from app.models.diet_plan import DietPlan
+from app.core.security import create_access_token
+from app.analytics import moving_average, period_change, trend_slope, calorie_adherence
+
+
+@pytest.fixture
+async def client_user(test_db):
+    """Create a test client user"""
+    user = User(
+        email="analytics@example.com",
+        hashed_password="hashed_password",
+        full_name="Analytics Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client_token(client_user):
+    """Create an access token for the client user"""
+    return create_access_token({"sub": client_user.email, "user_id": client_user.id})
+
+
+def test_moving_average_and_slope_match_reference():
+    """Test the vectorized metrics against straightforward references"""
+    rng = np.random.default_rng(5)
+    values = rng.integers(0, 3000, size=(4, 60)).astype(float)
+    mask = values > 600
+
+    expected = [
+        [np.mean([v for v, m in zip(row[i - 6:i + 1], mrow[i - 6:i + 1]) if m]) for i in range(6, 60)]
+        for row, mrow in zip(values, mask)
+    ]
+    np.testing.assert_allclose(moving_average(values, 7, mask), expected)
+    np.testing.assert_allclose(moving_average(values[0], 7), np.convolve(values[0], np.ones(7) / 7, "valid"))
+
+    x = np.arange(60)
+    np.testing.assert_allclose(trend_slope(values), [np.polyfit(x, row, 1)[0] for row in values])
+    np.testing.assert_allclose(
+        trend_slope(values, mask), [np.polyfit(x[m], row[m], 1)[0] for row, m in zip(values, mask)]
+    )
+    assert np.isnan(trend_slope(np.zeros(10), np.zeros(10, dtype=bool)))
+
+
+def test_period_change_and_adherence():
+    """Test week-over-week totals, masked means and adherence counts"""
+    values = np.array([1.0] * 7 + [2.0] * 7)
+    assert period_change(values, 7) == (14.0, 7.0)
+
+    calories = np.array([0, 2000, 2150, 2500, 0, 1900, 1000, 2000])
+    current, previous = period_change(calories, 4, calories > 0)
+    assert (current, previous) == pytest.approx((4900 / 3, 6650 / 3))
+
+    stats = calorie_adherence(calories, 2000.0, tolerance=0.1)
+    assert stats["days_logged"] == 6
+    assert stats["days_within_target"] == 4
+    assert stats["rate"] == pytest.approx(66.667, abs=1e-3)
+    assert stats["average_ratio"] == pytest.approx(11550 / 2000 / 6)
+
+
+@pytest.mark.asyncio
+async def test_client_analytics_endpoint(client_user, client_token, test_db):
+    """Test analytics over two weeks of workouts and meals"""
+    today = date.today()
+    for offset in range(20):
+        day = today - timedelta(days=offset)
+        if offset < 7 or offset % 2 == 0:
+            test_db.add(WorkoutLog(user_id=client_user.id, workout_date=day, exercise_name="Run"))
+        test_db.add(DietLog(
+            user_id=client_user.id, meal_date=day, meal_type=MealType.LUNCH,
+            food_name="Meal", calories=1000.0, protein_grams=50.0
+        ))
+        if offset < 7:
+            test_db.add(DietLog(
+                user_id=client_user.id, meal_date=day, meal_type=MealType.DINNER,
+                food_name="Meal", calories=1000.0, protein_grams=50.0
+            ))
+    test_db.add(DietPlan(user_id=client_user.id, name="Cut", start_date=today, target_calories=2000.0))
+    await test_db.commit()
+
+    headers = {"Authorization": f"Bearer {client_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/api/v1/client/analytics", params={"days": 14}, headers=headers)
+        too_short = await ac.get("/api/v1/client/analytics", params={"days": 7}, headers=headers)
+
+    assert response.status_code == 200
+    assert too_short.status_code == 422
+    data = response.json()
+    assert data["dates"][0] == (today - timedelta(days=13)).isoformat()
+    assert len(data["dates"]) == len(data["workouts"]["moving_average_7d"]) == 14
+    assert data["workouts"]["moving_average_7d"][-1] == 1.0
+    # The previous week logged workouts on days 8, 10 and 12 ago
+    assert data["workouts"]["week_over_week"] == {"current": 7.0, "previous": 3.0, "absolute": 4.0, "percent": 133.3}
+    assert data["calories"]["week_over_week"]["percent"] == 100.0
+    assert data["calories"]["trend_per_week"] > 0
+    assert data["protein_grams"]["moving_average_7d"][-1] == 100.0
+    assert data["adherence"] == {
+        "target_calories": 2000.0,
+        "days_logged": 14,
+        "days_within_target": 7,
+        "rate": 50.0,
+        "average_ratio": 0.75,
+    }
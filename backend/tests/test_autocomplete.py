@@ -0,0 +1,159 @@
+"""
+Tests for exercise and food autocomplete
+"""
+
+import threading
+import pytest
+from datetime import date
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.workout_log import WorkoutLog
+from app.models.diet_log import DietLog, MealType
+from app.models.food import Food
+from app.core.security import create_access_token
+from app.services.autocomplete import autocomplete, PrefixIndex
+
+
+@pytest.fixture
+async def client_user(test_db):
+    """Create a test client user"""
+    user = User(
+        email="autocomplete@example.com",
+        hashed_password="hashed_password",
+        full_name="Autocomplete Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+async def other_user(test_db):
+    """Create a second client user"""
+    user = User(
+        email="autocomplete-other@example.com",
+        hashed_password="hashed_password",
+        full_name="Other Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client_token(client_user):
+    """Create an access token for the client user"""
+    return create_access_token({"sub": client_user.email, "user_id": client_user.id})
+
+
+def test_prefix_index_matches_word_prefixes():
+    """Test that any word of a name can start the match"""
+    index = PrefixIndex()
+    index.add("Bench Press")
+    index.add("Overhead Press")
+    index.add("Deadlift")
+
+    assert {s["name"] for s in index.search("pre")} == {"Bench Press", "Overhead Press"}
+    assert [s["name"] for s in index.search("BENCH p")] == ["Bench Press"]
+    assert index.search("x") == []
+
+
+def test_prefix_index_ranks_user_then_global_usage():
+    """Test that the user's own usage outranks global popularity"""
+    index = PrefixIndex()
+    index.add("Squat", user_id=1, uses=50)
+    index.add("Split Squat", user_id=2, uses=2)
+    index.add("Sumo Squat", user_id=1, uses=1)
+
+    assert [s["name"] for s in index.search("s")] == ["Squat", "Split Squat", "Sumo Squat"]
+    assert [s["name"] for s in index.search("s", user_id=2)] == ["Split Squat", "Squat", "Sumo Squat"]
+
+    index.add("Split Squat", user_id=2, uses=-2)
+    assert index.search("split", user_id=2)[0]["user_uses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_index_built_from_logs_and_catalog(client_user, other_user, client_token, test_db):
+    """Test building the indexes at startup from existing logs and foods"""
+    test_db.add_all([
+        WorkoutLog(user_id=other_user.id, workout_date=date.today(), exercise_name="Bench Press"),
+        WorkoutLog(user_id=other_user.id, workout_date=date.today(), exercise_name="Bench Press"),
+        WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Back Squat"),
+        DietLog(user_id=client_user.id, meal_date=date.today(), meal_type=MealType.SNACK, food_name="Protein shake"),
+        Food(name="Peanut Butter", normalized_name="peanut butter", calories=95.0),
+    ])
+    await test_db.commit()
+    await autocomplete.build()
+
+    headers = {"Authorization": f"Bearer {client_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        exercises = await ac.get("/api/v1/client/autocomplete/exercises", params={"q": "b"}, headers=headers)
+        foods = await ac.get("/api/v1/client/autocomplete/foods", params={"q": "p"}, headers=headers)
+
+    assert exercises.status_code == 200
+    # The user's own exercise ranks above the globally more popular one
+    assert [s["name"] for s in exercises.json()] == ["Back Squat", "Bench Press"]
+    assert exercises.json()[1]["total_uses"] == 2
+    assert exercises.json()[1]["id"] is not None
+    assert [s["name"] for s in foods.json()] == ["Protein shake", "Peanut Butter"]
+
+
+@pytest.mark.asyncio
+async def test_index_loads_off_the_event_loop(client_user, test_db, monkeypatch):
+    """Test that rebuilds sort the new index in a worker thread"""
+    threads = []
+    load = PrefixIndex.load
+
+    def recording_load(self, rows):
+        threads.append(threading.current_thread())
+        load(self, rows)
+
+    monkeypatch.setattr(PrefixIndex, "load", recording_load)
+    test_db.add(WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Front Squat"))
+    await test_db.commit()
+    await autocomplete.build()
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+    assert autocomplete.exercises.search("front")[0]["name"] == "Front Squat"
+
+
+@pytest.mark.asyncio
+async def test_index_updated_on_log_writes(client_token):
+    """Test that creating, renaming and deleting logs update suggestions"""
+    headers = {"Authorization": f"Bearer {client_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        created = await ac.post(
+            "/api/v1/client/workout-logs",
+            headers=headers,
+            json={"workout_date": date.today().isoformat(), "exercise_name": "Romanian Deadlift"}
+        )
+        after_create = await ac.get("/api/v1/client/autocomplete/exercises", params={"q": "dead"}, headers=headers)
+
+        await ac.put(
+            f"/api/v1/client/workout-logs/{created.json()['id']}",
+            headers=headers,
+            json={"exercise_name": "Stiff Leg Deadlift"}
+        )
+        after_rename = await ac.get("/api/v1/client/autocomplete/exercises", params={"q": "dead"}, headers=headers)
+
+        await ac.delete(f"/api/v1/client/workout-logs/{created.json()['id']}", headers=headers)
+        after_delete = await ac.get("/api/v1/client/autocomplete/exercises", params={"q": "stiff"}, headers=headers)
+
+    assert after_create.json()[0]["name"] == "Romanian Deadlift"
+    assert after_create.json()[0]["id"] == created.json()["exercise_id"]
+    assert after_rename.json()[0]["name"] == "Stiff Leg Deadlift"
+    assert after_rename.json()[0]["user_uses"] == 1
+    assert after_delete.json()[0]["user_uses"] == 0
@@ -0,0 +1,164 @@
+"""
+Tests for the response cache and cached admin chart endpoints
+"""
+
+import asyncio
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.core.cache import ResponseCache, response_cache
+from app.core.metrics import metrics
+from app.core.security import create_access_token
+
+
+@pytest.fixture
+async def admin_user(test_db):
+    """Create a test admin user"""
+    user = User(
+        email="cacheadmin@example.com",
+        hashed_password="hashed_password",
+        full_name="Cache Admin",
+        role=UserRole.ADMIN,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def admin_token(admin_user):
+    """Create an access token for the admin user"""
+    return create_access_token({"sub": admin_user.email, "user_id": admin_user.id})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_coalesced():
+    """Test that a cold key is computed once for many concurrent callers"""
+    cache = ResponseCache(max_entries=10)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(
+        *[cache.get_or_compute("k", "test.coalesce", compute, ttl=60) for _ in range(50)]
+    )
+
+    assert calls == 1
+    assert all(result == {"value": 42} for result in results)
+    assert metrics.get("cache_misses_total", namespace="test.coalesce") == 1
+    assert metrics.get("cache_coalesced_total", namespace="test.coalesce") == 49
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_revalidating():
+    """Test stale-while-revalidate refreshes the entry in the background"""
+    cache = ResponseCache(max_entries=10)
+    version = 0
+
+    async def compute():
+        nonlocal version
+        version += 1
+        return version
+
+    assert await cache.get_or_compute("k", "test.swr", compute, ttl=0, stale_ttl=60) == 1
+    # Expired but within the stale window: old value now, refresh in background
+    assert await cache.get_or_compute("k", "test.swr", compute, ttl=0, stale_ttl=60) == 1
+    await cache.drain()
+    assert await cache.get_or_compute("k", "test.swr", compute, ttl=0, stale_ttl=60) == 2
+    assert metrics.get("cache_revalidations_total", namespace="test.swr") >= 1
+
+
+@pytest.mark.asyncio
+async def test_failed_computation_is_not_cached():
+    """Test that errors propagate and the next call recomputes"""
+    cache = ResponseCache(max_entries=10)
+    attempts = 0
+
+    async def compute():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("k", "test.error", compute, ttl=60)
+    assert await cache.get_or_compute("k", "test.error", compute, ttl=60) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters():
+    """Test that a waiter recomputes when the caller it coalesced onto is cancelled"""
+    cache = ResponseCache(max_entries=10)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.create_task(cache.get_or_compute("k", "test.cancel", compute, ttl=60))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_compute("k", "test.cancel", compute, ttl=60))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await waiter == 2
+    assert leader.cancelled()
+    assert await cache.get_or_compute("k", "test.cancel", compute, ttl=60) == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_are_bounded():
+    """Test that the least recently used entries are evicted"""
+    cache = ResponseCache(max_entries=2)
+
+    for key in ("a", "b", "c"):
+        async def compute(key=key):
+            return key
+        await cache.get_or_compute(key, "test.lru", compute, ttl=60)
+
+    assert list(cache._entries) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_admin_chart_is_served_from_cache(admin_token):
+    """Test that repeated chart requests with the same parameters hit the cache"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    namespace = "admin.coach_performance"
+    hits_before = metrics.get("cache_hits_total", namespace=namespace)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get("/api/v1/admin/charts/coach-performance", headers=headers)
+        second = await ac.get("/api/v1/admin/charts/coach-performance", headers=headers)
+        stats = await ac.get("/api/v1/admin/metrics", headers=headers)
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert metrics.get("cache_hits_total", namespace=namespace) == hits_before + 1
+    assert stats.status_code == 200
+    assert "counters" in stats.json()
+
+
+@pytest.mark.asyncio
+async def test_admin_chart_cache_varies_by_parameters(admin_token):
+    """Test that different query parameters use different cache entries"""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.get("/api/v1/admin/charts/system-health?days=7", headers=headers)
+        await ac.get("/api/v1/admin/charts/system-health?days=30", headers=headers)
+
+    keys = [key for key in response_cache._entries if key.startswith("admin.system_health")]
+    assert len(keys) == 2
@@ -177,6 +177,37 @@ async def test_get_progress(client_user, client_token, test_db):
     assert data["last_30_days"]["diet_logs"] >= 1
 
 
+@pytest.mark.asyncio
+async def test_get_progress_window_with_comparison(client_user, client_token, test_db):
+    """Test progress over a custom window compared with the prior period"""
+    today = date.today()
+    test_db.add_all([
+        WorkoutLog(user_id=client_user.id, workout_date=today, exercise_name="Squat"),
+        WorkoutLog(user_id=client_user.id, workout_date=today - timedelta(days=3), exercise_name="Squat"),
+        # Prior 7-day period
+        WorkoutLog(user_id=client_user.id, workout_date=today - timedelta(days=10), exercise_name="Squat"),
+        # Outside both periods
+        WorkoutLog(user_id=client_user.id, workout_date=today - timedelta(days=40), exercise_name="Squat"),
+    ])
+    await test_db.commit()
+    
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/api/v1/client/progress",
+            params={"days": 7, "compare": True},
+            headers={"Authorization": f"Bearer {client_token}"}
+        )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["window"]["days"] == 7
+    assert data["last_7_days"]["workout_sessions"] == 2
+    assert data["previous_period"]["workout_sessions"] == 1
+    assert data["change"]["workout_sessions"] == {"absolute": 1, "percent": 100.0}
+    assert data["change"]["diet_logs"] == {"absolute": 0, "percent": None}
+
+
 @pytest.mark.asyncio
 async def test_update_profile(client_token, test_db):
     """Test updating user profile"""
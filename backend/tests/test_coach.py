@@ -125,6 +125,30 @@ async def test_get_client(coach_token, client_user, booking, test_db):
     assert data["full_name"] == "Test Client"
 
 
+@pytest.mark.asyncio
+async def test_client_routes_with_several_bookings(coach_token, client_user, booking, test_db):
+    """Test that a coach with more than one booking with a client can open every client view"""
+    from app.models.booking import Booking, BookingStatus
+    
+    test_db.add(Booking(
+        coach_id=booking.coach_id,
+        client_id=client_user.id,
+        slot_number=2,
+        scheduled_at=booking.scheduled_at + timedelta(days=7),
+        status=BookingStatus.PENDING
+    ))
+    await test_db.commit()
+    
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for suffix in ("", "/workout-logs", "/diet-logs", "/progress", "/records", "/analytics"):
+            response = await ac.get(
+                f"/api/v1/coach/clients/{client_user.id}{suffix}",
+                headers={"Authorization": f"Bearer {coach_token}"}
+            )
+            assert response.status_code == 200, suffix
+
+
 @pytest.mark.asyncio
 async def test_get_client_not_found(coach_token, test_db):
     """Test getting a non-existent client returns 404"""
@@ -279,6 +303,37 @@ async def test_get_client_diet_logs(coach_token, client_user, booking, test_db):
     assert len(data) >= 1
 
 
+@pytest.mark.asyncio
+async def test_get_client_progress_matches_client_view(coach_token, client_user, booking, test_db):
+    """Test that coaches see the same progress metrics as the client"""
+    test_db.add_all([
+        WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Running"),
+        WorkoutPlan(user_id=client_user.id, name="Base Plan", start_date=date.today()),
+    ])
+    await test_db.commit()
+    
+    client_token = create_access_token({"sub": client_user.email, "user_id": client_user.id})
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        coach_view = await ac.get(
+            f"/api/v1/coach/clients/{client_user.id}/progress",
+            params={"days": 90, "compare": True},
+            headers={"Authorization": f"Bearer {coach_token}"}
+        )
+        client_view = await ac.get(
+            "/api/v1/client/progress",
+            params={"days": 90, "compare": True},
+            headers={"Authorization": f"Bearer {client_token}"}
+        )
+    
+    assert coach_view.status_code == 200
+    data = coach_view.json()
+    assert data.pop("client_id") == client_user.id
+    assert data == client_view.json()
+    assert data["last_90_days"]["workout_sessions"] == 1
+    assert data["active_plans"]["workout_plans"] == 1
+
+
 @pytest.mark.asyncio
 async def test_get_coach_profile(coach_token, test_db):
     """Test getting coach profile"""
@@ -321,3 +376,116 @@ async def test_update_coach_profile(coach_token, test_db):
     assert data["experience"] == "10 years of professional coaching"
     assert data["certifications"] == "NSCA-CSCS, ACE-CPT"
     assert data["specialties"] == "Strength training, nutrition coaching"
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_workout_plan_template(coach_token, client_user, test_db):
+    """Test assigning a template to several clients with per-client overrides"""
+    clients = [client_user]
+    for i in range(2, 4):
+        user = User(email=f"client{i}@example.com", hashed_password="hashed_password",
+                    full_name=f"Client {i}", role=UserRole.CLIENT)
+        test_db.add(user)
+        clients.append(user)
+    await test_db.commit()
+    client_ids = [client.id for client in clients]
+    headers = {"Authorization": f"Bearer {coach_token}"}
+    details = {"days": {"monday": ["Squat", "Bench Press"], "thursday": ["Deadlift"]}, "notes": "RPE 7"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/v1/coach/plan-templates",
+            headers=headers,
+            json={"plan_type": "workout", "name": "Strength Block", "details": details}
+        )
+        assert response.status_code == 201
+        template_id = response.json()["id"]
+
+        response = await ac.post(
+            "/api/v1/coach/workout-plans/bulk-assign",
+            headers=headers,
+            json={
+                "template_id": template_id,
+                "user_ids": client_ids + [client_ids[0]],
+                "start_date": date.today().isoformat(),
+                "duration_weeks": 8,
+                "overrides": {str(client_ids[1]): {"notes": "Knee-friendly: box squats"}},
+            }
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created"] == 3
+        assert len(set(data["plan_ids"])) == 3
+
+        # Template edits reach every assigned plan
+        response = await ac.put(
+            f"/api/v1/coach/plan-templates/{template_id}",
+            headers=headers,
+            json={"details": {**details, "deload_week": 4}}
+        )
+        assert response.status_code == 200
+
+        client_token = create_access_token({"sub": clients[1].email, "user_id": client_ids[1]})
+        response = await ac.get("/api/v1/client/workout-plans", headers={"Authorization": f"Bearer {client_token}"})
+
+    plans = response.json()
+    assert len(plans) == 1
+    assert plans[0]["name"] == "Strength Block"
+    assert plans[0]["template_id"] == template_id
+    assert plans[0]["duration_weeks"] == 8
+    assert plans[0]["workout_details"] == {**details, "deload_week": 4, "notes": "Knee-friendly: box squats"}
+
+    # Plan rows store only the overrides, never a copy of the template
+    from sqlalchemy import select
+    rows = (await test_db.execute(
+        select(WorkoutPlan.user_id, WorkoutPlan.workout_details).where(WorkoutPlan.template_id == template_id)
+    )).all()
+    assert {user_id: stored for user_id, stored in rows} == {
+        client_ids[0]: None, client_ids[1]: {"notes": "Knee-friendly: box squats"}, client_ids[2]: None
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_validation(coach_token, coach_user, client_user, test_db):
+    """Test that bulk assignment checks the template and every target user"""
+    from app.models.plan_template import PlanTemplate, PlanType
+
+    other_coach = User(email="othercoach@example.com", hashed_password="hashed_password",
+                       full_name="Other Coach", role=UserRole.COACH)
+    test_db.add(other_coach)
+    await test_db.commit()
+    diet_template = PlanTemplate(coach_id=coach_user.id, plan_type=PlanType.DIET, name="Cut",
+                                 details={"meals": 4})
+    foreign_template = PlanTemplate(coach_id=other_coach.id, plan_type=PlanType.WORKOUT, name="Theirs")
+    test_db.add_all([diet_template, foreign_template])
+    await test_db.commit()
+
+    headers = {"Authorization": f"Bearer {coach_token}"}
+    body = {"user_ids": [client_user.id], "start_date": date.today().isoformat()}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        # Wrong plan type and another coach's template
+        for template_id in (diet_template.id, foreign_template.id):
+            response = await ac.post("/api/v1/coach/workout-plans/bulk-assign", headers=headers,
+                                     json={**body, "template_id": template_id})
+            assert response.status_code == 404
+
+        response = await ac.post("/api/v1/coach/diet-plans/bulk-assign", headers=headers,
+                                 json={**body, "template_id": diet_template.id, "user_ids": [client_user.id, other_coach.id]})
+        assert response.status_code == 404
+        assert str(other_coach.id) in response.json()["detail"]
+
+        response = await ac.post("/api/v1/coach/diet-plans/bulk-assign", headers=headers,
+                                 json={**body, "template_id": diet_template.id, "overrides": {"999": {}}})
+        assert response.status_code == 400
+
+        response = await ac.post("/api/v1/coach/diet-plans/bulk-assign", headers=headers,
+                                 json={**body, "template_id": diet_template.id, "target_calories": 1800})
+        assert response.status_code == 201
+
+    from sqlalchemy import select
+    plans = (await test_db.execute(select(DietPlan))).scalars().all()
+    assert len(plans) == 1
+    assert plans[0].target_calories == 1800
+    assert plans[0].resolved_meal_plan_details == {"meals": 4}
@@ -5,9 +5,12 @@ Tests for dependency functions
 import pytest
 from fastapi import HTTPException
 from jose import jwt
+from sqlalchemy import inspect
 
 from app.models.user import User, UserRole
-from app.core.dependencies import get_current_user, get_current_active_user, require_coach, require_admin
+from app.core.dependencies import (
+    get_current_user, get_current_active_user, load_full_profile, require_coach, require_admin
+)
 from app.core.security import create_access_token
 from app.core.config import settings
 
@@ -94,6 +97,23 @@ async def test_get_current_user_valid_token(test_db, active_client_user):
     assert user.email == active_client_user.email
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_loads_only_core_columns(test_db, active_client_user):
+    """Test that authentication leaves the profile columns to the endpoints that need them"""
+    token = create_access_token({
+        "sub": active_client_user.email,
+        "user_id": active_client_user.id
+    })
+    test_db.expunge_all()
+    
+    user = await get_current_user(token, test_db)
+    
+    assert {"height", "target_goals", "track_record", "custom_fields", "hashed_password"} <= inspect(user).unloaded
+    
+    user = await load_full_profile(test_db, user)
+    assert {"height", "target_goals", "track_record", "custom_fields"}.isdisjoint(inspect(user).unloaded)
+
+
 @pytest.mark.asyncio
 async def test_get_current_user_invalid_token(test_db):
     """Test getting current user with invalid token raises exception"""
@@ -0,0 +1,179 @@
+"""
+Tests for chart downsampling
+"""
+
+import math
+import random
+
+import pytest
+from datetime import date, timedelta
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.workout_log import WorkoutLog
+from app.models.diet_log import DietLog, MealType
+from app.core.downsample import downsample_chart, lttb_indices
+from app.core.security import create_access_token
+
+
+def reference_lttb(data, threshold):
+    """Straightforward LTTB over (x, y) pairs, as published by Steinarsson"""
+    if threshold >= len(data) or threshold < 3:
+        return list(range(len(data)))
+
+    every = (len(data) - 2) / (threshold - 2)
+    sampled = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, len(data))
+        avg_x = sum(data[j][0] for j in range(avg_start, avg_end)) / (avg_end - avg_start)
+        avg_y = sum(data[j][1] for j in range(avg_start, avg_end)) / (avg_end - avg_start)
+
+        range_start = math.floor(i * every) + 1
+        range_end = math.floor((i + 1) * every) + 1
+        max_area = -1
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs(
+                (data[a][0] - avg_x) * (data[j][1] - data[a][1])
+                - (data[a][0] - data[j][0]) * (avg_y - data[a][1])
+            )
+            if area > max_area:
+                max_area = area
+                next_a = j
+        sampled.append(next_a)
+        a = next_a
+    sampled.append(len(data) - 1)
+    return sampled
+
+
+@pytest.fixture
+async def client_user(test_db):
+    """Create a test client user"""
+    user = User(
+        email="downsample@example.com",
+        hashed_password="hashed_password",
+        full_name="Downsample Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client_token(client_user):
+    """Create an access token for the client user"""
+    return create_access_token({"sub": client_user.email, "user_id": client_user.id})
+
+
+def test_lttb_matches_reference_implementation():
+    """Test the vectorized LTTB against the reference loop on random series"""
+    rng = random.Random(7)
+    for n, threshold in [(10, 5), (100, 12), (365, 50), (1000, 97), (53, 52)]:
+        values = [rng.gauss(50, 15) for _ in range(n)]
+        expected = reference_lttb(list(enumerate(values)), threshold)
+        assert lttb_indices(values, threshold).tolist() == expected
+
+
+def test_lttb_golden_output():
+    """Test LTTB keeps the extremes of a known series"""
+    values = [1, 5, 2, 8, 3, 9, 1, 1, 7, 2]
+    assert lttb_indices(values, 5).tolist() == [0, 1, 5, 6, 9]
+
+
+def test_bucket_downsampling_reports_avg_min_max():
+    """Test bucketed aggregation over equal-size buckets"""
+    chart = downsample_chart(
+        ["d0", "d1", "d2", "d3", "d4", "d5"], {"data": [1, 3, 2, 6, 4, 4]}, 3, method="bucket"
+    )
+    assert chart["labels"] == ["d0", "d2", "d4"]
+    assert chart["data"] == [2.0, 4.0, 4.0]
+    assert chart["min"]["data"] == [1.0, 2.0, 4.0]
+    assert chart["max"]["data"] == [3.0, 6.0, 4.0]
+    assert chart["downsampled"] == {"method": "bucket", "points": 3, "source_points": 6}
+
+
+def test_short_series_are_returned_unchanged():
+    """Test that series within max_points are not modified"""
+    series = {"data": [1, 2, 3]}
+    assert downsample_chart(["a", "b", "c"], series, 10) == {"labels": ["a", "b", "c"], "data": [1, 2, 3]}
+    assert downsample_chart(["a", "b", "c"], series, None) == {"labels": ["a", "b", "c"], "data": [1, 2, 3]}
+
+
+@pytest.mark.asyncio
+async def test_workout_volume_chart_downsampled_against_full_resolution(client_user, client_token, test_db):
+    """Test that downsampled volume points are a subset of the full-resolution chart"""
+    rng = random.Random(3)
+    today = date.today()
+    test_db.add_all([
+        WorkoutLog(
+            user_id=client_user.id,
+            workout_date=today - timedelta(days=offset),
+            exercise_name="Bench Press",
+            weight=round(60 + offset * 0.1 + rng.uniform(-5, 5), 1)
+        )
+        for offset in range(200)
+    ])
+    await test_db.commit()
+
+    headers = {"Authorization": f"Bearer {client_token}"}
+    url = "/api/v1/client/charts/workout-volume"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        full = (await ac.get(url, params={"days": 365}, headers=headers)).json()
+        unreduced = (await ac.get(url, params={"days": 365, "max_points": 500}, headers=headers)).json()
+        reduced = (await ac.get(url, params={"days": 365, "max_points": 30}, headers=headers)).json()
+        invalid = await ac.get(url, params={"days": 365, "max_points": 1}, headers=headers)
+
+    assert unreduced == full
+    assert invalid.status_code == 422
+
+    full_series = full["data"]["Bench Press"]
+    series = reduced["data"]["Bench Press"]
+    assert len(full_series["dates"]) == 200
+    assert len(series["dates"]) == 30
+    assert series["downsampled"] == {"method": "lttb", "points": 30, "source_points": 200}
+    assert series["dates"][0] == full_series["dates"][0]
+    assert series["dates"][-1] == full_series["dates"][-1]
+    by_date = dict(zip(full_series["dates"], full_series["max_weights"]))
+    assert all(by_date[d] == w for d, w in zip(series["dates"], series["max_weights"]))
+
+
+@pytest.mark.asyncio
+async def test_diet_adherence_chart_bucketed(client_user, client_token, test_db):
+    """Test bucketed diet adherence averages the full-resolution daily totals"""
+    today = date.today()
+    test_db.add_all([
+        DietLog(
+            user_id=client_user.id,
+            meal_date=today - timedelta(days=offset),
+            meal_type=MealType.LUNCH,
+            food_name="Rice Bowl",
+            calories=float(1800 + offset * 10)
+        )
+        for offset in range(90)
+    ])
+    await test_db.commit()
+
+    headers = {"Authorization": f"Bearer {client_token}"}
+    url = "/api/v1/client/charts/diet-adherence"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        full = (await ac.get(url, params={"days": 365}, headers=headers)).json()
+        bucketed = (await ac.get(
+            url, params={"days": 365, "max_points": 9, "downsample": "bucket"}, headers=headers
+        )).json()
+
+    assert len(bucketed["labels"]) == 9
+    assert bucketed["labels"] == full["labels"][::10]
+    assert bucketed["calories"] == [
+        sum(full["calories"][i:i + 10]) / 10 for i in range(0, 90, 10)
+    ]
+    assert bucketed["max"]["calories"] == [max(full["calories"][i:i + 10]) for i in range(0, 90, 10)]
+    assert bucketed["targets"] == full["targets"]
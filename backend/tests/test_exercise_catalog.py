@@ -0,0 +1,169 @@
+"""
+Tests for the exercise catalog and exercise id interning
+"""
+
+import pytest
+from datetime import date
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select, func
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.exercise import Exercise
+from app.models.workout_log import WorkoutLog
+from app.core.metrics import metrics
+from app.core.security import create_access_token
+from app.services.exercise_catalog import exercise_catalog
+
+
+@pytest.fixture
+async def client_user(test_db):
+    """Create a test client user"""
+    user = User(
+        email="catalogclient@example.com",
+        hashed_password="hashed_password",
+        full_name="Catalog Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+async def admin_user(test_db):
+    """Create a test admin user"""
+    user = User(
+        email="catalogadmin@example.com",
+        hashed_password="hashed_password",
+        full_name="Catalog Admin",
+        role=UserRole.ADMIN,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client_token(client_user):
+    """Create an access token for the client user"""
+    return create_access_token({"sub": client_user.email, "user_id": client_user.id})
+
+
+@pytest.fixture
+def admin_token(admin_user):
+    """Create an access token for the admin user"""
+    return create_access_token({"sub": admin_user.email, "user_id": admin_user.id})
+
+
+@pytest.mark.asyncio
+async def test_spelling_variants_share_one_exercise(client_user, client_token, test_db):
+    """Test that case and whitespace variants resolve to the same exercise id"""
+    test_db.add_all([
+        WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Bench Press", weight=60.0),
+        WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="bench  press ", weight=80.0),
+        WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Squat", weight=100.0),
+    ])
+    await test_db.commit()
+
+    ids = (await test_db.execute(select(WorkoutLog.exercise_id).order_by(WorkoutLog.id))).scalars().all()
+    assert ids[0] == ids[1] != ids[2]
+    assert (await test_db.execute(select(func.count(Exercise.id)))).scalar() == 2
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/api/v1/client/charts/workout-volume",
+            params={"exercise": "BENCH PRESS"},
+            headers={"Authorization": f"Bearer {client_token}"}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["exercises"] == ["Bench Press"]
+    assert data["data"]["Bench Press"]["avg_weights"] == [70.0]
+    assert data["data"]["Bench Press"]["max_weights"] == [80.0]
+
+
+@pytest.mark.asyncio
+async def test_known_names_are_served_from_cache(client_user, test_db):
+    """Test that repeated names do not query the catalog again"""
+    test_db.add(WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Deadlift"))
+    await test_db.commit()
+
+    hits_before = metrics.get("exercise_cache_hits_total")
+    misses_before = metrics.get("exercise_cache_misses_total")
+    test_db.add(WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="deadlift"))
+    await test_db.commit()
+
+    assert metrics.get("exercise_cache_hits_total") == hits_before + 1
+    assert metrics.get("exercise_cache_misses_total") == misses_before
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_exercise_is_not_cached(client_user, test_db):
+    """Test that ids created in a rolled back transaction are forgotten"""
+    test_db.add(WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Snatch"))
+    await test_db.flush()
+    await test_db.rollback()
+
+    assert await exercise_catalog.resolve(test_db, "Snatch") is None
+
+
+@pytest.mark.asyncio
+async def test_renaming_a_log_reassigns_exercise(client_user, client_token, test_db):
+    """Test that updating exercise_name moves the log to the new exercise"""
+    transport = ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {client_token}"}
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        created = await ac.post(
+            "/api/v1/client/workout-logs",
+            headers=headers,
+            json={"workout_date": date.today().isoformat(), "exercise_name": "Row"}
+        )
+        updated = await ac.put(
+            f"/api/v1/client/workout-logs/{created.json()['id']}",
+            headers=headers,
+            json={"exercise_name": "Pull Up"}
+        )
+
+    assert updated.status_code == 200
+    assert updated.json()["exercise_id"] != created.json()["exercise_id"]
+    assert updated.json()["exercise_id"] == await exercise_catalog.resolve(test_db, "pull up")
+
+
+@pytest.mark.asyncio
+async def test_admin_adds_exercise_alias(admin_token, client_user, test_db):
+    """Test that an alias resolves new logs to the canonical exercise"""
+    test_db.add(WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="Bench Press"))
+    await test_db.commit()
+    exercise_id = await exercise_catalog.resolve(test_db, "Bench Press")
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            f"/api/v1/admin/exercises/{exercise_id}/aliases", json={"alias": "BP"}, headers=headers
+        )
+        duplicate = await ac.post(
+            f"/api/v1/admin/exercises/{exercise_id}/aliases", json={"alias": "bench press"}, headers=headers
+        )
+        missing = await ac.post("/api/v1/admin/exercises/999/aliases", json={"alias": "x"}, headers=headers)
+        catalog = await ac.get("/api/v1/admin/exercises", headers=headers)
+
+    assert response.status_code == 201
+    assert response.json()["aliases"] == ["bp"]
+    assert duplicate.status_code == 409
+    assert missing.status_code == 404
+    assert catalog.json() == [{"id": exercise_id, "name": "Bench Press", "aliases": ["bp"]}]
+
+    log = WorkoutLog(user_id=client_user.id, workout_date=date.today(), exercise_name="bp")
+    test_db.add(log)
+    await test_db.commit()
+    assert log.exercise_id == exercise_id
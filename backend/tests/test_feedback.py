@@ -2,6 +2,8 @@
 Tests for feedback endpoints
 """
 
+from datetime import datetime
+
 import pytest
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy import select
@@ -9,7 +11,11 @@ from sqlalchemy import select
 from app.main import app
 from app.models.user import User, UserRole
 from app.models.feedback import Feedback, FeedbackStatus
+from app.core.config import settings
+from app.core.metrics import metrics
 from app.core.security import create_access_token
+from app.services.feedback_buffer import feedback_buffer, FeedbackBuffer, FeedbackBufferFull
+from tests.conftest import TestSessionLocal
 
 
 @pytest.fixture
@@ -75,12 +81,21 @@ async def test_submit_feedback_authenticated(client_token, test_db):
             headers={"Authorization": f"Bearer {client_token}"}
         )
     
-    assert response.status_code == 201
+    assert response.status_code == 202
     data = response.json()
-    assert data["message"] == feedback_data["message"]
-    assert data["status"] == "open"
-    assert "created_at" in data
-    assert "updated_at" in data
+    assert data["status"] == "queued"
+    
+    await feedback_buffer.flush()
+    result = await test_db.execute(
+        select(Feedback).where(Feedback.submission_id == data["submission_id"])
+    )
+    feedback = result.scalar_one()
+    assert feedback.message == feedback_data["message"]
+    assert feedback.status == FeedbackStatus.OPEN
+    assert feedback.user_id is not None
+    assert feedback.name == "Test Client"
+    assert feedback.created_at is not None
+    assert feedback.updated_at is not None
 
 
 @pytest.mark.asyncio
@@ -101,12 +116,20 @@ async def test_submit_feedback_anonymous(test_db):
             json=feedback_data
         )
     
-    assert response.status_code == 201
+    assert response.status_code == 202
     data = response.json()
-    assert data["message"] == feedback_data["message"]
-    assert data["name"] == feedback_data["name"]
-    assert data["email"] == feedback_data["email"]
-    assert data["status"] == "open"
+    assert data["submission_id"]
+    
+    await feedback_buffer.flush()
+    result = await test_db.execute(
+        select(Feedback).where(Feedback.submission_id == data["submission_id"])
+    )
+    feedback = result.scalar_one()
+    assert feedback.message == feedback_data["message"]
+    assert feedback.name == feedback_data["name"]
+    assert feedback.email == feedback_data["email"]
+    assert feedback.user_id is None
+    assert feedback.status == FeedbackStatus.OPEN
 
 
 @pytest.mark.asyncio
@@ -146,6 +169,97 @@ async def test_get_all_feedback_non_admin_forbidden(client_token):
     assert response.status_code == 403
 
 
+@pytest.mark.asyncio
+async def test_get_all_feedback_keyset_pagination(admin_token, test_db):
+    """Test walking all feedback with X-Next-Cursor without gaps or repeats"""
+    # Same created_at for every row so the id tie-breaker is exercised
+    created_at = datetime(2026, 1, 1, 12, 0, 0)
+    test_db.add_all([
+        Feedback(message=f"Feedback {i}", is_anonymous=True, created_at=created_at)
+        for i in range(7)
+    ])
+    await test_db.commit()
+    
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    seen = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        params = {"limit": 3}
+        while True:
+            response = await ac.get("/api/v1/feedback/", params=params, headers=headers)
+            assert response.status_code == 200
+            seen.extend(item["id"] for item in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params = {"limit": 3, "cursor": cursor}
+    
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_next_cursor_header_is_exposed_to_browsers(admin_token, test_db):
+    """Test that cross-origin frontends may read X-Next-Cursor"""
+    test_db.add_all([Feedback(message=f"Feedback {i}", is_anonymous=True) for i in range(2)])
+    await test_db.commit()
+    
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/api/v1/feedback/",
+            params={"limit": 1},
+            headers={"Authorization": f"Bearer {admin_token}", "Origin": settings.ALLOWED_ORIGINS[0]}
+        )
+    
+    assert response.headers["x-next-cursor"]
+    exposed = {name.strip().lower() for name in response.headers["access-control-expose-headers"].split(",")}
+    assert {"x-next-cursor", "retry-after"} <= exposed
+
+
+@pytest.mark.asyncio
+async def test_get_all_feedback_filters_and_search(admin_token, test_db):
+    """Test filtering feedback by status and searching the message"""
+    test_db.add_all([
+        Feedback(message="The dashboard chart is slow", is_anonymous=True, status=FeedbackStatus.OPEN),
+        Feedback(message="Please add dark mode", is_anonymous=True, status=FeedbackStatus.OPEN),
+        Feedback(message="Slow login page", is_anonymous=True, status=FeedbackStatus.RESOLVED),
+        Feedback(message="100% loading forever", is_anonymous=True, status=FeedbackStatus.CANNOT_WORK_ON),
+    ])
+    await test_db.commit()
+    
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        by_status = await ac.get(
+            "/api/v1/feedback/", params={"status": ["resolved", "cannot_work_on"]}, headers=headers
+        )
+        by_text = await ac.get("/api/v1/feedback/", params={"q": "slow"}, headers=headers)
+        combined = await ac.get(
+            "/api/v1/feedback/", params={"q": "slow", "status": "open"}, headers=headers
+        )
+        literal_percent = await ac.get("/api/v1/feedback/", params={"q": "0%"}, headers=headers)
+    
+    assert {item["status"] for item in by_status.json()} == {"resolved", "cannot_work_on"}
+    assert len(by_status.json()) == 2
+    assert len(by_text.json()) == 2
+    assert [item["message"] for item in combined.json()] == ["The dashboard chart is slow"]
+    assert [item["message"] for item in literal_percent.json()] == ["100% loading forever"]
+
+
+@pytest.mark.asyncio
+async def test_get_all_feedback_invalid_cursor(admin_token):
+    """Test that a malformed cursor is rejected"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/api/v1/feedback/",
+            params={"cursor": "not-a-cursor"},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_update_feedback_status(admin_token, test_db):
     """Test updating feedback status"""
@@ -244,3 +358,83 @@ async def test_feedback_status_enum_values(admin_token, test_db):
             assert response.status_code == 200
             data = response.json()
             assert data["status"] == status
+
+
+@pytest.mark.asyncio
+async def test_feedback_buffer_writes_in_batches(test_db):
+    """Test that queued submissions are batch-inserted"""
+    buffer = FeedbackBuffer(max_size=100, batch_size=10, flush_interval_ms=50, enqueue_timeout_ms=10)
+    buffer.session_factory = TestSessionLocal
+    
+    for i in range(25):
+        await buffer.submit({"message": f"Batched feedback {i}", "is_anonymous": True})
+    await buffer.stop()
+    
+    result = await test_db.execute(select(Feedback))
+    rows = result.scalars().all()
+    assert len(rows) == 25
+    assert all(row.status == FeedbackStatus.OPEN for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_feedback_buffer_drops_only_the_bad_row(test_db):
+    """Test that a failed batch insert is retried row by row"""
+    metrics.reset()
+    buffer = FeedbackBuffer(max_size=100, batch_size=10, flush_interval_ms=50, enqueue_timeout_ms=10)
+    buffer.session_factory = TestSessionLocal
+    
+    for i in range(5):
+        # message is NOT NULL, so the third row cannot be stored
+        await buffer.submit({"message": None if i == 2 else f"Feedback {i}", "is_anonymous": True})
+    await buffer.stop()
+    
+    result = await test_db.execute(select(Feedback.message).order_by(Feedback.id))
+    assert result.scalars().all() == ["Feedback 0", "Feedback 1", "Feedback 3", "Feedback 4"]
+    assert metrics.get("feedback_buffer_dropped_total") == 1
+    assert metrics.get("feedback_buffer_flushed_total") == 4
+
+
+@pytest.mark.asyncio
+async def test_feedback_buffer_applies_backpressure():
+    """Test that a full buffer rejects submissions after the enqueue timeout"""
+    buffer = FeedbackBuffer(max_size=2, batch_size=10, flush_interval_ms=50, enqueue_timeout_ms=10)
+    buffer.session_factory = TestSessionLocal
+    # Occupy the queue without a flusher draining it
+    buffer._ensure_started()
+    buffer._flusher.cancel()
+    
+    await buffer.submit({"message": "one", "is_anonymous": True})
+    await buffer.submit({"message": "two", "is_anonymous": True})
+    with pytest.raises(FeedbackBufferFull):
+        await buffer.submit({"message": "three", "is_anonymous": True})
+    buffer.reset()
+
+
+@pytest.mark.asyncio
+async def test_submit_feedback_returns_503_when_buffer_full(monkeypatch):
+    """Test that the endpoint surfaces backpressure as 503 with Retry-After"""
+    async def reject(row):
+        raise FeedbackBufferFull()
+    
+    monkeypatch.setattr(feedback_buffer, "submit", reject)
+    
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/feedback/", json={"message": "Busy"})
+    
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_submit_feedback_clips_user_agent(test_db):
+    """Test that an oversized User-Agent is cut to the column size"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/feedback/", json={"message": "Long agent"},
+                                 headers={"User-Agent": "x" * 2000})
+    await feedback_buffer.flush()
+    
+    assert response.status_code == 202
+    user_agent = await test_db.scalar(select(Feedback.user_agent).where(Feedback.message == "Long agent"))
+    assert len(user_agent) == 500
@@ -0,0 +1,225 @@
+"""
+Tests for the food catalog, nutrition auto-fill and CSV import
+"""
+
+import asyncio
+import pytest
+from datetime import date
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.food import Food
+from app.core.metrics import metrics
+from app.core.security import create_access_token
+from app.services.food_catalog import FoodCatalog
+
+
+@pytest.fixture
+async def client_user(test_db):
+    """Create a test client user"""
+    user = User(
+        email="foodclient@example.com",
+        hashed_password="hashed_password",
+        full_name="Food Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+async def admin_user(test_db):
+    """Create a test admin user"""
+    user = User(
+        email="foodadmin@example.com",
+        hashed_password="hashed_password",
+        full_name="Food Admin",
+        role=UserRole.ADMIN,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client_token(client_user):
+    """Create an access token for the client user"""
+    return create_access_token({"sub": client_user.email, "user_id": client_user.id})
+
+
+@pytest.fixture
+def admin_token(admin_user):
+    """Create an access token for the admin user"""
+    return create_access_token({"sub": admin_user.email, "user_id": admin_user.id})
+
+
+@pytest.fixture
+async def protein_shake(test_db):
+    """Create a catalog food"""
+    food = Food(
+        name="Protein Shake",
+        normalized_name="protein shake",
+        serving_size="1 scoop (30 g)",
+        calories=120.0,
+        protein_grams=24.0,
+        carbs_grams=3.0,
+        fat_grams=1.5
+    )
+    test_db.add(food)
+    await test_db.commit()
+    await test_db.refresh(food)
+    return food
+
+
+@pytest.mark.asyncio
+async def test_diet_log_fills_macros_from_food(client_token, protein_shake):
+    """Test that food_id fills the name and omitted macros scaled by servings"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/v1/client/diet-logs",
+            headers={"Authorization": f"Bearer {client_token}"},
+            json={
+                "meal_date": date.today().isoformat(),
+                "meal_type": "snack",
+                "food_id": protein_shake.id,
+                "servings": 2,
+                "fat_grams": 4.0
+            }
+        )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["food_name"] == "Protein Shake"
+    assert data["food_id"] == protein_shake.id
+    assert data["calories"] == 240.0
+    assert data["protein_grams"] == 48.0
+    # Explicit values win over the catalog
+    assert data["fat_grams"] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_diet_log_food_lookup_is_cached(client_token, protein_shake):
+    """Test that repeated logs of the same food hit the in-memory cache"""
+    hits_before = metrics.get("food_cache_hits_total")
+    payload = {"meal_date": date.today().isoformat(), "meal_type": "snack", "food_id": protein_shake.id}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for _ in range(3):
+            response = await ac.post(
+                "/api/v1/client/diet-logs",
+                headers={"Authorization": f"Bearer {client_token}"},
+                json=payload
+            )
+            assert response.status_code == 201
+
+    assert metrics.get("food_cache_hits_total") == hits_before + 2
+
+
+@pytest.mark.asyncio
+async def test_food_cache_entries_expire(protein_shake, test_db):
+    """Test that an entry changed by another worker's import is reloaded after the TTL"""
+    catalog = FoodCatalog(max_entries=10, ttl=0.05)
+    assert (await catalog.get(test_db, protein_shake.id))["calories"] == 120.0
+
+    # Updated behind this process's back, as an import on another worker would
+    protein_shake.calories = 130.0
+    await test_db.commit()
+    assert (await catalog.get(test_db, protein_shake.id))["calories"] == 120.0
+
+    await asyncio.sleep(0.06)
+    assert (await catalog.get(test_db, protein_shake.id))["calories"] == 130.0
+
+
+@pytest.mark.asyncio
+async def test_diet_log_servings_update_recomputes_macros(client_token, protein_shake):
+    """Test that changing servings rescales catalog macros"""
+    headers = {"Authorization": f"Bearer {client_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        created = await ac.post(
+            "/api/v1/client/diet-logs",
+            headers=headers,
+            json={"meal_date": date.today().isoformat(), "meal_type": "snack", "food_id": protein_shake.id}
+        )
+        updated = await ac.put(
+            f"/api/v1/client/diet-logs/{created.json()['id']}",
+            headers=headers,
+            json={"servings": 0.5}
+        )
+
+    assert updated.status_code == 200
+    assert updated.json()["calories"] == 60.0
+    assert updated.json()["food_name"] == "Protein Shake"
+
+
+@pytest.mark.asyncio
+async def test_diet_log_requires_name_or_known_food(client_token):
+    """Test validation of food_name / food_id on create"""
+    headers = {"Authorization": f"Bearer {client_token}"}
+    base = {"meal_date": date.today().isoformat(), "meal_type": "lunch"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        missing_both = await ac.post("/api/v1/client/diet-logs", headers=headers, json=base)
+        unknown_food = await ac.post(
+            "/api/v1/client/diet-logs", headers=headers, json={**base, "food_id": 999}
+        )
+
+    assert missing_both.status_code == 422
+    assert unknown_food.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_foods_csv(admin_token, protein_shake, test_db):
+    """Test bulk CSV import inserts, updates and reports bad rows"""
+    csv_content = (
+        "name,serving_size,calories,protein_grams,carbs_grams,fat_grams\n"
+        "Oatmeal,1 cup,150,5,27,3\n"
+        "protein  shake,1 scoop,130,25,3,2\n"
+        ",1 cup,10,0,0,0\n"
+        "Banana,1 medium,abc,1,27,0\n"
+        "Greek Yogurt,170 g,100,17,6,0.7\n"
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/v1/admin/foods/import",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("foods.csv", csv_content.encode(), "text/csv")}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 3
+    assert data["rejected"] == 2
+    assert [error["line"] for error in data["errors"]] == [4, 5]
+
+    result = await test_db.execute(select(Food).order_by(Food.normalized_name))
+    foods = {food.normalized_name: food for food in result.scalars().all()}
+    assert set(foods) == {"greek yogurt", "oatmeal", "protein shake"}
+    await test_db.refresh(foods["protein shake"])
+    assert foods["protein shake"].calories == 130.0
+    assert foods["protein shake"].id == protein_shake.id
+
+
+@pytest.mark.asyncio
+async def test_import_foods_csv_requires_name_column(admin_token):
+    """Test that a CSV without a name column is rejected"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/v1/admin/foods/import",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("foods.csv", b"food,calories\nOatmeal,150\n", "text/csv")}
+        )
+
+    assert response.status_code == 400
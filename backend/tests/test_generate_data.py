@@ -0,0 +1,61 @@
+"""
+Tests for the bulk synthetic data generator
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.generate_data import generate
+from app.models import Booking, DietLog, DietPlan, User, WorkoutLog, WorkoutPlan
+from tests.conftest import test_engine, TestSessionLocal
+
+TODAY = date(2026, 3, 15)
+
+
+async def _generate(seed: int = 7) -> dict:
+    return await generate(
+        test_engine, clients=12, coaches=3, days=30, workouts_per_day=1.5, meals_per_day=3,
+        bookings_per_coach=4, seed=seed, batch_size=50, today=TODAY, report=lambda line: None,
+    )
+
+
+async def test_generate_loads_every_table():
+    """Test that the generated row counts match the database"""
+    loaded = await _generate()
+
+    async with TestSessionLocal() as session:
+        for model in (User, Booking, WorkoutPlan, DietPlan, WorkoutLog, DietLog):
+            count = await session.scalar(select(func.count()).select_from(model))
+            assert count == loaded[model.__tablename__]
+        first = await session.scalar(func.min(WorkoutLog.workout_date))
+        last = await session.scalar(func.max(WorkoutLog.workout_date))
+        with_catalog = await session.scalar(select(func.count()).where(DietLog.food_id.is_not(None)))
+
+    assert loaded["users"] == 15
+    assert loaded["bookings"] == 12
+    assert loaded["workout_plans"] == loaded["diet_plans"] == 12
+    # 12 clients x 30 days at ~1.5 workouts and ~3 meals a day
+    assert 300 < loaded["workout_logs"] < 800
+    assert 600 < loaded["diet_logs"] < 1500
+    assert first >= date(2026, 2, 14) and last == TODAY
+    assert with_catalog == loaded["diet_logs"]
+
+
+async def test_generate_is_deterministic_per_seed():
+    """Test that a seed reproduces the same logs and cannot be loaded twice"""
+    loaded = await _generate(seed=7)
+    async with TestSessionLocal() as session:
+        totals = (await session.scalar(func.sum(WorkoutLog.reps)), await session.scalar(func.sum(DietLog.calories)))
+
+    async with test_engine.begin() as conn:
+        for model in (DietLog, WorkoutLog, DietPlan, WorkoutPlan, Booking, User):
+            await conn.execute(model.__table__.delete())
+
+    assert await _generate(seed=7) == loaded
+    async with TestSessionLocal() as session:
+        assert (await session.scalar(func.sum(WorkoutLog.reps)), await session.scalar(func.sum(DietLog.calories))) == totals
+
+    with pytest.raises(ValueError):
+        await _generate(seed=7)
@@ -5,6 +5,7 @@ Tests for health check endpoints
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.core.security import create_access_token
 from app.main import app
 
 
@@ -33,3 +34,120 @@ async def test_root_endpoint():
         assert "message" in data
         assert "version" in data
         assert "docs" in data
+
+
+@pytest.mark.asyncio
+async def test_ready_reports_warmup():
+    """Test the readiness probe answers 503 until warm-up has finished"""
+    from app.services.warmup import warmup
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/v1/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+
+        await warmup.run()
+
+        response = await client.get("/api/v1/ready")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["failed_steps"] == []
+        assert data["warmup_seconds"] >= 0
+
+
+async def _deep_health(admin: bool = True):
+    headers = {}
+    if admin:
+        token = create_access_token({"sub": "admin@example.com", "user_id": 1, "role": "admin"})
+        headers["Authorization"] = f"Bearer {token}"
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get("/api/v1/health/deep", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_deep_health_check_is_cached():
+    """Test the dependency report and that repeated probes reuse it"""
+    from app.core.metrics import metrics
+
+    metrics.reset()
+    response = await _deep_health()
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["checks"]["database"]["status"] == "ok"
+    assert data["checks"]["database"]["latency_ms"] >= data["checks"]["database"]["query_ms"]
+    assert data["checks"]["redis"] == {"status": "disabled"}
+    assert "lag_ms" in data["checks"]["event_loop"]
+
+    assert (await _deep_health()).json()["checked_at"] == data["checked_at"]
+    assert metrics.get("health_checks_total", status="ok") == 1
+
+
+@pytest.mark.asyncio
+async def test_deep_health_check_hides_details_from_non_admins():
+    """Test that anonymous callers only see the status of each check"""
+    data = (await _deep_health(admin=False)).json()
+    assert data["status"] == "ok"
+    assert data["checks"]["database"] == {"status": "ok"}
+    assert data["checks"]["pool"] == {"status": "ok"}
+    assert "duration_ms" not in data
+
+
+@pytest.mark.asyncio
+async def test_deep_health_check_degraded_and_down(monkeypatch):
+    """Test latency thresholds, a failing Redis and an unreachable database"""
+    from app.core.cache import response_cache
+    from app.core.config import settings
+    from app.services.health_checks import health_checker
+
+    class FailingRedis:
+        async def ping(self):
+            raise ConnectionError("redis unavailable")
+
+    monkeypatch.setattr(settings, "HEALTH_DB_LATENCY_DEGRADED_MS", -1.0)
+    monkeypatch.setattr(health_checker, "redis_factory", FailingRedis)
+    response = await _deep_health()
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "degraded"
+    assert data["checks"]["database"]["status"] == "degraded"
+    assert data["checks"]["redis"]["status"] == "down"
+
+    class UnreachableEngine:
+        pool = health_checker.engine.pool
+
+        def connect(self):
+            raise ConnectionRefusedError("database unavailable")
+
+    monkeypatch.setattr(health_checker, "engine", UnreachableEngine())
+    response_cache.clear()
+    response = await _deep_health()
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "down"
+    assert data["checks"]["database"]["status"] == "down"
+    assert data["checks"]["database"]["error"] == "ConnectionRefusedError"
+
+
+@pytest.mark.asyncio
+async def test_pool_saturation(tmp_path, monkeypatch):
+    """Test that a fully checked-out pool reports degraded"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    from app.services.health_checks import health_checker
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=AsyncAdaptedQueuePool, pool_size=2, max_overflow=0
+    )
+    monkeypatch.setattr(health_checker, "engine", engine)
+    try:
+        pool = health_checker.check_pool()
+        assert pool["status"] == "ok" and pool["capacity"] == 2 and pool["saturation"] == 0
+
+        async with engine.connect(), engine.connect():
+            pool = health_checker.check_pool()
+            assert pool["checked_out"] == 2 and pool["saturation"] == 1.0
+            assert pool["status"] == "degraded"
+    finally:
+        await engine.dispose()
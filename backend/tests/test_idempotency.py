@@ -0,0 +1,277 @@
+"""
+Tests for Idempotency-Key handling
+"""
+
+import asyncio
+import os
+from datetime import date
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.idempotency import (
+    COMPLETED,
+    IdempotencyMiddleware,
+    InMemoryIdempotencyStore,
+    IN_PROGRESS,
+    RedisIdempotencyStore,
+    request_fingerprint,
+)
+from app.core.metrics import metrics
+from app.core.security import create_access_token
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.workout_log import WorkoutLog
+
+REDIS_TEST_URL = os.environ.get("REDIS_TEST_URL")
+
+
+@pytest.fixture
+async def client_token(test_db):
+    """Create a client user and return an access token for it"""
+    user = User(
+        email="idempotent@example.com",
+        hashed_password="hashed_password",
+        full_name="Idempotent Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True,
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return create_access_token({"sub": user.email, "user_id": user.id})
+
+
+class CountingApp:
+    """ASGI app that counts its executions and can be held or made to fail"""
+
+    def __init__(self, status: int = 201):
+        self.status = status
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": self.status,
+                    "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"call %d: %s" % (self.calls, body)})
+
+
+def _client(inner, store=None):
+    middleware = IdempotencyMiddleware(inner, store or InMemoryIdempotencyStore(max_keys=100))
+    return AsyncClient(transport=ASGITransport(app=middleware), base_url="http://test")
+
+
+async def test_retry_replays_the_first_response(client_token, test_db):
+    """Test that a retried POST creates one row and gets the original response back"""
+    metrics.reset()
+    headers = {"Authorization": f"Bearer {client_token}", "Idempotency-Key": "log-1"}
+    payload = {"workout_date": date.today().isoformat(), "exercise_name": "Squat", "sets": 5, "reps": 5}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.post("/api/v1/client/workout-logs", headers=headers, json=payload)
+        retry = await ac.post("/api/v1/client/workout-logs", headers=headers, json=payload)
+        other = await ac.post("/api/v1/client/workout-logs", json=payload,
+                              headers={**headers, "Idempotency-Key": "log-2"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert other.json()["id"] != first.json()["id"]
+    assert metrics.get("idempotency_replays_total") == 1
+
+    count = await test_db.scalar(select(func.count()).select_from(WorkoutLog))
+    assert count == 2
+
+
+async def test_key_reused_for_a_different_request(client_token):
+    """Test that a key cannot be replayed against another body"""
+    headers = {"Authorization": f"Bearer {client_token}", "Idempotency-Key": "log-1"}
+    payload = {"workout_date": date.today().isoformat(), "exercise_name": "Squat"}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        assert (await ac.post("/api/v1/client/workout-logs", headers=headers, json=payload)).status_code == 201
+        response = await ac.post("/api/v1/client/workout-logs", headers=headers,
+                                 json={**payload, "exercise_name": "Deadlift"})
+        assert response.status_code == 422
+
+        response = await ac.post("/api/v1/client/workout-logs", json=payload,
+                                 headers={**headers, "Idempotency-Key": "x" * 256})
+        assert response.status_code == 400
+
+
+async def test_concurrent_duplicates_execute_once():
+    """Test that duplicates arriving mid-request wait and share its response"""
+    metrics.reset()
+    inner = CountingApp()
+    inner.release.clear()
+    headers = {"Idempotency-Key": "k"}
+
+    async with _client(inner) as ac:
+        requests = [asyncio.create_task(ac.post("/things", content=b"a", headers=headers)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert inner.calls == 1
+        inner.release.set()
+        responses = await asyncio.gather(*requests)
+
+    assert inner.calls == 1
+    assert {response.text for response in responses} == {"call 1: a"}
+    assert sorted(response.headers.get("idempotent-replayed", "") for response in responses) == ["", "true", "true"]
+    assert metrics.get("idempotency_waits_total") == 2
+
+
+async def test_duplicate_gets_409_when_the_first_is_too_slow(monkeypatch):
+    """Test that a waiting duplicate gives up after IDEMPOTENCY_WAIT_SECONDS"""
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.05)
+    inner = CountingApp()
+    inner.release.clear()
+
+    async with _client(inner) as ac:
+        first = asyncio.create_task(ac.post("/things", content=b"a", headers={"Idempotency-Key": "k"}))
+        await asyncio.sleep(0.01)
+        duplicate = await ac.post("/things", content=b"a", headers={"Idempotency-Key": "k"})
+        inner.release.set()
+        await first
+
+    assert duplicate.status_code == 409
+    assert duplicate.headers["retry-after"] == "1"
+    assert inner.calls == 1
+
+
+async def test_server_errors_are_not_stored():
+    """Test that a retry after a 5xx runs the request again"""
+    inner = CountingApp(status=503)
+    store = InMemoryIdempotencyStore(max_keys=100)
+
+    async with _client(inner, store) as ac:
+        await ac.post("/things", content=b"a", headers={"Idempotency-Key": "k"})
+        inner.status = 201
+        response = await ac.post("/things", content=b"a", headers={"Idempotency-Key": "k"})
+        replay = await ac.post("/things", content=b"a", headers={"Idempotency-Key": "k"})
+
+    assert inner.calls == 2
+    assert response.text == replay.text == "call 2: a"
+    assert replay.headers["idempotent-replayed"] == "true"
+
+
+async def test_keys_are_scoped_to_the_caller():
+    """Test that two users sending the same key do not see each other's response"""
+    inner = CountingApp()
+    tokens = [create_access_token({"sub": f"user{i}@example.com", "user_id": i}) for i in (1, 2)]
+
+    async with _client(inner) as ac:
+        for token in tokens:
+            response = await ac.post("/things", content=b"a",
+                                     headers={"Idempotency-Key": "k", "Authorization": f"Bearer {token}"})
+            assert "idempotent-replayed" not in response.headers
+
+    assert inner.calls == 2
+
+
+async def test_oversized_bodies_and_store_errors_run_without_a_key(monkeypatch):
+    """Test that requests the middleware cannot protect still go through"""
+    class BrokenStore(InMemoryIdempotencyStore):
+        async def reserve(self, key, fingerprint, lock_ttl):
+            raise ConnectionError("redis unavailable")
+
+    metrics.reset()
+    monkeypatch.setattr(settings, "IDEMPOTENCY_MAX_BODY_BYTES", 4)
+    inner = CountingApp()
+
+    async with _client(inner) as ac:
+        for _ in range(2):
+            response = await ac.post("/things", content=b"too large", headers={"Idempotency-Key": "k"})
+            assert response.text.endswith("too large")
+    assert inner.calls == 2
+    assert metrics.get("idempotency_skipped_total") == 2
+
+    async with _client(inner, BrokenStore(max_keys=100)) as ac:
+        assert (await ac.post("/things", content=b"a", headers={"Idempotency-Key": "k"})).status_code == 201
+    assert metrics.get("idempotency_store_errors_total") == 1
+
+
+async def test_store_errors_while_waiting_run_without_a_key():
+    """Test that a store failing during a duplicate's wait fails open instead of 500"""
+    fingerprint = request_fingerprint("POST", "/things", b"", b"a")
+
+    class FlakyStore(InMemoryIdempotencyStore):
+        """Reports a running first attempt, then fails once the duplicate stops waiting"""
+
+        def __init__(self, fail_in):
+            super().__init__(max_keys=100)
+            self.fail_in = fail_in
+            self.reserved = False
+
+        async def reserve(self, key, fingerprint_, lock_ttl):
+            if not self.reserved:
+                self.reserved = True
+                return {"state": IN_PROGRESS, "fingerprint": fingerprint}
+            raise ConnectionError("redis unavailable")
+
+        async def wait(self, key, timeout):
+            if self.fail_in == "wait":
+                raise ConnectionError("redis unavailable")
+            return None
+
+    for fail_in in ("wait", "reserve"):
+        metrics.reset()
+        inner = CountingApp()
+        async with _client(inner, FlakyStore(fail_in)) as ac:
+            response = await ac.post("/things", content=b"a", headers={"Idempotency-Key": "k"})
+        assert response.status_code == 201
+        assert inner.calls == 1
+        assert metrics.get("idempotency_store_errors_total") == 1
+
+
+async def test_in_memory_records_expire():
+    """Test lock and record TTLs"""
+    store = InMemoryIdempotencyStore(max_keys=100)
+    assert await store.reserve("k", "f", lock_ttl=0.01) is None
+    assert (await store.reserve("k", "f", lock_ttl=0.01))["state"] == "in_progress"
+    await asyncio.sleep(0.02)
+    # A crashed worker's reservation runs out and the key can be claimed again
+    assert await store.reserve("k", "f", lock_ttl=0.01) is None
+
+    await store.complete("k", {"state": COMPLETED, "fingerprint": "f", "response": {}}, ttl=60)
+    assert (await store.wait("k", timeout=1))["state"] == COMPLETED
+
+
+@pytest.mark.skipif(not REDIS_TEST_URL, reason="set REDIS_TEST_URL to a scratch Redis database")
+async def test_redis_store(monkeypatch):
+    """Test reservation, waiting and replay against a real Redis"""
+    from app.core import redis_client
+
+    monkeypatch.setattr(settings, "REDIS_URL", REDIS_TEST_URL)
+    await redis_client.close_redis()
+    store = RedisIdempotencyStore(prefix="test-idempotency:", poll_interval=0.01)
+    try:
+        await store.clear()
+        assert await store.reserve("k", "f", lock_ttl=5) is None
+        assert (await store.reserve("k", "f", lock_ttl=5))["state"] == "in_progress"
+        assert (await store.wait("k", timeout=0.05))["state"] == "in_progress"
+
+        await store.release("k")
+        assert await store.wait("k", timeout=0.05) is None
+
+        inner = CountingApp()
+        async with _client(inner, store) as ac:
+            responses = await asyncio.gather(*(
+                ac.post("/things", content=b"a", headers={"Idempotency-Key": "r"}) for _ in range(3)
+            ))
+        assert inner.calls == 1
+        assert {response.text for response in responses} == {"call 1: a"}
+    finally:
+        await store.clear()
+        await redis_client.close_redis()
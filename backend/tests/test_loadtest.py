@@ -0,0 +1,80 @@
+"""
+Tests for the load-test harness
+"""
+
+import httpx
+import pytest
+
+from app.core.rate_limit import rate_limiter
+from app.core.security import get_password_hash
+from app.db.generate_data import generate
+from app.main import app
+from app.models import User, UserRole
+from loadtest.runner import parse_mix, run_load
+from loadtest.scenarios import Accounts
+from loadtest.stats import EndpointStats, format_summary
+from tests.conftest import test_engine, TestSessionLocal
+
+
+def test_endpoint_stats_summary():
+    """Test percentiles and the split between server errors and rejections"""
+    stats = EndpointStats()
+    for ms in range(1, 101):
+        stats.record(ms / 1000, 200)
+    stats.record(0.5, 503)
+    stats.record(0.5, 0)
+    stats.record(0.01, 400)
+
+    summary = stats.summary(elapsed=2.0)
+    assert summary["requests"] == 103
+    assert summary["throughput_rps"] == 51.5
+    assert summary["errors"] == 2 and summary["rejected"] == 1
+    assert summary["status_codes"] == {"0": 1, "200": 100, "400": 1, "503": 1}
+    assert 49 <= summary["p50_ms"] <= 52
+    assert summary["p99_ms"] > summary["p95_ms"] > summary["p50_ms"]
+    assert summary["max_ms"] == 500.0
+
+
+def test_parse_mix():
+    """Test user mix parsing and validation"""
+    assert parse_mix("client=70, coach=20,admin=10") == {"client": 70, "coach": 20, "admin": 10}
+    with pytest.raises(ValueError):
+        parse_mix("client=1,visitor=1")
+    with pytest.raises(ValueError):
+        parse_mix("client=0")
+
+
+async def test_run_load_against_app(monkeypatch):
+    """Test every scenario end to end against the in-process app"""
+    # Every simulated user logs in from the same address
+    monkeypatch.setattr(rate_limiter, "burst", 1e9)
+    await generate(
+        test_engine, clients=6, coaches=2, days=5, bookings_per_coach=3, seed=5, report=lambda line: None
+    )
+    async with TestSessionLocal() as session:
+        session.add(User(
+            email="admin@vibe.com", hashed_password=get_password_hash("admin123"),
+            full_name="Admin", role=UserRole.ADMIN, is_active=True,
+        ))
+        await session.commit()
+
+    accounts = Accounts.generated(5, clients=6, coaches=2, admin="admin@vibe.com", admin_password="admin123")
+    endpoints = {}
+    for scenario in ("client", "coach", "admin", "booking"):
+        # The test database is a single shared SQLite connection, so sessions run one at a time
+        report = await run_load(
+            "http://test", accounts, {scenario: 1},
+            rate=20, duration=0.3, concurrency=1, think_time=0, burst_size=1, admin_polls=2, seed=1,
+            transport=httpx.ASGITransport(app=app),
+        )
+        assert report["failed_sessions"] == {}
+        assert report["sessions"][scenario] >= 1
+        assert report["overall"]["errors"] == 0
+        assert "overall" in format_summary(report)
+        endpoints.update(report["endpoints"])
+
+    assert endpoints["POST /api/v1/client/workout-logs"]["status_codes"].keys() == {"201"}
+    assert "GET /api/v1/coach/clients/{client_id}/progress" in endpoints
+    assert "POST /api/v1/bookings/book" in endpoints
+    assert endpoints["GET /api/v1/admin/stats"]["requests"] >= 3
+    assert "p99_ms" in endpoints["POST /api/v1/auth/login"]
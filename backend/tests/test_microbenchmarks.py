@@ -0,0 +1,40 @@
+"""
+Tests for the microbenchmark suite's runner and baseline comparison
+"""
+
+from benchmarks.bench_micro import BENCHMARKS, compare
+
+
+def _run(calibration: float, **results) -> dict:
+    return {
+        "calibration_us": calibration,
+        "results": {name: {"min_us": us, "median_us": us, "loops": 1} for name, us in results.items()},
+    }
+
+
+def test_every_benchmark_runs():
+    """Test that each benchmark's setup and body still work against the current code"""
+    for name, setup in BENCHMARKS.items():
+        setup()()
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Test regression, improvement and new-benchmark statuses"""
+    baseline = _run(10.0, fast=100.0, slow=100.0, steady=100.0)
+    current = _run(10.0, fast=50.0, slow=130.0, steady=110.0, added=5.0)
+
+    rows = {row["name"]: row for row in compare(current, baseline, threshold=0.25)}
+
+    assert rows["slow"]["status"] == "REGRESSED" and rows["slow"]["ratio"] == 1.3
+    assert rows["fast"]["status"] == "improved"
+    assert rows["steady"]["status"] == "ok"
+    assert rows["added"]["status"] == "new" and rows["added"]["ratio"] is None
+
+
+def test_compare_normalizes_by_calibration():
+    """Test that a uniformly slower machine is not reported as a regression"""
+    baseline = _run(10.0, query=100.0)
+    current = _run(20.0, query=200.0)
+
+    assert compare(current, baseline, threshold=0.25)[0]["status"] == "ok"
+    assert compare(current, baseline, threshold=0.25, normalize=False)[0]["status"] == "REGRESSED"
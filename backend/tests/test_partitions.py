@@ -0,0 +1,25 @@
+"""
+Tests for the log table partition maintenance helpers
+"""
+
+from datetime import date
+
+from app.db.partitions import add_months, months_between, partition_name, partition_month
+
+
+def test_month_arithmetic():
+    """Test month stepping across year boundaries"""
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert list(months_between(date(2026, 11, 19), date(2027, 1, 1))) == [
+        date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)
+    ]
+
+
+def test_partition_names_round_trip():
+    """Test that partition names map back to their month and table"""
+    name = partition_name("workout_logs", date(2026, 3, 1))
+    assert name == "workout_logs_p2026_03"
+    assert partition_month("workout_logs", name) == date(2026, 3, 1)
+    assert partition_month("diet_logs", name) is None
+    assert partition_month("workout_logs", "workout_logs_default") is None
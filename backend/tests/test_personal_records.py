@@ -0,0 +1,181 @@
+"""
+Tests for personal records
+"""
+
+import random
+
+import pytest
+from datetime import date, datetime, timezone, timedelta
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.booking import Booking, BookingStatus
+from app.models.workout_log import WorkoutLog
+from app.models.personal_record import PersonalRecord
+from app.core.security import create_access_token
+from app.services.personal_records import PersonalRecordService, RECORD_FIELDS, estimate_one_rep_max, log_metrics
+
+
+@pytest.fixture
+async def client_user(test_db):
+    """Create a test client user"""
+    user = User(
+        email="records@example.com",
+        hashed_password="hashed_password",
+        full_name="Records Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+async def coach_user(test_db):
+    """Create a test coach user"""
+    user = User(
+        email="records-coach@example.com",
+        hashed_password="hashed_password",
+        full_name="Records Coach",
+        role=UserRole.COACH,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client_headers(client_user):
+    """Authorization headers for the client user"""
+    token = create_access_token({"sub": client_user.email, "user_id": client_user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def coach_headers(coach_user):
+    """Authorization headers for the coach user"""
+    token = create_access_token({"sub": coach_user.email, "user_id": coach_user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _log(exercise_name, days_ago, weight, reps=None, sets=None):
+    return {
+        "workout_date": (date.today() - timedelta(days=days_ago)).isoformat(),
+        "exercise_name": exercise_name,
+        "weight": weight,
+        "reps": reps,
+        "sets": sets,
+    }
+
+
+def test_record_metrics():
+    """Test the Epley estimate and per-log volume"""
+    assert estimate_one_rep_max(100.0, 1) == 100.0
+    assert estimate_one_rep_max(100.0, 10) == 133.33
+    assert estimate_one_rep_max(None, 5) is None
+    assert log_metrics(50.0, 10, 3) == {"max_weight": 50.0, "best_e1rm": 66.67, "best_volume": 1500.0}
+    assert log_metrics(50.0, None, None) == {"max_weight": 50.0, "best_e1rm": None, "best_volume": None}
+
+
+@pytest.mark.asyncio
+async def test_records_follow_log_writes(client_headers):
+    """Test that records are raised on create and recomputed on edit and delete"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        heavy = await ac.post("/api/v1/client/workout-logs", headers=client_headers, json=_log("Squat", 5, 140.0, 1, 1))
+        await ac.post("/api/v1/client/workout-logs", headers=client_headers, json=_log("squat", 3, 100.0, 10, 5))
+        await ac.post("/api/v1/client/workout-logs", headers=client_headers, json=_log("Squat", 1, 120.0, 3, 3))
+        created = (await ac.get("/api/v1/client/records", headers=client_headers)).json()
+
+        # Lowering the heaviest lift hands max weight to the next best log
+        await ac.put(
+            f"/api/v1/client/workout-logs/{heavy.json()['id']}", headers=client_headers, json={"weight": 90.0}
+        )
+        edited = (await ac.get("/api/v1/client/records", headers=client_headers)).json()
+
+        # Moving it to another exercise gives that exercise a record
+        await ac.put(
+            f"/api/v1/client/workout-logs/{heavy.json()['id']}", headers=client_headers, json={"exercise_name": "Deadlift"}
+        )
+        moved = (await ac.get("/api/v1/client/records", headers=client_headers)).json()
+
+        await ac.delete(f"/api/v1/client/workout-logs/{heavy.json()['id']}", headers=client_headers)
+        deleted = (await ac.get("/api/v1/client/records", headers=client_headers)).json()
+
+    assert created == [{
+        "exercise_id": created[0]["exercise_id"],
+        "exercise_name": "Squat",
+        "max_weight": 140.0,
+        "max_weight_date": (date.today() - timedelta(days=5)).isoformat(),
+        "best_e1rm": 140.0,
+        "best_e1rm_date": (date.today() - timedelta(days=5)).isoformat(),
+        "best_volume": 5000.0,
+        "best_volume_date": (date.today() - timedelta(days=3)).isoformat(),
+        "updated_at": created[0]["updated_at"],
+    }]
+    assert edited[0]["max_weight"] == 120.0
+    assert edited[0]["best_e1rm"] == 133.33
+    assert [(r["exercise_name"], r["max_weight"]) for r in moved] == [("Deadlift", 90.0), ("Squat", 120.0)]
+    assert [r["exercise_name"] for r in deleted] == ["Squat"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_matches_history(client_user, test_db):
+    """Test that a backfill reproduces the best values over random history"""
+    rng = random.Random(11)
+    logs = [
+        WorkoutLog(
+            user_id=client_user.id,
+            workout_date=date.today() - timedelta(days=rng.randint(0, 365)),
+            exercise_name=rng.choice(["Bench Press", "Squat", "Row"]),
+            weight=rng.choice([None, rng.randint(20, 160) * 2.5]),
+            reps=rng.randint(1, 12),
+            sets=rng.randint(1, 5),
+        )
+        for _ in range(300)
+    ]
+    test_db.add_all(logs)
+    await test_db.commit()
+
+    written = await PersonalRecordService.backfill(test_db, batch_size=2)
+    await test_db.commit()
+
+    records = (await test_db.execute(select(PersonalRecord))).scalars().all()
+    assert written == len(records) == 3
+    for record in records:
+        exercise_logs = [log for log in logs if log.exercise_id == record.exercise_id]
+        for field in RECORD_FIELDS:
+            values = [log_metrics(log.weight, log.reps, log.sets)[field] for log in exercise_logs]
+            assert getattr(record, field) == max(v for v in values if v is not None)
+
+
+@pytest.mark.asyncio
+async def test_coach_reads_connected_client_records(client_user, coach_user, client_headers, coach_headers, test_db):
+    """Test that coaches can only read records of clients they have bookings with"""
+    url = f"/api/v1/coach/clients/{client_user.id}/records"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.post("/api/v1/client/workout-logs", headers=client_headers, json=_log("Bench Press", 0, 80.0, 5, 3))
+        forbidden = await ac.get(url, headers=coach_headers)
+
+        test_db.add(Booking(
+            coach_id=coach_user.id,
+            client_id=client_user.id,
+            slot_number=1,
+            scheduled_at=datetime.now(timezone.utc) + timedelta(days=7),
+            status=BookingStatus.CONFIRMED
+        ))
+        await test_db.commit()
+        allowed = await ac.get(url, headers=coach_headers)
+
+    assert forbidden.status_code == 403
+    assert allowed.status_code == 200
+    assert allowed.json()[0]["best_volume"] == 1200.0
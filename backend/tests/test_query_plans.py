@@ -0,0 +1,620 @@
+"""
+Query plan regression suite (PostgreSQL only)
+
+Seeds a dedicated PostgreSQL database at realistic scale, calls every
+endpoint of the client, coach, admin and bookings routers, captures each
+SQL statement the request issues and runs EXPLAIN on it. A test fails when
+a plan sequentially scans a large relation or its estimated cost exceeds
+the endpoint's budget, so a missing index or a query that stops using one
+shows up before it reaches production.
+
+The suite is skipped unless QUERY_PLAN_DATABASE_URL points at a scratch
+database (postgresql+asyncpg://...). Its public schema is DROPPED and
+rebuilt with the migrations, so never point it at real data. See
+scripts/query_plans.sh for running it against a throwaway container.
+"""
+
+import asyncio
+import io
+import json
+import os
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.main import app
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.db.base import get_db
+from app.db.seed_charts import EXERCISES, BREAKFAST_FOODS, LUNCH_FOODS, DINNER_FOODS, SNACK_FOODS
+from app.services.exercise_catalog import normalize_exercise_name
+from app.services.food_catalog import normalize_food_name
+from app.services.streak_service import StreakService
+from app.services.report_jobs import report_job_manager, DatabaseReportJobStore
+from app.core.cache import response_cache
+from app.services.feedback_buffer import feedback_buffer
+from app.services.autocomplete import autocomplete
+
+QUERY_PLAN_DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Seed scale: a year of history for a mid-sized coaching platform
+CLIENTS = int(os.environ.get("QUERY_PLAN_CLIENTS", 400))
+COACHES = 20
+HISTORY_DAYS = 365
+
+# A sequential scan fails the suite when the scanned relation (or partition)
+# holds at least this many rows
+MIN_SEQ_SCAN_ROWS = 5000
+
+# Default ceiling for the estimated total cost of a single statement. The
+# per-user endpoints plan at a few hundred at the seeded scale; platform-wide
+# aggregates set their own budget on the scenario
+DEFAULT_COST_BUDGET = 1000.0
+
+# (endpoint, table) -> why a sequential scan is expected there
+ALLOWED_SEQ_SCANS = {
+    ("GET /api/v1/admin/stats", "workout_logs"): "platform-wide count of every log",
+    ("GET /api/v1/admin/stats", "diet_logs"): "platform-wide count of every log",
+    ("GET /api/v1/admin/reports/usage", "workout_logs"): "usage report aggregates every log in the window",
+    ("GET /api/v1/admin/reports/usage", "diet_logs"): "usage report aggregates every log in the window",
+    ("POST /api/v1/admin/reports/usage", "workout_logs"): "usage report aggregates every log in the window",
+    ("POST /api/v1/admin/reports/usage", "diet_logs"): "usage report aggregates every log in the window",
+    ("GET /api/v1/admin/charts/platform-usage", "workout_logs"): "daily platform totals over the window",
+    ("GET /api/v1/admin/charts/platform-usage", "diet_logs"): "daily platform totals over the window",
+    ("GET /api/v1/admin/charts/system-health", "workout_logs"): "daily platform totals over the window",
+    ("GET /api/v1/admin/charts/system-health", "diet_logs"): "daily platform totals over the window",
+    ("GET /api/v1/coach/charts/engagement", "workout_logs"): "daily totals across all clients over the window",
+    ("GET /api/v1/coach/charts/engagement", "diet_logs"): "daily totals across all clients over the window",
+    ("GET /api/v1/coach/charts/client-overview", "workout_logs"): "weekly consistency of every client, last 4 weeks",
+}
+
+ROUTER_PREFIXES = ("/api/v1/client", "/api/v1/coach", "/api/v1/admin", "/api/v1/bookings")
+
+PARTITION = re.compile(r"^(?P<table>.+)_(p\d{4}_\d{2}|default)$")
+
+
+@dataclass
+class Scenario:
+    """One request against an endpoint, made as the given role"""
+    method: str
+    path: str
+    role: str
+    params: Dict = field(default_factory=dict)
+    json: Optional[Dict] = None
+    files: Optional[Dict] = None
+    # Creates the rows a write needs and returns extra path values
+    setup: Optional[Callable] = None
+    cost_budget: float = DEFAULT_COST_BUDGET
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+async def _insert_workout_log(conn, seed):
+    result = await conn.execute(
+        text(
+            "INSERT INTO workout_logs "
+            "(user_id, workout_date, exercise_name, sets, reps, weight, created_at, updated_at) "
+            "VALUES (:user_id, :day, 'Bench Press', 3, 8, 60, now(), now()) RETURNING id"
+        ),
+        {"user_id": seed["client_id"], "day": date.today()},
+    )
+    return {"log_id": result.scalar_one()}
+
+
+async def _insert_diet_log(conn, seed):
+    result = await conn.execute(
+        text(
+            "INSERT INTO diet_logs (user_id, meal_date, meal_type, food_name, calories, created_at, updated_at) "
+            "VALUES (:user_id, :day, 'lunch', 'Tuna salad wrap', 420, now(), now()) RETURNING id"
+        ),
+        {"user_id": seed["client_id"], "day": date.today()},
+    )
+    return {"log_id": result.scalar_one()}
+
+
+async def _insert_plan(conn, seed, table):
+    result = await conn.execute(
+        text(
+            f"INSERT INTO {table} (user_id, name, start_date, status, created_at, updated_at) "
+            "VALUES (:user_id, 'Plan', CAST(:day AS date) - 1, 'paused', now(), now()) RETURNING id"
+        ),
+        {"user_id": seed["client_id"], "day": date.today()},
+    )
+    return {"plan_id": result.scalar_one()}
+
+
+async def _insert_template(conn, seed, plan_type):
+    result = await conn.execute(
+        text(
+            "INSERT INTO plan_templates (coach_id, plan_type, name, details, created_at, updated_at) "
+            "VALUES (:coach_id, :plan_type, 'Template', '{\"weeks\": 4}', now(), now()) RETURNING id"
+        ),
+        {"coach_id": seed["coach_id"], "plan_type": plan_type},
+    )
+    return {"template_id": result.scalar_one(), "user_ids": [seed["client_id"], seed["unbooked_client_id"]]}
+
+
+async def _insert_user(conn, seed):
+    result = await conn.execute(
+        text(
+            "INSERT INTO users (email, hashed_password, full_name, role, is_active, is_verified, "
+            "available_slots, created_at, updated_at) "
+            "VALUES ('plan-' || gen_random_uuid() || '@example.com', 'x', 'Temp', 'client', "
+            "true, true, 10, now(), now()) "
+            "RETURNING id"
+        )
+    )
+    return {"user_id": result.scalar_one()}
+
+
+async def _insert_report_job(conn, seed):
+    await conn.execute(
+        text(
+            "INSERT INTO report_jobs (id, kind, params, dedup_key, status, created_at, updated_at) "
+            "VALUES ('plan-job', 'usage', '{}', 'plan-job', 'completed', now(), now()) ON CONFLICT DO NOTHING"
+        )
+    )
+    return {"job_id": "plan-job"}
+
+
+def _ids(**keys):
+    """Path values taken straight from the seed"""
+    async def setup(conn, seed):
+        return {name: seed[key] for name, key in keys.items()}
+    return setup
+
+
+def _food_csv():
+    return {"file": ("foods.csv", io.BytesIO(b"name,calories\nPlan Test Oats,150\nBench Snack,90\n"), "text/csv")}
+
+
+SCENARIOS = [
+    # Client
+    Scenario("POST", "/api/v1/client/workout-logs", "client",
+             json={"workout_date": str(date.today()), "exercise_name": "Bench Press", "sets": 3, "reps": 5,
+                   "weight": 90}),
+    Scenario("GET", "/api/v1/client/workout-logs", "client",
+             params={"start_date": str(date.today() - timedelta(days=30)), "end_date": str(date.today())}),
+    Scenario("GET", "/api/v1/client/workout-logs/{log_id}", "client", setup=_ids(log_id="workout_log_id")),
+    Scenario("PUT", "/api/v1/client/workout-logs/{log_id}", "client", json={"weight": 65}, setup=_insert_workout_log),
+    Scenario("DELETE", "/api/v1/client/workout-logs/{log_id}", "client", setup=_insert_workout_log),
+    Scenario("POST", "/api/v1/client/diet-logs", "client",
+             json={"meal_date": str(date.today()), "meal_type": "snack", "food_id": 1, "servings": 1.5}),
+    Scenario("GET", "/api/v1/client/diet-logs", "client",
+             params={"start_date": str(date.today() - timedelta(days=30)), "end_date": str(date.today())}),
+    Scenario("GET", "/api/v1/client/diet-logs/{log_id}", "client", setup=_ids(log_id="diet_log_id")),
+    Scenario("PUT", "/api/v1/client/diet-logs/{log_id}", "client", json={"calories": 500}, setup=_insert_diet_log),
+    Scenario("DELETE", "/api/v1/client/diet-logs/{log_id}", "client", setup=_insert_diet_log),
+    Scenario("GET", "/api/v1/client/workout-plans", "client"),
+    Scenario("GET", "/api/v1/client/workout-plans/{plan_id}", "client", setup=_ids(plan_id="workout_plan_id")),
+    Scenario("GET", "/api/v1/client/diet-plans", "client"),
+    Scenario("GET", "/api/v1/client/diet-plans/{plan_id}", "client", setup=_ids(plan_id="diet_plan_id")),
+    Scenario("GET", "/api/v1/client/progress", "client", params={"days": 90, "compare": "true"}),
+    Scenario("GET", "/api/v1/client/records", "client"),
+    Scenario("GET", "/api/v1/client/analytics", "client", params={"days": 90}),
+    Scenario("GET", "/api/v1/client/charts/workout-frequency", "client", params={"days": 365}),
+    Scenario("GET", "/api/v1/client/charts/diet-adherence", "client", params={"days": 365}),
+    Scenario("GET", "/api/v1/client/charts/workout-volume", "client", params={"days": 365, "exercise": "Squats"}),
+    Scenario("GET", "/api/v1/client/autocomplete/exercises", "client", params={"q": "be"}),
+    Scenario("GET", "/api/v1/client/autocomplete/foods", "client", params={"q": "pro"}),
+    Scenario("GET", "/api/v1/client/profile", "client"),
+    Scenario("PUT", "/api/v1/client/profile", "client", json={"weight": 80.5}),
+    # Coach
+    Scenario("GET", "/api/v1/coach/clients", "coach"),
+    Scenario("GET", "/api/v1/coach/clients/{client_id}", "coach", setup=_ids(client_id="client_id")),
+    Scenario("GET", "/api/v1/coach/clients/{client_id}/workout-logs", "coach", setup=_ids(client_id="client_id"),
+             params={"start_date": str(date.today() - timedelta(days=30))}),
+    Scenario("GET", "/api/v1/coach/clients/{client_id}/diet-logs", "coach", setup=_ids(client_id="client_id"),
+             params={"start_date": str(date.today() - timedelta(days=30))}),
+    Scenario("GET", "/api/v1/coach/clients/{client_id}/progress", "coach", setup=_ids(client_id="client_id"),
+             params={"days": 90}),
+    Scenario("GET", "/api/v1/coach/clients/{client_id}/records", "coach", setup=_ids(client_id="client_id")),
+    Scenario("GET", "/api/v1/coach/clients/{client_id}/analytics", "coach", setup=_ids(client_id="client_id"),
+             params={"days": 90}),
+    Scenario("POST", "/api/v1/coach/workout-plans", "coach", setup=_ids(user_id="client_id"),
+             json={"user_id": "{user_id}", "name": "Block", "start_date": str(date.today())}),
+    Scenario("GET", "/api/v1/coach/workout-plans", "coach", setup=_ids(client_id="client_id"),
+             params={"client_id": "{client_id}"}),
+    Scenario("PUT", "/api/v1/coach/workout-plans/{plan_id}", "coach", json={"status": "paused"},
+             setup=lambda conn, seed: _insert_plan(conn, seed, "workout_plans")),
+    Scenario("DELETE", "/api/v1/coach/workout-plans/{plan_id}", "coach",
+             setup=lambda conn, seed: _insert_plan(conn, seed, "workout_plans")),
+    Scenario("POST", "/api/v1/coach/diet-plans", "coach", setup=_ids(user_id="client_id"),
+             json={"user_id": "{user_id}", "name": "Cut", "start_date": str(date.today()), "target_calories": 2000}),
+    Scenario("GET", "/api/v1/coach/diet-plans", "coach", setup=_ids(client_id="client_id"),
+             params={"client_id": "{client_id}"}),
+    Scenario("PUT", "/api/v1/coach/diet-plans/{plan_id}", "coach", json={"status": "paused"},
+             setup=lambda conn, seed: _insert_plan(conn, seed, "diet_plans")),
+    Scenario("DELETE", "/api/v1/coach/diet-plans/{plan_id}", "coach",
+             setup=lambda conn, seed: _insert_plan(conn, seed, "diet_plans")),
+    Scenario("POST", "/api/v1/coach/plan-templates", "coach",
+             json={"plan_type": "workout", "name": "Block", "details": {"weeks": 4}}),
+    Scenario("GET", "/api/v1/coach/plan-templates", "coach", params={"plan_type": "workout"}),
+    Scenario("PUT", "/api/v1/coach/plan-templates/{template_id}", "coach", json={"details": {"weeks": 6}},
+             setup=lambda conn, seed: _insert_template(conn, seed, "workout")),
+    Scenario("POST", "/api/v1/coach/workout-plans/bulk-assign", "coach",
+             setup=lambda conn, seed: _insert_template(conn, seed, "workout"),
+             json={"template_id": "{template_id}", "user_ids": "{user_ids}", "start_date": str(date.today())}),
+    Scenario("POST", "/api/v1/coach/diet-plans/bulk-assign", "coach",
+             setup=lambda conn, seed: _insert_template(conn, seed, "diet"),
+             json={"template_id": "{template_id}", "user_ids": "{user_ids}", "start_date": str(date.today())}),
+    Scenario("GET", "/api/v1/coach/charts/client-overview", "coach", cost_budget=3000),
+    Scenario("GET", "/api/v1/coach/charts/engagement", "coach", params={"days": 90}, cost_budget=10000),
+    Scenario("GET", "/api/v1/coach/charts/plan-assignments", "coach"),
+    Scenario("GET", "/api/v1/coach/profile", "coach"),
+    Scenario("PUT", "/api/v1/coach/profile", "coach", json={"experience": "12 years"}),
+    # Admin
+    Scenario("GET", "/api/v1/admin/users", "admin", params={"role": "coach"}),
+    Scenario("GET", "/api/v1/admin/users/{user_id}", "admin", setup=_ids(user_id="client_id")),
+    Scenario("PUT", "/api/v1/admin/users/{user_id}", "admin", json={"is_verified": True}, setup=_insert_user),
+    # The ORM delete cascade loads the user's whole log history first
+    Scenario("DELETE", "/api/v1/admin/users/{user_id}", "admin", setup=_insert_user, cost_budget=5000),
+    Scenario("GET", "/api/v1/admin/exercises", "admin"),
+    Scenario("POST", "/api/v1/admin/exercises/{exercise_id}/aliases", "admin", setup=_ids(exercise_id="exercise_id"),
+             json={"alias": "Flat Bench"}),
+    Scenario("POST", "/api/v1/admin/foods/import", "admin", files=_food_csv),
+    Scenario("GET", "/api/v1/admin/stats", "admin", cost_budget=25000),
+    Scenario("GET", "/api/v1/admin/metrics", "admin"),
+    Scenario("GET", "/api/v1/admin/reports/usage", "admin", params={"days": 30}, cost_budget=5000),
+    Scenario("POST", "/api/v1/admin/reports/usage", "admin", params={"days": 60}, cost_budget=6000),
+    Scenario("GET", "/api/v1/admin/reports/{job_id}", "admin", setup=_insert_report_job),
+    Scenario("GET", "/api/v1/admin/charts/user-growth", "admin", params={"days": 365}),
+    Scenario("GET", "/api/v1/admin/charts/platform-usage", "admin", params={"days": 30}, cost_budget=5000),
+    Scenario("GET", "/api/v1/admin/charts/coach-performance", "admin"),
+    Scenario("GET", "/api/v1/admin/charts/system-health", "admin", params={"days": 30}, cost_budget=6000),
+    # Bookings
+    Scenario("GET", "/api/v1/bookings/coaches", "client"),
+    Scenario("GET", "/api/v1/bookings/coaches/{coach_id}", "client", setup=_ids(coach_id="coach_id")),
+    Scenario("POST", "/api/v1/bookings/book", "unbooked_client", setup=_ids(coach_id="coach_id"),
+             json={"coach_id": "{coach_id}", "slot_number": 1}),
+    Scenario("GET", "/api/v1/bookings/my-bookings", "client"),
+    Scenario("PUT", "/api/v1/bookings/bookings/{booking_id}", "client", setup=_ids(booking_id="booking_id"),
+             json={"notes": "Running late"}),
+    Scenario("GET", "/api/v1/bookings/coach/bookings", "coach"),
+    Scenario("GET", "/api/v1/bookings/admin/bookings", "admin"),
+    Scenario("GET", "/api/v1/bookings/admin/coaches/{coach_id}/bookings", "admin", setup=_ids(coach_id="coach_id")),
+]
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def _migrate(revision: str) -> None:
+    """Run the alembic migrations up to revision against the plan database"""
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    # env.py always connects with settings.DATABASE_URL
+    original = settings.DATABASE_URL
+    settings.DATABASE_URL = QUERY_PLAN_DATABASE_URL
+    try:
+        command.upgrade(config, revision)
+    finally:
+        settings.DATABASE_URL = original
+
+
+async def _reset_schema() -> None:
+    import asyncpg
+
+    conn = await asyncpg.connect(_asyncpg_dsn(QUERY_PLAN_DATABASE_URL))
+    try:
+        # Also drops the enum types and the alembic_version table of earlier runs
+        await conn.execute("DROP SCHEMA public CASCADE; CREATE SCHEMA public")
+    finally:
+        await conn.close()
+
+
+async def _seed() -> Dict:
+    """Bulk load a year of activity with COPY and return ids the scenarios use"""
+    import asyncpg
+
+    rng = random.Random(39)
+    now = datetime.now(timezone.utc)
+    today = date.today()
+    password = get_password_hash("plan-suite")
+    conn = await asyncpg.connect(_asyncpg_dsn(QUERY_PLAN_DATABASE_URL))
+    try:
+        users = [("admin@plans.test", password, "Plan Admin", "admin", True, True, 10, now, now)]
+        users += [
+            (f"coach{i}@plans.test", password, f"Coach {i}", "coach", True, True, CLIENTS // COACHES + 5, now, now)
+            for i in range(COACHES)
+        ]
+        users += [
+            (f"client{i}@plans.test", password, f"Client {i}", "client", True, True, 10,
+             now - timedelta(days=rng.randint(0, HISTORY_DAYS)), now)
+            for i in range(CLIENTS + 1)
+        ]
+        await conn.copy_records_to_table(
+            "users", records=users,
+            columns=["email", "hashed_password", "full_name", "role", "is_active", "is_verified",
+                     "available_slots", "created_at", "updated_at"],
+        )
+        rows = await conn.fetch("SELECT id, role::text AS role FROM users ORDER BY id")
+        admin_id = rows[0]["id"]
+        coach_ids = [row["id"] for row in rows if row["role"] == "coach"]
+        client_ids = [row["id"] for row in rows if row["role"] == "client"]
+        # The last client has no booking, for the booking scenario
+        booked_clients, unbooked_client_id = client_ids[:-1], client_ids[-1]
+
+        await conn.copy_records_to_table(
+            "exercises", records=[(name, normalize_exercise_name(name), now, now) for name in EXERCISES],
+            columns=["name", "normalized_name", "created_at", "updated_at"],
+        )
+        exercise_ids = dict(await conn.fetch("SELECT name, id FROM exercises"))
+        meals = {
+            "breakfast": BREAKFAST_FOODS, "lunch": LUNCH_FOODS, "dinner": DINNER_FOODS, "snack": SNACK_FOODS,
+        }
+        await conn.copy_records_to_table(
+            "foods",
+            records=[
+                (name, normalize_food_name(name), "1 serving", *macros, now, now)
+                for foods in meals.values() for name, *macros in foods
+            ],
+            columns=["name", "normalized_name", "serving_size", "calories", "protein_grams", "carbs_grams",
+                     "fat_grams", "created_at", "updated_at"],
+        )
+        food_ids = dict(await conn.fetch("SELECT name, id FROM foods"))
+
+        bookings, workouts, diets, workout_plans, diet_plans = [], [], [], [], []
+        for index, client_id in enumerate(booked_clients):
+            coach_id = coach_ids[index % COACHES]
+            bookings.append((coach_id, client_id, index // COACHES + 1, now + timedelta(days=rng.randint(1, 30)),
+                             rng.choice(["pending", "confirmed", "completed"]), None, now, now))
+            for status in ("completed", "active"):
+                start = today - timedelta(days=rng.randint(0, 180))
+                workout_plans.append((client_id, f"{status.title()} block", start, status, now, now))
+                calories = rng.choice([1800.0, 2000.0, 2200.0, 2500.0])
+                diet_plans.append((client_id, f"{status.title()} diet", start, status,
+                                   calories, calories * 0.3 / 4, calories * 0.45 / 4, calories * 0.25 / 9, now, now))
+        for client_id in client_ids:
+            frequency = rng.randint(2, 6) / 7
+            for offset in range(HISTORY_DAYS):
+                day = today - timedelta(days=offset)
+                if rng.random() < frequency:
+                    for name in rng.sample(EXERCISES, rng.randint(2, 5)):
+                        workouts.append((client_id, day, name, exercise_ids[name], rng.randint(2, 5),
+                                         rng.randint(5, 15), round(rng.uniform(20, 120), 1), 45, now, now))
+                for meal_type, foods in meals.items():
+                    if rng.random() < (0.4 if meal_type == "snack" else 0.85):
+                        name, calories, protein, carbs, fat = rng.choice(foods)
+                        diets.append((client_id, day, meal_type, name, food_ids[name], 1.0,
+                                      float(calories), float(protein), float(carbs), float(fat), now, now))
+
+        # Load the logs in date order, as they arrive in production, so one
+        # user's rows are spread over the heap instead of clustered together
+        workouts.sort(key=lambda record: record[1])
+        diets.sort(key=lambda record: record[1])
+
+        await conn.copy_records_to_table(
+            "bookings", records=bookings,
+            columns=["coach_id", "client_id", "slot_number", "scheduled_at", "status", "notes",
+                     "created_at", "updated_at"],
+        )
+        await conn.copy_records_to_table(
+            "workout_plans", records=workout_plans,
+            columns=["user_id", "name", "start_date", "status", "created_at", "updated_at"],
+        )
+        await conn.copy_records_to_table(
+            "diet_plans", records=diet_plans,
+            columns=["user_id", "name", "start_date", "status", "target_calories", "target_protein_grams",
+                     "target_carbs_grams", "target_fat_grams", "created_at", "updated_at"],
+        )
+        await conn.copy_records_to_table(
+            "workout_logs", records=workouts,
+            columns=["user_id", "workout_date", "exercise_name", "exercise_id", "sets", "reps", "weight",
+                     "duration_minutes", "created_at", "updated_at"],
+        )
+        await conn.copy_records_to_table(
+            "diet_logs", records=diets,
+            columns=["user_id", "meal_date", "meal_type", "food_name", "food_id", "servings", "calories",
+                     "protein_grams", "carbs_grams", "fat_grams", "created_at", "updated_at"],
+        )
+        await conn.execute(
+            "INSERT INTO personal_records (user_id, exercise_id, max_weight, best_volume, created_at, updated_at) "
+            "SELECT user_id, exercise_id, max(weight), max(sets * reps * weight), now(), now() "
+            "FROM workout_logs GROUP BY user_id, exercise_id"
+        )
+
+        client_id = booked_clients[0]
+        seed = {
+            "admin_id": admin_id,
+            "coach_id": coach_ids[0],
+            "client_id": client_id,
+            "unbooked_client_id": unbooked_client_id,
+            "exercise_id": exercise_ids["Bench Press"],
+            "workout_log_id": await conn.fetchval("SELECT max(id) FROM workout_logs WHERE user_id = $1", client_id),
+            "diet_log_id": await conn.fetchval("SELECT max(id) FROM diet_logs WHERE user_id = $1", client_id),
+            "workout_plan_id": await conn.fetchval("SELECT max(id) FROM workout_plans WHERE user_id = $1", client_id),
+            "diet_plan_id": await conn.fetchval("SELECT max(id) FROM diet_plans WHERE user_id = $1", client_id),
+            "booking_id": await conn.fetchval("SELECT id FROM bookings WHERE client_id = $1", client_id),
+        }
+    finally:
+        await conn.close()
+
+    engine = create_async_engine(QUERY_PLAN_DATABASE_URL, poolclass=NullPool)
+    async with AsyncSession(engine) as session:
+        await StreakService.refresh(session, client_ids)
+        await session.commit()
+    await engine.dispose()
+    return seed
+
+
+async def _analyze() -> Dict[str, float]:
+    """Refresh planner statistics and return the row count of every table and partition"""
+    import asyncpg
+
+    conn = await asyncpg.connect(_asyncpg_dsn(QUERY_PLAN_DATABASE_URL))
+    try:
+        await conn.execute("VACUUM ANALYZE")
+        rows = await conn.fetch(
+            "SELECT relname, reltuples FROM pg_class "
+            "JOIN pg_namespace ON pg_namespace.oid = relnamespace "
+            "WHERE nspname = 'public' AND relkind IN ('r', 'p')"
+        )
+        return {row["relname"]: row["reltuples"] for row in rows}
+    finally:
+        await conn.close()
+
+
+@pytest.fixture(scope="module")
+def plan_database():
+    """Migrate and seed the plan database once for the whole module"""
+    asyncio.run(_reset_schema())
+    # Load the history before 013 so the month partitions are created around it
+    _migrate("012")
+    seed = asyncio.run(_seed())
+    _migrate("head")
+    seed["row_counts"] = asyncio.run(_analyze())
+    return seed
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _parent_table(relation: str) -> str:
+    match = PARTITION.match(relation)
+    return match.group("table") if match else relation
+
+
+def _format(value, values: Dict):
+    if isinstance(value, str) and value.startswith("{") and value.endswith("}"):
+        return values[value[1:-1]]
+    if isinstance(value, dict):
+        return {key: _format(item, values) for key, item in value.items()}
+    return value
+
+
+def _is_explainable(statement: str) -> bool:
+    verb = statement.lstrip().split(None, 1)[0].upper()
+    return verb in {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"} and "pg_catalog" not in statement
+
+
+async def _run_scenario(engine, scenario: Scenario, seed: Dict) -> List[tuple]:
+    """Make the scenario's request and return the (statement, parameters) it executed"""
+    async with engine.begin() as conn:
+        values = await scenario.setup(conn, seed) if scenario.setup else {}
+
+    users = {
+        "client": seed["client_id"], "unbooked_client": seed["unbooked_client_id"],
+        "coach": seed["coach_id"], "admin": seed["admin_id"],
+    }
+    async with engine.connect() as conn:
+        email = await conn.scalar(text("SELECT email FROM users WHERE id = :id"), {"id": users[scenario.role]})
+    token = create_access_token({"sub": email, "user_id": users[scenario.role]})
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if _is_explainable(statement):
+            # A multi-row INSERT batch arrives flagged executemany but with one flat parameter list
+            batched = executemany and parameters and isinstance(parameters[0], (tuple, list, dict))
+            statements.append((statement, parameters[0] if batched else parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.request(
+                scenario.method,
+                scenario.path.format(**values),
+                params=_format(scenario.params, values),
+                json=_format(scenario.json, values),
+                files=scenario.files() if scenario.files else None,
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        # Work the request handed to background tasks is part of its cost
+        await report_job_manager.drain()
+        await response_cache.drain()
+        await feedback_buffer.stop()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    assert response.status_code < 400, f"{scenario.endpoint}: {response.status_code} {response.text}"
+    return statements
+
+
+def _check_plan(scenario: Scenario, plan: dict, row_counts: Dict[str, float]) -> List[str]:
+    problems = []
+    for node in _plan_nodes(plan["Plan"]):
+        if node["Node Type"] != "Seq Scan":
+            continue
+        relation = node["Relation Name"]
+        table = _parent_table(relation)
+        if row_counts.get(relation, 0) < MIN_SEQ_SCAN_ROWS or (scenario.endpoint, table) in ALLOWED_SEQ_SCANS:
+            continue
+        problems.append(f"Seq Scan on {relation} ({row_counts[relation]:.0f} rows)")
+    cost = plan["Plan"]["Total Cost"]
+    if cost > scenario.cost_budget:
+        problems.append(f"estimated cost {cost:.0f} exceeds budget {scenario.cost_budget:.0f}")
+    return problems
+
+
+def test_every_endpoint_has_a_scenario():
+    """Test that new client, coach, admin and booking endpoints are added to the plan suite"""
+    routes = {
+        f"{method} {route.path}"
+        for route in app.routes
+        if getattr(route, "path", "").startswith(ROUTER_PREFIXES)
+        for method in route.methods
+    }
+    assert routes == {scenario.endpoint for scenario in SCENARIOS}
+
+
+@pytest.mark.skipif(
+    not QUERY_PLAN_DATABASE_URL, reason="set QUERY_PLAN_DATABASE_URL to a scratch PostgreSQL database"
+)
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario.endpoint)
+async def test_query_plans(plan_database, scenario):
+    """Test that every statement of an endpoint avoids large seq scans and stays within its cost budget"""
+    engine = create_async_engine(QUERY_PLAN_DATABASE_URL, poolclass=NullPool, echo=False)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+    async def plan_get_db():
+        async with factory() as session:
+            yield session
+
+    previous = app.dependency_overrides.get(get_db)
+    background = [report_job_manager, response_cache, feedback_buffer, autocomplete]
+    previous_factories = [component.session_factory for component in background]
+    previous_store = report_job_manager.store
+    app.dependency_overrides[get_db] = plan_get_db
+    for component in background:
+        component.session_factory = factory
+    report_job_manager.store = DatabaseReportJobStore(factory)
+    try:
+        statements = await _run_scenario(engine, scenario, plan_database)
+        failures = []
+        async with engine.connect() as conn:
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar_one()
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+                for problem in _check_plan(scenario, plan, plan_database["row_counts"]):
+                    failures.append(f"{problem}\n    {' '.join(statement.split())[:300]}")
+    finally:
+        app.dependency_overrides[get_db] = previous
+        for component, factory_ in zip(background, previous_factories):
+            component.session_factory = factory_
+        report_job_manager.store = previous_store
+        await engine.dispose()
+
+    assert statements, f"{scenario.endpoint} issued no SQL"
+    assert not failures, f"{scenario.endpoint}:\n  " + "\n  ".join(failures)
@@ -0,0 +1,151 @@
+"""
+Tests for token-bucket rate limiting
+"""
+
+import os
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core import rate_limit
+from app.core.metrics import metrics
+from app.core.rate_limit import (
+    InMemoryTokenBucketStore,
+    RateLimiter,
+    RedisTokenBucketStore,
+    parse_route_costs,
+    rate_limiter,
+)
+from app.core.security import create_access_token
+from app.main import app
+
+REDIS_TEST_URL = os.environ.get("REDIS_TEST_URL")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_route_costs_longest_prefix_wins():
+    """Test method-specific rules, prefix precedence, exemptions and the default"""
+    limiter = RateLimiter(InMemoryTokenBucketStore(max_keys=10), rate=1, burst=10, costs={
+        "/api/v1/health": 0,
+        "/api/v1/admin/": 2,
+        "/api/v1/admin/charts/": 10,
+        "POST /api/v1/auth/login": 5,
+    })
+    assert limiter.cost("GET", "/api/v1/admin/charts/user-growth") == 10
+    assert limiter.cost("GET", "/api/v1/admin/users") == 2
+    assert limiter.cost("POST", "/api/v1/auth/login") == 5
+    assert limiter.cost("GET", "/api/v1/auth/login") == 1
+    assert limiter.cost("GET", "/api/v1/health/deep") == 0
+    assert limiter.cost("GET", "/api/v1/client/progress") == 1
+
+    rules = parse_route_costs({"/a": 1, "GET /a": 2, "/a/b": 3})
+    assert rules == [(None, "/a/b", 3.0), ("GET", "/a", 2.0), (None, "/a", 1.0)]
+
+
+async def test_in_memory_bucket_refills(monkeypatch):
+    """Test spending, the retry delay and refilling over time"""
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    store = InMemoryTokenBucketStore(max_keys=10)
+
+    for _ in range(5):
+        assert await store.take("ip:1", 2, rate=1, burst=10) == 0
+    assert await store.take("ip:1", 2, rate=1, burst=10) == 2.0
+    # Other keys have their own bucket
+    assert await store.take("ip:2", 2, rate=1, burst=10) == 0
+
+    clock.now += 1.5
+    assert await store.take("ip:1", 2, rate=1, burst=10) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert await store.take("ip:1", 2, rate=1, burst=10) == 0
+
+
+async def test_in_memory_store_stays_bounded(monkeypatch):
+    """Test that idle buckets and then the oldest ones are evicted at max_keys"""
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    store = InMemoryTokenBucketStore(max_keys=8)
+
+    for i in range(8):
+        await store.take(f"ip:{i}", 1, rate=1, burst=5)
+    clock.now += 10
+    await store.take("ip:new", 1, rate=1, burst=5)
+    assert list(store._buckets) == ["ip:new"]
+
+    for i in range(20):
+        await store.take(f"busy:{i}", 1, rate=1, burst=5)
+    assert len(store._buckets) <= 8
+
+
+async def test_login_limited_per_ip_with_retry_after(monkeypatch):
+    """Test that repeated logins get 429 with Retry-After while other clients are unaffected"""
+    monkeypatch.setattr(rate_limiter, "rate", 1.0)
+    monkeypatch.setattr(rate_limiter, "burst", 30.0)
+    metrics.reset()
+    login = {"email": "nobody@example.com", "password": "wrong"}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        statuses = [(await client.post("/api/v1/auth/login", json=login)).status_code for _ in range(3)]
+        assert statuses == [401, 401, 401]
+
+        response = await client.post("/api/v1/auth/login", json=login)
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Too many requests"}
+        assert 1 <= int(response.headers["retry-after"]) <= 10
+        assert metrics.get("rate_limited_total") == 1
+
+        # Exempt routes and authenticated users have their own budget
+        assert (await client.get("/api/v1/health")).status_code == 200
+        token = create_access_token({"sub": "someone@example.com", "user_id": 12345})
+        response = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+
+
+async def test_forged_token_falls_back_to_ip():
+    """Test that an invalid token cannot select another user's bucket"""
+    token = create_access_token({"sub": "victim@example.com", "user_id": 7})
+    scope = {"type": "http", "method": "GET", "path": "/", "client": ("198.51.100.4", 1234)}
+
+    assert rate_limiter.key({**scope, "headers": [(b"authorization", f"Bearer {token}".encode())]}) == "user:7"
+    assert rate_limiter.key({**scope, "headers": [(b"authorization", f"Bearer {token}x".encode())]}) == "ip:198.51.100.4"
+    assert rate_limiter.key({**scope, "headers": []}) == "ip:198.51.100.4"
+
+
+async def test_store_errors_fail_open():
+    """Test that an unavailable store lets requests through"""
+    class BrokenStore(InMemoryTokenBucketStore):
+        async def take(self, key, cost, rate, burst):
+            raise ConnectionError("redis unavailable")
+
+    metrics.reset()
+    limiter = RateLimiter(BrokenStore(max_keys=10), rate=1, burst=1, costs={})
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "client": ("198.51.100.4", 1)}
+    assert await limiter.check(scope) == 0
+    assert metrics.get("rate_limit_store_errors_total") == 1
+
+
+@pytest.mark.skipif(not REDIS_TEST_URL, reason="set REDIS_TEST_URL to a scratch Redis database")
+async def test_redis_bucket(monkeypatch):
+    """Test the Lua token bucket against a real Redis"""
+    from app.core import redis_client
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REDIS_URL", REDIS_TEST_URL)
+    await redis_client.close_redis()
+    store = RedisTokenBucketStore(prefix="test-ratelimit:")
+    try:
+        await store.clear()
+        assert await store.take("ip:1", 4, rate=1, burst=10) == 0
+        assert await store.take("ip:1", 4, rate=1, burst=10) == 0
+        assert await store.take("ip:1", 4, rate=1, burst=10) == pytest.approx(2.0, abs=0.1)
+        assert await store.take("ip:2", 4, rate=1, burst=10) == 0
+    finally:
+        await store.clear()
+        await redis_client.close_redis()
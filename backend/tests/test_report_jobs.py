@@ -0,0 +1,206 @@
+"""
+Tests for background report jobs
+"""
+
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from httpx import AsyncClient, ASGITransport
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.workout_log import WorkoutLog
+from app.models.report_job import ReportJobStatus
+from app.core.security import create_access_token
+from app.services import report_jobs
+from app.services.report_jobs import report_job_manager, DatabaseReportJobStore
+from tests.conftest import TestSessionLocal
+
+
+@pytest.fixture
+async def admin_user(test_db):
+    """Create a test admin user"""
+    user = User(
+        email="reportadmin@example.com",
+        hashed_password="hashed_password",
+        full_name="Report Admin",
+        role=UserRole.ADMIN,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def admin_token(admin_user):
+    """Create an access token for the admin user"""
+    return create_access_token({"sub": admin_user.email, "user_id": admin_user.id})
+
+
+@pytest.mark.asyncio
+async def test_submit_and_poll_usage_report(admin_user, admin_token, test_db):
+    """Test that a queued usage report completes and matches the synchronous report"""
+    test_db.add(WorkoutLog(
+        user_id=admin_user.id,
+        workout_date=date.today(),
+        exercise_name="Squats",
+        sets=3,
+        reps=5
+    ))
+    await test_db.commit()
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/admin/reports/usage?days=7", headers=headers)
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] in ("pending", "running")
+        assert job["params"] == {"days": 7}
+
+        await report_job_manager.drain()
+
+        response = await ac.get(f"/api/v1/admin/reports/{job['id']}", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["expires_at"] is not None
+
+        sync_response = await ac.get("/api/v1/admin/reports/usage?days=7", headers=headers)
+
+    assert data["result"] == sync_response.json()
+    assert data["result"]["activity"]["workouts_logged"] == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_reports_are_deduplicated(admin_user):
+    """Test that identical in-flight jobs share a job id"""
+    first, second = await asyncio.gather(
+        report_job_manager.submit("usage", {"days": 30}),
+        report_job_manager.submit("usage", {"days": 30}),
+    )
+    other = await report_job_manager.submit("usage", {"days": 90})
+
+    assert first.id == second.id
+    assert other.id != first.id
+
+
+@pytest.mark.asyncio
+async def test_expired_report_is_not_returned(admin_user):
+    """Test that jobs past their retention period are treated as missing"""
+    job = await report_job_manager.submit("usage", {"days": 30})
+    await report_job_manager.drain()
+    assert await report_job_manager.get(job.id) is not None
+
+    await report_job_manager.store.update(
+        job.id, expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+    )
+    assert await report_job_manager.get(job.id) is None
+
+
+@pytest.mark.asyncio
+async def test_database_report_job_store(admin_user):
+    """Test running a job against the database-backed store"""
+    report_job_manager.store = DatabaseReportJobStore(TestSessionLocal)
+
+    job = await report_job_manager.submit("usage", {"days": 14})
+    duplicate = await report_job_manager.submit("usage", {"days": 14})
+    assert duplicate.id == job.id
+
+    await report_job_manager.drain()
+
+    stored = await report_job_manager.get(job.id)
+    assert stored.status == ReportJobStatus.COMPLETED
+    assert stored.result["report_period_days"] == 14
+
+
+@pytest.mark.asyncio
+async def test_cancelled_report_is_not_deduplicated_onto(admin_user, monkeypatch):
+    """Test that a job cancelled on shutdown fails instead of staying active"""
+    report_job_manager.store = DatabaseReportJobStore(TestSessionLocal)
+
+    async def hang(db, **params):
+        await asyncio.sleep(60)
+
+    monkeypatch.setitem(report_jobs.REPORT_BUILDERS, "usage", hang)
+    job = await report_job_manager.submit("usage", {"days": 7})
+    await asyncio.sleep(0.01)
+    await report_job_manager.shutdown(timeout=0.01)
+
+    cancelled = await report_job_manager.get(job.id)
+    assert cancelled.status == ReportJobStatus.FAILED
+    assert cancelled.expires_at is not None
+
+    monkeypatch.undo()
+    retry = await report_job_manager.submit("usage", {"days": 7})
+    assert retry.id != job.id
+    await report_job_manager.drain()
+    assert (await report_job_manager.get(retry.id)).status == ReportJobStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_stale_active_report_is_not_deduplicated_onto(admin_user):
+    """Test that a job left running by a dead worker stops absorbing new requests"""
+    report_job_manager.store = DatabaseReportJobStore(TestSessionLocal)
+
+    job = await report_job_manager.submit("usage", {"days": 7})
+    await report_job_manager.drain()
+    # As if the worker had died mid-run
+    await report_job_manager.store.update(job.id, status=ReportJobStatus.RUNNING, expires_at=None)
+    assert (await report_job_manager.submit("usage", {"days": 7})).id == job.id
+
+    await report_job_manager.store.update(
+        job.id,
+        created_at=datetime.now(timezone.utc) - report_job_manager.stale_after - timedelta(seconds=1)
+    )
+    retry = await report_job_manager.submit("usage", {"days": 7})
+    assert retry.id != job.id
+    await report_job_manager.drain()
+
+    # The submit marked the abandoned job failed, so it expires like any other
+    abandoned = await report_job_manager.store.get(job.id)
+    assert abandoned.status == ReportJobStatus.FAILED
+    assert abandoned.expires_at is not None
+
+
+@pytest.mark.asyncio
+async def test_polling_an_abandoned_report_reports_failure(admin_user, admin_token):
+    """Test that polling a job whose worker died stops saying running"""
+    report_job_manager.store = DatabaseReportJobStore(TestSessionLocal)
+
+    job = await report_job_manager.submit("usage", {"days": 7})
+    await report_job_manager.drain()
+    await report_job_manager.store.update(
+        job.id,
+        status=ReportJobStatus.RUNNING,
+        expires_at=None,
+        created_at=datetime.now(timezone.utc) - report_job_manager.stale_after - timedelta(seconds=1)
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            f"/api/v1/admin/reports/{job.id}",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"].startswith("Abandoned")
+    assert (await report_job_manager.store.get(job.id)).expires_at is not None
+
+
+@pytest.mark.asyncio
+async def test_get_unknown_report_job(admin_token):
+    """Test polling a job id that does not exist"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get(
+            "/api/v1/admin/reports/00000000-0000-0000-0000-000000000000",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+    assert response.status_code == 404
@@ -0,0 +1,118 @@
+"""
+Tests for the production server launcher
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.server import (
+    cpu_limit,
+    gunicorn_options,
+    memory_limit_bytes,
+    select_http,
+    select_loop,
+    worker_count,
+)
+
+
+@pytest.fixture
+def cgroup(tmp_path, monkeypatch):
+    """Fake cgroup root on a host with 8 usable CPUs"""
+    monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(8)))
+    return tmp_path
+
+
+def test_cpu_limit_cgroup_v2(cgroup):
+    """Test that a v2 quota caps the CPU count and "max" leaves the affinity"""
+    (cgroup / "cpu.max").write_text("150000 100000\n")
+    assert cpu_limit(cgroup) == 1.5
+
+    (cgroup / "cpu.max").write_text("max 100000\n")
+    assert cpu_limit(cgroup) == 8
+
+
+def test_cpu_limit_cgroup_v1(cgroup):
+    """Test v1 quota files, with -1 meaning unlimited"""
+    (cgroup / "cpu").mkdir()
+    (cgroup / "cpu" / "cpu.cfs_period_us").write_text("100000")
+    (cgroup / "cpu" / "cpu.cfs_quota_us").write_text("200000")
+    assert cpu_limit(cgroup) == 2
+
+    (cgroup / "cpu" / "cpu.cfs_quota_us").write_text("-1")
+    assert cpu_limit(cgroup) == 8
+
+
+def test_cpu_limit_without_cgroup(cgroup):
+    """Test that the affinity is used when no cgroup files exist"""
+    assert cpu_limit(cgroup) == 8
+
+
+def test_memory_limit(cgroup):
+    """Test v2 and v1 memory limits, including their "unlimited" forms"""
+    assert memory_limit_bytes(cgroup) is None
+    (cgroup / "memory.max").write_text("max")
+    assert memory_limit_bytes(cgroup) is None
+    (cgroup / "memory.max").write_text(str(512 * 1024 * 1024))
+    assert memory_limit_bytes(cgroup) == 512 * 1024 * 1024
+
+    (cgroup / "memory.max").unlink()
+    (cgroup / "memory").mkdir()
+    (cgroup / "memory" / "memory.limit_in_bytes").write_text("9223372036854771712")
+    assert memory_limit_bytes(cgroup) is None
+
+
+def test_worker_count(cgroup, monkeypatch):
+    """Test sizing from the CPU quota, the explicit override and the caps"""
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    monkeypatch.setattr(settings, "SERVER_WORKERS_PER_CORE", 1.0)
+    monkeypatch.setattr(settings, "SERVER_MAX_WORKERS", 16)
+    monkeypatch.setattr(settings, "SERVER_WORKER_MEMORY_MB", 256)
+    (cgroup / "cpu.max").write_text("250000 100000")
+    assert worker_count(cgroup) == 3
+
+    monkeypatch.setattr(settings, "SERVER_WORKERS_PER_CORE", 2.0)
+    assert worker_count(cgroup) == 5
+
+    # Only two 256 MB workers fit in 600 MB
+    (cgroup / "memory.max").write_text(str(600 * 1024 * 1024))
+    assert worker_count(cgroup) == 2
+
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 12)
+    monkeypatch.setattr(settings, "SERVER_WORKER_MEMORY_MB", 0)
+    monkeypatch.setattr(settings, "SERVER_MAX_WORKERS", 10)
+    assert worker_count(cgroup) == 10
+
+    # A tiny quota still gets one worker
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    monkeypatch.setattr(settings, "SERVER_WORKER_MEMORY_MB", 4096)
+    assert worker_count(cgroup) == 1
+
+
+def test_select_loop_and_http(monkeypatch):
+    """Test that "auto" prefers the compiled implementations only when installed"""
+    assert select_loop("asyncio") == "asyncio"
+    assert select_http("h11") == "h11"
+
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: object())
+    assert select_loop("auto") == "uvloop"
+    assert select_http("auto") == "httptools"
+
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    assert select_loop("auto") == "asyncio"
+    assert select_http("auto") == "h11"
+
+
+def test_gunicorn_options(cgroup, monkeypatch):
+    """Test that the SERVER_* settings map onto gunicorn's options"""
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS_JITTER", 50)
+    monkeypatch.setattr(settings, "SERVER_GRACEFUL_TIMEOUT_SECONDS", 20)
+    monkeypatch.setattr(settings, "SERVER_PRELOAD", True)
+
+    options = gunicorn_options(cgroup)
+    assert options["bind"] == f"{settings.HOST}:{settings.PORT}"
+    assert options["workers"] == 3
+    assert options["worker_class"] == "app.server.UvicornWorker"
+    assert options["max_requests_jitter"] == 50
+    assert options["graceful_timeout"] > 20
+    assert options["preload_app"] is True
@@ -0,0 +1,156 @@
+"""
+Tests for workout streaks
+"""
+
+import pytest
+from datetime import date, timedelta
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.workout_log import WorkoutLog
+from app.models.workout_streak import WorkoutStreak
+from app.core.security import create_access_token
+from app.services.streak_service import StreakService
+
+
+@pytest.fixture
+async def client_user(test_db):
+    """Create a test client user"""
+    user = User(
+        email="streaks@example.com",
+        hashed_password="hashed_password",
+        full_name="Streak Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add(user)
+    await test_db.commit()
+    await test_db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def client_headers(client_user):
+    """Authorization headers for the client user"""
+    token = create_access_token({"sub": client_user.email, "user_id": client_user.id})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _days_ago(days):
+    return date.today() - timedelta(days=days)
+
+
+async def _cached(test_db, user_id):
+    result = await test_db.execute(
+        select(WorkoutStreak).where(WorkoutStreak.user_id == user_id).execution_options(populate_existing=True)
+    )
+    streak = result.scalar_one_or_none()
+    if streak is None:
+        return None
+    return {
+        "user_id": streak.user_id,
+        "current_start": streak.current_start,
+        "last_workout_date": streak.last_workout_date,
+        "current_length": streak.current_length,
+        "longest_streak": streak.longest_streak,
+    }
+
+
+@pytest.mark.asyncio
+async def test_streaks_computed_from_history(client_user, test_db):
+    """Test gaps-and-islands over days with several logs and gaps"""
+    for days in [0, 0, 1, 2, 5, 6, 7, 8, 12, 20]:
+        test_db.add(WorkoutLog(user_id=client_user.id, workout_date=_days_ago(days), exercise_name="Run"))
+    await test_db.commit()
+
+    computed = await StreakService.compute(test_db, [client_user.id])
+    assert computed[client_user.id] == {
+        "user_id": client_user.id,
+        "current_start": _days_ago(2),
+        "last_workout_date": _days_ago(0),
+        "current_length": 3,
+        "longest_streak": 4,
+    }
+
+    summary = (await StreakService.get_streaks(test_db, [client_user.id]))[client_user.id]
+    assert summary["current_streak"] == 3
+    assert summary["longest_streak"] == 4
+    # Weeks ending today cover days 0-6, 7-13, 14-20 and 21-27
+    assert summary["weekly_consistency"] == {"weeks": 4, "active_weeks": 3, "rate": 75.0, "training_days": 9}
+
+    stale = (await StreakService.get_streaks(test_db, [client_user.id], today=_days_ago(-2)))[client_user.id]
+    assert stale["current_streak"] == 0
+    assert stale["longest_streak"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cached_streak_follows_log_writes(client_user, client_headers, test_db):
+    """Test that the cached state matches a full recompute after each write"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        async def log(days):
+            response = await ac.post(
+                "/api/v1/client/workout-logs",
+                headers=client_headers,
+                json={"workout_date": _days_ago(days).isoformat(), "exercise_name": "Row"}
+            )
+            return response.json()["id"]
+
+        steps = []
+        for days in [4, 3, 1, 0, 0]:
+            await log(days)
+            steps.append(await _cached(test_db, client_user.id))
+        # Back-dated log joining the two runs
+        bridge = await log(2)
+        steps.append(await _cached(test_db, client_user.id))
+        await ac.delete(f"/api/v1/client/workout-logs/{bridge}", headers=client_headers)
+        steps.append(await _cached(test_db, client_user.id))
+        progress = (await ac.get("/api/v1/client/progress", headers=client_headers)).json()
+
+        expected = (await StreakService.compute(test_db, [client_user.id]))[client_user.id]
+
+    assert [step["current_length"] for step in steps] == [1, 2, 1, 2, 2, 5, 2]
+    assert [step["longest_streak"] for step in steps] == [1, 2, 2, 2, 2, 5, 2]
+    assert steps[-1] == expected
+    assert progress["streaks"]["current_streak"] == 2
+    assert progress["streaks"]["last_workout_date"] == date.today().isoformat()
+
+
+@pytest.mark.asyncio
+async def test_coach_overview_includes_streaks(client_user, test_db):
+    """Test that the coach client overview reports streaks for every client"""
+    coach = User(
+        email="streaks-coach@example.com",
+        hashed_password="hashed_password",
+        full_name="Streak Coach",
+        role=UserRole.COACH,
+        is_active=True,
+        is_verified=True
+    )
+    idle = User(
+        email="streaks-idle@example.com",
+        hashed_password="hashed_password",
+        full_name="Idle Client",
+        role=UserRole.CLIENT,
+        is_active=True,
+        is_verified=True
+    )
+    test_db.add_all([coach, idle])
+    for days in [1, 2]:
+        test_db.add(WorkoutLog(user_id=client_user.id, workout_date=_days_ago(days), exercise_name="Run"))
+    await test_db.commit()
+
+    token = create_access_token({"sub": coach.email, "user_id": coach.id})
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/api/v1/coach/charts/client-overview", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    clients = {client["client_id"]: client for client in response.json()["clients"]}
+    assert clients[client_user.id]["current_streak"] == 2
+    assert clients[client_user.id]["weekly_consistency"]["training_days"] == 2
+    assert clients[idle.id]["current_streak"] == 0
+    assert clients[idle.id]["last_workout_date"] is None
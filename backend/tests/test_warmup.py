@@ -0,0 +1,109 @@
+"""
+Tests for the startup warm-up
+"""
+
+import asyncio
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import metrics
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.main import app
+from app.models.user import User, UserRole
+from app.services.autocomplete import autocomplete
+from app.services.warmup import WarmupService, warmup
+
+
+async def _user(test_db, email: str, role: UserRole, **fields) -> User:
+    user = User(email=email, hashed_password="x", full_name=email.split("@")[0], role=role, is_active=True, **fields)
+    test_db.add(user)
+    await test_db.commit()
+    return user
+
+
+async def test_warmup_runs_every_step(test_db, monkeypatch):
+    """Test warm-up timings, metrics and the primed caches"""
+    await _user(test_db, "coach@example.com", UserRole.COACH, available_slots=10)
+    # Periodic autocomplete rebuilds are off by default
+    monkeypatch.setattr(autocomplete, "refresh_seconds", 600)
+    metrics.reset()
+
+    await warmup.run()
+
+    assert warmup.ready
+    assert set(warmup.steps) == {"mappers", "connections", "caches"}
+    assert warmup.failed == []
+    assert metrics.get("warmup_duration_seconds") == warmup.duration_seconds > 0
+    assert metrics.get("warmup_step_duration_seconds", step="connections") > 0
+    # The booking board was computed once; the first request is a cache hit
+    assert metrics.get("cache_misses_total", namespace="bookings.coaches") == 1
+    assert autocomplete._refresher is not None
+
+
+async def test_coach_board_served_from_cache_until_booking(test_db):
+    """Test that the primed board is reused and a booking invalidates it"""
+    coach = await _user(test_db, "coach@example.com", UserRole.COACH, available_slots=10)
+    client_user = await _user(test_db, "client@example.com", UserRole.CLIENT)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': client_user.email, 'user_id': client_user.id})}"}
+    await warmup.run()
+    metrics.reset()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        board = (await client.get("/api/v1/bookings/coaches", headers=headers)).json()
+        assert board[0]["booked_slots"] == 0
+        assert metrics.get("cache_hits_total", namespace="bookings.coaches") == 1
+
+        response = await client.post(
+            "/api/v1/bookings/book", json={"coach_id": coach.id, "slot_number": 1}, headers=headers
+        )
+        assert response.status_code == 201
+
+        board = (await client.get("/api/v1/bookings/coaches", headers=headers)).json()
+        assert board[0]["booked_slots"] == 1
+
+
+async def test_failed_step_still_marks_ready():
+    """Test that a failing step is recorded without keeping the worker unready"""
+    metrics.reset()
+    service = WarmupService(pool_connections=1)
+    service.session_factory = warmup.session_factory
+
+    class BrokenEngine:
+        def connect(self):
+            raise ConnectionRefusedError("database unavailable")
+
+    service.engine = BrokenEngine()
+    await service.run()
+
+    assert service.ready
+    assert service.status()["failed_steps"] == ["connections"]
+    assert metrics.get("warmup_failures_total", step="connections") == 1
+
+
+async def test_connections_are_clamped_to_the_pool(tmp_path):
+    """Test that asking for more connections than the pool holds does not stall warm-up"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}",
+        poolclass=AsyncAdaptedQueuePool, pool_size=2, max_overflow=1, pool_timeout=30
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    service = WarmupService(pool_connections=20)
+    service.engine = engine
+    try:
+        assert service._connection_count() == 3
+        await asyncio.wait_for(service._warm_connections(), 5)
+        assert engine.pool.checkedin() == 2
+    finally:
+        await engine.dispose()
+
+
+async def test_disabled_warmup_is_ready_immediately():
+    """Test that WARMUP_ENABLED=false skips warm-up"""
+    service = WarmupService(pool_connections=1, enabled=False)
+    service.start()
+    assert service.ready
+    assert service.steps == {}